@@ -3,15 +3,63 @@ Ce fichier est le point d'entrée de l'application Flask.
 Il initialise l'application et configure les routes API.
 """
 
+import os
+import weakref
+from functools import partial
 from flask import Flask
 from flask_restx import Api
 from flask_cors import CORS
-from app.extensions import bcrypt, jwt, db
+from app.compression import init_compression
+from app.extensions import jwt, db, passwords, entity_cache, response_cache
+from app.persistence.spatial import register_spatial_functions
+from app.persistence.sqlite_tuning import register_sqlite_pragmas
+from app.persistence.invalidation_bus import invalidation_bus
+from app.services import facade
+from app.serializers import output_json
+from app.services.loader import reset_request_loader
 from app.api.v1.users import api as users_ns
 from app.api.v1.amenities import api as amenities_ns
 from app.api.v1.places import api as places_ns
 from app.api.v1.reviews import api as reviews_ns
 from app.api.v1.auth import api as auth_ns
+from app.api.v1.admin import api as admin_ns
+
+
+def _reset_engines_after_fork(app_ref):
+    """
+    Remplace, dans un processus fils, le pool de connexions hérité du parent.
+    Les connexions déjà ouvertes ne sont pas fermées : elles appartiennent au parent.
+    
+    Args:
+        app_ref (weakref.ref): Référence faible vers l'application
+    """
+    app = app_ref()
+    if app is None:
+        return
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def _check_secrets(app):
+    """
+    Vérifie que les clés de signature sont fournies par l'environnement lorsque la
+    configuration l'exige : avec une clé publiée dans le dépôt, n'importe qui pourrait
+    forger un jeton JWT.
+    
+    Args:
+        app (Flask): L'application configurée
+    
+    Raises:
+        RuntimeError: Si SECRET_KEY ou JWT_SECRET_KEY manque ou vaut sa valeur par défaut
+    """
+    if not app.config.get('REQUIRE_SECRETS'):
+        return
+    from config import DEFAULT_JWT_SECRET_KEY, DEFAULT_SECRET_KEY
+    for name, default in (('SECRET_KEY', DEFAULT_SECRET_KEY), ('JWT_SECRET_KEY', DEFAULT_JWT_SECRET_KEY)):
+        if app.config.get(name) in (None, '', default):
+            raise RuntimeError(f"La variable d'environnement {name} doit être définie "
+                               f"avec un secret propre au déploiement")
 
 
 def create_app(config_class="config.DevelopmentConfig"):
@@ -30,12 +78,33 @@ def create_app(config_class="config.DevelopmentConfig"):
     """
     app = Flask(__name__)
     app.config.from_object(config_class)
+    _check_secrets(app)
     # Enable CORS for all routes
-    CORS(app, resources={r"/api/*": {"origins": "*"}})
-    bcrypt.init_app(app)
+    CORS(app, resources={r"/api/*": {"origins": "*"}}, expose_headers=['X-Next-Cursor', 'Link', 'ETag', 'Last-Modified'])
+    passwords.init_app(app)
+    entity_cache.init_app(app)
+    # Middlewares WSGI : compression, puis devant elle le cache HTTP, qui conserve
+    # les variantes compressées ; les GET anonymes en cache ne passent ni par Flask ni par l'ORM
+    init_compression(app)
+    response_cache.init_app(app)
+    invalidation_bus.init_app(app)
     jwt.init_app(app)
     db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            register_sqlite_pragmas(engine, app.config.get('SQLITE_PRAGMAS'))
+            register_spatial_functions(engine)
+        invalidation_bus.create_table()
+        if app.config.get('ENTITY_CACHE_WARMUP'):
+            facade.warm_cache()
+    if hasattr(os, 'register_at_fork'):
+        # Chaque worker d'un serveur multi-processus ouvre ses propres connexions
+        os.register_at_fork(after_in_child=partial(_reset_engines_after_fork, weakref.ref(app)))
+    # Le cache du chargeur par lots ne survit pas à la requête
+    app.teardown_request(reset_request_loader)
     api = Api(app, version='1.0', title='HBnB API', description='API de l\'application HBnB')
+    # Encodage JSON des réponses avec orjson lorsqu'il est installé
+    api.representations['application/json'] = output_json
 
     # Enregistrement des espaces de noms
     api.add_namespace(users_ns, path='/api/v1/users')
@@ -43,4 +112,5 @@ def create_app(config_class="config.DevelopmentConfig"):
     api.add_namespace(places_ns, path='/api/v1/places')
     api.add_namespace(reviews_ns, path='/api/v1/reviews')
     api.add_namespace(auth_ns, path='/api/v1/auth')
+    api.add_namespace(admin_ns, path='/api/v1/admin')
     return app
\ No newline at end of file
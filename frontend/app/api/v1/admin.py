@@ -4,10 +4,12 @@ Il définit les routes pour gérer les utilisateurs, les équipements, les lieux
 qui nécessitent des privilèges d'administrateur.
 """
 
-from flask import request
+from datetime import datetime, timezone
+from flask import Response, request, stream_with_context
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services.facade import facade
+from app.serializers import AMENITY, USER_ADMIN, ndjson
 
 api = Namespace('admin', description='Opérations d\'administration')
 
@@ -115,14 +117,7 @@ class AdminUserResource(Resource):
             if not updated_user:
                 return {'error': 'Utilisateur non trouvé'}, 404
             
-            return {
-                'id': updated_user.id,
-                'first_name': updated_user.first_name,
-                'last_name': updated_user.last_name,
-                'email': updated_user.email,
-                'role': updated_user.role,
-                'is_admin': updated_user.is_admin
-            }, 200
+            return USER_ADMIN(updated_user), 200
         except ValueError as e:
             return {'error': str(e)}, 400
 
@@ -156,10 +151,7 @@ class AdminAmenityList(Resource):
         amenity_data = api.payload
         try:
             new_amenity = facade.create_amenity(amenity_data)
-            return {
-                'id': new_amenity.id,
-                'name': new_amenity.name
-            }, 201
+            return AMENITY(new_amenity), 201
         except ValueError as e:
             return {'error': str(e)}, 400
 
@@ -196,13 +188,60 @@ class AdminAmenityResource(Resource):
             updated_amenity = facade.update_amenity(amenity_id, amenity_data)
             return {
                 'message': 'Équipement mis à jour avec succès',
-                'amenity': {
-                    'id': updated_amenity.id,
-                    'name': updated_amenity.name
-                }
+                'amenity': AMENITY(updated_amenity)
             }, 200
         except ValueError as e:
             if "non trouvé" in str(e):
                 return {'error': str(e)}, 404
             else:
                 return {'error': str(e)}, 400
+
+@api.route('/export/<string:kind>')
+class AdminExport(Resource):
+    """
+    Ressource d'export d'une collection (places, reviews ou users) en NDJSON.
+    """
+    @api.doc(params={
+        'format': 'Format de l\'export (ndjson uniquement)',
+        'since': 'Date ISO 8601 : n\'exporte que les objets modifiés à cette date ou après'
+    })
+    @api.response(200, 'Export en cours de transmission')
+    @api.response(400, 'Format ou date invalide')
+    @api.response(401, 'Non autorisé - Authentification requise')
+    @api.response(403, 'Interdit - Privilèges d\'administrateur requis')
+    @api.response(404, 'Collection non trouvée')
+    @jwt_required()
+    def get(self, kind):
+        """
+        Exporte une collection, un objet JSON par ligne, par date de modification croissante.
+        
+        La réponse est transmise au fil de la lecture de la base, par lots :
+        la mémoire utilisée ne dépend pas de la taille de la collection.
+        Le mot de passe des utilisateurs n'est jamais exporté.
+        Nécessite des privilèges d'administrateur.
+        """
+        # Vérifie si l'utilisateur est un administrateur
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            return {'message': 'Admin privileges required'}, 403
+        
+        if request.args.get('format', 'ndjson') != 'ndjson':
+            return {'error': 'Format non supporté, seul ndjson est accepté'}, 400
+        
+        since = request.args.get('since')
+        if since is not None:
+            try:
+                since = datetime.fromisoformat(since)
+            except ValueError:
+                return {'error': 'Date since invalide, format ISO 8601 attendu'}, 400
+            # Les dates sont stockées en UTC sans fuseau
+            if since.tzinfo is not None:
+                since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        
+        try:
+            partitions = facade.export_rows(kind, since)
+        except ValueError as e:
+            return {'error': str(e)}, 404
+        
+        return Response(stream_with_context(ndjson(partitions)), mimetype='application/x-ndjson',
+                        headers={'Content-Disposition': f'attachment; filename={kind}.ndjson'})
@@ -6,7 +6,11 @@ Il définit les routes pour créer, récupérer, mettre à jour et supprimer des
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services import facade
+from app.response_cache import ALL, cache_tags
+from app.serializers import AMENITY
 from .decorators import admin_required
+from .bulk import bulk_result_model, bulk_response, parse_bulk_payload
+from .conditional import conditional
 
 api = Namespace('amenities', description='Opérations sur les équipements')
 
@@ -48,14 +52,13 @@ class AmenityList(Resource):
         amenity_data = api.payload
         try:
             new_amenity = facade.create_amenity(amenity_data)
-            return {
-                'id': new_amenity.id,
-                'name': new_amenity.name
-            }, 201
+            return AMENITY(new_amenity), 201
         except ValueError as e:
             api.abort(400, str(e))
 
     @api.response(200, 'Liste des équipements récupérée avec succès')
+    @api.response(304, 'Non modifié depuis la version du client')
+    @conditional(lambda: facade.get_collection_version('amenity'), last_modified=False)
     def get(self):
         """
         Récupère une liste de tous les équipements.
@@ -63,11 +66,38 @@ class AmenityList(Resource):
         Cette méthode renvoie une liste de tous les équipements enregistrés dans le système,
         avec leurs informations de base (id, nom).
         """
-        amenities = facade.get_all_amenities()
-        return [{
-            'id': amenity.id,
-            'name': amenity.name
-        } for amenity in amenities], 200
+        amenities = facade.list_amenities()
+        cache_tags(('amenity', ALL), *(('amenity', amenity.id) for amenity in amenities))
+        return AMENITY.many(amenities), 200
+
+amenity_bulk_result_model = bulk_result_model(api, 'Amenity')
+
+@api.route('/bulk')
+class AmenityBulk(Resource):
+    """
+    Ressource pour la création d'équipements en masse.
+    """
+    @api.expect([amenity_model])
+    @api.response(201, 'Tous les équipements ont été créés', amenity_bulk_result_model)
+    @api.response(207, 'Une partie des équipements a été créée, les autres sont listés dans errors',
+                  amenity_bulk_result_model)
+    @api.response(400, 'Aucun équipement valide ou corps de requête invalide')
+    @api.response(401, 'Non autorisé - Authentification requise')
+    @jwt_required()
+    def post(self):
+        """
+        Enregistre plusieurs équipements en une seule requête.
+        
+        Le corps est une liste d'équipements au format de POST /amenities/.
+        Les équipements valides sont insérés en une seule transaction ; la réponse indique
+        l'id de chaque équipement créé et la raison du refus des autres.
+        Nécessite une authentification JWT.
+        """
+        try:
+            items = parse_bulk_payload(api.payload)
+        except ValueError as e:
+            api.abort(400, str(e))
+        return bulk_response(*facade.create_amenities_bulk(items))
 
 @api.route('/<amenity_id>')
 class AmenityResource(Resource):
@@ -77,6 +107,8 @@ class AmenityResource(Resource):
     """
     @api.response(200, 'Détails de l\'équipement récupérés avec succès')
     @api.response(404, 'Équipement non trouvé')
+    @api.response(304, 'Non modifié depuis la version du client')
+    @conditional(facade.get_amenity_version)
     def get(self, amenity_id):
         """
         Récupère les détails d'un équipement par son ID.
@@ -85,11 +117,7 @@ class AmenityResource(Resource):
         identifié par son ID unique.
         """
         try:
-            amenity = facade.get_amenity(amenity_id)
-            return {
-                'id': amenity.id,
-                'name': amenity.name
-            }, 200
+            return facade.get_amenity_snapshot(amenity_id), 200
         except ValueError as e:
             api.abort(404, str(e))
 
@@ -118,10 +146,7 @@ class AmenityResource(Resource):
             updated_amenity = facade.update_amenity(amenity_id, amenity_data)
             return {
                 'message': 'Équipement mis à jour avec succès',
-                'amenity': {
-                    'id': updated_amenity.id,
-                    'name': updated_amenity.name
-                }
+                'amenity': AMENITY(updated_amenity)
             }, 200
         except ValueError as e:
             if "non trouvé" in str(e):
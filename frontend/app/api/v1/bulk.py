@@ -0,0 +1,64 @@
+"""
+Ce fichier contient les outils communs aux endpoints de création en masse
+(POST /places/bulk, /amenities/bulk et /reviews/bulk).
+"""
+
+from flask import current_app
+from flask_restx import fields
+
+
+def bulk_result_model(api, name):
+    """
+    Déclare dans un namespace le modèle de réponse d'une création en masse.
+
+    :param api: Le namespace Flask-RESTX
+    :param name: Le préfixe des modèles déclarés
+    :return: Le modèle de réponse
+    """
+    created = api.model(f'{name}BulkCreated', {
+        'index': fields.Integer(description='Position de l\'élément dans la requête'),
+        'id': fields.String(description='ID de l\'objet créé')
+    })
+    error = api.model(f'{name}BulkError', {
+        'index': fields.Integer(description='Position de l\'élément dans la requête'),
+        'error': fields.String(description='Raison du refus')
+    })
+    return api.model(f'{name}BulkResult', {
+        'created': fields.List(fields.Nested(created), description='Éléments créés'),
+        'errors': fields.List(fields.Nested(error), description='Éléments refusés')
+    })
+
+
+def parse_bulk_payload(payload):
+    """
+    Vérifie le corps d'une requête de création en masse.
+
+    :param payload: Le JSON reçu
+    :return: La liste des éléments
+    :raises ValueError: Si le corps n'est pas une liste non vide ou dépasse BULK_MAX_ITEMS
+    """
+    if not isinstance(payload, list) or not payload:
+        raise ValueError("Le corps de la requête doit être une liste non vide")
+    maximum = current_app.config.get('BULK_MAX_ITEMS', 1000)
+    if len(payload) > maximum:
+        raise ValueError(f"Une requête ne peut pas contenir plus de {maximum} éléments")
+    return payload
+
+
+def bulk_response(created, errors):
+    """
+    Construit la réponse d'une création en masse.
+    Le statut vaut 201 si tout a été créé, 207 si une partie seulement l'a été
+    et 400 si aucun élément n'était valide.
+
+    :param created: La liste des éléments créés {'index', 'id'}
+    :param errors: La liste des éléments refusés {'index', 'error'}
+    :return: Un tuple (corps, statut)
+    """
+    if not errors:
+        status = 201
+    elif created:
+        status = 207
+    else:
+        status = 400
+    return {'created': created, 'errors': errors}, status
@@ -0,0 +1,79 @@
+"""
+Ce fichier contient le décorateur des GET conditionnels (ETag, Last-Modified).
+La version d'une ressource est lue par une requête légère (dates de
+modification et nombres de lignes) avant tout chargement : si le client
+possède déjà cette version (If-None-Match, ou If-Modified-Since pour un objet
+seul), la réponse 304 est renvoyée sans charger ni sérialiser la ressource.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from flask import current_app, request
+from werkzeug.http import http_date, quote_etag
+
+
+def conditional(version_of, last_modified=True):
+    """
+    Décorateur de méthode GET ajoutant les en-têtes ETag et Last-Modified et
+    répondant 304 lorsque la version du client est à jour.
+
+    L'ETag est fort : il est dérivé du chemin, des paramètres de la requête et de
+    la version, et deux réponses de même ETag sont identiques octet pour octet.
+    Last-Modified est la plus récente des dates de la version ; If-None-Match
+    est prioritaire, car une suppression ne change pas cette date.
+
+    :param version_of: Une fonction recevant les paramètres de la route et renvoyant
+                       la version (un tuple), ou None si la ressource n'existe pas
+    :param last_modified: False pour une liste : la suppression d'un élément ne change
+                          que le nombre de la version, seul l'ETag est alors utilisé
+                          et If-Modified-Since est ignoré
+    :return: Le décorateur
+    """
+    def wrapper(fn):
+        @wraps(fn)
+        def decorator(resource, *args, **kwargs):
+            version = version_of(*args, **kwargs)
+            if version is None:
+                # Ressource introuvable : la méthode renvoie son erreur habituelle
+                return fn(resource, *args, **kwargs)
+
+            etag = _etag(version)
+            headers = {'ETag': quote_etag(etag), 'Cache-Control': 'no-cache'}
+            modified = None
+            if last_modified:
+                modified = max((value for value in version if isinstance(value, datetime)), default=None)
+            if modified is not None:
+                modified = modified.replace(microsecond=0, tzinfo=timezone.utc)
+                headers['Last-Modified'] = http_date(modified)
+
+            if _not_modified(etag, modified):
+                return current_app.response_class(status=304, headers=headers)
+            return _with_headers(fn(resource, *args, **kwargs), headers)
+        return decorator
+    return wrapper
+
+
+def _etag(version):
+    """Calcule l'ETag d'une version de la ressource demandée."""
+    key = repr((request.path, sorted(request.args.items(multi=True)), version))
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def _not_modified(etag, last_modified):
+    """Indique si le client possède déjà la version courante de la ressource."""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def _with_headers(result, headers):
+    """Ajoute les en-têtes de validation à une réponse 200 de Flask-RESTX."""
+    if not isinstance(result, tuple):
+        result = (result, 200)
+    data, status, *rest = result
+    if status != 200:
+        return result
+    return data, status, {**(rest[0] if rest else {}), **headers}
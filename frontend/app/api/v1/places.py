@@ -4,9 +4,18 @@ Il définit les routes pour créer, récupérer, mettre à jour et supprimer des
 ainsi que pour gérer les avis associés à ces lieux.
 """
 
+from urllib.parse import urlencode
+from flask import request, current_app
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services import facade
+from app.services.loader import request_loader
+from app.models.user import User
+from app.persistence.pagination import parse_limit
+from app.response_cache import ALL, cache_tags
+from app.serializers import PLACE_LIST, PLACE_NEARBY, PLACE_WRITE, REVIEW_SUMMARY, USER_AUTHOR
+from .bulk import bulk_result_model, bulk_response, parse_bulk_payload
+from .conditional import conditional
 
 api = Namespace('places', description='Opérations sur les lieux')
 
@@ -82,43 +91,153 @@ class PlaceList(Resource):
             place_data['owner_id'] = current_user_id
             
             new_place = facade.create_place(place_data)
-            
-            # Récupère les équipements pour ce lieu
-            amenities = []
-            if hasattr(new_place, 'amenities'):
-                amenities = [{
-                    'id': amenity.id,
-                    'name': amenity.name
-                } for amenity in new_place.amenities]
-            
-            return {
-                'id': new_place.id,
-                'title': new_place.title,
-                'description': new_place.description,
-                'price': new_place.price,
-                'latitude': new_place.latitude,
-                'longitude': new_place.longitude,
-                'owner_id': new_place.owner_id,
-                'amenities': amenities
-            }, 201
+            return PLACE_WRITE(new_place), 201
         except ValueError as e:
             api.abort(400, str(e))
 
+    @api.doc(params={
+        'limit': 'Nombre maximum de lieux à retourner',
+        'cursor': 'Curseur renvoyé dans l\'en-tête X-Next-Cursor de la page précédente, avec le même tri',
+        'min_price': 'Prix minimum par nuit',
+        'max_price': 'Prix maximum par nuit',
+        'amenities': 'IDs d\'équipements séparés par des virgules (tous requis)',
+        'owner_id': 'ID du propriétaire',
+        'sort': 'Tri : created_at (défaut), price, -price ou rating'
+    })
     @api.response(200, 'Liste des lieux récupérée avec succès')
+    @api.response(400, 'Paramètres de filtre, de tri ou de pagination invalides')
+    @api.response(304, 'Non modifié depuis la version du client')
+    @conditional(lambda: facade.get_collection_version('place'), last_modified=False)
+    def get(self):
+        """
+        Récupère une page de lieux.
+        
+        Cette méthode renvoie les lieux enregistrés dans le système avec leurs
+        informations de base (id, titre, prix, latitude, longitude).
+        Les filtres et le tri sont appliqués par la base de données.
+        La liste est paginée par curseur : si d'autres lieux existent, le curseur de
+        la page suivante est renvoyé dans l'en-tête X-Next-Cursor (et dans l'en-tête Link).
+        """
+        try:
+            limit = parse_limit(request.args.get('limit'),
+                                current_app.config['PAGINATION_DEFAULT_LIMIT'],
+                                current_app.config['PAGINATION_MAX_LIMIT'])
+            filters = {}
+            for name in ('min_price', 'max_price'):
+                if request.args.get(name):
+                    try:
+                        filters[name] = float(request.args[name])
+                    except ValueError:
+                        raise ValueError(f"Le paramètre {name} doit être un nombre")
+            if request.args.get('amenities'):
+                filters['amenity_ids'] = [amenity_id.strip() for amenity_id
+                                          in request.args['amenities'].split(',') if amenity_id.strip()]
+            if request.args.get('owner_id'):
+                filters['owner_id'] = request.args['owner_id']
+            places, next_cursor = facade.get_places_page(limit, request.args.get('cursor'), filters,
+                                                         request.args.get('sort', 'created_at'))
+        except ValueError as e:
+            api.abort(400, str(e))
+
+        # Réponse cacheable : purgée à chaque écriture d'un lieu ou d'un équipement filtré
+        cache_tags(('place', ALL), *(('place', place.id) for place in places),
+                   *(('amenity', amenity_id) for amenity_id in filters.get('amenity_ids', ())))
+        headers = {}
+        if next_cursor:
+            args = request.args.to_dict()
+            args.update({'limit': limit, 'cursor': next_cursor})
+            headers['X-Next-Cursor'] = next_cursor
+            headers['Link'] = f'<{request.base_url}?{urlencode(args)}>; rel="next"'
+        return PLACE_LIST.many(places), 200, headers
+
+place_bulk_result_model = bulk_result_model(api, 'Place')
+
+@api.route('/bulk')
+class PlaceBulk(Resource):
+    """
+    Ressource pour la création de lieux en masse.
+    """
+    @api.expect([place_model])
+    @api.response(201, 'Tous les lieux ont été créés', place_bulk_result_model)
+    @api.response(207, 'Une partie des lieux a été créée, les autres sont listés dans errors',
+                  place_bulk_result_model)
+    @api.response(400, 'Aucun lieu valide ou corps de requête invalide')
+    @api.response(401, 'Non autorisé - Authentification requise')
+    @jwt_required()
+    def post(self):
+        """
+        Enregistre plusieurs lieux en une seule requête.
+        
+        Le corps est une liste de lieux au format de POST /places/. Tous les éléments sont
+        validés avant l'insertion, qui se fait en une seule transaction ; la réponse indique
+        l'id de chaque lieu créé et la raison du refus des autres.
+        Le propriétaire est l'utilisateur authentifié, sauf pour un administrateur
+        qui peut indiquer l'owner_id de chaque lieu.
+        Nécessite une authentification JWT.
+        """
+        try:
+            items = parse_bulk_payload(api.payload)
+        except ValueError as e:
+            api.abort(400, str(e))
+
+        current_user_id = get_jwt_identity()
+        is_admin = get_jwt().get('is_admin', False)
+        places_data = []
+        for item in items:
+            if isinstance(item, dict):
+                item = dict(item)
+                if not is_admin or not item.get('owner_id'):
+                    item['owner_id'] = current_user_id
+            places_data.append(item)
+
+        return bulk_response(*facade.create_places_bulk(places_data))
+
+@api.route('/nearby')
+class PlaceNearby(Resource):
+    """
+    Ressource pour la recherche géographique de lieux.
+    Permet de récupérer les lieux situés dans un rayon donné autour d'un point.
+    """
+    @api.doc(params={
+        'lat': 'Latitude du point central',
+        'lng': 'Longitude du point central',
+        'radius_km': 'Rayon de recherche en kilomètres',
+        'limit': 'Nombre maximum de lieux à retourner'
+    })
+    @api.response(200, 'Lieux à proximité récupérés avec succès')
+    @api.response(400, 'Paramètres de recherche invalides')
+    @api.response(304, 'Non modifié depuis la version du client')
+    @conditional(lambda: facade.get_collection_version('place'), last_modified=False)
     def get(self):
         """
-        Récupère une liste de tous les lieux.
+        Récupère les lieux situés dans un rayon donné, du plus proche au plus éloigné.
         
-        Cette méthode renvoie une liste de tous les lieux enregistrés dans le système,
-        avec leurs informations de base (id, titre, latitude, longitude).
+        Cette méthode renvoie les informations de base des lieux (id, titre, latitude,
+        longitude) ainsi que leur distance au point central en kilomètres.
         """
-        places = facade.get_all_places()
-        return [{
-            'id': place.id,
-            'title': place.title,
-            'latitude': place.latitude,
-            'longitude': place.longitude
-        } for place in places], 200
+        try:
+            lat = float(request.args['lat'])
+            lng = float(request.args['lng'])
+            radius_km = float(request.args['radius_km'])
+        except KeyError as e:
+            api.abort(400, f"Paramètre requis manquant: {e.args[0]}")
+        except ValueError:
+            api.abort(400, 'Les paramètres lat, lng et radius_km doivent être des nombres')
+
+        try:
+            if radius_km > current_app.config['NEARBY_MAX_RADIUS_KM']:
+                raise ValueError(f"Le rayon ne doit pas dépasser {current_app.config['NEARBY_MAX_RADIUS_KM']} km")
+            limit = parse_limit(request.args.get('limit'),
+                                current_app.config['PAGINATION_DEFAULT_LIMIT'],
+                                current_app.config['PAGINATION_MAX_LIMIT'])
+            results = facade.get_places_nearby(lat, lng, radius_km, limit)
+        except ValueError as e:
+            api.abort(400, str(e))
+
+        rows = PLACE_NEARBY.many([place for place, _ in results])
+        for row, (_, distance) in zip(rows, results):
+            row['distance_km'] = round(distance, 3)
+        return rows, 200
 
 @api.route('/<place_id>')
 class PlaceResource(Resource):
@@ -128,6 +247,8 @@ class PlaceResource(Resource):
     """
     @api.response(200, 'Détails du lieu récupérés avec succès')
     @api.response(404, 'Lieu non trouvé')
+    @api.response(304, 'Non modifié depuis la version du client')
+    @conditional(facade.get_place_version)
     def get(self, place_id):
         """
         Récupère les détails d'un lieu par son ID.
@@ -137,43 +258,11 @@ class PlaceResource(Resource):
         et les avis associés.
         """
         try:
-            place = facade.get_place(place_id)
-            owner = facade.get_user(place.owner_id)
-            
-            # Récupère les avis pour ce lieu
-            reviews = []
-            if hasattr(place, 'reviews'):
-                reviews = [{
-                    'id': review.id,
-                    'text': review.text,
-                    'rating': review.rating,
-                    'user_id': review.user.id
-                } for review in place.reviews]
-            
-            # Récupère les équipements pour ce lieu
-            amenities = []
-            if hasattr(place, 'amenities'):
-                amenities = [{
-                    'id': amenity.id,
-                    'name': amenity.name
-                } for amenity in place.amenities]
-            
-            return {
-                'id': place.id,
-                'title': place.title,
-                'description': place.description,
-                'price': place.price,
-                'latitude': place.latitude,
-                'longitude': place.longitude,
-                'owner': {
-                    'id': owner.id,
-                    'first_name': owner.first_name,
-                    'last_name': owner.last_name,
-                    'email': owner.email
-                },
-                'reviews': reviews,
-                'amenities': amenities
-            }, 200
+            # Propriétaire, avis et équipements, depuis le cache de la façade si possible
+            place = facade.get_place_snapshot(place_id)
+            cache_tags(('place', place_id), ('user', place['owner']['id']),
+                       *(('amenity', amenity['id']) for amenity in place['amenities']))
+            return place, 200
         except ValueError as e:
             api.abort(404, str(e))
 
@@ -227,27 +316,9 @@ class PlaceResource(Resource):
             
             try:
                 updated_place = facade.update_place(place_id, update_data)
-                
-                # Récupère les équipements pour ce lieu
-                amenities = []
-                if hasattr(updated_place, 'amenities'):
-                    amenities = [{
-                        'id': amenity.id,
-                        'name': amenity.name
-                    } for amenity in updated_place.amenities]
-                
                 return {
                     'message': 'Lieu mis à jour avec succès',
-                    'place': {
-                        'id': updated_place.id,
-                        'title': updated_place.title,
-                        'description': updated_place.description,
-                        'price': updated_place.price,
-                        'latitude': updated_place.latitude,
-                        'longitude': updated_place.longitude,
-                        'owner_id': updated_place.owner_id,
-                        'amenities': amenities
-                    }
+                    'place': PLACE_WRITE(updated_place)
                 }, 200
             except ValueError as e:
                 api.abort(400, str(e))
@@ -299,6 +370,8 @@ class PlaceReviewList(Resource):
     """
     @api.response(200, 'Liste des avis pour le lieu récupérée avec succès')
     @api.response(404, 'Lieu non trouvé')
+    @api.response(304, 'Non modifié depuis la version du client')
+    @conditional(facade.get_place_reviews_version, last_modified=False)
     def get(self, place_id):
         """
         Récupère tous les avis pour un lieu spécifique.
@@ -308,15 +381,12 @@ class PlaceReviewList(Resource):
         """
         try:
             reviews = facade.get_reviews_by_place(place_id)
-            return [{
-                'id': review.id,
-                'text': review.text,
-                'rating': review.rating,
-                'user': {
-                    'id': review.user.id,
-                    'first_name': review.user.first_name,
-                    'last_name': review.user.last_name
-                }
-            } for review in reviews], 200
+            # Les auteurs sont chargés en une seule requête pour tous les avis
+            users = request_loader().load_many(User, (review.user_id for review in reviews))
+            cache_tags(('place', place_id), *(('user', user_id) for user_id in users))
+            rows = REVIEW_SUMMARY.many(reviews)
+            for row, review in zip(rows, reviews):
+                row['user'] = USER_AUTHOR(users[review.user_id])
+            return rows, 200
         except ValueError as e:
             api.abort(404, str(e))
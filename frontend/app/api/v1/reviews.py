@@ -6,6 +6,12 @@ Il définit les routes pour créer, récupérer, mettre à jour et supprimer des
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services import facade
+from app.services.loader import request_loader
+from app.models.user import User
+from app.models.place import Place
+from app.serializers import PLACE_TITLE, REVIEW, REVIEW_SUMMARY, USER_AUTHOR
+from .bulk import bulk_result_model, bulk_response, parse_bulk_payload
+from .conditional import conditional
 
 api = Namespace('reviews', description='Opérations sur les avis')
 
@@ -80,28 +86,18 @@ class ReviewList(Resource):
             place = facade.get_place(place_id)
             
             # Vérifie si l'utilisateur est le propriétaire du lieu
-            if place.owner_id == current_user_id:
+            if place and place.owner_id == current_user_id:
                 api.abort(400, 'You cannot review your own place')
             
-            # Vérifie si l'utilisateur a déjà laissé un avis pour ce lieu
-            reviews_for_place = facade.get_reviews_by_place(place_id)
-            if reviews_for_place:  # Check if reviews_for_place is not None
-                for review in reviews_for_place:
-                    if review.user.id == current_user_id:
-                        api.abort(400, 'You have already reviewed this place')
-            
+            # Un avis existant pour ce lieu est refusé par la façade (ValueError)
             new_review = facade.create_review(review_data)
-            return {
-                'id': new_review.id,
-                'text': new_review.text,
-                'rating': new_review.rating,
-                'user_id': new_review.user.id,
-                'place_id': new_review.place.id
-            }, 201
+            return REVIEW(new_review), 201
         except ValueError as e:
             api.abort(400, str(e))
 
     @api.response(200, 'Liste des avis récupérée avec succès')
+    @api.response(304, 'Non modifié depuis la version du client')
+    @conditional(lambda: facade.get_collection_version('review'), last_modified=False)
     def get(self):
         """
         Récupère une liste de tous les avis.
@@ -109,14 +105,50 @@ class ReviewList(Resource):
         Cette méthode renvoie une liste de tous les avis enregistrés dans le système,
         avec leurs informations de base (id, texte, note, utilisateur, lieu).
         """
-        reviews = facade.get_all_reviews()
-        return [{
-            'id': review.id,
-            'text': review.text,
-            'rating': review.rating,
-            'user_id': review.user.id,
-            'place_id': review.place.id
-        } for review in reviews], 200
+        return REVIEW.many(facade.list_reviews()), 200
+
+review_bulk_result_model = bulk_result_model(api, 'Review')
+
+@api.route('/bulk')
+class ReviewBulk(Resource):
+    """
+    Ressource pour la création d'avis en masse.
+    """
+    @api.expect([review_model])
+    @api.response(201, 'Tous les avis ont été créés', review_bulk_result_model)
+    @api.response(207, 'Une partie des avis a été créée, les autres sont listés dans errors',
+                  review_bulk_result_model)
+    @api.response(400, 'Aucun avis valide ou corps de requête invalide')
+    @api.response(401, 'Non autorisé - Authentification requise')
+    @jwt_required()
+    def post(self):
+        """
+        Enregistre plusieurs avis en une seule requête.
+        
+        Le corps est une liste d'avis au format de POST /reviews/. Les règles sont celles
+        de la création unitaire : pas d'avis sur son propre lieu, un seul avis par lieu.
+        Les avis valides sont insérés en une seule transaction ; la réponse indique
+        l'id de chaque avis créé et la raison du refus des autres.
+        L'auteur est l'utilisateur authentifié, sauf pour un administrateur
+        qui peut indiquer l'user_id de chaque avis.
+        Nécessite une authentification JWT.
+        """
+        try:
+            items = parse_bulk_payload(api.payload)
+        except ValueError as e:
+            api.abort(400, str(e))
+
+        current_user_id = get_jwt_identity()
+        is_admin = get_jwt().get('is_admin', False)
+        reviews_data = []
+        for item in items:
+            if isinstance(item, dict):
+                item = dict(item)
+                if not is_admin or not item.get('user_id'):
+                    item['user_id'] = current_user_id
+            reviews_data.append(item)
+
+        return bulk_response(*facade.create_reviews_bulk(reviews_data))
 
 @api.route('/<review_id>')
 class ReviewResource(Resource):
@@ -126,6 +158,8 @@ class ReviewResource(Resource):
     """
     @api.response(200, 'Détails de l\'avis récupérés avec succès')
     @api.response(404, 'Avis non trouvé')
+    @api.response(304, 'Non modifié depuis la version du client')
+    @conditional(facade.get_review_version)
     def get(self, review_id):
         """
         Récupère les détails d'un avis par son ID.
@@ -136,20 +170,13 @@ class ReviewResource(Resource):
         """
         try:
             review = facade.get_review(review_id)
-            return {
-                'id': review.id,
-                'text': review.text,
-                'rating': review.rating,
-                'user': {
-                    'id': review.user.id,
-                    'first_name': review.user.first_name,
-                    'last_name': review.user.last_name
-                },
-                'place': {
-                    'id': review.place.id,
-                    'title': review.place.title
-                }
-            }, 200
+            loader = request_loader()
+            user = loader.load(User, review.user_id)
+            place = loader.load(Place, review.place_id)
+            row = REVIEW_SUMMARY(review)
+            row['user'] = USER_AUTHOR(user)
+            row['place'] = PLACE_TITLE(place)
+            return row, 200
         except ValueError as e:
             api.abort(404, str(e))
 
@@ -182,7 +209,7 @@ class ReviewResource(Resource):
             review = facade.get_review(review_id)
             
             # Vérifie si l'utilisateur authentifié est l'auteur de l'avis ou un administrateur
-            if review.user.id != current_user_id and not is_admin:
+            if review.user_id != current_user_id and not is_admin:
                 api.abort(403, 'Unauthorized action')
         except ValueError as e:
             api.abort(404, str(e))
@@ -197,13 +224,7 @@ class ReviewResource(Resource):
             updated_review = facade.update_review(review_id, update_data)
             return {
                 'message': 'Avis mis à jour avec succès',
-                'review': {
-                    'id': updated_review.id,
-                    'text': updated_review.text,
-                    'rating': updated_review.rating,
-                    'user_id': updated_review.user.id,
-                    'place_id': updated_review.place.id
-                }
+                'review': REVIEW(updated_review)
             }, 200
         except ValueError as e:
             api.abort(400, str(e))
@@ -234,7 +255,7 @@ class ReviewResource(Resource):
             review = facade.get_review(review_id)
             
             # Vérifie si l'utilisateur authentifié est l'auteur de l'avis ou un administrateur
-            if review.user.id != current_user_id and not is_admin:
+            if review.user_id != current_user_id and not is_admin:
                 api.abort(403, 'Unauthorized action')
                 
             facade.delete_review(review_id)
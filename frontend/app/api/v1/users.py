@@ -6,6 +6,8 @@ Il définit les routes pour créer, récupérer, mettre à jour et supprimer des
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services.facade import facade
+from app.serializers import USER
+from .conditional import conditional
 from .decorators import admin_required
 
 api = Namespace('users', description='Opérations sur les utilisateurs')
@@ -61,6 +63,8 @@ class UserList(Resource):
             return {'error': str(e)}, 400
 
     @api.response(200, 'Liste des utilisateurs récupérée avec succès')
+    @api.response(304, 'Non modifié depuis la version du client')
+    @conditional(lambda: facade.get_collection_version('user'), last_modified=False)
     def get(self):
         """
         Récupère tous les utilisateurs.
@@ -68,9 +72,7 @@ class UserList(Resource):
         Cette méthode renvoie une liste de tous les utilisateurs enregistrés dans le système,
         avec leurs informations de base (id, prénom, nom, email).
         """
-        users = facade.get_all_users()
-        user_list = [{'id': user.id, 'first_name': user.first_name, 'last_name': user.last_name, 'email': user.email, 'role': user.role} for user in users]
-        return user_list, 200
+        return USER.many(facade.list_users()), 200
 
 @api.route('/<user_id>')
 class UserResource(Resource):
@@ -80,6 +82,8 @@ class UserResource(Resource):
     """
     @api.response(200, 'Détails de l\'utilisateur récupérés avec succès')
     @api.response(404, 'Utilisateur non trouvé')
+    @api.response(304, 'Non modifié depuis la version du client')
+    @conditional(facade.get_user_version)
     def get(self, user_id):
         """
         Récupère les détails d'un utilisateur par son ID.
@@ -87,10 +91,10 @@ class UserResource(Resource):
         Cette méthode renvoie les informations détaillées d'un utilisateur spécifique
         identifié par son ID unique.
         """
-        user = facade.get_user(user_id)
+        user = facade.get_user_snapshot(user_id)
         if not user:
             return {'error': 'Utilisateur non trouvé'}, 404
-        return {'id': user.id, 'first_name': user.first_name, 'last_name': user.last_name, 'email': user.email, 'role': user.role}, 200
+        return user, 200
 
     @api.expect(user_update_model, validate=True)
     @api.response(200, 'Utilisateur mis à jour avec succès')
@@ -143,7 +147,7 @@ class UserResource(Resource):
             updated_user = facade.update_user(user_id, user_data)
             if not updated_user:
                 return {'error': 'Utilisateur non trouvé'}, 404
-            return {'id': updated_user.id, 'first_name': updated_user.first_name, 'last_name': updated_user.last_name, 'email': updated_user.email, 'role': updated_user.role}, 200
+            return USER(updated_user), 200
         except ValueError as e:
             return {'error': str(e)}, 400
             
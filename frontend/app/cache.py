@@ -0,0 +1,162 @@
+"""
+Ce fichier contient le cache d'entités en mémoire du processus.
+HBnBFacade y conserve des instantanés (dictionnaires figés au format des
+réponses de l'API) des lieux, équipements et utilisateurs, indexés par
+(type, identifiant). Le cache est borné en taille (LRU) et en durée (TTL) ;
+la façade invalide les clés concernées à chaque écriture.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL = 60
+
+# Valeur renvoyée par get() pour une clé absente ou expirée
+MISSING = object()
+# Identifiant signifiant « toutes les entités de ce type »
+ALL = '*'
+
+
+class EntityCache:
+    """
+    Extension Flask de cache LRU + TTL, partagée par les threads du processus.
+    Avec ENTITY_CACHE_SIZE = 0, le cache est désactivé et chaque lecture
+    passe par la base de données.
+    """
+
+    def __init__(self, app=None):
+        self.max_size = 0
+        self.ttl = DEFAULT_TTL
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Incrémenté à chaque invalidation : une valeur chargée pendant une
+        # invalidation n'est pas mise en cache (elle est peut-être déjà périmée)
+        self._version = 0
+        self._reset_counters()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Lit ENTITY_CACHE_SIZE et ENTITY_CACHE_TTL dans la configuration et vide le cache.
+
+        :param app: L'application Flask
+        """
+        self.max_size = max(int(app.config.get('ENTITY_CACHE_SIZE', 0)), 0)
+        self.ttl = float(app.config.get('ENTITY_CACHE_TTL', DEFAULT_TTL))
+        self.clear()
+        self._reset_counters()
+
+    @property
+    def enabled(self):
+        """Indique si le cache conserve des entrées."""
+        return self.max_size > 0
+
+    def get(self, key):
+        """
+        Récupère une valeur du cache.
+
+        :param key: La clé, par exemple ('place', place_id)
+        :return: La valeur, ou MISSING si la clé est absente ou expirée
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return MISSING
+
+    def set(self, key, value, version=None):
+        """
+        Ajoute une valeur au cache, en évinçant les entrées les moins récemment utilisées.
+
+        :param key: La clé
+        :param value: La valeur, qui ne doit plus être modifiée ensuite
+        :param version: La version lue avant le chargement de la valeur (optionnel) ;
+                        la valeur est ignorée si une invalidation a eu lieu depuis
+        """
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key, load):
+        """
+        Lecture traversante : renvoie la valeur en cache ou la charge et la met en cache.
+        Une valeur None (entité inexistante) n'est pas mise en cache.
+
+        :param key: La clé
+        :param load: Une fonction sans argument qui charge la valeur
+        :return: La valeur
+        """
+        if not self.enabled:
+            return load()
+        value = self.get(key)
+        if value is not MISSING:
+            return value
+        version = self._version
+        value = load()
+        if value is not None:
+            self.set(key, value, version)
+        return value
+
+    def invalidate(self, *keys):
+        """
+        Retire des clés du cache.
+
+        :param keys: Les clés à retirer
+        """
+        with self._lock:
+            self._version += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def invalidate_kind(self, kind):
+        """
+        Retire toutes les clés d'un type d'entité, par exemple après un recalcul global.
+
+        :param kind: Le type d'entité ('place', 'amenity' ou 'user')
+        """
+        with self._lock:
+            self._version += 1
+            for key in [key for key in self._entries if key[0] == kind]:
+                del self._entries[key]
+                self.invalidations += 1
+
+    def clear(self):
+        """
+        Vide le cache sans remettre les compteurs à zéro.
+        """
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Renvoie les compteurs du cache.
+
+        :return: Un dictionnaire hits, misses, evictions, expirations, invalidations, size, max_size
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'expirations': self.expirations, 'invalidations': self.invalidations,
+                    'size': len(self._entries), 'max_size': self.max_size}
+
+    def _reset_counters(self):
+        """Remet les compteurs à zéro."""
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
@@ -0,0 +1,192 @@
+"""
+Ce fichier contient la compression des réponses HTTP.
+Le middleware choisit brotli ou gzip d'après l'en-tête Accept-Encoding du
+client et compresse les réponses textuelles (JSON, HTML, CSS, JavaScript)
+dont la taille atteint COMPRESSION_MIN_SIZE. Brotli n'est proposé que si le
+module brotli (dépendance optionnelle) est installé.
+
+Un ETag fort désigne une suite d'octets précise : la variante compressée
+reçoit donc un ETag suffixé ("abc-gzip"), et le suffixe est retiré des
+en-têtes If-None-Match avant qu'ils n'atteignent l'application.
+"""
+
+import gzip
+import re
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:  # dépendance optionnelle : gzip seul
+    brotli = None
+
+DEFAULT_MIN_SIZE = 500
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_LEVEL = 4
+# Types de contenu compressés (préfixes)
+COMPRESSIBLE_TYPES = ('application/json', 'application/javascript', 'application/x-ndjson',
+                      'image/svg+xml', 'text/')
+# Suffixe des fichiers précompressés de chaque codage
+FILE_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+_ETAG_SUFFIX = re.compile(r'-(br|gzip)"')
+
+
+def available_encodings():
+    """
+    Renvoie les codages disponibles, par ordre de préférence du serveur.
+
+    :return: ('br', 'gzip') si brotli est installé, sinon ('gzip',)
+    """
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(accept_encoding, encodings=None):
+    """
+    Choisit le codage à utiliser pour un client.
+
+    :param accept_encoding: La valeur de l'en-tête Accept-Encoding
+    :param encodings: Les codages proposés par ordre de préférence (available_encodings() par défaut)
+    :return: Le codage de plus haute qualité pour le client (le premier proposé à égalité), ou None
+    """
+    if not accept_encoding:
+        return None
+    accept = parse_accept_header(accept_encoding)
+    best, best_quality = None, 0
+    for encoding in encodings or available_encodings():
+        quality = accept.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding, level=None):
+    """
+    Compresse des données. La sortie gzip est reproductible (horodatage nul).
+
+    :param data: Les octets à compresser
+    :param encoding: 'br' ou 'gzip'
+    :param level: Le niveau de compression (niveau par défaut du codage si None)
+    :return: Les octets compressés
+    """
+    if encoding == 'br':
+        return brotli.compress(data, quality=DEFAULT_BROTLI_LEVEL if level is None else level)
+    return gzip.compress(data, compresslevel=DEFAULT_GZIP_LEVEL if level is None else level, mtime=0)
+
+
+def is_compressible(content_type):
+    """
+    Indique si un type de contenu gagne à être compressé.
+
+    :param content_type: La valeur de l'en-tête Content-Type
+    """
+    return (content_type or '').lower().startswith(COMPRESSIBLE_TYPES)
+
+
+def init_compression(app):
+    """
+    Place le middleware de compression devant app.wsgi_app, selon COMPRESSION_ENABLED,
+    COMPRESSION_MIN_SIZE, COMPRESSION_GZIP_LEVEL et COMPRESSION_BROTLI_LEVEL.
+
+    :param app: L'application Flask
+    """
+    if not app.config.get('COMPRESSION_ENABLED', True):
+        return
+    app.wsgi_app = CompressionMiddleware(
+        app.wsgi_app,
+        min_size=int(app.config.get('COMPRESSION_MIN_SIZE', DEFAULT_MIN_SIZE)),
+        levels={'gzip': int(app.config.get('COMPRESSION_GZIP_LEVEL', DEFAULT_GZIP_LEVEL)),
+                'br': int(app.config.get('COMPRESSION_BROTLI_LEVEL', DEFAULT_BROTLI_LEVEL))},
+    )
+
+
+class CompressionMiddleware:
+    """
+    Middleware WSGI de compression. Les réponses sans Content-Length
+    (réponses en flux) ne sont pas compressées, pour ne pas les mettre en mémoire.
+    """
+
+    def __init__(self, wsgi_app, min_size=DEFAULT_MIN_SIZE, levels=None):
+        self.wsgi_app = wsgi_app
+        self.min_size = min_size
+        self.levels = levels or {}
+        self.encodings = available_encodings()
+
+    def __call__(self, environ, start_response):
+        # Codage de la variante que le client revalide, d'après le suffixe de son ETag
+        revalidated = None
+        if 'HTTP_IF_NONE_MATCH' in environ:
+            match = _ETAG_SUFFIX.search(environ['HTTP_IF_NONE_MATCH'])
+            revalidated = match and match.group(1)
+            environ['HTTP_IF_NONE_MATCH'] = _ETAG_SUFFIX.sub('"', environ['HTTP_IF_NONE_MATCH'])
+        encoding = None
+        if environ['REQUEST_METHOD'] != 'HEAD':
+            encoding = negotiate(environ.get('HTTP_ACCEPT_ENCODING'), self.encodings)
+
+        captured = {}
+
+        def capture(status, headers, exc_info=None):
+            captured.update(status=status, headers=headers, exc_info=exc_info)
+            return _unsupported_write
+
+        app_iter = self.wsgi_app(environ, capture)
+        status, headers = captured['status'], captured['headers']
+        if status.startswith('304 '):
+            # Une 304 n'a pas de corps (ni de Content-Type) : elle reprend la variante revalidée
+            if revalidated:
+                headers = _suffix_etag(_add_vary(headers), revalidated)
+            start_response(status, headers, captured['exc_info'])
+            return app_iter
+
+        content_type = _header(headers, 'Content-Type')
+        if not is_compressible(content_type) or _header(headers, 'Content-Encoding'):
+            start_response(status, headers, captured['exc_info'])
+            return app_iter
+
+        headers = _add_vary(headers)
+        length = _header(headers, 'Content-Length')
+        if (encoding is None or not status.startswith('200 ') or length is None
+                or int(length) < self.min_size):
+            start_response(status, headers, captured['exc_info'])
+            return app_iter
+
+        try:
+            body = b''.join(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+        compressed = compress(body, encoding, self.levels.get(encoding))
+        if len(compressed) >= len(body):
+            start_response(status, headers, captured['exc_info'])
+            return [body]
+        headers = [(name, value) for name, value in _suffix_etag(headers, encoding)
+                   if name.lower() != 'content-length']
+        headers += [('Content-Encoding', encoding), ('Content-Length', str(len(compressed)))]
+        start_response(status, headers, captured['exc_info'])
+        return [compressed]
+
+
+def _unsupported_write(data):
+    """Remplace le callable write() de WSGI, que Flask n'utilise pas."""
+    raise RuntimeError("CompressionMiddleware ne prend pas en charge write()")
+
+
+def _header(headers, name):
+    """Renvoie la valeur d'un en-tête d'une liste WSGI, ou None."""
+    name = name.lower()
+    return next((value for key, value in headers if key.lower() == name), None)
+
+
+def _add_vary(headers):
+    """Ajoute Accept-Encoding à l'en-tête Vary."""
+    vary = _header(headers, 'Vary')
+    if vary is None:
+        return headers + [('Vary', 'Accept-Encoding')]
+    if 'accept-encoding' in vary.lower():
+        return headers
+    return [(name, f'{value}, Accept-Encoding' if name.lower() == 'vary' else value)
+            for name, value in headers]
+
+
+def _suffix_etag(headers, encoding):
+    """Suffixe l'ETag avec le codage : chaque variante a son propre ETag fort."""
+    return [(name, f'{value[:-1]}-{encoding}"' if name.lower() == 'etag' and value.endswith('"') else value)
+            for name, value in headers]
@@ -2,11 +2,15 @@
 Ce fichier contient les extensions Flask utilisées par l'application.
 """
 
-from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
+from app.passwords import PasswordHasher
+from app.cache import EntityCache
+from app.response_cache import ResponseCache
 
 # Initialisation des extensions
-bcrypt = Bcrypt()
 jwt = JWTManager()
 db = SQLAlchemy()
+passwords = PasswordHasher()
+entity_cache = EntityCache()
+response_cache = ResponseCache()
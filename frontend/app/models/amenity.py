@@ -2,16 +2,28 @@
 Ce fichier contient la classe Amenity qui représente un équipement dans l'application.
 """
 
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from .base_model import BaseModel
 from app.extensions import db
 
+# Règle de validation, partagée par le setter et les créations en masse de la façade
+def validate_name(value):
+    """Valide le nom d'un équipement et le renvoie."""
+    if not isinstance(value, str) or not value or len(value) > 50:
+        raise ValueError("Le nom de l'équipement est requis et ne doit pas dépasser 50 caractères.")
+    return value
+
 class Amenity(BaseModel):
     """
     Classe représentant un équipement dans l'application.
     Hérite de BaseModel pour les fonctionnalités communes.
     """
     __tablename__ = 'amenities'
+    __table_args__ = (
+        # Version des listes pour les GET conditionnels : MAX(updated_at), COUNT(*)
+        db.Index('ix_amenities_updated_at', 'updated_at'),
+    )
 
     _name = db.Column('name', db.String(50), nullable=False)
 
@@ -24,7 +36,7 @@ class Amenity(BaseModel):
         super().__init__()
         self.name = name
 
-    @property
+    @hybrid_property
     def name(self) -> str:
         """Getter pour le nom de l'équipement."""
         return self._name
@@ -35,9 +47,7 @@ class Amenity(BaseModel):
         Setter pour le nom de l'équipement.
         Vérifie que le nom n'est pas vide et ne dépasse pas 50 caractères.
         """
-        if not value or len(value) > 50:
-            raise ValueError("Le nom de l'équipement est requis et ne doit pas dépasser 50 caractères.")
-        self._name = value
+        self._name = validate_name(value)
 
     def __str__(self):
         """Retourne une représentation en chaîne de caractères de l'équipement."""
@@ -3,23 +3,71 @@ Ce fichier contient la classe Place qui représente un lieu dans l'application.
 """
 
 from typing import Optional, List
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from .base_model import BaseModel
 from .user import User
 from app.extensions import db
+from app.persistence.spatial import register_spatial_index
 
 # Association table for the many-to-many relationship between Place and Amenity
 place_amenity = db.Table('place_amenity',
     db.Column('place_id', db.String(36), db.ForeignKey('places.id'), primary_key=True),
-    db.Column('amenity_id', db.String(36), db.ForeignKey('amenities.id'), primary_key=True)
+    db.Column('amenity_id', db.String(36), db.ForeignKey('amenities.id'), primary_key=True),
+    # La clé primaire couvre les recherches par lieu ; cet index couvre celles par équipement
+    db.Index('ix_place_amenity_amenity_id_place_id', 'amenity_id', 'place_id')
 )
 
+# Règles de validation, partagées par les setters et les créations en masse de la façade
+def validate_title(value):
+    """Valide le titre d'un lieu et le renvoie."""
+    if not isinstance(value, str) or not value or len(value) > 100:
+        raise ValueError("Le titre est requis et ne doit pas dépasser 100 caractères.")
+    return value
+
+def validate_price(value):
+    """Valide le prix par nuit d'un lieu et le renvoie."""
+    if value <= 0:
+        raise ValueError("Le prix doit être une valeur positive.")
+    return value
+
+def validate_latitude(value):
+    """Valide la latitude d'un lieu et la renvoie."""
+    if not -90.0 <= value <= 90.0:
+        raise ValueError("La latitude doit être comprise entre -90.0 et 90.0.")
+    return value
+
+def validate_longitude(value):
+    """Valide la longitude d'un lieu et la renvoie."""
+    if not -180.0 <= value <= 180.0:
+        raise ValueError("La longitude doit être comprise entre -180.0 et 180.0.")
+    return value
+
+def validate_owner_id(value):
+    """Valide l'ID du propriétaire d'un lieu et le renvoie."""
+    if not isinstance(value, str) or not value:
+        raise ValueError("L'ID du propriétaire ne peut pas être vide.")
+    return value
+
 class Place(BaseModel):
     """
     Classe représentant un lieu dans l'application.
     Hérite de BaseModel pour les fonctionnalités communes.
     """
     __tablename__ = 'places'
+    __table_args__ = (
+        # Préfiltrage par boîte englobante lorsque l'index R*Tree n'est pas disponible
+        db.Index('ix_places_latitude_longitude', 'latitude', 'longitude'),
+        # Filtres et tris de la liste des lieux
+        db.Index('ix_places_price', 'price', 'id'),
+        db.Index('ix_places_created_at', 'created_at', 'id'),
+        db.Index('ix_places_owner_id', 'owner_id'),
+        db.Index('ix_places_avg_rating', 'avg_rating', 'id'),
+        # SQLite n'indexe pas les clés étrangères : relation User.places
+        db.Index('ix_places_user_id', 'user_id'),
+        # Version des listes pour les GET conditionnels : MAX(updated_at), COUNT(*)
+        db.Index('ix_places_updated_at', 'updated_at'),
+    )
 
     _title = db.Column('title', db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=True)
@@ -28,11 +76,16 @@ class Place(BaseModel):
     _longitude = db.Column('longitude', db.Float, nullable=False)
     _owner_id = db.Column('owner_id', db.String(36), db.ForeignKey('users.id'), nullable=False)
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    # Agrégats des avis, maintenus par HBnBFacade dans la même transaction que l'avis
+    review_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    avg_rating = db.Column(db.Float, nullable=False, default=0.0, server_default='0')
     
     # Define the many-to-many relationship with Amenity
+    # Chargée à la demande : les vues qui en ont besoin utilisent selectinload
     amenities = db.relationship('Amenity', secondary=place_amenity, 
                                backref=db.backref('places', lazy=True),
-                               lazy='subquery')
+                               lazy='select')
     
     # Define the one-to-many relationship with User (owner)
     owner = db.relationship('User', foreign_keys=[_owner_id], overlaps="owned_places")
@@ -63,6 +116,9 @@ class Place(BaseModel):
         self.longitude = longitude
         self.owner_id = owner_id
         self.user_id = user_id if user_id else owner_id
+        self.review_count = 0
+        self.rating_sum = 0
+        self.avg_rating = 0.0
         self.reviews = []
         self.amenities = []
 
@@ -80,7 +136,9 @@ class Place(BaseModel):
                 setattr(self, key, value)
         self.save()  # Met à jour l'horodatage de dernière modification
 
-    @property
+    # Propriétés hybrides : le setter valide en Python, et au niveau de la classe
+    # le getter renvoie la colonne, ce qui permet de filtrer en SQL (Place.price >= 10)
+    @hybrid_property
     def title(self) -> str:
         """Getter pour le titre du lieu."""
         return self._title
@@ -91,11 +149,9 @@ class Place(BaseModel):
         Setter pour le titre du lieu.
         Vérifie que le titre n'est pas vide et ne dépasse pas 100 caractères.
         """
-        if not value or len(value) > 100:
-            raise ValueError("Le titre est requis et ne doit pas dépasser 100 caractères.")
-        self._title = value
+        self._title = validate_title(value)
 
-    @property
+    @hybrid_property
     def price(self) -> float:
         """Getter pour le prix du lieu."""
         return self._price
@@ -106,11 +162,9 @@ class Place(BaseModel):
         Setter pour le prix du lieu.
         Vérifie que le prix est une valeur positive.
         """
-        if value <= 0:
-            raise ValueError("Le prix doit être une valeur positive.")
-        self._price = value
+        self._price = validate_price(value)
 
-    @property
+    @hybrid_property
     def latitude(self) -> float:
         """Getter pour la latitude du lieu."""
         return self._latitude
@@ -121,11 +175,9 @@ class Place(BaseModel):
         Setter pour la latitude du lieu.
         Vérifie que la latitude est comprise entre -90.0 et 90.0.
         """
-        if not -90.0 <= value <= 90.0:
-            raise ValueError("La latitude doit être comprise entre -90.0 et 90.0.")
-        self._latitude = value
+        self._latitude = validate_latitude(value)
 
-    @property
+    @hybrid_property
     def longitude(self) -> float:
         """Getter pour la longitude du lieu."""
         return self._longitude
@@ -136,11 +188,9 @@ class Place(BaseModel):
         Setter pour la longitude du lieu.
         Vérifie que la longitude est comprise entre -180.0 et 180.0.
         """
-        if not -180.0 <= value <= 180.0:
-            raise ValueError("La longitude doit être comprise entre -180.0 et 180.0.")
-        self._longitude = value
+        self._longitude = validate_longitude(value)
 
-    @property
+    @hybrid_property
     def owner_id(self) -> str:
         """Getter pour l'ID du propriétaire du lieu."""
         return self._owner_id
@@ -151,9 +201,7 @@ class Place(BaseModel):
         Setter pour l'ID du propriétaire du lieu.
         Vérifie que l'ID du propriétaire n'est pas vide.
         """
-        if not value:
-            raise ValueError("L'ID du propriétaire ne peut pas être vide.")
-        self._owner_id = value
+        self._owner_id = validate_owner_id(value)
 
     def add_review(self, review):
         """Ajoute un avis au lieu."""
@@ -166,3 +214,6 @@ class Place(BaseModel):
     def __str__(self):
         """Retourne une représentation en chaîne de caractères du lieu."""
         return f"Place(id={self.id}, title={self.title}, price={self.price}, owner_id={self.owner_id})"
+
+# Index spatial R*Tree synchronisé par triggers (SQLite uniquement)
+register_spatial_index(Place.__table__)
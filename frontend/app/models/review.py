@@ -2,17 +2,40 @@
 Ce fichier contient la classe Review qui représente un avis dans l'application.
 """
 
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from .base_model import BaseModel
 from .user import User
 from app.extensions import db
 
+# Règles de validation, partagées par les setters et les créations en masse de la façade
+def validate_text(value):
+    """Valide le texte d'un avis et le renvoie."""
+    if not isinstance(value, str) or not value:
+        raise ValueError("Le texte de l'avis est requis.")
+    return value
+
+def validate_rating(value):
+    """Valide la note d'un avis et la renvoie."""
+    if not 1 <= value <= 5:
+        raise ValueError("La note doit être comprise entre 1 et 5.")
+    return value
+
 class Review(BaseModel):
     """
     Classe représentant un avis dans l'application.
     Hérite de BaseModel pour les fonctionnalités communes.
     """
     __tablename__ = 'reviews'
+    __table_args__ = (
+        # Un seul avis par utilisateur et par lieu ; l'index sert aussi les recherches par lieu.
+        # Un index unique plutôt qu'une contrainte, pour pouvoir l'ajouter à une base existante.
+        db.Index('uq_reviews_place_id_user_id', 'place_id', 'user_id', unique=True),
+        # SQLite n'indexe pas les clés étrangères : avis d'un utilisateur et suppressions en cascade
+        db.Index('ix_reviews_user_id', 'user_id'),
+        # Version des listes pour les GET conditionnels : MAX(updated_at), COUNT(*)
+        db.Index('ix_reviews_updated_at', 'updated_at'),
+    )
 
     _text = db.Column('text', db.Text, nullable=False)
     _rating = db.Column('rating', db.Integer, nullable=False)
@@ -42,7 +65,7 @@ class Review(BaseModel):
         self.place_id = place.id
         self.user_id = user.id
 
-    @property
+    @hybrid_property
     def text(self) -> str:
         """Getter pour le texte de l'avis."""
         return self._text
@@ -53,11 +76,9 @@ class Review(BaseModel):
         Setter pour le texte de l'avis.
         Vérifie que le texte n'est pas vide.
         """
-        if not value:
-            raise ValueError("Le texte de l'avis est requis.")
-        self._text = value
+        self._text = validate_text(value)
 
-    @property
+    @hybrid_property
     def rating(self) -> int:
         """Getter pour la note de l'avis."""
         return self._rating
@@ -68,9 +89,7 @@ class Review(BaseModel):
         Setter pour la note de l'avis.
         Vérifie que la note est comprise entre 1 et 5.
         """
-        if not 1 <= value <= 5:
-            raise ValueError("La note doit être comprise entre 1 et 5.")
-        self._rating = value
+        self._rating = validate_rating(value)
 
     @property
     def place(self):
@@ -6,19 +6,63 @@ from typing import Optional
 import re
 from sqlalchemy.orm import validates, relationship
 from .base_model import BaseModel
-from app.extensions import bcrypt, db
+from app.extensions import db, passwords
 
 # Définition des rôles utilisateur
 class UserRole:
     USER = "user"
     ADMIN = "admin"
 
+# Règles de validation, partagées par le modèle et les créations en masse de la façade
+def validate_first_name(value):
+    """Valide le prénom de l'utilisateur et le renvoie."""
+    if not isinstance(value, str) or not value or len(value) > 50:
+        raise ValueError("Le prénom est requis et ne doit pas dépasser 50 caractères.")
+    return value
+
+def validate_last_name(value):
+    """Valide le nom de famille de l'utilisateur et le renvoie."""
+    if not isinstance(value, str) or not value or len(value) > 50:
+        raise ValueError("Le nom de famille est requis et ne doit pas dépasser 50 caractères.")
+    return value
+
+def validate_email(value):
+    """Valide l'adresse email de l'utilisateur et la renvoie."""
+    if not isinstance(value, str) or not re.match(r"[^@]+@[^@]+\.[^@]+", value):
+        raise ValueError("Format d'email invalide.")
+    return value
+
+def validate_password(value):
+    """Valide le mot de passe en clair de l'utilisateur et le renvoie."""
+    if not isinstance(value, str) or len(value) < 8:
+        raise ValueError("Le mot de passe est requis et doit avoir au moins 8 caractères.")
+    return value
+
+def validate_role(value):
+    """Valide le rôle de l'utilisateur et le renvoie."""
+    if value not in (UserRole.USER, UserRole.ADMIN):
+        raise ValueError("Le rôle doit être user ou admin")
+    return value
+
+def validate_is_admin(value):
+    """Valide l'indicateur administrateur de l'utilisateur et le renvoie."""
+    if not isinstance(value, bool):
+        raise ValueError("Le champ is_admin doit être un booléen")
+    return value
+
 class User(BaseModel):
     """
     Classe représentant un utilisateur dans l'application.
     Hérite de BaseModel pour les fonctionnalités communes.
     """
     __tablename__ = 'users'
+    __table_args__ = (
+        # Recherches par rôle et liste des administrateurs (UserRepository)
+        db.Index('ix_users_role', 'role'),
+        db.Index('ix_users_is_admin', 'is_admin'),
+        # Version des listes pour les GET conditionnels : MAX(updated_at), COUNT(*)
+        db.Index('ix_users_updated_at', 'updated_at'),
+    )
 
     first_name = db.Column(db.String(50), nullable=False)
     last_name = db.Column(db.String(50), nullable=False)
@@ -42,40 +86,42 @@ class User(BaseModel):
     @validates('first_name')
     def validate_first_name(self, key, value):
         """Valide le prénom de l'utilisateur."""
-        if not value or len(value) > 50:
-            raise ValueError("Le prénom est requis et ne doit pas dépasser 50 caractères.")
-        return value
+        return validate_first_name(value)
 
     @validates('last_name')
     def validate_last_name(self, key, value):
         """Valide le nom de famille de l'utilisateur."""
-        if not value or len(value) > 50:
-            raise ValueError("Le nom de famille est requis et ne doit pas dépasser 50 caractères.")
-        return value
+        return validate_last_name(value)
 
     @validates('email')
     def validate_email(self, key, value):
         """Valide l'adresse email de l'utilisateur."""
-        if not value or not re.match(r"[^@]+@[^@]+\.[^@]+", value):
-            raise ValueError("Format d'email invalide.")
-        return value
+        return validate_email(value)
 
     @validates('password')
     def validate_password(self, key, value):
         """Valide le mot de passe de l'utilisateur."""
-        if not value or len(value) < 8:
-            raise ValueError("Le mot de passe est requis et doit avoir au moins 8 caractères.")
-        return value
+        return validate_password(value)
+
+    @validates('role')
+    def validate_role(self, key, value):
+        """Valide le rôle de l'utilisateur."""
+        return validate_role(value)
+
+    @validates('is_admin')
+    def validate_is_admin(self, key, value):
+        """Valide l'indicateur administrateur de l'utilisateur."""
+        return validate_is_admin(value)
 
     def hash_password(self, password: str):
         """
         Hashes the password before storing it.
+        The bcrypt cost comes from BCRYPT_LOG_ROUNDS; the work runs in the
+        password hashing pool when PASSWORD_HASH_WORKERS is set.
         
         :param password: The plaintext password to hash
         """
-        if not password or len(password) < 8:
-            raise ValueError("Le mot de passe est requis et doit avoir au moins 8 caractères.")
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password = passwords.hash(validate_password(password))
         
     def verify_password(self, password: str) -> bool:
         """
@@ -84,7 +130,7 @@ class User(BaseModel):
         :param password: The plaintext password to verify
         :return: True if the password matches, False otherwise
         """
-        return bcrypt.check_password_hash(self.password, password)
+        return passwords.verify(self.password, password)
 
     def __str__(self):
         """Retourne une représentation en chaîne de caractères de l'utilisateur."""
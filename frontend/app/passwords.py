@@ -0,0 +1,165 @@
+"""
+Ce fichier contient le hachage des mots de passe avec bcrypt.
+bcrypt est volontairement coûteux en CPU : le coût (BCRYPT_LOG_ROUNDS) est
+configurable par environnement. PASSWORD_HASH_CONCURRENCY borne le nombre de
+calculs simultanés d'un processus, pour qu'un pic de connexions n'accapare pas
+le CPU des autres requêtes.
+
+bcrypt libère le GIL : dans le thread de la requête, les calculs de plusieurs
+threads avancent déjà en parallèle. Le pool de processus (PASSWORD_HASH_WORKERS)
+ne libère pas ce thread, qui attend le résultat, et ajoute un aller-retour entre
+processus ; chaque worker du serveur crée le sien. Il sert surtout à hash_many,
+pour les imports en masse.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+
+DEFAULT_ROUNDS = 12
+# bcrypt n'utilise que les 72 premiers octets du mot de passe
+MAX_PASSWORD_BYTES = 72
+
+
+def _encode(password):
+    """Encode le mot de passe en tronquant à la longueur prise en compte par bcrypt."""
+    return password.encode('utf-8')[:MAX_PASSWORD_BYTES]
+
+
+def hash_password(password, rounds):
+    """
+    Calcule le hash bcrypt d'un mot de passe.
+
+    :param password: Le mot de passe en clair
+    :param rounds: Le coût bcrypt (log2 du nombre d'itérations)
+    :return: Le hash sous forme de chaîne
+    """
+    return bcrypt.hashpw(_encode(password), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def check_password(hashed, password):
+    """
+    Vérifie un mot de passe contre un hash bcrypt.
+
+    :param hashed: Le hash stocké
+    :param password: Le mot de passe en clair
+    :return: True si le mot de passe correspond
+    """
+    try:
+        return bcrypt.checkpw(_encode(password), hashed.encode('utf-8'))
+    except ValueError:
+        # Hash mal formé
+        return False
+
+
+class PasswordHasher:
+    """
+    Extension Flask de hachage des mots de passe.
+    Avec PASSWORD_HASH_WORKERS = 0, bcrypt est exécuté dans le thread appelant ;
+    sinon il est exécuté dans un pool d'autant de processus, créé à la première
+    utilisation dans chaque processus (donc après le fork des workers du serveur).
+    Avec PASSWORD_HASH_CONCURRENCY > 0, hash et verify attendent qu'un des
+    PASSWORD_HASH_CONCURRENCY emplacements du processus soit libre.
+    """
+
+    def __init__(self, app=None):
+        self.rounds = DEFAULT_ROUNDS
+        self.workers = 0
+        self.concurrency = 0
+        self._slots = None
+        self._pool = None
+        self._pool_pid = None
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Lit BCRYPT_LOG_ROUNDS, PASSWORD_HASH_WORKERS et PASSWORD_HASH_CONCURRENCY
+        dans la configuration.
+
+        :param app: L'application Flask
+        """
+        self.rounds = int(app.config.get('BCRYPT_LOG_ROUNDS', DEFAULT_ROUNDS))
+        self.concurrency = int(app.config.get('PASSWORD_HASH_CONCURRENCY', 0))
+        self._slots = threading.BoundedSemaphore(self.concurrency) if self.concurrency > 0 else None
+        workers = int(app.config.get('PASSWORD_HASH_WORKERS', 0))
+        if workers != self.workers:
+            self.shutdown()
+            self.workers = workers
+
+    def hash(self, password):
+        """
+        Calcule le hash d'un mot de passe avec le coût configuré.
+
+        :param password: Le mot de passe en clair
+        :return: Le hash sous forme de chaîne
+        """
+        return self._run(hash_password, password, self.rounds)
+
+    def hash_many(self, passwords):
+        """
+        Calcule le hash de plusieurs mots de passe, répartis entre les processus du pool.
+
+        :param passwords: Les mots de passe en clair
+        :return: La liste des hashs, dans l'ordre des mots de passe
+        """
+        passwords = list(passwords)
+        if self.workers <= 0 or len(passwords) < 2:
+            return [self._run(hash_password, password, self.rounds) for password in passwords]
+        # Des paquets de plusieurs mots de passe amortissent les échanges entre processus
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self._get_pool().map(hash_password, passwords, [self.rounds] * len(passwords),
+                                         chunksize=chunksize))
+
+    def verify(self, hashed, password):
+        """
+        Vérifie un mot de passe contre un hash, quel que soit le coût avec lequel il a été calculé.
+
+        :param hashed: Le hash stocké
+        :param password: Le mot de passe en clair
+        :return: True si le mot de passe correspond
+        """
+        return self._run(check_password, hashed, password)
+
+    def shutdown(self):
+        """
+        Arrête le pool de processus s'il a été créé par ce processus.
+        """
+        with self._lock:
+            if self._pool is not None and self._pool_pid == os.getpid():
+                self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+            self._pool_pid = None
+
+    def _run(self, function, *args):
+        """
+        Exécute la fonction dans le pool, ou directement s'il n'y en a pas,
+        après avoir obtenu un emplacement si la concurrence est bornée.
+        """
+        if self._slots is None:
+            return self._call(function, *args)
+        with self._slots:
+            return self._call(function, *args)
+
+    def _call(self, function, *args):
+        if self.workers <= 0:
+            return function(*args)
+        return self._get_pool().submit(function, *args).result()
+
+    def _get_pool(self):
+        """Crée le pool à la première utilisation, ou après un fork du processus."""
+        pid = os.getpid()
+        with self._lock:
+            if self._pool is None or self._pool_pid != pid:
+                # Un pool hérité d'un fork n'est pas utilisable : on en crée un nouveau.
+                # spawn évite de dupliquer les threads et connexions du processus parent.
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+                self._pool_pid = pid
+            return self._pool
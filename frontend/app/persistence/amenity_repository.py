@@ -3,7 +3,11 @@ Ce fichier contient l'implémentation du repository spécifique pour les équipe
 Il étend le SQLAlchemyRepository pour ajouter des fonctionnalités spécifiques aux équipements.
 """
 
+from datetime import datetime
+from sqlalchemy import delete, select, update
+from app.extensions import db
 from app.models.amenity import Amenity
+from app.models.place import Place, place_amenity
 from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
 
 class AmenityRepository(SQLAlchemyRepository):
@@ -36,3 +40,18 @@ class AmenityRepository(SQLAlchemyRepository):
         :return: Une liste d'équipements dont le nom contient le terme recherché
         """
         return self.model.query.filter(self.model.name.ilike(f'%{search_term}%')).all()
+
+    def delete_with_links(self, amenity_id):
+        """
+        Supprime un équipement et ses liens avec les lieux, sans charger ces lieux.
+        Les lieux liés sont datés, comme dans update_place, pour que la version des
+        listes filtrées par équipement change. Ne valide pas la transaction.
+        
+        :param amenity_id: L'identifiant de l'équipement à supprimer
+        :return: Le nombre d'équipements supprimés
+        """
+        linked = select(place_amenity.c.place_id).where(place_amenity.c.amenity_id == amenity_id)
+        db.session.execute(update(Place).where(Place.id.in_(linked)).values(updated_at=datetime.utcnow()),
+                           execution_options={'synchronize_session': False})
+        db.session.execute(delete(place_amenity).where(place_amenity.c.amenity_id == amenity_id))
+        return self.delete_where(self.model.id == amenity_id)
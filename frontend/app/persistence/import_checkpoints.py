@@ -0,0 +1,113 @@
+"""
+Ce fichier contient les points de reprise des imports en masse.
+Un import (scripts/import_data.py) valide ses lignes par lots ; la position
+atteinte dans le fichier source est inscrite dans la table import_checkpoints,
+dans la même transaction que le lot. Après une interruption, l'import reprend
+donc exactement après le dernier lot validé, sans doublon ni ligne perdue.
+
+La même table porte un marqueur par type d'import dont les index secondaires
+ont été supprimés pour la durée du chargement (--defer-indexes) : il est posé
+avant leur suppression et retiré après leur reconstruction, de sorte qu'un
+import interrompu laisse une trace que l'exécution suivante sait réparer.
+"""
+
+from datetime import datetime
+from sqlalchemy import delete, insert, select, update
+from app.extensions import db
+
+import_checkpoints = db.Table(
+    'import_checkpoints',
+    db.Column('source', db.String(255), primary_key=True),
+    db.Column('records', db.Integer, nullable=False),
+    db.Column('imported', db.Integer, nullable=False),
+    db.Column('rejected', db.Integer, nullable=False),
+    db.Column('updated_at', db.DateTime, nullable=False),
+)
+
+
+def get_checkpoint(source):
+    """
+    Récupère le point de reprise d'un import.
+
+    :param source: La clé de l'import (type et chemin du fichier)
+    :return: Un tuple (enregistrements lus, importés, rejetés), (0, 0, 0) sans point de reprise
+    """
+    row = db.session.execute(
+        select(import_checkpoints.c.records, import_checkpoints.c.imported, import_checkpoints.c.rejected)
+        .where(import_checkpoints.c.source == source)
+    ).first()
+    return tuple(row) if row else (0, 0, 0)
+
+
+def save_checkpoint(source, records, imported, rejected):
+    """
+    Inscrit le point de reprise dans la session courante : il n'est validé
+    qu'avec la transaction du lot.
+
+    :param source: La clé de l'import
+    :param records: Le nombre d'enregistrements du fichier traités
+    :param imported: Le nombre de lignes importées
+    :param rejected: Le nombre d'enregistrements rejetés
+    """
+    values = {'records': records, 'imported': imported, 'rejected': rejected,
+              'updated_at': datetime.utcnow()}
+    updated = db.session.execute(
+        update(import_checkpoints).where(import_checkpoints.c.source == source).values(**values)
+    ).rowcount
+    if not updated:
+        db.session.execute(insert(import_checkpoints).values(source=source, **values))
+
+
+def _deferred_source(kind):
+    """Clé du marqueur d'index supprimés d'un type d'import."""
+    return f'deferred-indexes:{kind}'
+
+
+def mark_indexes_deferred(connection, kind):
+    """
+    Inscrit que les index d'un type d'import sont supprimés. À appeler dans la
+    transaction qui les supprime, avant la suppression.
+
+    :param connection: La connexion de la transaction
+    :param kind: Le type d'import (users, places ou reviews)
+    """
+    source = _deferred_source(kind)
+    connection.execute(delete(import_checkpoints).where(import_checkpoints.c.source == source))
+    connection.execute(insert(import_checkpoints).values(source=source, records=0, imported=0, rejected=0,
+                                                         updated_at=datetime.utcnow()))
+
+
+def clear_indexes_deferred(connection, kind=None):
+    """
+    Retire le marqueur d'index supprimés, une fois les index reconstruits.
+
+    :param connection: La connexion de la transaction qui les a reconstruits
+    :param kind: Le type d'import, ou None pour tous les types
+    """
+    source = import_checkpoints.c.source
+    connection.execute(delete(import_checkpoints).where(
+        source == _deferred_source(kind) if kind else source.startswith(_deferred_source(''))
+    ))
+
+
+def get_deferred_kinds():
+    """
+    Récupère les types d'import dont les index n'ont pas été reconstruits.
+
+    :return: La liste des types marqués, triée
+    """
+    prefix = _deferred_source('')
+    sources = db.session.scalars(
+        select(import_checkpoints.c.source).where(import_checkpoints.c.source.startswith(prefix))
+    )
+    return sorted(source[len(prefix):] for source in sources)
+
+
+def clear_checkpoint(source):
+    """
+    Supprime le point de reprise d'un import, pour le recommencer depuis le début.
+
+    :param source: La clé de l'import
+    """
+    db.session.execute(delete(import_checkpoints).where(import_checkpoints.c.source == source))
+    db.session.commit()
@@ -0,0 +1,153 @@
+"""
+Ce fichier contient le canal d'invalidation du cache d'entités entre processus.
+Chaque worker du serveur a son propre EntityCache : une écriture traitée par
+un autre worker doit lui être signalée. Les invalidations sont inscrites dans
+la table cache_invalidations, dans la même transaction que l'écriture, et
+chaque processus lit les lignes dont le numéro de séquence dépasse le dernier
+lu avant de servir une entité depuis son cache, au plus une fois par
+ENTITY_CACHE_BUS_INTERVAL secondes. Une entité lue depuis le cache reflète
+donc toute écriture validée plus de ENTITY_CACHE_BUS_INTERVAL secondes avant.
+
+Les numéros sont attribués à l'insertion, pas à la validation : avec plusieurs
+écrivains simultanés (hors SQLite, qui les sérialise), la ligne N peut être
+validée après la lecture de la ligne N+1. Les numéros manquants sous le dernier
+lu sont donc relus à chaque passage pendant GAP_TIMEOUT secondes ; le délai
+garanti vaut pour les transactions d'écriture plus courtes que GAP_TIMEOUT.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, insert, select
+from app.cache import ALL
+from app.extensions import db
+
+DEFAULT_INTERVAL = 1.0
+DEFAULT_RETENTION = 3600
+# Nombre de publications entre deux purges des lignes trop anciennes
+PRUNE_EVERY = 100
+# Durée (s) pendant laquelle un numéro manquant est attendu : au-delà, la transaction
+# qui l'avait pris est considérée comme annulée (une séquence ne réutilise pas ses numéros)
+GAP_TIMEOUT = 60
+
+cache_invalidations = db.Table(
+    'cache_invalidations',
+    db.Column('seq', db.Integer, primary_key=True, autoincrement=True),
+    db.Column('kind', db.String(20), nullable=False),
+    db.Column('entity_id', db.String(36), nullable=False),
+    db.Column('created_at', db.DateTime, nullable=False, index=True),
+    # Jamais de réutilisation d'un numéro, même après la purge des dernières lignes
+    sqlite_autoincrement=True,
+)
+
+
+class InvalidationBus:
+    """
+    Extension Flask reliant le cache d'entités du processus à la table d'invalidations.
+    Avec ENTITY_CACHE_BUS_INTERVAL < 0, le canal est désactivé (un seul processus).
+    """
+
+    def __init__(self, app=None):
+        self.interval = DEFAULT_INTERVAL
+        self.retention = DEFAULT_RETENTION
+        self._last_seq = None
+        self._last_poll = None
+        # Numéros manquants sous _last_seq, avec l'instant où le manque a été constaté
+        self._gaps = {}
+        self._published = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Lit ENTITY_CACHE_BUS_INTERVAL et ENTITY_CACHE_BUS_RETENTION dans la configuration.
+
+        :param app: L'application Flask
+        """
+        self.interval = float(app.config.get('ENTITY_CACHE_BUS_INTERVAL', DEFAULT_INTERVAL))
+        self.retention = float(app.config.get('ENTITY_CACHE_BUS_RETENTION', DEFAULT_RETENTION))
+        self._last_seq = None
+        self._last_poll = None
+        self._gaps = {}
+
+    def create_table(self):
+        """
+        Crée la table cache_invalidations si elle manque, pour qu'une base créée
+        avant le canal reste utilisable sans passer par upgrade_database.py.
+        Sans effet si le canal est désactivé.
+        """
+        if self.enabled:
+            cache_invalidations.create(db.engine, checkfirst=True)
+
+    @property
+    def enabled(self):
+        """Indique si les invalidations sont échangées entre processus."""
+        return self.interval >= 0
+
+    def publish(self, keys):
+        """
+        Inscrit des invalidations dans la session courante : elles ne sont visibles
+        des autres processus qu'après la validation de la transaction d'écriture.
+
+        :param keys: Des clés (type, identifiant) ; l'identifiant ALL vise tout le type
+        """
+        if not self.enabled:
+            return
+        now = datetime.utcnow()
+        rows = [{'kind': kind, 'entity_id': entity_id, 'created_at': now} for kind, entity_id in keys]
+        if not rows:
+            return
+        db.session.execute(insert(cache_invalidations), rows)
+        self._published += 1
+        if self._published % PRUNE_EVERY == 0:
+            db.session.execute(delete(cache_invalidations).where(
+                cache_invalidations.c.created_at < now - timedelta(seconds=self.retention)
+            ))
+
+    def poll(self, cache):
+        """
+        Applique au cache les invalidations publiées par les autres processus,
+        si la dernière lecture date de plus de ENTITY_CACHE_BUS_INTERVAL secondes.
+
+        :param cache: L'EntityCache du processus
+        """
+        if not self.enabled or not cache.enabled:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if self._last_poll is not None and now - self._last_poll < self.interval:
+                return
+            if self._last_seq is None or now - self._last_poll > self.retention:
+                # Premier passage, ou lignes peut-être déjà purgées : on repart de zéro
+                self._last_seq = db.session.scalar(
+                    select(func.coalesce(func.max(cache_invalidations.c.seq), 0)))
+                self._gaps = {}
+                cache.clear()
+            else:
+                self._gaps = {seq: since for seq, since in self._gaps.items() if now - since < GAP_TIMEOUT}
+                pending = cache_invalidations.c.seq > self._last_seq
+                if self._gaps:
+                    pending = pending | cache_invalidations.c.seq.in_(list(self._gaps))
+                rows = db.session.execute(
+                    select(cache_invalidations.c.seq, cache_invalidations.c.kind,
+                           cache_invalidations.c.entity_id)
+                    .where(pending)
+                    .order_by(cache_invalidations.c.seq)
+                ).all()
+                for seq, kind, entity_id in rows:
+                    if entity_id == ALL:
+                        cache.invalidate_kind(kind)
+                    else:
+                        cache.invalidate((kind, entity_id))
+                    if seq > self._last_seq:
+                        # Les numéros sautés peuvent appartenir à une transaction encore en cours
+                        self._gaps.update(dict.fromkeys(range(self._last_seq + 1, seq), now))
+                        self._last_seq = seq
+                    else:
+                        self._gaps.pop(seq, None)
+            self._last_poll = now
+
+
+# Instance unique du processus, initialisée par create_app
+invalidation_bus = InvalidationBus()
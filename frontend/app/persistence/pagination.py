@@ -0,0 +1,68 @@
+"""
+Ce fichier contient les utilitaires de pagination par curseur (keyset pagination).
+Un curseur encode les valeurs des clés de tri (par défaut (created_at, id)) du
+dernier élément d'une page, ce qui permet de récupérer la page suivante sans OFFSET.
+Il encode aussi le tri qui l'a produit : rejoué avec un autre tri, il est refusé
+au lieu de renvoyer une page arbitraire.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(*values, sort):
+    """
+    Encode la position d'un élément en curseur opaque.
+
+    :param values: Les valeurs des clés de tri du dernier élément de la page
+    :param sort: Le nom ou la description du tri de la page
+    :return: Une chaîne base64 utilisable dans une URL
+    """
+    payload = json.dumps({'sort': sort,
+                          'keys': [{'dt': value.isoformat()} if isinstance(value, datetime) else value
+                                   for value in values]}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort, size=2):
+    """
+    Décode un curseur produit par encode_cursor.
+
+    :param cursor: Le curseur opaque reçu du client
+    :param sort: Le tri de la page demandée, qui doit être celui du curseur
+    :param size: Le nombre de clés de tri attendu
+    :return: Un tuple des valeurs des clés de tri
+    :raises ValueError: Si le curseur est invalide ou a été produit par un autre tri
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        values = payload['keys']
+        if payload['sort'] != sort or not isinstance(values, list) or len(values) != size:
+            raise ValueError
+        return tuple(datetime.fromisoformat(value['dt']) if isinstance(value, dict) else value
+                     for value in values)
+    except (ValueError, TypeError, KeyError, UnicodeError):
+        raise ValueError("Curseur de pagination invalide")
+
+
+def parse_limit(value, default, maximum):
+    """
+    Valide le paramètre limit d'une requête paginée.
+
+    :param value: La valeur brute reçue (chaîne ou None)
+    :param default: La limite utilisée si aucune valeur n'est fournie
+    :param maximum: La limite maximale autorisée
+    :return: La limite sous forme d'entier
+    :raises ValueError: Si la limite n'est pas un entier strictement positif
+    """
+    if value is None or value == '':
+        return default
+    try:
+        limit = int(value)
+    except (ValueError, TypeError):
+        raise ValueError("Le paramètre limit doit être un entier")
+    if limit <= 0:
+        raise ValueError("Le paramètre limit doit être strictement positif")
+    return min(limit, maximum)
@@ -3,7 +3,16 @@ Ce fichier contient l'implémentation du repository spécifique pour les lieux.
 Il étend le SQLAlchemyRepository pour ajouter des fonctionnalités spécifiques aux lieux.
 """
 
-from app.models.place import Place
+import heapq
+from operator import itemgetter
+from sqlalchemy import and_, bindparam, case, delete, func, insert, literal_column, or_, select, update
+from sqlalchemy.orm import joinedload, selectinload
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place, place_amenity
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.spatial import bounding_boxes, has_spatial_index, haversine_km, places_rtree
 from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
 
 class PlaceRepository(SQLAlchemyRepository):
@@ -19,6 +28,284 @@ class PlaceRepository(SQLAlchemyRepository):
         """
         super().__init__(Place)
 
+    def get_with_details(self, place_id):
+        """
+        Récupère un lieu avec son propriétaire, ses équipements, ses avis et
+        les auteurs de ces avis, en un nombre fixe de requêtes.
+        Le nombre de requêtes ne dépend pas du nombre d'avis du lieu.
+        
+        :param place_id: L'identifiant du lieu
+        :return: Le lieu avec ses relations chargées ou None s'il n'existe pas
+        """
+        return self.model.query.options(
+            joinedload(self.model.owner),
+            selectinload(self.model.amenities),
+            selectinload(self.model.reviews).joinedload(Review._user)
+        ).filter(self.model.id == place_id).first()
+
+    def get_many_with_details(self, limit):
+        """
+        Récupère les lieux les plus récents avec les mêmes relations que get_with_details,
+        en un nombre fixe de requêtes (préchargement du cache de la façade).
+        
+        :param limit: Le nombre maximum de lieux à retourner
+        :return: Une liste de lieux avec leurs relations chargées
+        """
+        return self.model.query.options(
+            joinedload(self.model.owner),
+            selectinload(self.model.amenities),
+            selectinload(self.model.reviews).joinedload(Review._user)
+        ).order_by(self.model.created_at.desc(), self.model.id.desc()).limit(limit).all()
+
+    def get_detail_version(self, place_id):
+        """
+        Récupère en une seule requête de quoi dater la représentation détaillée d'un lieu :
+        le lieu, son propriétaire, ses avis et ses équipements.
+        
+        :param place_id: L'identifiant du lieu
+        :return: Un tuple (updated_at du lieu, du propriétaire, dernier avis modifié, nombre d'avis,
+                 dernier équipement modifié, nombre d'équipements), ou None si le lieu n'existe pas
+        """
+        def reviews(column):
+            return select(column).where(Review.place_id == self.model.id).scalar_subquery()
+
+        def amenities(column):
+            return select(column).select_from(place_amenity).join(
+                Amenity, Amenity.id == place_amenity.c.amenity_id
+            ).where(place_amenity.c.place_id == self.model.id).scalar_subquery()
+
+        row = db.session.execute(
+            select(self.model.updated_at, User.updated_at,
+                   reviews(func.max(Review.updated_at)), reviews(func.count(Review.id)),
+                   amenities(func.max(Amenity.updated_at)), amenities(func.count(Amenity.id)))
+            .select_from(self.model).outerjoin(User, User.id == self.model.owner_id)
+            .where(self.model.id == place_id)
+        ).first()
+        return tuple(row) if row else None
+
+    def get_reviews_version(self, place_id):
+        """
+        Récupère en une seule requête de quoi dater la liste des avis d'un lieu
+        et de leurs auteurs.
+        
+        :param place_id: L'identifiant du lieu
+        :return: Un tuple (nombre d'avis, dernier avis modifié, dernier auteur modifié),
+                 ou None si le lieu n'existe pas
+        """
+        found, count, reviews_updated_at, users_updated_at = db.session.execute(
+            select(func.count(self.model.id), func.count(Review.id),
+                   func.max(Review.updated_at), func.max(User.updated_at))
+            .select_from(self.model)
+            .outerjoin(Review, Review.place_id == self.model.id)
+            .outerjoin(User, User.id == Review.user_id)
+            .where(self.model.id == place_id)
+        ).one()
+        return (count, reviews_updated_at, users_updated_at) if found else None
+
+    def get_ids_by_owner(self, owner_id):
+        """
+        Récupère les identifiants des lieux d'un propriétaire.
+        
+        :param owner_id: L'identifiant du propriétaire
+        :return: Une liste d'identifiants
+        """
+        return list(db.session.scalars(select(self.model.id).where(self.model.owner_id == owner_id)))
+
+    def get_ids_by_amenity(self, amenity_id):
+        """
+        Récupère les identifiants des lieux qui possèdent un équipement.
+        
+        :param amenity_id: L'identifiant de l'équipement
+        :return: Une liste d'identifiants
+        """
+        return list(db.session.scalars(
+            select(place_amenity.c.place_id).where(place_amenity.c.amenity_id == amenity_id)
+        ))
+
+    # Tris acceptés par get_places_page
+    SORTS = ('created_at', 'price', '-price', 'rating')
+
+    def get_places_page(self, limit, cursor=None, min_price=None, max_price=None,
+                        amenity_ids=None, owner_id=None, sort='created_at', projection=None):
+        """
+        Récupère une page de lieux filtrés et triés par la base de données.
+        
+        :param limit: Le nombre maximum de lieux à retourner
+        :param cursor: Le curseur renvoyé par la page précédente (optionnel)
+        :param min_price: Le prix minimum (optionnel)
+        :param max_price: Le prix maximum (optionnel)
+        :param amenity_ids: Les équipements que chaque lieu doit tous posséder (optionnel)
+        :param owner_id: L'identifiant du propriétaire (optionnel)
+        :param sort: Le tri : created_at, price, -price ou rating (meilleure note d'abord)
+        :param projection: Une Projection des colonnes à lire, au lieu d'objets ORM (optionnel)
+        :return: Un tuple (lieux, curseur suivant ou None)
+        :raises ValueError: Si le tri ou le curseur est invalide
+        """
+        query = self.model.query
+        if min_price is not None:
+            query = query.filter(self.model.price >= min_price)
+        if max_price is not None:
+            query = query.filter(self.model.price <= max_price)
+        if owner_id is not None:
+            query = query.filter(self.model.owner_id == owner_id)
+        if amenity_ids:
+            amenity_ids = set(amenity_ids)
+            # Lieux possédant tous les équipements demandés, via l'index (amenity_id, place_id)
+            matching = select(place_amenity.c.place_id).where(
+                place_amenity.c.amenity_id.in_(amenity_ids)
+            ).group_by(place_amenity.c.place_id).having(func.count() == len(amenity_ids))
+            query = query.filter(self.model.id.in_(matching))
+
+        if sort == 'created_at':
+            order_by = [(self.model.created_at, False)]
+        elif sort == 'price':
+            order_by = [(self.model.price, False)]
+        elif sort == '-price':
+            order_by = [(self.model.price, True)]
+        elif sort == 'rating':
+            order_by = [(self.model.avg_rating, True)]
+        else:
+            raise ValueError(f"Tri invalide: {sort}. Valeurs acceptées: {', '.join(self.SORTS)}")
+        return self.get_page(limit, cursor, query=query, order_by=order_by, projection=projection)
+
+    def adjust_rating(self, place_id, count_delta, rating_delta):
+        """
+        Met à jour les agrégats d'avis d'un lieu par une seule requête UPDATE atomique.
+        Ne valide pas la transaction : l'appelant la valide avec l'avis concerné.
+        
+        :param place_id: L'identifiant du lieu
+        :param count_delta: La variation du nombre d'avis
+        :param rating_delta: La variation de la somme des notes
+        """
+        new_count = self.model.review_count + count_delta
+        new_sum = self.model.rating_sum + rating_delta
+        db.session.execute(
+            update(self.model).where(self.model.id == place_id).values(
+                review_count=new_count,
+                rating_sum=new_sum,
+                avg_rating=case((new_count > 0, new_sum * 1.0 / new_count), else_=0.0)
+            ).execution_options(synchronize_session='fetch')
+        )
+
+    def adjust_ratings(self, deltas):
+        """
+        Variante d'adjust_rating pour plusieurs lieux, en une seule requête executemany.
+        Ne valide pas la transaction.
+        
+        :param deltas: Un dictionnaire {place_id: (variation du nombre d'avis, variation de la somme des notes)}
+        """
+        if not deltas:
+            return
+        places = self.model.__table__
+        new_count = places.c.review_count + bindparam('count_delta')
+        new_sum = places.c.rating_sum + bindparam('rating_delta')
+        db.session.execute(
+            update(places).where(places.c.id == bindparam('target_id')).values(
+                review_count=new_count,
+                rating_sum=new_sum,
+                avg_rating=case((new_count > 0, new_sum * 1.0 / new_count), else_=0.0)
+            ),
+            [{'target_id': place_id, 'count_delta': count_delta, 'rating_delta': rating_delta}
+             for place_id, (count_delta, rating_delta) in deltas.items()]
+        )
+
+    def get_owner_ids(self, place_ids):
+        """
+        Récupère le propriétaire de plusieurs lieux en une seule requête IN.
+        
+        :param place_ids: Les identifiants des lieux
+        :return: Un dictionnaire {place_id: owner_id} limité aux lieux existants
+        """
+        place_ids = set(place_ids)
+        if not place_ids:
+            return {}
+        return dict(db.session.execute(
+            select(self.model.id, self.model.owner_id).where(self.model.id.in_(place_ids))
+        ).all())
+
+    def add_amenity_links(self, links):
+        """
+        Associe des équipements à des lieux en une seule requête executemany.
+        Ne valide pas la transaction.
+        
+        :param links: Une liste de couples (place_id, amenity_id)
+        """
+        if links:
+            db.session.execute(insert(place_amenity),
+                               [{'place_id': place_id, 'amenity_id': amenity_id}
+                                for place_id, amenity_id in links])
+
+    def remove_ratings_of_user(self, user_id):
+        """
+        Retire des agrégats de chaque lieu les notes laissées par un utilisateur,
+        en une seule requête UPDATE. Ne valide pas la transaction.
+        
+        :param user_id: L'identifiant de l'utilisateur dont les avis vont être supprimés
+        """
+        def user_reviews(column):
+            return select(column).where(Review.user_id == user_id, Review.place_id == self.model.id)
+
+        new_count = self.model.review_count - user_reviews(func.count(Review.id)).scalar_subquery()
+        new_sum = self.model.rating_sum - user_reviews(func.coalesce(func.sum(Review.rating), 0)).scalar_subquery()
+        db.session.execute(
+            update(self.model).where(
+                self.model.id.in_(select(Review.place_id).where(Review.user_id == user_id))
+            ).values(
+                review_count=new_count,
+                rating_sum=new_sum,
+                avg_rating=case((new_count > 0, new_sum * 1.0 / new_count), else_=0.0)
+            ).execution_options(synchronize_session=False)
+        )
+
+    def delete_place_rows(self, place_id):
+        """
+        Supprime un lieu et ses liens avec les équipements sans les charger.
+        Ne valide pas la transaction ; les avis du lieu doivent être supprimés avant.
+        
+        :param place_id: L'identifiant du lieu
+        :return: Le nombre de lieux supprimés
+        """
+        return self._delete_places(self.model.id == place_id)
+
+    def delete_places_by_owner(self, owner_id):
+        """
+        Supprime tous les lieux d'un propriétaire et leurs liens avec les équipements,
+        en deux requêtes DELETE quel que soit le nombre de lieux.
+        Ne valide pas la transaction ; les avis de ces lieux doivent être supprimés avant.
+        
+        :param owner_id: L'identifiant du propriétaire
+        :return: Le nombre de lieux supprimés
+        """
+        return self._delete_places(self.model.owner_id == owner_id)
+
+    def _delete_places(self, criterion):
+        """Supprime les liens place_amenity puis les lieux vérifiant le critère."""
+        db.session.execute(delete(place_amenity).where(
+            place_amenity.c.place_id.in_(select(self.model.id).where(criterion))
+        ))
+        return self.delete_where(criterion)
+
+    def recompute_rating_aggregates(self):
+        """
+        Recalcule les agrégats d'avis de tous les lieux à partir de la table reviews.
+        Sert de réparation après un import ou une modification directe de la base.
+        
+        :return: Le nombre de lieux mis à jour
+        """
+        count = select(func.count(Review.id)).where(Review.place_id == self.model.id).scalar_subquery()
+        total = select(func.coalesce(func.sum(Review.rating), 0)).where(
+            Review.place_id == self.model.id
+        ).scalar_subquery()
+        result = db.session.execute(
+            update(self.model).values(
+                review_count=count,
+                rating_sum=total,
+                avg_rating=case((count > 0, total * 1.0 / count), else_=0.0)
+            ).execution_options(synchronize_session=False)
+        )
+        self.commit()
+        return result.rowcount
+
     def get_places_by_owner(self, owner_id):
         """
         Récupère tous les lieux appartenant à un propriétaire spécifique.
@@ -59,3 +346,48 @@ class PlaceRepository(SQLAlchemyRepository):
             self.model.latitude.between(lat - radius, lat + radius),
             self.model.longitude.between(lng - radius, lng + radius)
         ).all()
+
+    def get_places_nearby(self, lat, lng, radius_km, limit, projection=None):
+        """
+        Récupère les lieux situés à moins de radius_km kilomètres d'un point,
+        triés du plus proche au plus éloigné.
+        Les candidats sont préfiltrés par boîte englobante via l'index spatial
+        (R*Tree sous SQLite, index (latitude, longitude) sinon). Sous SQLite, la
+        distance de Haversine est calculée par la fonction SQL haversine_km et la
+        requête trie et limite elle-même : seules limit lignes sont construites,
+        quel que soit le nombre de candidats dans la boîte. Les autres bases
+        parcourent les candidats en flux et n'en gardent que les limit plus proches.
+        
+        :param lat: La latitude du point central
+        :param lng: La longitude du point central
+        :param radius_km: Le rayon de recherche en kilomètres
+        :param limit: Le nombre maximum de lieux à retourner
+        :param projection: Une Projection des colonnes à lire, qui doit comprendre
+                           latitude et longitude, au lieu d'objets ORM (optionnel)
+        :return: Une liste de tuples (lieu, distance en km)
+        """
+        boxes = bounding_boxes(lat, lng, radius_km)
+        if has_spatial_index(db.session):
+            conditions = [and_(places_rtree.c.max_lat >= min_lat, places_rtree.c.min_lat <= max_lat,
+                               places_rtree.c.max_lng >= min_lng, places_rtree.c.min_lng <= max_lng)
+                          for min_lat, max_lat, min_lng, max_lng in boxes]
+            candidate_ids = select(places_rtree.c.id).where(or_(*conditions))
+            query = self.model.query.filter(literal_column('places.spatial_id').in_(candidate_ids))
+        else:
+            query = self.model.query.filter(or_(*[
+                and_(self.model.latitude.between(min_lat, max_lat),
+                     self.model.longitude.between(min_lng, max_lng))
+                for min_lat, max_lat, min_lng, max_lng in boxes
+            ]))
+        entities = projection.columns if projection is not None else (self.model,)
+
+        if db.session.get_bind().dialect.name == 'sqlite':
+            distance = func.haversine_km(lat, lng, self.model.latitude, self.model.longitude).label('distance')
+            rows = query.with_entities(*entities, distance).order_by(distance, self.model.id).limit(limit)
+            # Les lignes sont triées : celles hors du rayon ne peuvent être qu'à la fin
+            return [(projection.row._make(row[:-1]) if projection is not None else row[0], row[-1])
+                    for row in rows if row[-1] <= radius_km]
+
+        places = query if projection is None else map(projection.row._make, query.with_entities(*entities))
+        distances = ((place, haversine_km(lat, lng, place.latitude, place.longitude)) for place in places)
+        return heapq.nsmallest(limit, (item for item in distances if item[1] <= radius_km), key=itemgetter(1))
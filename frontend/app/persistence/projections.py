@@ -0,0 +1,66 @@
+"""
+Ce fichier contient les projections utilisées par les listes et l'export de l'API.
+
+Une projection ne sélectionne que les colonnes dont une liste a besoin et
+renvoie chaque ligne sous forme de namedtuple : un tuple sans __dict__ ni
+état de session, là où un objet ORM porte son dictionnaire d'attributs, son
+InstanceState et sa place dans l'identity map. Les champs portent les noms
+publics des attributs du modèle (title et non _title) : les Serializer de
+app/serializers.py lisent indifféremment une ligne ou un objet ORM.
+Les lignes sont en lecture seule et ne sont pas attachées à la session.
+"""
+
+from collections import namedtuple
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+class Projection:
+    """
+    Sous-ensemble de colonnes d'un modèle, renvoyé sous forme de namedtuple.
+
+    :param name: Le nom du type de ligne
+    :param columns: Les colonnes sélectionnées (nom du champ=expression)
+    """
+
+    def __init__(self, name, /, **columns):
+        self.row = namedtuple(name, columns)
+        self.columns = tuple(column.label(key) for key, column in columns.items())
+
+    def __len__(self):
+        return len(self.columns)
+
+    def rows(self, result):
+        """
+        Convertit les lignes d'un résultat en namedtuple.
+
+        :param result: Un itérable de lignes contenant exactement les colonnes de la projection
+        :return: La liste des lignes de la projection
+        """
+        return list(map(self.row._make, result))
+
+
+PLACE_LIST = Projection('PlaceListRow', id=Place.id, title=Place.title, price=Place.price,
+                        latitude=Place.latitude, longitude=Place.longitude,
+                        avg_rating=Place.avg_rating, review_count=Place.review_count)
+PLACE_LOCATION = Projection('PlaceLocationRow', id=Place.id, title=Place.title,
+                            latitude=Place.latitude, longitude=Place.longitude)
+REVIEW_LIST = Projection('ReviewListRow', id=Review.id, text=Review.text, rating=Review.rating,
+                         user_id=Review.user_id, place_id=Review.place_id)
+USER_LIST = Projection('UserListRow', id=User.id, first_name=User.first_name, last_name=User.last_name,
+                       email=User.email, role=User.role)
+AMENITY_LIST = Projection('AmenityListRow', id=Amenity.id, name=Amenity.name)
+
+# Export NDJSON des administrateurs : toutes les colonnes, sauf le mot de passe
+PLACE_EXPORT = Projection('PlaceExportRow', id=Place.id, title=Place.title, description=Place.description,
+                          price=Place.price, latitude=Place.latitude, longitude=Place.longitude,
+                          owner_id=Place.owner_id, review_count=Place.review_count,
+                          avg_rating=Place.avg_rating, created_at=Place.created_at, updated_at=Place.updated_at)
+REVIEW_EXPORT = Projection('ReviewExportRow', id=Review.id, text=Review.text, rating=Review.rating,
+                           user_id=Review.user_id, place_id=Review.place_id,
+                           created_at=Review.created_at, updated_at=Review.updated_at)
+USER_EXPORT = Projection('UserExportRow', id=User.id, first_name=User.first_name, last_name=User.last_name,
+                         email=User.email, role=User.role, is_admin=User.is_admin,
+                         created_at=User.created_at, updated_at=User.updated_at)
@@ -4,6 +4,7 @@ Il définit une interface abstraite Repository et une implémentation en mémoir
 """
 
 from abc import ABC, abstractmethod
+from app.persistence.pagination import encode_cursor, decode_cursor
 
 class Repository(ABC):
     """
@@ -38,6 +39,17 @@ class Repository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_page(self, limit, cursor=None):
+        """
+        Récupère une page d'objets triés par (created_at, id).
+        
+        :param limit: Le nombre maximum d'objets à retourner
+        :param cursor: Le curseur renvoyé par la page précédente (optionnel)
+        :return: Un tuple (objets, curseur suivant ou None)
+        """
+        pass
+
     @abstractmethod
     def update(self, obj_id, data):
         """
@@ -105,6 +117,23 @@ class InMemoryRepository(Repository):
         all_objects = list(self._storage.values())
         return all_objects
 
+    def get_page(self, limit, cursor=None):
+        """
+        Récupère une page d'objets triés par (created_at, id).
+        
+        :param limit: Le nombre maximum d'objets à retourner
+        :param cursor: Le curseur renvoyé par la page précédente (optionnel)
+        :return: Un tuple (objets, curseur suivant ou None)
+        """
+        objects = sorted(self._storage.values(), key=lambda obj: (obj.created_at, obj.id))
+        if cursor:
+            position = decode_cursor(cursor, 'created_at')
+            objects = [obj for obj in objects if (obj.created_at, obj.id) > position]
+        if len(objects) <= limit:
+            return objects, None
+        page = objects[:limit]
+        return page, encode_cursor(page[-1].created_at, page[-1].id, sort='created_at')
+
     def update(self, obj_id, obj):
         """
         Met à jour un objet dans le repository.
@@ -3,7 +3,11 @@ Ce fichier contient l'implémentation du repository spécifique pour les avis.
 Il étend le SQLAlchemyRepository pour ajouter des fonctionnalités spécifiques aux avis.
 """
 
+from sqlalchemy import exists, or_, select
+from app.extensions import db
+from app.models.place import Place
 from app.models.review import Review
+from app.models.user import User
 from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
 
 class ReviewRepository(SQLAlchemyRepository):
@@ -28,6 +32,86 @@ class ReviewRepository(SQLAlchemyRepository):
         """
         return self.model.query.filter_by(place_id=place_id).all()
     
+    def delete_reviews_by_place(self, place_id):
+        """
+        Supprime tous les avis d'un lieu en une seule requête DELETE.
+        Ne valide pas la transaction.
+        
+        :param place_id: L'identifiant du lieu
+        :return: Le nombre d'avis supprimés
+        """
+        return self.delete_where(self.model.place_id == place_id)
+
+    def delete_reviews_for_user(self, user_id):
+        """
+        Supprime en une seule requête DELETE les avis écrits par un utilisateur
+        et ceux laissés sur les lieux dont il est propriétaire.
+        Ne valide pas la transaction.
+        
+        :param user_id: L'identifiant de l'utilisateur
+        :return: Le nombre d'avis supprimés
+        """
+        owned_places = select(Place.id).where(Place.owner_id == user_id)
+        return self.delete_where(or_(self.model.user_id == user_id,
+                                     self.model.place_id.in_(owned_places)))
+
+    def get_detail_version(self, review_id):
+        """
+        Récupère en une seule requête de quoi dater la représentation détaillée d'un avis :
+        l'avis, son auteur et le lieu concerné.
+        
+        :param review_id: L'identifiant de l'avis
+        :return: Un tuple (updated_at de l'avis, de l'auteur, du lieu), ou None si l'avis n'existe pas
+        """
+        row = db.session.execute(
+            select(self.model.updated_at, User.updated_at, Place.updated_at)
+            .select_from(self.model)
+            .outerjoin(User, User.id == self.model.user_id)
+            .outerjoin(Place, Place.id == self.model.place_id)
+            .where(self.model.id == review_id)
+        ).first()
+        return tuple(row) if row else None
+
+    def get_place_ids_by_user(self, user_id):
+        """
+        Récupère les identifiants des lieux évalués par un utilisateur.
+        
+        :param user_id: L'identifiant de l'utilisateur
+        :return: Une liste d'identifiants
+        """
+        return list(db.session.scalars(select(self.model.place_id).where(self.model.user_id == user_id)))
+
+    def has_reviewed(self, place_id, user_id):
+        """
+        Indique si un utilisateur a déjà évalué un lieu, avec une requête EXISTS
+        servie par l'index unique (place_id, user_id).
+        
+        :param place_id: L'identifiant du lieu
+        :param user_id: L'identifiant de l'utilisateur
+        :return: True si un avis existe
+        """
+        return db.session.scalar(select(exists().where(
+            self.model.place_id == place_id, self.model.user_id == user_id
+        )))
+
+    def get_reviewed_pairs(self, place_ids, user_ids):
+        """
+        Récupère en une seule requête les couples (lieu, utilisateur) déjà évalués
+        parmi les lieux et utilisateurs fournis.
+        
+        :param place_ids: Les identifiants des lieux
+        :param user_ids: Les identifiants des utilisateurs
+        :return: Un ensemble de couples (place_id, user_id)
+        """
+        place_ids, user_ids = set(place_ids), set(user_ids)
+        if not place_ids or not user_ids:
+            return set()
+        return set(db.session.execute(
+            select(self.model.place_id, self.model.user_id).where(
+                self.model.place_id.in_(place_ids), self.model.user_id.in_(user_ids)
+            )
+        ).all())
+
     def get_reviews_by_user(self, user_id):
         """
         Récupère tous les avis laissés par un utilisateur spécifique.
@@ -49,6 +133,8 @@ class ReviewRepository(SQLAlchemyRepository):
     def get_average_rating_for_place(self, place_id):
         """
         Calcule la note moyenne pour un lieu spécifique.
+        Parcourt tous les avis du lieu : préférer Place.avg_rating, maintenu à jour
+        par la façade, sauf pour vérifier ou réparer cet agrégat.
         
         :param place_id: L'identifiant du lieu
         :return: La note moyenne ou None si le lieu n'a pas d'avis
@@ -0,0 +1,186 @@
+"""
+Ce fichier contient les outils de recherche géographique sur les lieux.
+Sous SQLite, un index spatial R*Tree (table virtuelle places_rtree) est maintenu
+à jour par des triggers sur la table places. Il est indexé par la colonne
+places.spatial_id et non par le rowid implicite : la clé primaire des lieux est
+TEXT, et VACUUM peut renuméroter le rowid d'une telle table. Cette colonne, propre
+à SQLite, n'est pas déclarée dans le modèle Place : elle est ajoutée avec l'index.
+Les autres bases utilisent l'index composite (latitude, longitude) pour le
+préfiltrage par boîte englobante.
+"""
+
+import math
+import weakref
+from sqlalchemy import DDL, column, event, table, text
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Vue légère de la table virtuelle, qui n'appartient pas aux métadonnées SQLAlchemy
+places_rtree = table('places_rtree',
+                     column('id'), column('min_lat'), column('max_lat'),
+                     column('min_lng'), column('max_lng'))
+
+# Triggers de l'index R*Tree, y compris ceux des versions précédentes indexées par rowid
+SPATIAL_INDEX_TRIGGERS = ('places_spatial_id', 'places_rtree_insert', 'places_rtree_update', 'places_rtree_delete')
+
+SPATIAL_INDEX_DDL = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_places_spatial_id ON places (spatial_id)",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS places_rtree
+       USING rtree(id, min_lat, max_lat, min_lng, max_lng)""",
+    # Les insertions qui ne fournissent pas spatial_id (SQL brut) reçoivent le suivant ;
+    # la mise à jour déclenche places_rtree_update, qui renseigne l'index
+    """CREATE TRIGGER IF NOT EXISTS places_spatial_id AFTER INSERT ON places
+       WHEN new.spatial_id IS NULL
+       BEGIN
+           UPDATE places SET spatial_id = (SELECT COALESCE(MAX(spatial_id), 0) + 1 FROM places)
+           WHERE id = new.id;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS places_rtree_insert AFTER INSERT ON places
+       WHEN new.spatial_id IS NOT NULL
+       BEGIN
+           INSERT OR REPLACE INTO places_rtree
+           VALUES (new.spatial_id, new.latitude, new.latitude, new.longitude, new.longitude);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS places_rtree_update
+       AFTER UPDATE OF latitude, longitude, spatial_id ON places
+       WHEN new.spatial_id IS NOT NULL
+       BEGIN
+           DELETE FROM places_rtree WHERE id = old.spatial_id AND old.spatial_id IS NOT new.spatial_id;
+           INSERT OR REPLACE INTO places_rtree
+           VALUES (new.spatial_id, new.latitude, new.latitude, new.longitude, new.longitude);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS places_rtree_delete AFTER DELETE ON places
+       BEGIN
+           DELETE FROM places_rtree WHERE id = old.spatial_id;
+       END""",
+]
+
+# Présence de l'index R*Tree par moteur, pour ne pas lire sqlite_master à chaque requête
+_spatial_index_engines = weakref.WeakKeyDictionary()
+
+
+def install_spatial_index(connection):
+    """
+    Crée l'index R*Tree et ses triggers, puis le reconstruit à partir des lieux existants.
+    Sans effet si la base n'est pas SQLite. Peut être exécuté sur une base existante :
+    la colonne spatial_id est ajoutée si besoin, renseignée pour les lieux qui n'en ont
+    pas, et les triggers des versions précédentes sont remplacés.
+
+    :param connection: Une connexion SQLAlchemy
+    """
+    if connection.dialect.name != 'sqlite':
+        return
+    columns = {row[1] for row in connection.exec_driver_sql("PRAGMA table_info(places)")}
+    if 'spatial_id' not in columns:
+        connection.exec_driver_sql("ALTER TABLE places ADD COLUMN spatial_id INTEGER")
+    for trigger in SPATIAL_INDEX_TRIGGERS:
+        connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+    # Le rowid ne sert qu'à numéroter une fois les lieux qui n'ont pas encore de clé
+    connection.exec_driver_sql(
+        "UPDATE places SET spatial_id = (SELECT COALESCE(MAX(spatial_id), 0) FROM places) + rowid "
+        "WHERE spatial_id IS NULL"
+    )
+    for statement in SPATIAL_INDEX_DDL:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql("DELETE FROM places_rtree")
+    connection.exec_driver_sql(
+        "INSERT INTO places_rtree "
+        "SELECT spatial_id, latitude, latitude, longitude, longitude FROM places"
+    )
+    _spatial_index_engines.pop(connection.engine, None)
+
+
+def has_spatial_index(session):
+    """
+    Indique si l'index R*Tree est disponible sur la base courante.
+    Le résultat est mémorisé par moteur ; il est oublié lorsque la table places
+    est créée ou supprimée par SQLAlchemy, ou l'index installé.
+
+    :param session: La session SQLAlchemy
+    :return: True si la table places_rtree et la colonne places.spatial_id existent
+    """
+    engine = session.get_bind().engine
+    if engine.dialect.name != 'sqlite':
+        return False
+    available = _spatial_index_engines.get(engine)
+    if available is None:
+        available = bool(session.scalar(text(
+            "SELECT EXISTS (SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'places_rtree') "
+            "AND EXISTS (SELECT 1 FROM pragma_table_info('places') WHERE name = 'spatial_id')"
+        )))
+        _spatial_index_engines[engine] = available
+    return available
+
+
+def _forget_spatial_index(target, connection, **kw):
+    _spatial_index_engines.pop(connection.engine, None)
+
+
+def register_spatial_index(places_table):
+    """
+    Crée automatiquement la colonne spatial_id et l'index R*Tree avec la table places
+    et le supprime avec elle (db.drop_all).
+
+    :param places_table: L'objet Table des lieux
+    """
+    event.listen(places_table, 'after_create',
+                 DDL('ALTER TABLE places ADD COLUMN spatial_id INTEGER').execute_if(dialect='sqlite'))
+    for statement in SPATIAL_INDEX_DDL:
+        event.listen(places_table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    event.listen(places_table, 'before_drop',
+                 DDL('DROP TABLE IF EXISTS places_rtree').execute_if(dialect='sqlite'))
+    event.listen(places_table, 'after_create', _forget_spatial_index)
+    event.listen(places_table, 'after_drop', _forget_spatial_index)
+
+
+def register_spatial_functions(engine):
+    """
+    Déclare la fonction SQL haversine_km(lat1, lng1, lat2, lng2) sur chaque nouvelle
+    connexion d'un moteur SQLite, pour trier et limiter les recherches par distance
+    dans la requête. Sans effet si le moteur n'est pas SQLite.
+
+    :param engine: Le moteur SQLAlchemy
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def create_spatial_functions(dbapi_connection, connection_record):
+        dbapi_connection.create_function('haversine_km', 4, haversine_km, deterministic=True)
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """
+    Calcule la distance orthodromique entre deux points.
+
+    :return: La distance en kilomètres
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_boxes(lat, lng, radius_km):
+    """
+    Calcule les boîtes englobantes (en degrés) d'un cercle de rayon radius_km.
+    L'écart en longitude est élargi selon la latitude, et une boîte traversant
+    l'antiméridien est découpée en deux.
+
+    :return: Une liste de tuples (min_lat, max_lat, min_lng, max_lng)
+    """
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat - d_lat, lat + d_lat
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        # Le cercle contient un pôle : toutes les longitudes sont concernées
+        return [(max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0)]
+
+    d_lng = math.degrees(math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM)
+                                       / math.cos(math.radians(lat)))))
+    min_lng, max_lng = lng - d_lng, lng + d_lng
+    if min_lng < -180.0:
+        return [(min_lat, max_lat, min_lng + 360.0, 180.0), (min_lat, max_lat, -180.0, max_lng)]
+    if max_lng > 180.0:
+        return [(min_lat, max_lat, min_lng, 180.0), (min_lat, max_lat, -180.0, max_lng - 360.0)]
+    return [(min_lat, max_lat, min_lng, max_lng)]
@@ -3,7 +3,10 @@ Ce fichier contient l'implémentation du repository SQLAlchemy pour la persistan
 Il implémente l'interface Repository définie dans repository.py.
 """
 
+from sqlalchemy import and_, delete, func, or_, select
 from app.persistence.repository import Repository
+from app.persistence import unit_of_work
+from app.persistence.pagination import encode_cursor, decode_cursor
 from app.extensions import db
 
 class SQLAlchemyRepository(Repository):
@@ -23,11 +26,12 @@ class SQLAlchemyRepository(Repository):
     def add(self, obj):
         """
         Ajoute un objet à la base de données.
+        Dans une unité de travail, l'objet est seulement envoyé à la base (flush).
         
         :param obj: L'objet à ajouter
         """
         db.session.add(obj)
-        db.session.commit()
+        unit_of_work.commit()
 
     def get(self, obj_id):
         """
@@ -38,14 +42,132 @@ class SQLAlchemyRepository(Repository):
         """
         return self.model.query.get(obj_id)
 
-    def get_all(self):
+    def get_existing_ids(self, ids):
+        """
+        Indique lesquels des identifiants fournis existent, en une seule requête IN.
+        
+        :param ids: Les identifiants à vérifier
+        :return: L'ensemble des identifiants existants
+        """
+        ids = set(ids)
+        if not ids:
+            return set()
+        return set(db.session.scalars(select(self.model.id).where(self.model.id.in_(ids))))
+
+    def get_version(self, obj_id):
+        """
+        Récupère la date de dernière modification d'un objet sans le charger.
+        Sert de validateur aux requêtes GET conditionnelles.
+        
+        :param obj_id: L'identifiant de l'objet
+        :return: La valeur de updated_at, ou None si l'objet n'existe pas
+        """
+        return db.session.scalar(select(self.model.updated_at).where(self.model.id == obj_id))
+
+    def get_collection_version(self):
+        """
+        Récupère la version de la collection en une seule requête MAX(updated_at), COUNT(*).
+        Toute création ou modification change le maximum, toute suppression change le nombre.
+        
+        :return: Un tuple (dernière modification ou None, nombre d'objets)
+        """
+        return tuple(db.session.execute(
+            select(func.max(self.model.updated_at), func.count()).select_from(self.model)
+        ).one())
+
+    def bulk_add(self, mappings):
+        """
+        Insère plusieurs objets en une seule requête executemany, sans créer d'objets ORM.
+        Les valeurs ne passent pas par les validations du modèle : l'appelant doit
+        les avoir vérifiées et fournir l'id et les horodatages.
+        
+        :param mappings: Une liste de dictionnaires indexés par nom d'attribut du modèle
+        """
+        if mappings:
+            db.session.bulk_insert_mappings(self.model, mappings)
+            unit_of_work.commit()
+
+    def get_all(self, projection=None):
         """
         Récupère tous les objets du repository.
         
+        :param projection: Une Projection : seules ses colonnes sont lues, et chaque
+                           objet est renvoyé sous forme de namedtuple (optionnel)
         :return: Une liste contenant tous les objets
         """
+        if projection is not None:
+            return projection.rows(db.session.execute(select(*projection.columns)))
         return self.model.query.all()
 
+    def iter_partitions(self, projection, since=None, batch_size=1000):
+        """
+        Parcourt les lignes d'une projection par lots, par date de modification croissante.
+        Le curseur de la base est lu au fur et à mesure (yield_per) : la mémoire utilisée
+        ne dépend que de batch_size, quelle que soit la taille de la table.
+        
+        :param projection: La Projection des colonnes à lire
+        :param since: Ne renvoie que les lignes modifiées à cette date ou après (optionnel)
+        :param batch_size: Le nombre de lignes lues par lot
+        :return: Un générateur de listes de lignes (Row, nommées comme la projection)
+        """
+        statement = select(*projection.columns).order_by(self.model.updated_at, self.model.id)
+        if since is not None:
+            statement = statement.where(self.model.updated_at >= since)
+        result = db.session.execute(statement.execution_options(yield_per=batch_size))
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
+
+    def get_page(self, limit, cursor=None, query=None, order_by=None, projection=None):
+        """
+        Récupère une page d'objets à l'aide d'un curseur.
+        La pagination par clé évite OFFSET : chaque page coûte le même prix
+        quelle que soit sa position dans la table.
+        
+        :param limit: Le nombre maximum d'objets à retourner
+        :param cursor: Le curseur renvoyé par la page précédente (optionnel)
+        :param query: Une requête de base déjà filtrée (optionnel)
+        :param order_by: Une liste de couples (expression, décroissant) définissant le tri,
+                         (created_at croissant) par défaut ; l'id est toujours ajouté en dernier,
+                         dans le sens de la première clé pour qu'un index (clé, id) suffise
+        :param projection: Une Projection : seules ses colonnes sont lues, et chaque
+                           objet est renvoyé sous forme de namedtuple (optionnel)
+        :return: Un tuple (objets, curseur suivant ou None)
+        :raises ValueError: Si le curseur est invalide
+        """
+        if query is None:
+            query = self.model.query
+        keys = list(order_by or [(self.model.created_at, False)])
+        keys.append((self.model.id, keys[0][1]))
+        # Le curseur n'est valable que pour le tri qui l'a produit
+        sort = ','.join(f"{'-' if descending else ''}{expression}" for expression, descending in keys)
+
+        if cursor:
+            values = decode_cursor(cursor, sort, len(keys))
+            # (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ... en respectant le sens de chaque clé
+            conditions = []
+            for i, (expression, descending) in enumerate(keys):
+                after = expression < values[i] if descending else expression > values[i]
+                conditions.append(and_(*[keys[j][0] == values[j] for j in range(i)], after))
+            query = query.filter(or_(*conditions))
+
+        size = 1
+        if projection is not None:
+            query, size = query.with_entities(*projection.columns), len(projection)
+        query = query.add_columns(*[expression.label(f'_key{i}') for i, (expression, _) in enumerate(keys)])
+        query = query.order_by(*[expression.desc() if descending else expression
+                                 for expression, descending in keys])
+        rows = query.limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(*rows[-1][size:], sort=sort)
+        if projection is not None:
+            return projection.rows(row[:size] for row in rows), next_cursor
+        return [row[0] for row in rows], next_cursor
+
     def update(self, obj_id, data):
         """
         Met à jour un objet dans la base de données.
@@ -57,7 +179,7 @@ class SQLAlchemyRepository(Repository):
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
-            db.session.commit()
+            unit_of_work.commit()
 
     def delete(self, obj_id):
         """
@@ -68,7 +190,38 @@ class SQLAlchemyRepository(Repository):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            unit_of_work.commit()
+
+    def delete_where(self, *criteria):
+        """
+        Supprime en une seule requête DELETE tous les objets vérifiant les critères.
+        Ne valide pas la transaction, afin de pouvoir enchaîner plusieurs suppressions
+        en cascade avant une unique validation. Les objets supprimés déjà chargés
+        sont retirés de la session.
+        
+        :param criteria: Les critères SQLAlchemy de sélection des lignes à supprimer
+        :return: Le nombre de lignes supprimées
+        """
+        result = db.session.execute(
+            delete(self.model).where(*criteria).execution_options(synchronize_session='fetch')
+        )
+        return result.rowcount
+
+    def delete_by_id(self, obj_id):
+        """
+        Supprime un objet par son identifiant sans le charger.
+        Ne valide pas la transaction.
+        
+        :param obj_id: L'identifiant de l'objet à supprimer
+        :return: Le nombre de lignes supprimées
+        """
+        return self.delete_where(self.model.id == obj_id)
+
+    def commit(self):
+        """
+        Valide la transaction en cours, ou se contente d'un flush dans une unité de travail.
+        """
+        unit_of_work.commit()
 
     def get_by_attribute(self, attr_name, attr_value):
         """
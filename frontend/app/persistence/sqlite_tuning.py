@@ -0,0 +1,63 @@
+"""
+Ce fichier contient le profil de performance SQLite.
+Les PRAGMA de SQLite sont propres à chaque connexion (sauf journal_mode=WAL,
+enregistré dans le fichier) : ils sont donc appliqués à chaque nouvelle
+connexion du pool par un événement connect du moteur SQLAlchemy.
+"""
+
+import re
+from sqlalchemy import event
+
+# Noms des PRAGMA acceptés dans SQLITE_PRAGMAS
+SUPPORTED_PRAGMAS = ('journal_mode', 'synchronous', 'cache_size', 'mmap_size',
+                     'temp_store', 'busy_timeout', 'wal_autocheckpoint', 'foreign_keys')
+
+_VALUE = re.compile(r'^-?\w+$')
+
+
+def validate_pragmas(pragmas):
+    """
+    Vérifie un profil de PRAGMA avant de l'injecter dans des requêtes SQL.
+
+    :param pragmas: Un dictionnaire {nom: valeur}
+    :raises ValueError: Si un nom n'est pas supporté ou une valeur n'est pas un mot ou un entier
+    """
+    for name, value in pragmas.items():
+        if name not in SUPPORTED_PRAGMAS:
+            raise ValueError(f"PRAGMA SQLite non supporté : {name}")
+        if not _VALUE.match(str(value)):
+            raise ValueError(f"Valeur invalide pour le PRAGMA {name} : {value!r}")
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    """
+    Applique un profil de PRAGMA à une connexion DB-API SQLite.
+
+    :param dbapi_connection: La connexion sqlite3
+    :param pragmas: Un dictionnaire {nom: valeur} déjà validé
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+    finally:
+        cursor.close()
+
+
+def register_sqlite_pragmas(engine, pragmas):
+    """
+    Applique un profil de PRAGMA à chaque nouvelle connexion d'un moteur SQLite.
+    Sans effet si le moteur n'est pas SQLite ou si le profil est vide.
+
+    :param engine: Le moteur SQLAlchemy
+    :param pragmas: Un dictionnaire {nom: valeur}, ou None
+    :raises ValueError: Si le profil est invalide
+    """
+    if not pragmas or engine.dialect.name != 'sqlite':
+        return
+    pragmas = dict(pragmas)
+    validate_pragmas(pragmas)
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, pragmas)
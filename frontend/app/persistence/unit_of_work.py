@@ -0,0 +1,84 @@
+"""
+Ce fichier contient l'unité de travail (unit of work) de la couche de persistance.
+À l'intérieur d'un bloc transaction(), les repositories se contentent d'un flush :
+les écritures sont envoyées à la base mais validées une seule fois, à la sortie
+du bloc le plus externe, ou annulées ensemble si une exception est levée.
+Des actions peuvent être différées après la validation avec on_commit().
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+from app.extensions import db
+
+_DEPTH_KEY = 'unit_of_work_depth'
+_ON_COMMIT_KEY = 'unit_of_work_on_commit'
+
+
+def in_transaction():
+    """
+    Indique si une unité de travail est ouverte sur la session courante.
+
+    :return: True à l'intérieur d'un bloc transaction()
+    """
+    return db.session.info.get(_DEPTH_KEY, 0) > 0
+
+
+def commit():
+    """
+    Valide la session courante, ou se contente d'un flush si une unité de travail
+    est ouverte : la validation est alors faite à la sortie du bloc le plus externe.
+    """
+    if in_transaction():
+        db.session.flush()
+    else:
+        db.session.commit()
+
+
+def on_commit(callback):
+    """
+    Exécute une fonction après la validation de l'unité de travail en cours,
+    ou immédiatement s'il n'y en a pas. La fonction n'est pas appelée si
+    l'unité de travail est annulée.
+
+    :param callback: Une fonction sans argument
+    """
+    if in_transaction():
+        db.session.info.setdefault(_ON_COMMIT_KEY, []).append(callback)
+    else:
+        callback()
+
+
+@contextmanager
+def transaction():
+    """
+    Ouvre une unité de travail. Les blocs imbriqués rejoignent le bloc externe,
+    qui valide la session à sa sortie ou l'annule si une exception est levée.
+    """
+    info = db.session.info
+    depth = info.get(_DEPTH_KEY, 0)
+    info[_DEPTH_KEY] = depth + 1
+    try:
+        yield
+        if depth == 0:
+            db.session.commit()
+    except BaseException:
+        if depth == 0:
+            info.pop(_ON_COMMIT_KEY, None)
+            db.session.rollback()
+        raise
+    finally:
+        info[_DEPTH_KEY] = depth
+    if depth == 0:
+        for callback in info.pop(_ON_COMMIT_KEY, ()):
+            callback()
+
+
+def transactional(method):
+    """
+    Décorateur exécutant une méthode dans une unité de travail.
+    """
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with transaction():
+            return method(*args, **kwargs)
+    return wrapper
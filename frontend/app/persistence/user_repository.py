@@ -3,6 +3,8 @@ Ce fichier contient l'implémentation du repository spécifique pour les utilisa
 Il étend le SQLAlchemyRepository pour ajouter des fonctionnalités spécifiques aux utilisateurs.
 """
 
+from sqlalchemy import select
+from app.extensions import db
 from app.models.user import User
 from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
 
@@ -27,6 +29,18 @@ class UserRepository(SQLAlchemyRepository):
         :return: L'utilisateur correspondant ou None s'il n'existe pas
         """
         return self.model.query.filter_by(email=email).first()
+
+    def get_existing_emails(self, emails):
+        """
+        Indique lesquelles des adresses email fournies sont déjà enregistrées, en une seule requête IN.
+        
+        :param emails: Les adresses email à vérifier
+        :return: L'ensemble des adresses déjà enregistrées
+        """
+        emails = set(emails)
+        if not emails:
+            return set()
+        return set(db.session.scalars(select(self.model.email).where(self.model.email.in_(emails))))
     
     def get_users_by_role(self, role):
         """
@@ -0,0 +1,400 @@
+"""
+Ce fichier contient le cache HTTP des GET anonymes de l'API.
+Il s'intercale devant l'application WSGI : une réponse en cache est renvoyée
+sans passer par le routage de Flask ni par l'ORM. Seules les réponses que les
+endpoints ont étiquetées avec cache_tags() sont conservées, indexées par URL
+normalisée (paramètres triés). Chaque étiquette désigne une entité
+(type, identifiant) ou une collection (type, ALL) ; la façade purge les
+étiquettes des entités qu'elle modifie.
+
+Deux stockages sont disponibles : 'memory', propre au processus, et 'sqlite',
+un fichier partagé par tous les workers du serveur.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from urllib.parse import parse_qsl, urlencode
+from flask import g
+from werkzeug.http import parse_etags, unquote_etag
+from app.cache import ALL
+
+DEFAULT_TTL = 30
+# Seules les URL de l'API sont cherchées dans le cache
+PREFIX = '/api/'
+# En-tête interne portant les étiquettes de la réponse, retiré avant l'envoi
+TAGS_HEADER = 'X-Cache-Tags'
+# Nombre d'écritures entre deux purges des entrées expirées du stockage SQLite
+PRUNE_EVERY = 100
+# En-têtes d'une réponse 200 conservés dans la réponse 304 servie depuis le cache
+NOT_MODIFIED_HEADERS = {'etag', 'last-modified', 'cache-control', 'vary', 'access-control-allow-origin',
+                        'access-control-expose-headers'}
+
+
+def cache_tags(*keys):
+    """
+    Rend la réponse en cours cacheable et l'étiquette avec les entités qu'elle contient.
+
+    :param keys: Des clés (type, identifiant) ; l'identifiant ALL désigne la collection,
+                 purgée à chaque création, modification ou suppression d'une entité du type
+    """
+    tags = g.setdefault('response_cache_tags', set())
+    tags.update(f'{kind}:{obj_id}' for kind, obj_id in keys)
+
+
+def _tags_header(response):
+    """Transmet au cache les étiquettes de la réponse (fonction after_request)."""
+    tags = g.pop('response_cache_tags', None)
+    if tags:
+        response.headers[TAGS_HEADER] = ' '.join(sorted(tags))
+    return response
+
+
+def cache_key(environ):
+    """
+    Calcule la clé d'une requête : URL complète, paramètres triés, et codages
+    acceptés par le client (la réponse en cache peut être compressée).
+
+    :param environ: L'environnement WSGI de la requête
+    :return: La clé
+    """
+    query = urlencode(sorted(parse_qsl(environ.get('QUERY_STRING', ''), keep_blank_values=True)))
+    return (f"{environ['wsgi.url_scheme']}://{environ.get('HTTP_HOST', '')}"
+            f"{environ.get('SCRIPT_NAME', '')}{environ.get('PATH_INFO', '')}?{query}"
+            f"|{environ.get('HTTP_ACCEPT_ENCODING', '')}")
+
+
+class MemoryStore:
+    """
+    Stockage LRU en mémoire, propre au processus et partagé par ses threads.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._tags = defaultdict(set)
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def generation(self):
+        """
+        Renvoie le numéro de génération, incrémenté à chaque purge : une réponse
+        calculée pendant une purge n'est pas mise en cache.
+        """
+        return self._generation
+
+    def get(self, key):
+        """
+        :param key: La clé de la requête
+        :return: Un tuple (statut, en-têtes, corps), ou None si la clé est absente ou expirée
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            response, _, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def set(self, key, response, tags, ttl, generation):
+        """
+        Conserve une réponse, sauf si une purge a eu lieu depuis la génération indiquée.
+
+        :param key: La clé de la requête
+        :param response: Un tuple (statut, en-têtes, corps)
+        :param tags: Les étiquettes de la réponse
+        :param ttl: La durée de vie en secondes
+        :param generation: La génération lue avant le calcul de la réponse
+        :return: True si la réponse a été conservée
+        """
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._remove(key)
+            self._entries[key] = (response, tags, time.monotonic() + ttl)
+            for tag in tags:
+                self._tags[tag].add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+            return True
+
+    def purge(self, tags):
+        """
+        Retire les réponses portant l'une des étiquettes.
+
+        :param tags: Les étiquettes
+        """
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+    def clear(self):
+        """Retire toutes les réponses."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key):
+        """Retire une réponse et ses étiquettes ; le verrou doit être tenu."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[1]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class SQLiteStore:
+    """
+    Stockage dans un fichier SQLite en mode WAL, partagé par les processus :
+    une purge faite par un worker vaut pour tous. Chaque thread de chaque
+    processus a sa propre connexion.
+    """
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, status TEXT NOT NULL, '
+        'headers TEXT NOT NULL, body BLOB NOT NULL, expires_at REAL NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS ix_responses_expires_at ON responses (expires_at)',
+        'CREATE TABLE IF NOT EXISTS response_tags (tag TEXT NOT NULL, key TEXT NOT NULL, '
+        'PRIMARY KEY (tag, key)) WITHOUT ROWID',
+        'CREATE INDEX IF NOT EXISTS ix_response_tags_key ON response_tags (key)',
+        'CREATE TABLE IF NOT EXISTS generation (id INTEGER PRIMARY KEY CHECK (id = 1), value INTEGER NOT NULL)',
+        'INSERT OR IGNORE INTO generation (id, value) VALUES (1, 0)',
+    )
+
+    def __init__(self, path, max_size):
+        self.path = path
+        self.max_size = max_size
+        self._local = threading.local()
+        self._writes = 0
+        connection = self._connection()
+        connection.execute('PRAGMA journal_mode=WAL')
+        with _transaction(connection):
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+
+    def generation(self):
+        """Renvoie le numéro de génération, incrémenté à chaque purge par n'importe quel processus."""
+        return self._connection().execute('SELECT value FROM generation').fetchone()[0]
+
+    def get(self, key):
+        """
+        :param key: La clé de la requête
+        :return: Un tuple (statut, en-têtes, corps), ou None si la clé est absente ou expirée
+        """
+        row = self._connection().execute(
+            'SELECT status, headers, body FROM responses WHERE key = ? AND expires_at > ?',
+            (key, time.time())).fetchone()
+        if row is None:
+            return None
+        status, headers, body = row
+        return status, [tuple(header) for header in json.loads(headers)], body
+
+    def set(self, key, response, tags, ttl, generation):
+        """
+        Conserve une réponse, sauf si une purge a eu lieu depuis la génération indiquée.
+        Voir MemoryStore.set.
+        """
+        status, headers, body = response
+        connection = self._connection()
+        with _transaction(connection):
+            if connection.execute('SELECT value FROM generation').fetchone()[0] != generation:
+                return False
+            connection.execute('DELETE FROM response_tags WHERE key = ?', (key,))
+            connection.execute('INSERT OR REPLACE INTO responses (key, status, headers, body, expires_at) '
+                               'VALUES (?, ?, ?, ?, ?)',
+                               (key, status, json.dumps(headers), body, time.time() + ttl))
+            connection.executemany('INSERT OR IGNORE INTO response_tags (tag, key) VALUES (?, ?)',
+                                   [(tag, key) for tag in tags])
+            self._writes += 1
+            if self._writes % PRUNE_EVERY == 0:
+                self._prune(connection)
+        return True
+
+    def purge(self, tags):
+        """
+        Retire les réponses portant l'une des étiquettes, en deux requêtes DELETE.
+
+        :param tags: Les étiquettes
+        """
+        tagged = 'SELECT key FROM response_tags WHERE tag IN (SELECT value FROM json_each(?))'
+        tags = json.dumps(list(tags))
+        connection = self._connection()
+        with _transaction(connection):
+            connection.execute('UPDATE generation SET value = value + 1')
+            connection.execute(f'DELETE FROM responses WHERE key IN ({tagged})', (tags,))
+            connection.execute(f'DELETE FROM response_tags WHERE key IN ({tagged})', (tags,))
+
+    def clear(self):
+        """Retire toutes les réponses."""
+        connection = self._connection()
+        with _transaction(connection):
+            connection.execute('UPDATE generation SET value = value + 1')
+            connection.execute('DELETE FROM responses')
+            connection.execute('DELETE FROM response_tags')
+
+    def _prune(self, connection):
+        """Retire les réponses expirées, puis les plus anciennes au-delà de max_size."""
+        connection.execute('DELETE FROM responses WHERE expires_at <= ?', (time.time(),))
+        connection.execute('DELETE FROM responses WHERE key IN (SELECT key FROM responses '
+                           'ORDER BY expires_at DESC LIMIT -1 OFFSET ?)', (self.max_size,))
+        connection.execute('DELETE FROM response_tags WHERE key NOT IN (SELECT key FROM responses)')
+
+    def _connection(self):
+        """Renvoie la connexion du thread, rouverte après un fork."""
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            local.connection.execute('PRAGMA synchronous=NORMAL')
+            local.pid = os.getpid()
+        return local.connection
+
+
+class _transaction:
+    """Transaction BEGIN IMMEDIATE sur une connexion sqlite3 en mode autocommit."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute('BEGIN IMMEDIATE')
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.connection.execute('ROLLBACK' if exc_type else 'COMMIT')
+
+
+class ResponseCache:
+    """
+    Extension Flask du cache HTTP. init_app() place le middleware devant
+    app.wsgi_app ; avec RESPONSE_CACHE_BACKEND vide, le cache est désactivé.
+    """
+
+    def __init__(self, app=None):
+        self.store = None
+        self.ttl = DEFAULT_TTL
+        self.hits = self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Lit RESPONSE_CACHE_BACKEND, RESPONSE_CACHE_PATH, RESPONSE_CACHE_SIZE et
+        RESPONSE_CACHE_TTL dans la configuration.
+
+        :param app: L'application Flask
+        :raises ValueError: Si le stockage demandé n'existe pas
+        """
+        backend = app.config.get('RESPONSE_CACHE_BACKEND')
+        size = int(app.config.get('RESPONSE_CACHE_SIZE', 1024))
+        self.ttl = float(app.config.get('RESPONSE_CACHE_TTL', DEFAULT_TTL))
+        self.hits = self.misses = 0
+        if not backend or size <= 0:
+            self.store = None
+            return
+        if backend == 'memory':
+            self.store = MemoryStore(size)
+        elif backend == 'sqlite':
+            # Chemin relatif au dossier instance de l'application
+            os.makedirs(app.instance_path, exist_ok=True)
+            path = os.path.join(app.instance_path, app.config.get('RESPONSE_CACHE_PATH', 'response_cache.db'))
+            self.store = SQLiteStore(path, size)
+        else:
+            raise ValueError(f"RESPONSE_CACHE_BACKEND invalide: {backend}. Valeurs acceptées: memory, sqlite")
+        app.after_request(_tags_header)
+        app.wsgi_app = _Middleware(app.wsgi_app, self)
+
+    @property
+    def enabled(self):
+        """Indique si les réponses sont mises en cache."""
+        return self.store is not None
+
+    def purge(self, *keys):
+        """
+        Retire les réponses contenant l'une des entités ou collections.
+
+        :param keys: Des clés (type, identifiant) ; l'identifiant ALL vise la collection
+        """
+        if self.store is not None and keys:
+            self.store.purge([f'{kind}:{obj_id}' for kind, obj_id in keys])
+
+    def clear(self):
+        """Retire toutes les réponses, par exemple après un recalcul global."""
+        if self.store is not None:
+            self.store.clear()
+
+
+class _Middleware:
+    """Middleware WSGI servant les GET anonymes depuis le cache."""
+
+    def __init__(self, wsgi_app, cache):
+        self.wsgi_app = wsgi_app
+        self.cache = cache
+
+    def __call__(self, environ, start_response):
+        store = self.cache.store
+        if (store is None or environ['REQUEST_METHOD'] != 'GET' or 'HTTP_AUTHORIZATION' in environ
+                or not environ.get('PATH_INFO', '').startswith(PREFIX)):
+            return self.wsgi_app(environ, _without_tags(start_response))
+
+        key = cache_key(environ)
+        cached = store.get(key)
+        if cached is not None:
+            self.cache.hits += 1
+            status, headers, body = cached
+            if _not_modified(environ, headers):
+                start_response('304 NOT MODIFIED', [(name, value) for name, value in headers
+                                                    if name.lower() in NOT_MODIFIED_HEADERS])
+                return []
+            start_response(status, headers + [('X-Cache', 'HIT')])
+            return [body]
+
+        self.cache.misses += 1
+        generation = store.generation()
+        captured = {}
+
+        def capture(status, headers, exc_info=None):
+            captured['status'] = status
+            captured['tags'] = next((value for name, value in headers if name == TAGS_HEADER), None)
+            captured['headers'] = [(name, value) for name, value in headers if name != TAGS_HEADER]
+            return start_response(status, captured['headers'] + [('X-Cache', 'MISS')], exc_info)
+
+        app_iter = self.wsgi_app(environ, capture)
+        if (not captured.get('tags') or not captured['status'].startswith('200 ')
+                or any(name.lower() == 'set-cookie' for name, _ in captured['headers'])):
+            return app_iter
+        try:
+            body = b''.join(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+        store.set(key, (captured['status'], captured['headers'], body), captured['tags'].split(),
+                  self.cache.ttl, generation)
+        return [body]
+
+
+def _without_tags(start_response):
+    """Retire l'en-tête interne des étiquettes d'une réponse non mise en cache."""
+    def wrapper(status, headers, exc_info=None):
+        return start_response(status, [(name, value) for name, value in headers if name != TAGS_HEADER],
+                              exc_info)
+    return wrapper
+
+
+def _not_modified(environ, headers):
+    """Indique si le client possède déjà la réponse en cache (If-None-Match)."""
+    if 'HTTP_IF_NONE_MATCH' not in environ:
+        return False
+    etag = next((value for name, value in headers if name.lower() == 'etag'), None)
+    return etag is not None and parse_etags(environ['HTTP_IF_NONE_MATCH']).contains_weak(unquote_etag(etag)[0])
@@ -0,0 +1,185 @@
+"""
+Ce fichier contient la sérialisation des réponses de l'API.
+
+Chaque vue d'un modèle (liste, détail, objet imbriqué) est décrite une seule fois
+par un Serializer, partagé entre les namespaces et avec la façade. À sa création,
+le Serializer compile une fonction qui construit le dictionnaire en un seul
+littéral ({'id': obj.id, 'title': obj._title, ...}), et une fonction many() qui
+sérialise une liste dans une seule compréhension : ni boucle sur les champs, ni
+appel de fonction par objet. Les vues de détail lisent directement la colonne
+mappée (_title) plutôt que la propriété hybride qui la renvoie ; les vues de
+liste lisent les noms publics, communs aux objets ORM et aux lignes des
+projections de app/persistence/projections.py.
+
+output_json remplace la représentation JSON de flask-restx : elle encode avec
+orjson lorsqu'il est installé, et avec le module json sinon. ndjson encode
+un flux de lignes, lot par lot, pour les réponses en streaming.
+"""
+
+import json
+from datetime import date
+from flask import current_app, make_response
+
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle : encodeur de la bibliothèque standard
+    orjson = None
+
+
+class Nested:
+    """
+    Champ contenant un objet lié, sérialisé par un autre Serializer (None reste None).
+
+    :param serializer: Le Serializer de l'objet lié
+    :param source: L'attribut qui contient l'objet (la clé du champ par défaut)
+    :param many: True si l'attribut contient une liste d'objets
+    """
+
+    def __init__(self, serializer, source=None, many=False):
+        self.serializer = serializer
+        self.source = source
+        self.many = many
+
+
+class Serializer:
+    """
+    Extracteur précompilé des champs d'un objet vers un dictionnaire.
+
+    Serializer('PlaceList', 'id', ('title', '_title'), owner=Nested(USER_OWNER))
+    produit {'id': obj.id, 'title': obj._title, 'owner': ...} ; les clés
+    apparaissent dans l'ordre des arguments.
+
+    :param name: Le nom de la vue, utilisé pour nommer les fonctions compilées
+    :param fields: Les champs : un nom d'attribut, ou un couple (clé, attribut)
+    :param nested: Les champs contenant des objets liés (clé=Nested(...))
+    """
+
+    def __init__(self, name, *fields, **nested):
+        self.name = name
+        self.fields = tuple((field, field) if isinstance(field, str) else tuple(field) for field in fields)
+        self.nested = nested
+        self.keys = tuple(key for key, _ in self.fields) + tuple(nested)
+        self._one, self._many = self._compile()
+
+    def __call__(self, obj):
+        """
+        Sérialise un objet.
+
+        :param obj: L'objet à sérialiser
+        :return: Le dictionnaire de la vue
+        """
+        return self._one(obj)
+
+    def many(self, objs):
+        """
+        Sérialise une suite d'objets.
+
+        :param objs: Un itérable d'objets
+        :return: La liste des dictionnaires de la vue
+        """
+        return self._many(objs)
+
+    def _compile(self):
+        """Génère et compile les fonctions de sérialisation d'un objet et d'une liste."""
+        namespace = {}
+        items = []
+        for key, source in self.fields:
+            if not source.isidentifier():
+                raise ValueError(f"Attribut invalide pour le champ {key!r}: {source!r}")
+            items.append(f'{key!r}: obj.{source}')
+        for index, (key, field) in enumerate(self.nested.items()):
+            source = field.source or key
+            if not source.isidentifier():
+                raise ValueError(f"Attribut invalide pour le champ {key!r}: {source!r}")
+            # La liste imbriquée réutilise la compréhension compilée de l'autre Serializer
+            function = f'_nested{index}'
+            namespace[function] = field.serializer._many if field.many else field.serializer._one
+            items.append(f'{key!r}: (None if (v{index} := obj.{source}) is None else {function}(v{index}))')
+        literal = '{' + ', '.join(items) + '}'
+        source = (f'def one(obj):\n    return {literal}\n'
+                  f'def many(objs):\n    return [{literal} for obj in objs]\n')
+        exec(compile(source, f'<serializer {self.name}>', 'exec'), namespace)
+        return namespace['one'], namespace['many']
+
+    def __repr__(self):
+        return f'Serializer({self.name!r}, {", ".join(self.keys)})'
+
+
+def dumps(data):
+    """
+    Encode des données en JSON (octets UTF-8).
+
+    :param data: Les données à encoder
+    :return: Le document JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=_json_default).encode()
+
+
+def ndjson(partitions):
+    """
+    Encode des lots de lignes en NDJSON (un objet JSON par ligne).
+
+    :param partitions: Un itérable de lots de lignes offrant _asdict() (Row ou namedtuple)
+    :return: Un générateur produisant un morceau d'octets par lot
+    """
+    for rows in partitions:
+        yield b''.join([dumps(row._asdict()) + b'\n' for row in rows])
+
+
+def _json_default(value):
+    """Encode les dates au format ISO 8601, comme orjson."""
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Type non sérialisable en JSON: {type(value).__name__}")
+
+
+def output_json(data, code, headers=None):
+    """
+    Représentation JSON des réponses flask-restx, encodée avec orjson si disponible.
+    Les réglages RESTX_JSON (sérialiseur personnalisé) gardent l'encodeur json.
+
+    :param data: Les données renvoyées par la ressource
+    :param code: Le code de statut HTTP
+    :param headers: Les en-têtes supplémentaires
+    :return: La réponse Flask
+    """
+    settings = current_app.config.get('RESTX_JSON')
+    if orjson is None or settings:
+        settings = dict(settings or {})
+        if current_app.debug:
+            settings.setdefault('indent', 4)
+        dumped = json.dumps(data, **settings) + '\n'
+    else:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        if current_app.debug:
+            option |= orjson.OPT_INDENT_2
+        dumped = orjson.dumps(data, option=option)
+    response = make_response(dumped, code)
+    response.headers.extend(headers or {})
+    return response
+
+
+# Vues partagées par les namespaces et la façade
+AMENITY = Serializer('Amenity', 'id', 'name')
+
+USER = Serializer('User', 'id', 'first_name', 'last_name', 'email', 'role')
+USER_ADMIN = Serializer('UserAdmin', 'id', 'first_name', 'last_name', 'email', 'role', 'is_admin')
+USER_OWNER = Serializer('UserOwner', 'id', 'first_name', 'last_name', 'email')
+USER_AUTHOR = Serializer('UserAuthor', 'id', 'first_name', 'last_name')
+
+REVIEW = Serializer('Review', 'id', 'text', 'rating', 'user_id', 'place_id')
+REVIEW_IN_PLACE = Serializer('ReviewInPlace', 'id', ('text', '_text'), ('rating', '_rating'), 'user_id')
+REVIEW_SUMMARY = Serializer('ReviewSummary', 'id', ('text', '_text'), ('rating', '_rating'))
+
+PLACE_LIST = Serializer('PlaceList', 'id', 'title', 'price', 'latitude', 'longitude', 'avg_rating', 'review_count')
+PLACE_NEARBY = Serializer('PlaceNearby', 'id', 'title', 'latitude', 'longitude')
+PLACE_TITLE = Serializer('PlaceTitle', 'id', ('title', '_title'))
+PLACE_WRITE = Serializer('PlaceWrite', 'id', ('title', '_title'), 'description', ('price', '_price'),
+                         ('latitude', '_latitude'), ('longitude', '_longitude'), ('owner_id', '_owner_id'),
+                         amenities=Nested(AMENITY, many=True))
+PLACE_DETAIL = Serializer('PlaceDetail', 'id', ('title', '_title'), 'description', ('price', '_price'),
+                          ('latitude', '_latitude'), ('longitude', '_longitude'), 'avg_rating', 'review_count',
+                          owner=Nested(USER_OWNER), reviews=Nested(REVIEW_IN_PLACE, many=True),
+                          amenities=Nested(AMENITY, many=True))
@@ -3,14 +3,164 @@ Ce fichier contient la classe HBnBFacade qui sert d'interface entre les contrôl
 et la couche de persistance. Elle encapsule toute la logique métier de l'application.
 """
 
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from functools import partial
+from sqlalchemy.exc import IntegrityError
 from app.persistence.user_repository import UserRepository
 from app.persistence.place_repository import PlaceRepository
 from app.persistence.review_repository import ReviewRepository
 from app.persistence.amenity_repository import AmenityRepository
-from app.models.user import User
+from app.persistence.unit_of_work import on_commit, transaction, transactional
+from app.persistence.invalidation_bus import ALL, invalidation_bus
+from app.persistence.projections import (AMENITY_LIST, PLACE_EXPORT, PLACE_LIST, PLACE_LOCATION, REVIEW_EXPORT,
+                                         REVIEW_LIST, USER_EXPORT, USER_LIST)
+from app.extensions import entity_cache, passwords, response_cache
+from app.models import amenity as amenity_rules, place as place_rules, review as review_rules, user as user_rules
+from app.models.user import User, UserRole
 from app.models.amenity import Amenity
 from app.models.place import Place
 from app.models.review import Review
+from app.serializers import AMENITY, PLACE_DETAIL, USER
+
+
+# Champs requis des créations, unitaires ou en masse
+USER_FIELDS = ['first_name', 'last_name', 'email', 'password']
+PLACE_FIELDS = ['title', 'price', 'latitude', 'longitude', 'owner_id']
+REVIEW_FIELDS = ['text', 'rating', 'user_id', 'place_id']
+
+
+def _collect_valid(items, validate, errors):
+    """
+    Valide chaque élément d'une création en masse.
+    
+    :param items: La liste des éléments reçus
+    :param validate: Une fonction qui renvoie les valeurs validées d'un élément ou lève ValueError
+    :param errors: La liste où ajouter les erreurs {'index', 'error'}
+    :return: Une liste de couples (index, valeurs validées)
+    """
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            if not isinstance(item, dict):
+                raise ValueError(f"Entrée invalide: dictionnaire attendu, reçu {type(item).__name__}")
+            valid.append((index, validate(item)))
+        except ValueError as e:
+            errors.append({'index': index, 'error': str(e)})
+    return valid
+
+
+def _require(item, fields):
+    """Vérifie que les champs requis sont présents."""
+    for field in fields:
+        if field not in item:
+            raise ValueError(f"Champ requis manquant: {field}")
+
+
+def _number(item, field):
+    """Convertit un champ numérique en float."""
+    try:
+        return float(item[field])
+    except (TypeError, ValueError):
+        raise ValueError(f"Le champ {field} doit être un nombre")
+
+
+def _rating(value):
+    """Convertit une note en entier et la valide avec la règle du modèle Review."""
+    try:
+        return review_rules.validate_rating(int(value))
+    except (TypeError, ValueError):
+        raise ValueError("La note doit être un entier compris entre 1 et 5")
+
+
+# Les fonctions suivantes valident un élément avec les champs requis de la méthode
+# create_* correspondante et les règles du modèle (app/models), puis renvoient les
+# valeurs indexées par nom d'attribut du modèle, prêtes pour bulk_insert_mappings.
+
+def _user_values(item):
+    """Valide un utilisateur comme create_user et le modèle User."""
+    _require(item, USER_FIELDS)
+    return {'first_name': user_rules.validate_first_name(item['first_name']),
+            'last_name': user_rules.validate_last_name(item['last_name']),
+            'email': user_rules.validate_email(item['email']),
+            'password': user_rules.validate_password(item['password']),
+            'role': user_rules.validate_role(item.get('role', UserRole.USER)),
+            'is_admin': user_rules.validate_is_admin(item.get('is_admin', False))}
+
+
+def _amenity_values(item):
+    """Valide un équipement comme le modèle Amenity."""
+    return {'_name': amenity_rules.validate_name(item.get('name'))}
+
+
+def _place_values(item):
+    """
+    Valide un lieu comme create_place et le modèle Place.
+
+    :return: Un tuple (valeurs, IDs des équipements sans doublon)
+    """
+    _require(item, PLACE_FIELDS)
+    owner_id = place_rules.validate_owner_id(item['owner_id'])
+    amenity_ids = item.get('amenities') or []
+    if not isinstance(amenity_ids, list) or not all(isinstance(a, str) for a in amenity_ids):
+        raise ValueError("Le champ amenities doit être une liste d'IDs d'équipements")
+    values = {'_title': place_rules.validate_title(item['title']),
+              'description': item.get('description'),
+              '_price': place_rules.validate_price(_number(item, 'price')),
+              '_latitude': place_rules.validate_latitude(_number(item, 'latitude')),
+              '_longitude': place_rules.validate_longitude(_number(item, 'longitude')),
+              '_owner_id': owner_id, 'user_id': owner_id}
+    return values, list(dict.fromkeys(amenity_ids))
+
+
+def _review_values(item):
+    """Valide un avis comme create_review et le modèle Review."""
+    _require(item, REVIEW_FIELDS)
+    return {'_text': review_rules.validate_text(item['text']), '_rating': _rating(item['rating']),
+            'user_id': item['user_id'], 'place_id': item['place_id']}
+
+
+def _keep_ids(items, valid, repo, errors):
+    """
+    Reprend les identifiants fournis par les éléments d'un import, pour que les lignes
+    importées ensuite puissent y faire référence. Un identifiant mal formé, déjà présent
+    dans la base ou répété dans le lot rend l'élément invalide ; les éléments sans id
+    en recevront un nouveau.
+    
+    :param items: La liste des éléments reçus
+    :param valid: Les couples (index, valeurs validées) renvoyés par _collect_valid
+    :param repo: Le repository de la table cible
+    :param errors: La liste où ajouter les erreurs {'index', 'error'}
+    :return: Un tuple (couples restants, {index: identifiant})
+    """
+    ids, kept = {}, []
+    for index, values in valid:
+        obj_id = items[index].get('id')
+        if obj_id is not None and (not isinstance(obj_id, str) or not obj_id or len(obj_id) > 36):
+            errors.append({'index': index, 'error': "L'id doit être une chaîne de 1 à 36 caractères"})
+            continue
+        if obj_id is not None:
+            ids[index] = obj_id
+        kept.append((index, values))
+    taken = repo.get_existing_ids(ids.values())
+    valid = []
+    for index, values in kept:
+        obj_id = ids.get(index)
+        if obj_id in taken:
+            errors.append({'index': index, 'error': f"L'id {obj_id} existe déjà"})
+            continue
+        if obj_id is not None:
+            taken.add(obj_id)
+        valid.append((index, values))
+    return valid, ids
+
+
+def _new_row(values, now, obj_id=None):
+    """Complète les valeurs d'une ligne insérée en masse avec son id et ses horodatages."""
+    values.update(id=obj_id or str(uuid.uuid4()), created_at=now, updated_at=now)
+    return values
+
 
 class HBnBFacade:
     """
@@ -27,6 +177,155 @@ class HBnBFacade:
         self.place_repo = PlaceRepository()
         self.review_repo = ReviewRepository()
 
+    def transaction(self):
+        """
+        Ouvre une unité de travail : les méthodes de la façade appelées dans le bloc
+        ne valident pas la session, qui est validée une seule fois à sa sortie.
+        
+        Exemple ::
+        
+            with facade.transaction():
+                place = facade.create_place(place_data)
+                facade.create_review({'place_id': place.id, ...})
+        
+        :return: Un gestionnaire de contexte
+        """
+        return transaction()
+
+    def _invalidate(self, kind, ids):
+        """
+        Retire des entités du cache, immédiatement puis de nouveau après la validation
+        de la transaction : une lecture concurrente a pu remettre en cache l'état
+        précédent entre-temps. L'invalidation est aussi publiée, dans la transaction,
+        pour les caches des autres processus. Les réponses HTTP en cache contenant
+        ces entités ou leur collection sont purgées de la même façon.
+        
+        :param kind: Le type d'entité ('place', 'amenity' ou 'user')
+        :param ids: Les identifiants des entités modifiées ; vide pour une création,
+                    qui ne change que la collection
+        """
+        keys = [(kind, obj_id) for obj_id in ids]
+        if response_cache.enabled:
+            tags = [(kind, ALL)] + keys
+            response_cache.purge(*tags)
+            on_commit(partial(response_cache.purge, *tags))
+        if not entity_cache.enabled or not keys:
+            return
+        entity_cache.invalidate(*keys)
+        on_commit(partial(entity_cache.invalidate, *keys))
+        invalidation_bus.publish(keys)
+
+    def _cached(self, key, load):
+        """
+        Lecture traversante du cache, après application des invalidations
+        publiées par les autres processus.
+        
+        :param key: La clé (type, identifiant)
+        :param load: Une fonction sans argument qui charge l'instantané, ou None
+        :return: L'instantané ou None
+        """
+        invalidation_bus.poll(entity_cache)
+        return entity_cache.get_or_load(key, load)
+
+    def warm_cache(self):
+        """
+        Précharge le cache avec tous les équipements puis les lieux les plus récents,
+        dans la limite de sa taille.
+        
+        :return: Le nombre d'entités mises en cache
+        """
+        if not entity_cache.enabled:
+            return 0
+        invalidation_bus.poll(entity_cache)
+        snapshots = [(('amenity', amenity.id), AMENITY(amenity))
+                     for amenity in self.amenity_repo.get_all()[:entity_cache.max_size]]
+        remaining = entity_cache.max_size - len(snapshots)
+        if remaining > 0:
+            snapshots += [(('place', place.id), PLACE_DETAIL(place))
+                          for place in self.place_repo.get_many_with_details(remaining)]
+        for key, snapshot in snapshots:
+            entity_cache.set(key, snapshot)
+        return len(snapshots)
+
+    def get_collection_version(self, kind):
+        """
+        Renvoie la version d'une collection, en une seule requête MAX(updated_at), COUNT(*).
+        Sert de validateur aux GET conditionnels des listes.
+        
+        :param kind: Le type d'entité ('user', 'amenity', 'place' ou 'review')
+        :return: Un tuple (dernière modification ou None, nombre d'objets)
+        """
+        repos = {'user': self.user_repo, 'amenity': self.amenity_repo,
+                 'place': self.place_repo, 'review': self.review_repo}
+        return repos[kind].get_collection_version()
+
+    def get_user_version(self, user_id):
+        """
+        Renvoie la version de la représentation d'un utilisateur, sans le charger.
+        
+        :param user_id: L'identifiant de l'utilisateur
+        :return: Un tuple de dates de modification, ou None si l'utilisateur n'existe pas
+        """
+        updated_at = self.user_repo.get_version(user_id)
+        return (updated_at,) if updated_at else None
+
+    def get_amenity_version(self, amenity_id):
+        """
+        Renvoie la version de la représentation d'un équipement, sans le charger.
+        
+        :param amenity_id: L'identifiant de l'équipement
+        :return: Un tuple de dates de modification, ou None si l'équipement n'existe pas
+        """
+        updated_at = self.amenity_repo.get_version(amenity_id)
+        return (updated_at,) if updated_at else None
+
+    def get_place_version(self, place_id):
+        """
+        Renvoie la version de la représentation détaillée d'un lieu (propriétaire,
+        avis et équipements compris), en une seule requête.
+        
+        :param place_id: L'identifiant du lieu
+        :return: Un tuple de dates de modification et de nombres, ou None si le lieu n'existe pas
+        """
+        return self.place_repo.get_detail_version(place_id)
+
+    def get_place_reviews_version(self, place_id):
+        """
+        Renvoie la version de la liste des avis d'un lieu, en une seule requête.
+        
+        :param place_id: L'identifiant du lieu
+        :return: Un tuple de dates de modification et de nombres, ou None si le lieu n'existe pas
+        """
+        return self.place_repo.get_reviews_version(place_id)
+
+    def get_review_version(self, review_id):
+        """
+        Renvoie la version de la représentation détaillée d'un avis (auteur et lieu compris).
+        
+        :param review_id: L'identifiant de l'avis
+        :return: Un tuple de dates de modification, ou None si l'avis n'existe pas
+        """
+        return self.review_repo.get_detail_version(review_id)
+
+    def export_rows(self, kind, since=None, batch_size=1000):
+        """
+        Parcourt toutes les lignes d'une collection pour l'export, par lots et par date
+        de modification croissante, sans charger la collection en mémoire.
+        
+        :param kind: La collection : 'places', 'reviews' ou 'users'
+        :param since: Ne renvoie que les lignes modifiées à cette date ou après (optionnel)
+        :param batch_size: Le nombre de lignes lues par lot
+        :return: Un générateur de lots de lignes (offrant _asdict())
+        :raises ValueError: Si la collection n'est pas exportable
+        """
+        exports = {'places': (self.place_repo, PLACE_EXPORT), 'reviews': (self.review_repo, REVIEW_EXPORT),
+                   'users': (self.user_repo, USER_EXPORT)}
+        if kind not in exports:
+            raise ValueError(f"Collection non trouvée: {kind}. Valeurs acceptées: {', '.join(exports)}")
+        repo, projection = exports[kind]
+        return repo.iter_partitions(projection, since, batch_size)
+
+    @transactional
     def create_user(self, user_data):
         """
         Crée un nouvel utilisateur.
@@ -36,10 +335,7 @@ class HBnBFacade:
         :raises ValueError: Si des champs requis sont manquants
         """
         # Vérifie que tous les champs requis sont présents
-        required_fields = ['first_name', 'last_name', 'email', 'password']
-        for field in required_fields:
-            if field not in user_data:
-                raise ValueError(f"Champ requis manquant: {field}")
+        _require(user_data, USER_FIELDS)
         
         # Crée l'utilisateur sans le mot de passe pour éviter la validation automatique
         password = user_data.pop('password')
@@ -53,6 +349,44 @@ class HBnBFacade:
         
         return user
 
+    @transactional
+    def create_users_bulk(self, users_data, keep_ids=False):
+        """
+        Crée plusieurs utilisateurs en une seule requête executemany.
+        Chaque élément est validé avec les règles du modèle User ; les adresses email
+        déjà enregistrées sont résolues avec une seule requête IN et les mots de passe
+        sont hachés en parallèle dans le pool de PASSWORD_HASH_WORKERS processus.
+        
+        :param users_data: Une liste de dictionnaires de données d'utilisateur
+        :param keep_ids: Reprendre l'id fourni par chaque élément (import)
+        :return: Un tuple (créés, erreurs) ; créés est une liste de {'index', 'id'}
+                 et erreurs une liste de {'index', 'error'}, triées par index
+        """
+        errors = []
+        valid = _collect_valid(users_data, _user_values, errors)
+        ids = {}
+        if keep_ids:
+            valid, ids = _keep_ids(users_data, valid, self.user_repo, errors)
+        taken = self.user_repo.get_existing_emails(values['email'] for _, values in valid)
+        accepted = []
+        for index, values in valid:
+            if values['email'] in taken:
+                errors.append({'index': index, 'error': 'Email already registered'})
+            else:
+                taken.add(values['email'])
+                accepted.append((index, values))
+
+        hashes = passwords.hash_many(values['password'] for _, values in accepted)
+        now = datetime.utcnow()
+        rows = []
+        for (index, values), hashed in zip(accepted, hashes):
+            values['password'] = hashed
+            rows.append(_new_row(values, now, ids.get(index)))
+        self.user_repo.bulk_add(rows)
+        self._invalidate('user', [])
+        return ([{'index': index, 'id': row['id']} for (index, _), row in zip(accepted, rows)],
+                sorted(errors, key=lambda error: error['index']))
+
     def get_user(self, user_id):
         """
         Récupère un utilisateur par son identifiant.
@@ -62,6 +396,19 @@ class HBnBFacade:
         """
         return self.user_repo.get(user_id)
 
+    def get_user_snapshot(self, user_id):
+        """
+        Récupère l'instantané d'un utilisateur, depuis le cache si possible.
+        L'instantané est partagé : il ne doit pas être modifié.
+        
+        :param user_id: L'identifiant de l'utilisateur
+        :return: Un dictionnaire au format de GET /users/<id> ou None s'il n'existe pas
+        """
+        def load():
+            user = self.user_repo.get(user_id)
+            return USER(user) if user else None
+        return self._cached(('user', user_id), load)
+
     def get_user_by_email(self, email):
         """
         Récupère un utilisateur par son adresse email.
@@ -79,6 +426,16 @@ class HBnBFacade:
         """
         return self.user_repo.get_all()
 
+    def list_users(self):
+        """
+        Récupère tous les utilisateurs au format de la liste de l'API, en ne lisant que
+        les colonnes nécessaires (projection USER_LIST) et sans créer d'objets ORM.
+        
+        :return: Une liste de namedtuple en lecture seule
+        """
+        return self.user_repo.get_all(projection=USER_LIST)
+
+    @transactional
     def update_user(self, user_id, user_data):
         """
         Met à jour un utilisateur existant.
@@ -100,8 +457,13 @@ class HBnBFacade:
                 
             # Sauvegarde les modifications
             self.user_repo.update(user_id, user_data)
+            self._invalidate('user', [user_id])
+            if entity_cache.enabled:
+                # Le propriétaire figure dans l'instantané de ses lieux
+                self._invalidate('place', self.place_repo.get_ids_by_owner(user_id))
         return user
 
+    @transactional
     def create_amenity(self, amenity_data):
         """
         Crée un nouvel équipement.
@@ -114,8 +476,27 @@ class HBnBFacade:
             raise ValueError("Le nom de l'équipement est requis")
         amenity = Amenity(**amenity_data)
         self.amenity_repo.add(amenity)
+        self._invalidate('amenity', [])
         return amenity
 
+    @transactional
+    def create_amenities_bulk(self, amenities_data):
+        """
+        Crée plusieurs équipements en une seule requête executemany.
+        Les éléments invalides ne sont pas créés et sont signalés individuellement.
+        
+        :param amenities_data: Une liste de dictionnaires de données d'équipement
+        :return: Un tuple (créés, erreurs) ; créés est une liste de {'index', 'id'}
+                 et erreurs une liste de {'index', 'error'}, triées par index
+        """
+        errors = []
+        now = datetime.utcnow()
+        rows = [(index, _new_row(values, now))
+                for index, values in _collect_valid(amenities_data, _amenity_values, errors)]
+        self.amenity_repo.bulk_add([row for _, row in rows])
+        self._invalidate('amenity', [])
+        return [{'index': index, 'id': row['id']} for index, row in rows], errors
+
     def get_amenity(self, amenity_id):
         """
         Récupère un équipement par son identifiant.
@@ -129,6 +510,23 @@ class HBnBFacade:
             raise ValueError(f"Équipement avec l'id {amenity_id} non trouvé")
         return amenity
 
+    def get_amenity_snapshot(self, amenity_id):
+        """
+        Récupère l'instantané d'un équipement, depuis le cache si possible.
+        L'instantané est partagé : il ne doit pas être modifié.
+        
+        :param amenity_id: L'identifiant de l'équipement
+        :return: Un dictionnaire au format de GET /amenities/<id>
+        :raises ValueError: Si l'équipement n'existe pas
+        """
+        def load():
+            amenity = self.amenity_repo.get(amenity_id)
+            return AMENITY(amenity) if amenity else None
+        snapshot = self._cached(('amenity', amenity_id), load)
+        if snapshot is None:
+            raise ValueError(f"Équipement avec l'id {amenity_id} non trouvé")
+        return snapshot
+
     def get_all_amenities(self):
         """
         Récupère tous les équipements.
@@ -137,6 +535,16 @@ class HBnBFacade:
         """
         return self.amenity_repo.get_all()
 
+    def list_amenities(self):
+        """
+        Récupère tous les équipements au format de la liste de l'API, en ne lisant que
+        les colonnes nécessaires (projection AMENITY_LIST) et sans créer d'objets ORM.
+        
+        :return: Une liste de namedtuple en lecture seule
+        """
+        return self.amenity_repo.get_all(projection=AMENITY_LIST)
+
+    @transactional
     def update_amenity(self, amenity_id, amenity_data):
         """
         Met à jour un équipement existant.
@@ -153,6 +561,9 @@ class HBnBFacade:
             for key, value in amenity_data.items():
                 setattr(amenity, key, value)
             self.amenity_repo.update(amenity_id, amenity_data)
+            self._invalidate('amenity', [amenity_id])
+            if entity_cache.enabled:
+                self._invalidate('place', self.place_repo.get_ids_by_amenity(amenity_id))
         return amenity
 
     def get_place(self, place_id):
@@ -168,6 +579,37 @@ class HBnBFacade:
             raise ValueError(f"Lieu avec l'id {place_id} non trouvé")
         return place
 
+    def get_place_details(self, place_id):
+        """
+        Récupère un lieu avec son propriétaire, ses équipements et ses avis.
+        
+        :param place_id: L'identifiant du lieu à récupérer
+        :return: L'objet lieu avec ses relations chargées
+        :raises ValueError: Si le lieu n'existe pas
+        """
+        place = self.place_repo.get_with_details(place_id)
+        if not place:
+            raise ValueError(f"Lieu avec l'id {place_id} non trouvé")
+        return place
+
+    def get_place_snapshot(self, place_id):
+        """
+        Récupère l'instantané d'un lieu avec son propriétaire, ses équipements et ses avis,
+        depuis le cache si possible. L'instantané est partagé : il ne doit pas être modifié.
+        
+        :param place_id: L'identifiant du lieu
+        :return: Un dictionnaire au format de GET /places/<id>
+        :raises ValueError: Si le lieu n'existe pas
+        """
+        def load():
+            place = self.place_repo.get_with_details(place_id)
+            return PLACE_DETAIL(place) if place else None
+        snapshot = self._cached(('place', place_id), load)
+        if snapshot is None:
+            raise ValueError(f"Lieu avec l'id {place_id} non trouvé")
+        return snapshot
+
+    @transactional
     def create_place(self, place_data):
         """
         Crée un nouveau lieu.
@@ -176,19 +618,11 @@ class HBnBFacade:
         :return: L'objet lieu créé
         :raises ValueError: Si des champs requis sont manquants ou invalides
         """
-        # Valide les champs requis
-        required_fields = ['title', 'price', 'latitude', 'longitude', 'owner_id']
-        for field in required_fields:
-            if field not in place_data:
-                raise ValueError(f"Champ requis manquant: {field}")
-
-        # Valide le prix, la latitude et la longitude
-        if float(place_data['price']) < 0:
-            raise ValueError("Le prix doit être positif ou nul")
-        if not -90 <= float(place_data['latitude']) <= 90:
-            raise ValueError("La latitude doit être comprise entre -90 et 90")
-        if not -180 <= float(place_data['longitude']) <= 180:
-            raise ValueError("La longitude doit être comprise entre -180 et 180")
+        # Valide les champs requis, le prix, la latitude et la longitude
+        _require(place_data, PLACE_FIELDS)
+        price = place_rules.validate_price(_number(place_data, 'price'))
+        latitude = place_rules.validate_latitude(_number(place_data, 'latitude'))
+        longitude = place_rules.validate_longitude(_number(place_data, 'longitude'))
 
         # Vérifie si le propriétaire existe
         owner = self.user_repo.get(place_data['owner_id'])
@@ -198,9 +632,9 @@ class HBnBFacade:
         place = Place(
             title=place_data['title'],
             description=place_data.get('description'),
-            price=float(place_data['price']),
-            latitude=float(place_data['latitude']),
-            longitude=float(place_data['longitude']),
+            price=price,
+            latitude=latitude,
+            longitude=longitude,
             owner_id=place_data['owner_id']
         )
         
@@ -215,8 +649,53 @@ class HBnBFacade:
                     pass
         
         self.place_repo.add(place)
+        self._invalidate('place', [])
         return place
 
+    @transactional
+    def create_places_bulk(self, places_data, keep_ids=False):
+        """
+        Crée plusieurs lieux en une seule transaction.
+        Chaque élément est validé avec les règles de create_place ; les propriétaires
+        et les équipements référencés sont résolus avec une seule requête IN chacun,
+        puis les lieux valides et leurs équipements sont insérés en executemany.
+        Contrairement à create_place, un équipement inconnu rend l'élément invalide.
+        
+        :param places_data: Une liste de dictionnaires de données de lieu
+        :param keep_ids: Reprendre l'id fourni par chaque élément (import)
+        :return: Un tuple (créés, erreurs) ; créés est une liste de {'index', 'id'}
+                 et erreurs une liste de {'index', 'error'}, triées par index
+        """
+        errors = []
+        valid = _collect_valid(places_data, _place_values, errors)
+        ids = {}
+        if keep_ids:
+            valid, ids = _keep_ids(places_data, valid, self.place_repo, errors)
+        owners = self.user_repo.get_existing_ids(values['_owner_id'] for _, (values, _) in valid)
+        amenities = self.amenity_repo.get_existing_ids(
+            amenity_id for _, (_, amenity_ids) in valid for amenity_id in amenity_ids
+        )
+
+        now = datetime.utcnow()
+        rows, links, created = [], [], []
+        for index, (values, amenity_ids) in valid:
+            missing = [amenity_id for amenity_id in amenity_ids if amenity_id not in amenities]
+            if values['_owner_id'] not in owners:
+                errors.append({'index': index,
+                               'error': f"Propriétaire avec l'id {values['_owner_id']} non trouvé"})
+            elif missing:
+                errors.append({'index': index, 'error': f"Équipement avec l'id {missing[0]} non trouvé"})
+            else:
+                row = _new_row(values, now, ids.get(index))
+                rows.append(row)
+                links.extend((row['id'], amenity_id) for amenity_id in amenity_ids)
+                created.append({'index': index, 'id': row['id']})
+
+        self.place_repo.bulk_add(rows)
+        self.place_repo.add_amenity_links(links)
+        self._invalidate('place', [])
+        return created, sorted(errors, key=lambda error: error['index'])
+
     def get_all_places(self):
         """
         Récupère tous les lieux.
@@ -225,6 +704,61 @@ class HBnBFacade:
         """
         return self.place_repo.get_all()
 
+    def get_places_page(self, limit, cursor=None, filters=None, sort='created_at'):
+        """
+        Récupère une page de lieux filtrés et triés.
+        
+        :param limit: Le nombre maximum de lieux à retourner
+        :param cursor: Le curseur renvoyé par la page précédente (optionnel)
+        :param filters: Dictionnaire de filtres (min_price, max_price, amenity_ids, owner_id)
+        :param sort: Le tri : created_at, price, -price ou rating
+        :return: Un tuple (lignes PLACE_LIST des lieux, curseur suivant ou None)
+        :raises ValueError: Si les filtres, le tri ou le curseur sont invalides
+        """
+        filters = filters or {}
+        min_price, max_price = filters.get('min_price'), filters.get('max_price')
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise ValueError("Le prix minimum doit être inférieur ou égal au prix maximum")
+        return self.place_repo.get_places_page(limit, cursor, sort=sort, projection=PLACE_LIST, **filters)
+
+    def get_places_nearby(self, lat, lng, radius_km, limit):
+        """
+        Récupère les lieux situés dans un rayon donné autour d'un point.
+        
+        :param lat: La latitude du point central
+        :param lng: La longitude du point central
+        :param radius_km: Le rayon de recherche en kilomètres
+        :param limit: Le nombre maximum de lieux à retourner
+        :return: Une liste de tuples (ligne PLACE_LOCATION du lieu, distance en km),
+                 du plus proche au plus éloigné
+        :raises ValueError: Si les coordonnées ou le rayon sont invalides
+        """
+        if not -90 <= lat <= 90:
+            raise ValueError("La latitude doit être comprise entre -90 et 90")
+        if not -180 <= lng <= 180:
+            raise ValueError("La longitude doit être comprise entre -180 et 180")
+        if not radius_km > 0:
+            raise ValueError("Le rayon doit être strictement positif")
+        return self.place_repo.get_places_nearby(lat, lng, radius_km, limit, projection=PLACE_LOCATION)
+
+    @transactional
+    def recompute_rating_aggregates(self):
+        """
+        Recalcule le nombre d'avis, la somme et la moyenne des notes de tous les lieux.
+        
+        :return: Le nombre de lieux mis à jour
+        """
+        count = self.place_repo.recompute_rating_aggregates()
+        if response_cache.enabled:
+            response_cache.clear()
+            on_commit(response_cache.clear)
+        if entity_cache.enabled:
+            entity_cache.invalidate_kind('place')
+            on_commit(partial(entity_cache.invalidate_kind, 'place'))
+            invalidation_bus.publish([('place', ALL)])
+        return count
+
+    @transactional
     def update_place(self, place_id, place_data):
         """
         Met à jour un lieu existant.
@@ -242,6 +776,10 @@ class HBnBFacade:
         if not isinstance(place_data, dict):
             raise ValueError(f"Entrée invalide: dictionnaire attendu, reçu {type(place_data)}")
 
+        # Les agrégats d'avis ne sont modifiables qu'à travers les avis
+        for key in ('review_count', 'rating_sum', 'avg_rating'):
+            place_data.pop(key, None)
+
         # Traite les équipements séparément s'ils sont présents
         if 'amenities' in place_data:
             # Récupère les IDs des équipements
@@ -249,6 +787,9 @@ class HBnBFacade:
             
             # Supprime tous les équipements existants
             place.amenities = []
+            # Les liens ne modifient pas la ligne du lieu : on la date explicitement
+            # pour que la version de sa représentation change
+            place.updated_at = datetime.utcnow()
             
             # Ajoute les nouveaux équipements
             for amenity_id in amenity_ids:
@@ -272,8 +813,10 @@ class HBnBFacade:
 
         # Met à jour le lieu dans le repository
         self.place_repo.update(place_id, place_data)
+        self._invalidate('place', [place_id])
         return place
         
+    @transactional
     def create_review(self, review_data):
         """
         Crée un nouvel avis.
@@ -282,19 +825,9 @@ class HBnBFacade:
         :return: L'objet avis créé
         :raises ValueError: Si des champs requis sont manquants ou invalides
         """
-        # Valide les champs requis
-        required_fields = ['text', 'rating', 'user_id', 'place_id']
-        for field in required_fields:
-            if field not in review_data:
-                raise ValueError(f"Champ requis manquant: {field}")
-        
-        # Valide la note
-        try:
-            rating = int(review_data['rating'])
-            if not 1 <= rating <= 5:
-                raise ValueError("La note doit être comprise entre 1 et 5")
-        except (ValueError, TypeError):
-            raise ValueError("La note doit être un entier compris entre 1 et 5")
+        # Valide les champs requis et la note
+        _require(review_data, REVIEW_FIELDS)
+        rating = _rating(review_data['rating'])
         
         # Vérifie si l'utilisateur existe
         user = self.user_repo.get(review_data['user_id'])
@@ -306,6 +839,10 @@ class HBnBFacade:
         if not place:
             raise ValueError(f"Lieu avec l'id {review_data['place_id']} non trouvé")
         
+        # Un seul avis par utilisateur et par lieu (requête EXISTS sur l'index unique)
+        if self.review_repo.has_reviewed(place.id, user.id):
+            raise ValueError("You have already reviewed this place")
+        
         # Crée l'avis
         review = Review(
             text=review_data['text'],
@@ -314,11 +851,73 @@ class HBnBFacade:
             user=user
         )
         
-        # Ajoute l'avis au repository
-        self.review_repo.add(review)
+        # Met à jour les agrégats du lieu ; validés avec l'avis par le repository
+        self.place_repo.adjust_rating(place.id, 1, rating)
         
+        # Ajoute l'avis au repository ; l'index unique arbitre deux créations simultanées
+        try:
+            self.review_repo.add(review)
+        except IntegrityError:
+            raise ValueError("You have already reviewed this place")
+        
+        # Les avis et les agrégats figurent dans l'instantané du lieu
+        self._invalidate('place', [place.id])
         return review
     
+    @transactional
+    def create_reviews_bulk(self, reviews_data, keep_ids=False):
+        """
+        Crée plusieurs avis en une seule transaction.
+        Les lieux, les utilisateurs et les avis existants sont résolus avec une seule
+        requête IN chacun ; les avis valides sont insérés en executemany et les agrégats
+        des lieux mis à jour avec une requête executemany.
+        Un utilisateur ne peut pas évaluer son propre lieu ni évaluer deux fois un lieu,
+        y compris à l'intérieur du lot.
+        
+        :param reviews_data: Une liste de dictionnaires de données d'avis
+        :param keep_ids: Reprendre l'id fourni par chaque élément (import)
+        :return: Un tuple (créés, erreurs) ; créés est une liste de {'index', 'id'}
+                 et erreurs une liste de {'index', 'error'}, triées par index
+        """
+        errors = []
+        valid = _collect_valid(reviews_data, _review_values, errors)
+        ids = {}
+        if keep_ids:
+            valid, ids = _keep_ids(reviews_data, valid, self.review_repo, errors)
+        place_ids = {values['place_id'] for _, values in valid}
+        user_ids = {values['user_id'] for _, values in valid}
+        owners = self.place_repo.get_owner_ids(place_ids)
+        users = self.user_repo.get_existing_ids(user_ids)
+        reviewed = self.review_repo.get_reviewed_pairs(place_ids, user_ids)
+
+        now = datetime.utcnow()
+        rows, created = [], []
+        deltas = defaultdict(lambda: (0, 0))
+        for index, values in valid:
+            place_id, user_id = values['place_id'], values['user_id']
+            if place_id not in owners:
+                error = f"Lieu avec l'id {place_id} non trouvé"
+            elif user_id not in users:
+                error = f"Utilisateur avec l'id {user_id} non trouvé"
+            elif owners[place_id] == user_id:
+                error = "You cannot review your own place"
+            elif (place_id, user_id) in reviewed:
+                error = "You have already reviewed this place"
+            else:
+                reviewed.add((place_id, user_id))
+                row = _new_row(values, now, ids.get(index))
+                rows.append(row)
+                count, total = deltas[place_id]
+                deltas[place_id] = (count + 1, total + values['_rating'])
+                created.append({'index': index, 'id': row['id']})
+                continue
+            errors.append({'index': index, 'error': error})
+
+        self.review_repo.bulk_add(rows)
+        self.place_repo.adjust_ratings(deltas)
+        self._invalidate('place', deltas)
+        return created, sorted(errors, key=lambda error: error['index'])
+
     def get_review(self, review_id):
         """
         Récupère un avis par son identifiant.
@@ -339,6 +938,15 @@ class HBnBFacade:
         :return: Une liste contenant tous les objets avis
         """
         return self.review_repo.get_all()
+
+    def list_reviews(self):
+        """
+        Récupère tous les avis au format de la liste de l'API, en ne lisant que
+        les colonnes nécessaires (projection REVIEW_LIST) et sans créer d'objets ORM.
+        
+        :return: Une liste de namedtuple en lecture seule
+        """
+        return self.review_repo.get_all(projection=REVIEW_LIST)
     
     def get_reviews_by_place(self, place_id):
         """
@@ -356,6 +964,7 @@ class HBnBFacade:
         # Retourne tous les avis pour le lieu
         return self.review_repo.get_reviews_by_place(place_id)
     
+    @transactional
     def update_review(self, review_id, review_data):
         """
         Met à jour un avis existant.
@@ -375,19 +984,18 @@ class HBnBFacade:
             review.text = review_data['text']
         
         if 'rating' in review_data:
-            try:
-                rating = int(review_data['rating'])
-                if not 1 <= rating <= 5:
-                    raise ValueError("La note doit être comprise entre 1 et 5")
+            rating = _rating(review_data['rating'])
+            if rating != review.rating:
+                self.place_repo.adjust_rating(review.place_id, 0, rating - review.rating)
                 review.rating = rating
-            except (ValueError, TypeError):
-                raise ValueError("La note doit être un entier compris entre 1 et 5")
         
         # Met à jour l'avis dans le repository
         self.review_repo.update(review_id, review_data)
+        self._invalidate('place', [review.place_id])
         
         return review
     
+    @transactional
     def delete_review(self, review_id):
         """
         Supprime un avis.
@@ -401,14 +1009,21 @@ class HBnBFacade:
         if not review:
             raise ValueError(f"Avis avec l'id {review_id} non trouvé")
         
+        # Retire la note des agrégats du lieu, validés avec la suppression
+        self.place_repo.adjust_rating(review.place_id, -1, -review.rating)
+        
         # Supprime l'avis du repository
+        place_id = review.place_id
         self.review_repo.delete(review_id)
+        self._invalidate('place', [place_id])
         
         return True
     
+    @transactional
     def delete_place(self, place_id):
         """
-        Supprime un lieu.
+        Supprime un lieu, ses avis et ses liens avec les équipements.
+        Les suppressions sont ensemblistes et validées en une seule transaction.
         
         :param place_id: L'identifiant du lieu à supprimer
         :return: True si la suppression a réussi, False sinon
@@ -419,19 +1034,19 @@ class HBnBFacade:
         if not place:
             raise ValueError(f"Lieu avec l'id {place_id} non trouvé")
         
-        # Supprime d'abord tous les avis associés à ce lieu
-        reviews = self.review_repo.get_reviews_by_place(place_id)
-        for review in reviews:
-            self.review_repo.delete(review.id)
-        
-        # Supprime le lieu du repository
-        self.place_repo.delete(place_id)
+        # Supprime d'abord tous les avis associés à ce lieu, puis le lieu et ses équipements
+        self.review_repo.delete_reviews_by_place(place_id)
+        self.place_repo.delete_place_rows(place_id)
+        self._invalidate('place', [place_id])
         
         return True
     
+    @transactional
     def delete_user(self, user_id):
         """
-        Supprime un utilisateur.
+        Supprime un utilisateur, ses avis, ses lieux et les avis de ses lieux.
+        Chaque cascade est une requête ensembliste, quel que soit le nombre de lignes,
+        et le tout est validé en une seule transaction.
         
         :param user_id: L'identifiant de l'utilisateur à supprimer
         :return: True si la suppression a réussi, False sinon
@@ -442,24 +1057,28 @@ class HBnBFacade:
         if not user:
             raise ValueError(f"Utilisateur avec l'id {user_id} non trouvé")
         
-        # Supprime d'abord tous les avis écrits par cet utilisateur
-        reviews = self.review_repo.get_reviews_by_user(user_id)
-        for review in reviews:
-            self.review_repo.delete(review.id)
+        # Lieux dont l'instantané change : ceux de l'utilisateur et ceux qu'il a évalués
+        if entity_cache.enabled or response_cache.enabled:
+            self._invalidate('place', set(self.place_repo.get_ids_by_owner(user_id))
+                             | set(self.review_repo.get_place_ids_by_user(user_id)))
+        self._invalidate('user', [user_id])
+        
+        # Retire les notes de l'utilisateur des agrégats des lieux qu'il a évalués
+        self.place_repo.remove_ratings_of_user(user_id)
         
-        # Supprime tous les lieux appartenant à cet utilisateur
-        places = self.place_repo.get_places_by_owner(user_id)
-        for place in places:
-            self.delete_place(place.id)
+        # Supprime les avis écrits par cet utilisateur et ceux laissés sur ses lieux
+        self.review_repo.delete_reviews_for_user(user_id)
         
-        # Supprime l'utilisateur du repository
-        self.user_repo.delete(user_id)
+        # Supprime tous les lieux appartenant à cet utilisateur, puis l'utilisateur
+        self.place_repo.delete_places_by_owner(user_id)
+        self.user_repo.delete_by_id(user_id)
         
         return True
     
+    @transactional
     def delete_amenity(self, amenity_id):
         """
-        Supprime un équipement.
+        Supprime un équipement et ses liens avec les lieux.
         
         :param amenity_id: L'identifiant de l'équipement à supprimer
         :return: True si la suppression a réussi, False sinon
@@ -470,8 +1089,11 @@ class HBnBFacade:
         if not amenity:
             raise ValueError(f"Équipement avec l'id {amenity_id} non trouvé")
         
-        # Supprime l'équipement du repository
-        self.amenity_repo.delete(amenity_id)
+        # Supprime les liens avec les lieux puis l'équipement, en une transaction
+        if entity_cache.enabled:
+            self._invalidate('place', self.place_repo.get_ids_by_amenity(amenity_id))
+        self._invalidate('amenity', [amenity_id])
+        self.amenity_repo.delete_with_links(amenity_id)
         
         return True
 
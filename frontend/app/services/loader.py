@@ -0,0 +1,125 @@
+"""
+Ce fichier contient le chargeur par lots (à la manière de DataLoader) utilisé
+par les sérialiseurs de l'API.
+Plutôt que de suivre une relation objet par objet (une requête SELECT par
+review.user), un sérialiseur annonce les identifiants dont il aura besoin,
+puis le chargeur les résout en une seule requête WHERE id IN (...) par type
+d'entité. Les objets chargés sont conservés jusqu'à la fin de la requête HTTP.
+"""
+
+from collections import defaultdict
+from flask import g
+from sqlalchemy import select
+from app.extensions import db
+
+# Nombre maximum d'identifiants par requête IN, sous la limite de variables de SQLite
+BATCH_SIZE = 500
+
+
+class BatchLoader:
+    """
+    Chargeur par lots d'entités par identifiant, avec cache.
+    Une instance ne doit pas survivre à la requête HTTP qui l'a créée :
+    utiliser request_loader() pour obtenir celle de la requête courante.
+    """
+
+    def __init__(self):
+        """
+        Initialise un chargeur vide.
+        """
+        self._cache = defaultdict(dict)
+        self._pending = defaultdict(set)
+        # Nombre de requêtes SQL émises, utile pour les tests et le diagnostic
+        self.queries = 0
+
+    def prime(self, model, ids):
+        """
+        Annonce des identifiants à charger au prochain accès à ce type d'entité.
+
+        :param model: La classe du modèle (User, Place...)
+        :param ids: Les identifiants à charger ; None et les doublons sont ignorés
+        """
+        cache = self._cache[model]
+        self._pending[model].update(obj_id for obj_id in ids
+                                    if obj_id is not None and obj_id not in cache)
+
+    def load(self, model, obj_id):
+        """
+        Récupère une entité par son identifiant, en chargeant au passage tous
+        les identifiants annoncés pour ce type d'entité.
+
+        :param model: La classe du modèle
+        :param obj_id: L'identifiant de l'entité
+        :return: L'entité ou None si elle n'existe pas
+        """
+        if obj_id is None:
+            return None
+        self.prime(model, (obj_id,))
+        self._dispatch(model)
+        return self._cache[model].get(obj_id)
+
+    def load_many(self, model, ids):
+        """
+        Récupère plusieurs entités par leurs identifiants.
+
+        :param model: La classe du modèle
+        :param ids: Les identifiants des entités
+        :return: Un dictionnaire {identifiant: entité} limité aux entités existantes
+        """
+        ids = list(ids)
+        self.prime(model, ids)
+        self._dispatch(model)
+        cache = self._cache[model]
+        return {obj_id: cache[obj_id] for obj_id in ids if cache.get(obj_id) is not None}
+
+    def clear(self, model=None):
+        """
+        Oublie les entités chargées, par exemple après une modification.
+
+        :param model: La classe du modèle à oublier, ou None pour tout oublier
+        """
+        if model is None:
+            self._cache.clear()
+            self._pending.clear()
+        else:
+            self._cache.pop(model, None)
+            self._pending.pop(model, None)
+
+    def _dispatch(self, model):
+        """
+        Charge les identifiants en attente pour un type d'entité.
+        Les identifiants inexistants sont mémorisés pour ne pas être redemandés.
+        """
+        pending = self._pending.pop(model, None)
+        if not pending:
+            return
+        cache = self._cache[model]
+        ids = sorted(pending)
+        for start in range(0, len(ids), BATCH_SIZE):
+            chunk = ids[start:start + BATCH_SIZE]
+            self.queries += 1
+            for obj in db.session.scalars(select(model).where(model.id.in_(chunk))):
+                cache[obj.id] = obj
+        for obj_id in ids:
+            cache.setdefault(obj_id, None)
+
+
+def request_loader():
+    """
+    Renvoie le chargeur par lots de la requête (ou du contexte d'application) courante.
+    Il est créé au premier appel et oublié à la fin de la requête.
+
+    :return: L'instance de BatchLoader propre à la requête
+    """
+    if 'batch_loader' not in g:
+        g.batch_loader = BatchLoader()
+    return g.batch_loader
+
+
+def reset_request_loader(exception=None):
+    """
+    Oublie le chargeur de la requête qui se termine.
+    Enregistré par create_app avec teardown_request : le contexte d'application,
+    et donc g, peut être partagé par plusieurs requêtes (tests, contexte imbriqué).
+    """
+    g.pop('batch_loader', None)
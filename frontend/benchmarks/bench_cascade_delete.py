@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark of HBnBFacade.delete_user against the number of reviews to delete.
+
+For each size a temporary SQLite database holds a host owning one place per
+40 reviews, each place equipped with a few amenities and reviewed by 40 guests.
+The host is then deleted twice on identical copies of the database: once with
+the set-based cascade of the facade and once with the former per-row loop
+(one get, one delete and one commit per review, then per place), which is
+emulated here. The per-row path grows with the number of rows and commits;
+the set-based path runs a fixed number of statements in a single transaction.
+
+Usage: python benchmarks/bench_cascade_delete.py [--sizes 1000,5000,20000] [--legacy-max 5000]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import event
+
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.services.facade import facade
+
+GUESTS = 40
+AMENITIES = 5
+
+
+def make_config(path):
+    class BenchmarkConfig:
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        JWT_SECRET_KEY = 'benchmark'
+    return BenchmarkConfig
+
+
+def populate(reviews):
+    """Remplit la base et renvoie l'identifiant de l'hôte."""
+    now = datetime.utcnow()
+    host_id = str(uuid.uuid4())
+    guest_ids = [str(uuid.uuid4()) for _ in range(GUESTS)]
+    amenity_ids = [str(uuid.uuid4()) for _ in range(AMENITIES)]
+    place_ids = [str(uuid.uuid4()) for _ in range(max(1, reviews // GUESTS))]
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO users (id, first_name, last_name, email, password, role, is_admin, created_at, updated_at) "
+            "VALUES (?, 'Bench', ?, ?, 'x', 'user', 0, ?, ?)",
+            [(user_id, str(i), f'user{i}@example.com', now, now)
+             for i, user_id in enumerate([host_id] + guest_ids)])
+        connection.exec_driver_sql(
+            "INSERT INTO amenities (id, name, created_at, updated_at) VALUES (?, ?, ?, ?)",
+            [(amenity_id, f'Amenity {i}', now, now) for i, amenity_id in enumerate(amenity_ids)])
+        connection.exec_driver_sql(
+            "INSERT INTO places (id, title, price, latitude, longitude, owner_id, user_id, "
+            "review_count, rating_sum, avg_rating, created_at, updated_at) "
+            "VALUES (?, ?, 50.0, 45.0, 5.0, ?, ?, ?, ?, 4.0, ?, ?)",
+            [(place_id, f'Place {i}', host_id, host_id, GUESTS, 4 * GUESTS, now, now)
+             for i, place_id in enumerate(place_ids)])
+        connection.exec_driver_sql(
+            "INSERT INTO place_amenity (place_id, amenity_id) VALUES (?, ?)",
+            [(place_id, amenity_id) for place_id in place_ids for amenity_id in amenity_ids])
+        connection.exec_driver_sql(
+            "INSERT INTO reviews (id, text, rating, user_id, place_id, created_at, updated_at) "
+            "VALUES (?, 'Nice', 4, ?, ?, ?, ?)",
+            [(str(uuid.uuid4()), guest_id, place_id, now, now)
+             for place_id in place_ids for guest_id in guest_ids])
+    return host_id, len(place_ids) * GUESTS
+
+
+def legacy_delete_user(user_id):
+    """Reproduit l'ancienne suppression ligne par ligne de HBnBFacade.delete_user."""
+    for review in facade.review_repo.get_reviews_by_user(user_id):
+        facade.place_repo.adjust_rating(review.place_id, -1, -review.rating)
+        facade.review_repo.delete(review.id)
+    for place in Place.query.filter(Place._owner_id == user_id).all():
+        for review in facade.review_repo.get_reviews_by_place(place.id):
+            facade.review_repo.delete(review.id)
+        facade.place_repo.delete(place.id)
+    facade.user_repo.delete(user_id)
+
+
+def time_delete(path, delete_user, user_id):
+    app = create_app(make_config(path))
+    with app.app_context():
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute',
+                     lambda *args: statements.append(args[2]))
+        start = time.perf_counter()
+        delete_user(user_id)
+        elapsed = time.perf_counter() - start
+        remaining = db.session.execute(db.text("SELECT count(*) FROM reviews")).scalar()
+        assert remaining == 0, f'{remaining} reviews left'
+        db.session.remove()
+        db.engine.dispose()
+    return elapsed * 1000, len(statements)
+
+
+def run(reviews, legacy_max):
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'source.db')
+        app = create_app(make_config(source))
+        with app.app_context():
+            db.create_all()
+            host_id, reviews = populate(reviews)
+            db.session.remove()
+            db.engine.dispose()
+
+        row = {'reviews': reviews, 'places': reviews // GUESTS}
+        bulk_path = os.path.join(tmp, 'bulk.db')
+        shutil.copy(source, bulk_path)
+        row['bulk_ms'], row['bulk_queries'] = time_delete(bulk_path, facade.delete_user, host_id)
+        if reviews <= legacy_max:
+            legacy_path = os.path.join(tmp, 'legacy.db')
+            shutil.copy(source, legacy_path)
+            row['legacy_ms'], row['legacy_queries'] = time_delete(legacy_path, legacy_delete_user, host_id)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='1000,5000,20000',
+                        help='comma-separated review counts (default: 1000,5000,20000)')
+    parser.add_argument('--legacy-max', type=int, default=5000,
+                        help='largest review count timed with the per-row loop (default: 5000)')
+    args = parser.parse_args()
+
+    print(f"{'reviews':>8} {'places':>7} {'bulk ms':>9} {'queries':>8} {'per-row ms':>11} {'queries':>8}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        row = run(size, args.legacy_max)
+        legacy = (f"{row['legacy_ms']:>11.1f} {row['legacy_queries']:>8}" if 'legacy_ms' in row
+                  else f"{'-':>11} {'-':>8}")
+        print(f"{row['reviews']:>8} {row['places']:>7} {row['bulk_ms']:>9.1f} {row['bulk_queries']:>8} {legacy}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark of response compression: bytes on the wire and CPU cost per codec.
+
+A temporary SQLite database holds 200 places and a place with 200 reviews.
+The benchmark fetches representative payloads through the API (a page of the
+places list, a place detail, the reviews of a place) and reads the frontend
+assets (scripts.js, styles.css). Each payload is then compressed with gzip at
+several levels and with brotli at several qualities when the brotli module is
+installed. For each codec the table reports the compressed size, the ratio to
+the identity size and the CPU time of one compression, which is what the
+middleware spends per uncached response. Precompressed static assets pay that
+cost once, at the highest level, in scripts/precompress_static.py.
+
+Usage: python benchmarks/bench_compression.py [--gzip-levels 1,6,9] [--brotli-levels 1,4,11] [--repeat 50]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.compression import available_encodings, compress
+from app.extensions import db
+
+FRONTEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PLACES = 200
+REVIEWS = 200
+AMENITIES = 8
+
+
+def make_config(path):
+    class BenchmarkConfig:
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        JWT_SECRET_KEY = 'benchmark'
+        # Payloads are measured before compression
+        COMPRESSION_ENABLED = False
+        PAGINATION_DEFAULT_LIMIT = 50
+        PAGINATION_MAX_LIMIT = 100
+    return BenchmarkConfig
+
+
+def populate():
+    """Remplit la base et renvoie l'identifiant du lieu le plus commenté."""
+    now = datetime.utcnow()
+    user_ids = [str(uuid.uuid4()) for _ in range(REVIEWS)]
+    amenity_ids = [str(uuid.uuid4()) for _ in range(AMENITIES)]
+    place_ids = [str(uuid.uuid4()) for _ in range(PLACES)]
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO users (id, first_name, last_name, email, password, role, is_admin, created_at, updated_at) "
+            "VALUES (?, 'Guest', ?, ?, 'x', 'user', 0, ?, ?)",
+            [(user_id, f'Number {i}', f'user{i}@example.com', now, now) for i, user_id in enumerate(user_ids)])
+        connection.exec_driver_sql(
+            "INSERT INTO amenities (id, name, created_at, updated_at) VALUES (?, ?, ?, ?)",
+            [(amenity_id, f'Amenity {i}', now, now) for i, amenity_id in enumerate(amenity_ids)])
+        connection.exec_driver_sql(
+            "INSERT INTO places (id, title, description, price, latitude, longitude, owner_id, user_id, "
+            "review_count, rating_sum, avg_rating, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, 0, 0.0, ?, ?)",
+            [(place_id, f'Cosy flat {i}', 'A quiet flat close to the old town, with a view on the river.',
+              40.0 + i % 90, 45.0 + (i % 50) / 100, 5.0 + (i % 70) / 100, user_ids[i % REVIEWS],
+              user_ids[i % REVIEWS], now, now)
+             for i, place_id in enumerate(place_ids)])
+        connection.exec_driver_sql(
+            "INSERT INTO place_amenity (place_id, amenity_id) VALUES (?, ?)",
+            [(place_ids[0], amenity_id) for amenity_id in amenity_ids])
+        connection.exec_driver_sql(
+            "INSERT INTO reviews (id, text, rating, user_id, place_id, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(str(uuid.uuid4()), f'Stayed there in spring, review number {i}. Clean and well located.',
+              1 + i % 5, user_id, place_ids[0], now, now)
+             for i, user_id in enumerate(user_ids)])
+        connection.exec_driver_sql(
+            "UPDATE places SET review_count = ?, rating_sum = ?, avg_rating = ? WHERE id = ?",
+            (REVIEWS, 3 * REVIEWS, 3.0, place_ids[0]))
+    return place_ids[0]
+
+
+def collect_payloads():
+    """Renvoie les charges utiles mesurées : (nom, octets)."""
+    payloads = []
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(make_config(os.path.join(tmp, 'bench.db')))
+        with app.app_context():
+            db.create_all()
+            place_id = populate()
+            client = app.test_client()
+            for name, url in (('places list (50)', '/api/v1/places/'),
+                              ('place detail', f'/api/v1/places/{place_id}'),
+                              (f'place reviews ({REVIEWS})', f'/api/v1/places/{place_id}/reviews')):
+                response = client.get(url)
+                assert response.status_code == 200, (url, response.status_code)
+                payloads.append((name, response.data))
+            db.session.remove()
+            db.engine.dispose()
+    for path in ('static/js/scripts.js', 'static/css/styles.css'):
+        with open(os.path.join(FRONTEND_DIR, path), 'rb') as asset:
+            payloads.append((os.path.basename(path), asset.read()))
+    return payloads
+
+
+def time_compress(data, encoding, level, repeat):
+    """Renvoie la taille compressée et le temps CPU moyen d'une compression (µs)."""
+    compressed = compress(data, encoding, level)
+    start = time.process_time()
+    for _ in range(repeat):
+        compress(data, encoding, level)
+    return len(compressed), (time.process_time() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--gzip-levels', default='1,6,9', help='comma-separated gzip levels (default: 1,6,9)')
+    parser.add_argument('--brotli-levels', default='1,4,11',
+                        help='comma-separated brotli qualities, if brotli is installed (default: 1,4,11)')
+    parser.add_argument('--repeat', type=int, default=50, help='compressions timed per codec (default: 50)')
+    args = parser.parse_args()
+
+    codecs = [('gzip', int(level)) for level in args.gzip_levels.split(',')]
+    if 'br' in available_encodings():
+        codecs += [('br', int(level)) for level in args.brotli_levels.split(',')]
+    else:
+        print("brotli is not installed: gzip only")
+
+    print(f"{'payload':<22} {'codec':<8} {'bytes':>8} {'ratio':>6} {'cpu us':>9}")
+    for name, data in collect_payloads():
+        print(f"{name:<22} {'identity':<8} {len(data):>8} {1:>6.2f} {0:>9.1f}")
+        for encoding, level in codecs:
+            size, cpu_us = time_compress(data, encoding, level, args.repeat)
+            print(f"{'':<22} {f'{encoding}-{level}':<8} {size:>8} {size / len(data):>6.2f} {cpu_us:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the nearby search (GET /api/v1/places/nearby) against table size.
+
+For each table size a temporary SQLite database is filled with places spread
+over Europe, then random nearby queries are timed with three prefilter
+strategies: the R*Tree index, the (latitude, longitude) B-tree index and a
+full table scan. The radius shrinks as 1/sqrt(N) so that every size returns
+roughly the same number of candidates: the time left over is the cost of
+finding them, which should stay flat for the indexed paths and grow linearly
+for the scan.
+
+Usage: python benchmarks/bench_nearby.py [--sizes 10000,100000,1000000] [--queries 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.extensions import db
+from app.persistence.spatial import bounding_boxes
+from app.services.facade import facade
+
+LAT_RANGE = (35.0, 60.0)
+LNG_RANGE = (-10.0, 30.0)
+# Rayon donnant environ 30 candidats pour 10 000 lieux sur la zone
+BASE_SIZE, BASE_RADIUS_KM = 10_000, 100.0
+
+PREFILTERS = {
+    'rtree': "SELECT count(*) FROM places WHERE spatial_id IN (SELECT id FROM places_rtree "
+             "WHERE max_lat >= :min_lat AND min_lat <= :max_lat "
+             "AND max_lng >= :min_lng AND min_lng <= :max_lng)",
+    'btree': "SELECT count(*) FROM places INDEXED BY ix_places_latitude_longitude "
+             "WHERE latitude BETWEEN :min_lat AND :max_lat AND longitude BETWEEN :min_lng AND :max_lng",
+    'scan': "SELECT count(*) FROM places NOT INDEXED "
+            "WHERE latitude BETWEEN :min_lat AND :max_lat AND longitude BETWEEN :min_lng AND :max_lng",
+}
+
+
+def make_config(path):
+    class BenchmarkConfig:
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        JWT_SECRET_KEY = 'benchmark'
+    return BenchmarkConfig
+
+
+def populate(size, rng):
+    owner_id = str(uuid.uuid4())
+    now = datetime.utcnow()
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO users (id, first_name, last_name, email, password, role, is_admin, created_at, updated_at) "
+            "VALUES (?, 'Bench', 'Owner', 'bench@example.com', 'x', 'user', 0, ?, ?)", (owner_id, now, now))
+        batch = []
+        for i in range(size):
+            batch.append((str(uuid.uuid4()), f'Place {i}', 50.0, rng.uniform(*LAT_RANGE),
+                          rng.uniform(*LNG_RANGE), owner_id, owner_id, now, now))
+            if len(batch) == 50_000:
+                connection.exec_driver_sql(
+                    "INSERT INTO places (id, title, price, latitude, longitude, owner_id, user_id, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", batch)
+                batch = []
+        if batch:
+            connection.exec_driver_sql(
+                "INSERT INTO places (id, title, price, latitude, longitude, owner_id, user_id, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", batch)
+
+
+def time_queries(fn, centers):
+    start = time.perf_counter()
+    for lat, lng in centers:
+        fn(lat, lng)
+    return (time.perf_counter() - start) / len(centers) * 1000
+
+
+def run(size, queries, seed):
+    rng = random.Random(seed)
+    radius_km = BASE_RADIUS_KM * (BASE_SIZE / size) ** 0.5
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(make_config(os.path.join(tmp, 'bench.db')))
+        with app.app_context():
+            db.create_all()
+            start = time.perf_counter()
+            populate(size, rng)
+            load_s = time.perf_counter() - start
+
+            centers = [(rng.uniform(LAT_RANGE[0] + 2, LAT_RANGE[1] - 2),
+                        rng.uniform(LNG_RANGE[0] + 2, LNG_RANGE[1] - 2)) for _ in range(queries)]
+            row = {'size': size, 'radius_km': radius_km, 'load_s': load_s}
+            with db.engine.connect() as connection:
+                for name, sql in PREFILTERS.items():
+                    def prefilter(lat, lng, sql=sql):
+                        (min_lat, max_lat, min_lng, max_lng), = bounding_boxes(lat, lng, radius_km)
+                        return connection.execute(db.text(sql), {'min_lat': min_lat, 'max_lat': max_lat,
+                                                                 'min_lng': min_lng, 'max_lng': max_lng}).scalar()
+                    row[name] = time_queries(prefilter, centers)
+
+            found = []
+            def endpoint(lat, lng):
+                found.append(len(facade.get_places_nearby(lat, lng, radius_km, 1000)))
+                db.session.expunge_all()
+            row['nearby'] = time_queries(endpoint, centers)
+            row['results'] = sum(found) / len(found)
+            db.session.remove()
+            db.engine.dispose()
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='10000,100000,1000000',
+                        help='comma-separated table sizes (default: 10000,100000,1000000)')
+    parser.add_argument('--queries', type=int, default=200, help='queries per size (default: 200)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'places':>9} {'radius km':>9} {'load s':>7} {'rtree ms':>9} {'btree ms':>9} "
+          f"{'scan ms':>9} {'nearby ms':>9} {'results':>8}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        row = run(size, args.queries, args.seed)
+        print(f"{row['size']:>9} {row['radius_km']:>9.2f} {row['load_s']:>7.1f} {row['rtree']:>9.3f} "
+              f"{row['btree']:>9.3f} {row['scan']:>9.3f} {row['nearby']:>9.3f} {row['results']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
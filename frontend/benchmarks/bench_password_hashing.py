@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark of POST /api/v1/auth/login throughput against bcrypt cost and pool size.
+
+For each BCRYPT_LOG_ROUNDS value a temporary SQLite database holds one user
+whose password was hashed with that cost. Concurrent client threads then log in
+repeatedly through the Flask test client, with PASSWORD_HASH_WORKERS set to
+each pool size (0 runs bcrypt on the request thread). Each added round doubles
+the bcrypt work, so logins/sec halves per round; the pool size caps how many
+cores are spent on hashing at once.
+
+Usage: python benchmarks/bench_password_hashing.py [--rounds 10,12] [--workers 0,1,2,4] [--threads 8]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.extensions import db, passwords
+from app.services.facade import facade
+
+CREDENTIALS = {'email': 'bench@example.com', 'password': 'benchmark-password'}
+
+
+def make_config(path, rounds, workers):
+    class BenchmarkConfig:
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        JWT_SECRET_KEY = 'benchmark'
+        BCRYPT_LOG_ROUNDS = rounds
+        PASSWORD_HASH_WORKERS = workers
+    return BenchmarkConfig
+
+
+def run(path, rounds, workers, threads, logins):
+    app = create_app(make_config(path, rounds, workers))
+    latencies = []
+    lock = threading.Lock()
+
+    def client_thread(count):
+        client = app.test_client()
+        for _ in range(count):
+            start = time.perf_counter()
+            response = client.post('/api/v1/auth/login', json=CREDENTIALS)
+            elapsed = time.perf_counter() - start
+            assert response.status_code == 200, response.get_data(as_text=True)
+            with lock:
+                latencies.append(elapsed)
+
+    # Échauffement : démarre le pool de processus hors mesure
+    client_thread(1)
+    latencies.clear()
+
+    workers_threads = [threading.Thread(target=client_thread, args=(logins // threads,))
+                       for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers_threads:
+        thread.start()
+    for thread in workers_threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    passwords.shutdown()
+    return len(latencies) / elapsed, statistics.mean(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rounds', default='10,12', help='comma-separated bcrypt costs (default: 10,12)')
+    parser.add_argument('--workers', default='0,1,2,4',
+                        help='comma-separated PASSWORD_HASH_WORKERS values (default: 0,1,2,4)')
+    parser.add_argument('--threads', type=int, default=8, help='concurrent client threads (default: 8)')
+    parser.add_argument('--logins', type=int, default=64, help='logins per measurement (default: 64)')
+    args = parser.parse_args()
+
+    print(f"cpus: {os.cpu_count()}, client threads: {args.threads}")
+    print(f"{'rounds':>6} {'workers':>7} {'logins/s':>9} {'mean ms':>9}")
+    for rounds in (int(r) for r in args.rounds.split(',')):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.db')
+            app = create_app(make_config(path, rounds, 0))
+            with app.app_context():
+                db.create_all()
+                facade.create_user(dict(CREDENTIALS, first_name='Bench', last_name='User'))
+                db.session.remove()
+            for workers in (int(w) for w in args.workers.split(',')):
+                throughput, latency = run(path, rounds, workers, args.threads, args.logins)
+                print(f"{rounds:>6} {workers:>7} {throughput:>9.1f} {latency:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark of list reads: full ORM objects against column projections.
+
+For each size a temporary SQLite database holds that many places. The list of
+places is then read twice: as ORM instances (Place.query.all(), every column,
+an InstanceState and an identity-map entry per row) and with the PLACE_LIST
+projection of app/persistence/projections.py (only the listed columns, one
+namedtuple per row). The table reports the memory held per row after the read,
+measured with tracemalloc, and the throughput of the read and of the read
+followed by the serialization of GET /api/v1/places/ (PLACE_LIST serializer).
+Times are the best of --repeat runs.
+
+Usage: python benchmarks/bench_projections.py [--sizes 1000,10000,100000] [--repeat 3]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.persistence import projections
+from app.serializers import PLACE_LIST
+from app.services.facade import facade
+
+
+def make_config(path):
+    class BenchmarkConfig:
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        JWT_SECRET_KEY = 'benchmark'
+    return BenchmarkConfig
+
+
+def populate(places):
+    """Remplit la base avec un propriétaire et ses lieux."""
+    now = datetime.utcnow()
+    owner_id = str(uuid.uuid4())
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO users (id, first_name, last_name, email, password, role, is_admin, created_at, updated_at) "
+            "VALUES (?, 'Bench', 'Owner', 'owner@example.com', 'x', 'user', 0, ?, ?)", (owner_id, now, now))
+        connection.exec_driver_sql(
+            "INSERT INTO places (id, title, description, price, latitude, longitude, owner_id, user_id, "
+            "review_count, rating_sum, avg_rating, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(str(uuid.uuid4()), f'Place {i}', 'A quiet flat close to the old town, with a view on the river.',
+              40.0 + i % 90, 45.0 + (i % 1000) / 1000, 5.0 + (i % 700) / 1000,
+              owner_id, owner_id, i % 7, 4 * (i % 7), 4.0 if i % 7 else 0.0, now, now)
+             for i in range(places)])
+
+
+def read_orm():
+    return Place.query.all()
+
+
+def read_projection():
+    return facade.place_repo.get_all(projection=projections.PLACE_LIST)
+
+
+def held_bytes(read):
+    """Renvoie la mémoire retenue par le résultat d'une lecture, en octets."""
+    db.session.expunge_all()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = read()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    db.session.expunge_all()
+    return held
+
+
+def best_of(repeat, function):
+    """Renvoie le meilleur temps d'exécution en secondes."""
+    best = None
+    for _ in range(repeat):
+        db.session.expunge_all()
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    db.session.expunge_all()
+    return best
+
+
+def run(size, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(make_config(os.path.join(tmp, 'bench.db')))
+        results = {}
+        with app.app_context():
+            db.create_all()
+            populate(size)
+            for name, read in (('orm', read_orm), ('projection', read_projection)):
+                results[name] = {
+                    'bytes_per_row': held_bytes(read) / size,
+                    'read_rows_s': size / best_of(repeat, read),
+                    'list_rows_s': size / best_of(repeat, lambda: PLACE_LIST.many(read())),
+                }
+            db.session.remove()
+            db.engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help='comma-separated place counts (default: 1000,10000,100000)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measure, best kept (default: 3)')
+    args = parser.parse_args()
+
+    print(f"{'places':>8} {'read':>11} {'bytes/row':>10} {'read rows/s':>12} {'list rows/s':>12}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        for name, row in run(size, args.repeat).items():
+            print(f"{size:>8} {name:>11} {row['bytes_per_row']:>10.0f} "
+                  f"{row['read_rows_s']:>12,.0f} {row['list_rows_s']:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark of response serialization: hand-built dicts and the stdlib json
+encoder against the precompiled serializers of app/serializers.py and orjson.
+
+For each size a temporary SQLite database holds that many places, which are
+loaded once as ORM objects. Both paths then turn the same objects into the
+body of GET /api/v1/places/: the former path builds each dict attribute by
+attribute through the hybrid properties and encodes it with json.dumps, as
+flask-restx does by default; the new path runs PLACE_LIST.many, a single
+compiled comprehension reading the mapped columns, and encodes with orjson
+(json.dumps when orjson is not installed). Times are the best of --repeat runs.
+
+Usage: python benchmarks/bench_serializers.py [--sizes 1000,10000,100000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.serializers import PLACE_LIST, dumps, orjson
+
+
+def make_config(path):
+    class BenchmarkConfig:
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        JWT_SECRET_KEY = 'benchmark'
+    return BenchmarkConfig
+
+
+def populate(places):
+    """Remplit la base avec un propriétaire et ses lieux."""
+    now = datetime.utcnow()
+    owner_id = str(uuid.uuid4())
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO users (id, first_name, last_name, email, password, role, is_admin, created_at, updated_at) "
+            "VALUES (?, 'Bench', 'Owner', 'owner@example.com', 'x', 'user', 0, ?, ?)", (owner_id, now, now))
+        connection.exec_driver_sql(
+            "INSERT INTO places (id, title, price, latitude, longitude, owner_id, user_id, "
+            "review_count, rating_sum, avg_rating, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(str(uuid.uuid4()), f'Place {i}', 40.0 + i % 90, 45.0 + (i % 1000) / 1000, 5.0 + (i % 700) / 1000,
+              owner_id, owner_id, i % 7, 4 * (i % 7), 4.0 if i % 7 else 0.0, now, now)
+             for i in range(places)])
+
+
+def legacy_dicts(places):
+    """Reproduit l'ancienne construction des réponses de GET /places/, attribut par attribut."""
+    return [{
+        'id': place.id,
+        'title': place.title,
+        'price': place.price,
+        'latitude': place.latitude,
+        'longitude': place.longitude,
+        'avg_rating': place.avg_rating,
+        'review_count': place.review_count
+    } for place in places]
+
+
+def legacy_body(places):
+    """Reproduit l'ancien corps de GET /places/ : dicts écrits à la main et json.dumps."""
+    return json.dumps(legacy_dicts(places)) + '\n'
+
+
+def compiled_body(places):
+    """Corps de GET /places/ avec le Serializer précompilé et orjson."""
+    return dumps(PLACE_LIST.many(places)) + b'\n'
+
+
+def best_of(repeat, function, *args):
+    """Renvoie le résultat de la fonction et le meilleur temps en ms."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def run(size, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(make_config(os.path.join(tmp, 'bench.db')))
+        with app.app_context():
+            db.create_all()
+            populate(size)
+            places = Place.query.all()
+
+            row = {'objects': len(places)}
+            rows, row['legacy_build_ms'] = best_of(repeat, legacy_dicts, places)
+            legacy, row['legacy_ms'] = best_of(repeat, legacy_body, places)
+            compiled, row['compiled_build_ms'] = best_of(repeat, PLACE_LIST.many, places)
+            assert compiled == rows
+            body, row['compiled_ms'] = best_of(repeat, compiled_body, places)
+            assert json.loads(body) == json.loads(legacy)
+            row['legacy_bytes'], row['compiled_bytes'] = len(legacy.encode()), len(body)
+            db.session.remove()
+            db.engine.dispose()
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help='comma-separated object counts (default: 1000,10000,100000)')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measure, best kept (default: 5)')
+    args = parser.parse_args()
+
+    print(f"encoder: {'orjson ' + orjson.__version__ if orjson is not None else 'json (orjson not installed)'}")
+    print(f"{'objects':>8} {'dicts ms':>9} {'+json ms':>9} {'compiled ms':>12} {'+encode ms':>11} "
+          f"{'speedup':>8} {'json KB':>8} {'new KB':>7}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        row = run(size, args.repeat)
+        print(f"{row['objects']:>8} {row['legacy_build_ms']:>9.1f} {row['legacy_ms']:>9.1f} "
+              f"{row['compiled_build_ms']:>12.1f} {row['compiled_ms']:>11.1f} "
+              f"{row['legacy_ms'] / row['compiled_ms']:>7.1f}x "
+              f"{row['legacy_bytes'] / 1024:>8.0f} {row['compiled_bytes'] / 1024:>7.0f}")
+
+
+if __name__ == '__main__':
+    main()
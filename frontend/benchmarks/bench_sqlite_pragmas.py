@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark of concurrent reads and writes on SQLite with and without the
+SQLITE_PRAGMAS performance profile.
+
+For each profile a temporary database is filled with places, then reader and
+writer processes run side by side for a fixed duration. Readers fetch a page of
+places by price, writers create a review and update the place aggregates in one
+transaction, as HBnBFacade.create_review does. With the default rollback journal
+a writer's commit locks readers out and every commit waits for an fsync; with
+WAL and synchronous=NORMAL, readers and the writer no longer block each other.
+
+Usage: python benchmarks/bench_sqlite_pragmas.py [--readers 4] [--writers 1] [--duration 5]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.extensions import db
+from app.persistence.sqlite_tuning import register_sqlite_pragmas
+from config import Config
+
+PROFILES = {
+    'default': None,
+    'tuned': Config.SQLITE_PRAGMAS,
+}
+
+READ = text("SELECT id, title, price FROM places WHERE price >= :price ORDER BY price, id LIMIT 20")
+INSERT_REVIEW = text("INSERT INTO reviews (id, text, rating, user_id, place_id, created_at, updated_at) "
+                     "VALUES (:id, 'Benchmark', :rating, :user_id, :place_id, :now, :now)")
+UPDATE_PLACE = text("UPDATE places SET review_count = review_count + 1, rating_sum = rating_sum + :rating, "
+                    "avg_rating = (rating_sum + :rating) * 1.0 / (review_count + 1) WHERE id = :place_id")
+
+
+def make_config(path):
+    class BenchmarkConfig:
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        JWT_SECRET_KEY = 'benchmark'
+    return BenchmarkConfig
+
+
+def populate(path, size):
+    """Crée le schéma et les lieux, et renvoie (user_id, place_ids)."""
+    app = create_app(make_config(path))
+    user_id = str(uuid.uuid4())
+    place_ids = [str(uuid.uuid4()) for _ in range(size)]
+    now = datetime.utcnow()
+    with app.app_context():
+        db.create_all()
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql(
+                "INSERT INTO users (id, first_name, last_name, email, password, role, is_admin, created_at, updated_at) "
+                "VALUES (?, 'Bench', 'User', 'bench@example.com', 'x', 'user', 0, ?, ?)", (user_id, now, now))
+            connection.exec_driver_sql(
+                "INSERT INTO places (id, title, price, latitude, longitude, owner_id, user_id, created_at, updated_at) "
+                "VALUES (?, ?, ?, 45.0, 5.0, ?, ?, ?, ?)",
+                [(place_id, f'Place {i}', float(i % 500), user_id, user_id, now, now)
+                 for i, place_id in enumerate(place_ids)])
+        db.engine.dispose()
+    return user_id, place_ids
+
+
+def worker(role, url, pragmas, duration, user_id, place_ids, seed, results):
+    engine = create_engine(url)
+    register_sqlite_pragmas(engine, pragmas)
+    rng = random.Random(seed)
+    operations = errors = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        try:
+            if role == 'reader':
+                with engine.connect() as connection:
+                    connection.execute(READ, {'price': rng.uniform(0, 480)}).all()
+            else:
+                rating, place_id = rng.randint(1, 5), rng.choice(place_ids)
+                with engine.begin() as connection:
+                    connection.execute(INSERT_REVIEW, {'id': str(uuid.uuid4()), 'rating': rating,
+                                                       'user_id': user_id, 'place_id': place_id,
+                                                       'now': datetime.utcnow()})
+                    connection.execute(UPDATE_PLACE, {'rating': rating, 'place_id': place_id})
+            operations += 1
+        except OperationalError:
+            # database is locked : busy_timeout dépassé
+            errors += 1
+    engine.dispose()
+    results.put((role, operations, errors))
+
+
+def run(profile, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        user_id, place_ids = populate(path, args.places)
+        url = f'sqlite:///{path}'
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        roles = ['reader'] * args.readers + ['writer'] * args.writers
+        processes = [context.Process(target=worker, args=(role, url, PROFILES[profile], args.duration,
+                                                          user_id, place_ids, i, results))
+                     for i, role in enumerate(roles)]
+        for process in processes:
+            process.start()
+        totals = {'reader': [0, 0], 'writer': [0, 0]}
+        for _ in processes:
+            role, operations, errors = results.get()
+            totals[role][0] += operations
+            totals[role][1] += errors
+        for process in processes:
+            process.join()
+    return {'reads': totals['reader'][0] / args.duration, 'writes': totals['writer'][0] / args.duration,
+            'errors': totals['reader'][1] + totals['writer'][1]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--readers', type=int, default=4, help='reader processes (default: 4)')
+    parser.add_argument('--writers', type=int, default=1, help='writer processes (default: 1)')
+    parser.add_argument('--duration', type=float, default=5, help='seconds per profile (default: 5)')
+    parser.add_argument('--places', type=int, default=10000, help='places in the database (default: 10000)')
+    args = parser.parse_args()
+
+    print(f"cpus: {os.cpu_count()}, readers: {args.readers}, writers: {args.writers}")
+    print(f"{'profile':>8} {'reads/s':>9} {'writes/s':>9} {'locked':>7}")
+    for profile in PROFILES:
+        row = run(profile, args)
+        print(f"{profile:>8} {row['reads']:>9.0f} {row['writes']:>9.1f} {row['errors']:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Load test of the production server (serve.py) against the number of workers.
+
+A temporary SQLite database is filled with places, then for each worker count
+serve.py is started with ProductionConfig on a free local port and hammered by
+concurrent keep-alive HTTP clients for a fixed duration. With --database, an
+existing database (e.g. from scripts/generate_dataset.py) is used instead
+of the temporary one. Requests/sec should
+grow with the number of workers up to the number of cores, since each worker
+is a separate process with its own interpreter lock.
+
+Usage: python benchmarks/load_test.py [--workers 1,2,4] [--threads 2] [--clients 16] [--duration 10]
+       [--places 1000 | --database PATH]
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, ROOT)
+
+from app import create_app
+from app.extensions import db
+
+
+def make_config(path):
+    class BenchmarkConfig:
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        JWT_SECRET_KEY = 'benchmark'
+    return BenchmarkConfig
+
+
+def populate(path, size):
+    app = create_app(make_config(path))
+    with app.app_context():
+        db.create_all()
+        owner_id = str(uuid.uuid4())
+        now = datetime.utcnow()
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql(
+                "INSERT INTO users (id, first_name, last_name, email, password, role, is_admin, created_at, updated_at) "
+                "VALUES (?, 'Load', 'Test', 'load@example.com', 'x', 'user', 0, ?, ?)", (owner_id, now, now))
+            connection.exec_driver_sql(
+                "INSERT INTO places (id, title, price, latitude, longitude, owner_id, user_id, created_at, updated_at) "
+                "VALUES (?, ?, ?, 45.0, 5.0, ?, ?, ?, ?)",
+                [(str(uuid.uuid4()), f'Place {i}', 20.0 + i % 200, owner_id, owner_id, now, now)
+                 for i in range(size)])
+        db.engine.dispose()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('serve.py exited during startup')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/api/v1/amenities/')
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('serve.py did not start in time')
+
+
+def hammer(port, path, clients, duration):
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        local = []
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                raise RuntimeError(f'HTTP {response.status}')
+            local.append(time.perf_counter() - start)
+            if response.getheader('Connection', '').lower() == 'close':
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return (len(latencies) / elapsed, statistics.median(latencies) * 1000,
+            latencies[int(len(latencies) * 0.95)] * 1000)
+
+
+def run(db_path, workers, args):
+    port = free_port()
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{db_path}', SECRET_KEY='load-test',
+               JWT_SECRET_KEY='load-test-jwt')
+    process = subprocess.Popen(
+        [sys.executable, 'serve.py', '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+         '--threads', str(args.threads), '--config', 'config.ProductionConfig']
+        + (['--server', args.server] if args.server else []),
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(port, process)
+        hammer(port, args.path, args.clients, 1)  # échauffement
+        return hammer(port, args.path, args.clients, args.duration)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--workers', default='1,2,4', help='comma-separated worker counts (default: 1,2,4)')
+    parser.add_argument('--threads', type=int, default=2, help='threads per worker (default: 2)')
+    parser.add_argument('--clients', type=int, default=16, help='concurrent HTTP clients (default: 16)')
+    parser.add_argument('--duration', type=float, default=10, help='seconds per measurement (default: 10)')
+    parser.add_argument('--places', type=int, default=1000, help='places in the database (default: 1000)')
+    parser.add_argument('--path', default='/api/v1/places/?limit=20', help='URL to request')
+    parser.add_argument('--server', choices=('gunicorn', 'waitress'), help='WSGI server passed to serve.py')
+    parser.add_argument('--database', help='existing SQLite database to serve instead of a generated one')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.database:
+            db_path = os.path.abspath(args.database)
+        else:
+            db_path = os.path.join(tmp, 'load.db')
+            populate(db_path, args.places)
+        print(f"cpus: {os.cpu_count()}, clients: {args.clients}, threads/worker: {args.threads}, path: {args.path}")
+        print(f"{'workers':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+        for workers in (int(w) for w in args.workers.split(',')):
+            throughput, p50, p95 = run(db_path, workers, args)
+            print(f"{workers:>7} {throughput:>9.1f} {p50:>8.2f} {p95:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,15 +6,75 @@ Il définit différentes classes de configuration pour les différents environne
 
 import os
 
+# Secrets de développement, publiés dans le dépôt : refusés en production
+DEFAULT_SECRET_KEY = 'default_secret_key'
+DEFAULT_JWT_SECRET_KEY = 'default_jwt_secret_key'
+
 class Config:
     """
     Classe de base pour la configuration de l'application.
     Contient les paramètres communs à tous les environnements.
     """
-    SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
+    SECRET_KEY = os.getenv('SECRET_KEY', DEFAULT_SECRET_KEY)
     DEBUG = False
-    JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'default_jwt_secret_key')
+    JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', DEFAULT_JWT_SECRET_KEY)
+    # Refuse de démarrer sans SECRET_KEY et JWT_SECRET_KEY propres au déploiement
+    REQUIRE_SECRETS = False
     JWT_ACCESS_TOKEN_EXPIRES = 3600  # 1 hour
+    # Pagination par curseur des endpoints de liste
+    PAGINATION_DEFAULT_LIMIT = int(os.getenv('PAGINATION_DEFAULT_LIMIT', 100))
+    PAGINATION_MAX_LIMIT = int(os.getenv('PAGINATION_MAX_LIMIT', 1000))
+    # Rayon maximum accepté par la recherche géographique (km)
+    NEARBY_MAX_RADIUS_KM = float(os.getenv('NEARBY_MAX_RADIUS_KM', 500))
+    # Nombre maximum d'éléments acceptés par les endpoints de création en masse
+    BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', 1000))
+    # Coût bcrypt des mots de passe (2^rounds itérations) ; les hashs existants restent valides
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    # Processus dédiés au hachage des mots de passe (0 : dans le thread de la requête).
+    # bcrypt libère le GIL : les threads d'un worker hachent déjà en parallèle, et le
+    # thread de la requête attend le résultat du pool. Chaque worker du serveur crée
+    # son propre pool : à réserver aux déploiements dimensionnés (au plus
+    # cpu_count // nombre de workers) et aux imports en masse.
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 0))
+    # Calculs bcrypt simultanés au plus dans un processus (0 : sans limite). Au-delà,
+    # les requêtes attendent leur tour au lieu de se partager le CPU.
+    PASSWORD_HASH_CONCURRENCY = int(os.getenv('PASSWORD_HASH_CONCURRENCY', 0))
+    # PRAGMA appliqués à chaque connexion SQLite (sans effet sur les autres bases).
+    # WAL laisse les lectures avancer pendant une écriture ; synchronous=NORMAL ne
+    # synchronise le disque qu'aux checkpoints, ce qui reste sûr en mode WAL.
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -64000)),  # négatif : en Kio (64 Mo)
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+        'temp_store': os.getenv('SQLITE_TEMP_STORE', 'MEMORY'),
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),  # ms
+    }
+    # Cache en mémoire des lieux, équipements et utilisateurs lus par id (0 : désactivé)
+    ENTITY_CACHE_SIZE = int(os.getenv('ENTITY_CACHE_SIZE', 1024))
+    ENTITY_CACHE_TTL = float(os.getenv('ENTITY_CACHE_TTL', 30))
+    # Chaque processus a son propre cache : les invalidations sont échangées par la table
+    # cache_invalidations, lue au plus toutes les ENTITY_CACHE_BUS_INTERVAL secondes
+    # (délai maximal de propagation entre workers ; négatif : canal désactivé)
+    ENTITY_CACHE_BUS_INTERVAL = float(os.getenv('ENTITY_CACHE_BUS_INTERVAL', 1.0))
+    # Durée de conservation des invalidations (s) ; au-delà, un worker inactif vide son cache
+    ENTITY_CACHE_BUS_RETENTION = float(os.getenv('ENTITY_CACHE_BUS_RETENTION', 3600))
+    # Précharge les équipements et les lieux les plus récents au démarrage
+    ENTITY_CACHE_WARMUP = os.getenv('ENTITY_CACHE_WARMUP', '0').lower() in ('1', 'true', 'yes')
+    # Cache HTTP des GET anonymes servi avant Flask : 'memory' (propre au processus),
+    # 'sqlite' (fichier partagé par les workers) ou vide (désactivé)
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'memory')
+    # Fichier du stockage 'sqlite', relatif au dossier instance
+    RESPONSE_CACHE_PATH = os.getenv('RESPONSE_CACHE_PATH', 'response_cache.db')
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 1024))
+    # Durée de vie des réponses (s), pour les écritures faites hors de la façade
+    RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', 30))
+    # Compression des réponses : brotli si le module est installé, sinon gzip
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', '1').lower() in ('1', 'true', 'yes')
+    # Taille minimale compressée (octets) : en dessous, l'en-tête gzip coûte plus qu'il ne gagne
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 500))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_LEVEL = int(os.getenv('COMPRESSION_BROTLI_LEVEL', 4))
 
 class DevelopmentConfig(Config):
     """
@@ -24,9 +84,40 @@ class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///development.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 10))
+
+class TestingConfig(Config):
+    """
+    Configuration pour les tests automatisés.
+    Utilise une base SQLite en mémoire pour isoler chaque exécution.
+    """
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_WORKERS = 0
+    ENTITY_CACHE_SIZE = 0
+    RESPONSE_CACHE_BACKEND = None
+
+class ProductionConfig(Config):
+    """
+    Configuration pour la production, servie par serve.py ou wsgi.py.
+    La base et les secrets sont fournis par l'environnement : create_app refuse
+    de démarrer si SECRET_KEY ou JWT_SECRET_KEY manque ou vaut le secret publié.
+    """
+    DEBUG = False
+    SECRET_KEY = os.getenv('SECRET_KEY')
+    JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
+    REQUIRE_SECRETS = True
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///production.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Plusieurs workers : une purge doit valoir pour tous
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'sqlite')
 
 # Dictionnaire des configurations disponibles
 config = {
     'development': DevelopmentConfig,
+    'testing': TestingConfig,
+    'production': ProductionConfig,
     'default': DevelopmentConfig
 }
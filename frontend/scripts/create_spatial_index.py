@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Script to add the R*Tree spatial index to an existing database.
+The index is created automatically by db.create_all() on new databases;
+this script installs it (and backfills it) on databases created before it existed,
+and rekeys on places.spatial_id an index created when it was keyed on the rowid.
+"""
+import sys
+import os
+
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.extensions import db
+from app.persistence.spatial import install_spatial_index
+
+def main():
+    """
+    Install the spatial index on the development database
+    """
+    app = create_app('config.DevelopmentConfig')
+    with app.app_context():
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql(
+                'CREATE INDEX IF NOT EXISTS ix_places_latitude_longitude ON places (latitude, longitude)'
+            )
+            install_spatial_index(connection)
+        print("Spatial index created successfully!")
+
+if __name__ == "__main__":
+    main()
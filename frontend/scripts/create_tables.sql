@@ -23,6 +23,10 @@ CREATE TABLE IF NOT EXISTS places (
     longitude FLOAT NOT NULL,
     owner_id CHAR(36) NOT NULL,
     user_id CHAR(36) NOT NULL,
+    review_count INT NOT NULL DEFAULT 0,
+    rating_sum INT NOT NULL DEFAULT 0,
+    avg_rating FLOAT NOT NULL DEFAULT 0,
+    spatial_id INTEGER,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE,
@@ -60,6 +64,15 @@ CREATE TABLE IF NOT EXISTS reviews (
     UNIQUE (user_id, place_id) -- Ensure a user can only leave one review per place
 );
 
+-- Log of entity cache invalidations shared by the server workers
+CREATE TABLE IF NOT EXISTS cache_invalidations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind VARCHAR(20) NOT NULL,
+    entity_id VARCHAR(36) NOT NULL,
+    created_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_cache_invalidations_created_at ON cache_invalidations (created_at);
+
 -- Note: SQLite triggers are simplified for compatibility
 CREATE TRIGGER IF NOT EXISTS update_users_timestamp
 AFTER UPDATE ON users
@@ -84,3 +97,54 @@ AFTER UPDATE ON reviews
 BEGIN
     UPDATE reviews SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
 END;
+
+-- Indexes for the filters and sorts of the places listing
+CREATE INDEX IF NOT EXISTS ix_places_price ON places (price, id);
+CREATE INDEX IF NOT EXISTS ix_places_created_at ON places (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_places_owner_id ON places (owner_id);
+CREATE INDEX IF NOT EXISTS ix_places_avg_rating ON places (avg_rating, id);
+CREATE INDEX IF NOT EXISTS ix_place_amenity_amenity_id_place_id ON place_amenity (amenity_id, place_id);
+
+-- Indexes for the foreign keys and filter columns that SQLite does not index by itself
+CREATE UNIQUE INDEX IF NOT EXISTS uq_reviews_place_id_user_id ON reviews (place_id, user_id);
+CREATE INDEX IF NOT EXISTS ix_reviews_user_id ON reviews (user_id);
+CREATE INDEX IF NOT EXISTS ix_places_user_id ON places (user_id);
+CREATE INDEX IF NOT EXISTS ix_users_role ON users (role);
+CREATE INDEX IF NOT EXISTS ix_users_is_admin ON users (is_admin);
+
+-- Indexes for the collection versions of the conditional GETs: MAX(updated_at), COUNT(*)
+CREATE INDEX IF NOT EXISTS ix_places_updated_at ON places (updated_at);
+CREATE INDEX IF NOT EXISTS ix_reviews_updated_at ON reviews (updated_at);
+CREATE INDEX IF NOT EXISTS ix_users_updated_at ON users (updated_at);
+CREATE INDEX IF NOT EXISTS ix_amenities_updated_at ON amenities (updated_at);
+
+-- Spatial indexes for the nearby search
+CREATE INDEX IF NOT EXISTS ix_places_latitude_longitude ON places (latitude, longitude);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_places_spatial_id ON places (spatial_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS places_rtree USING rtree(id, min_lat, max_lat, min_lng, max_lng);
+
+-- The R*Tree is keyed on places.spatial_id: VACUUM may renumber the implicit rowid of a table with a TEXT primary key
+CREATE TRIGGER IF NOT EXISTS places_spatial_id AFTER INSERT ON places
+WHEN NEW.spatial_id IS NULL
+BEGIN
+    UPDATE places SET spatial_id = (SELECT COALESCE(MAX(spatial_id), 0) + 1 FROM places) WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS places_rtree_insert AFTER INSERT ON places
+WHEN NEW.spatial_id IS NOT NULL
+BEGIN
+    INSERT OR REPLACE INTO places_rtree VALUES (NEW.spatial_id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude);
+END;
+
+CREATE TRIGGER IF NOT EXISTS places_rtree_update AFTER UPDATE OF latitude, longitude, spatial_id ON places
+WHEN NEW.spatial_id IS NOT NULL
+BEGIN
+    DELETE FROM places_rtree WHERE id = OLD.spatial_id AND OLD.spatial_id IS NOT NEW.spatial_id;
+    INSERT OR REPLACE INTO places_rtree VALUES (NEW.spatial_id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude);
+END;
+
+CREATE TRIGGER IF NOT EXISTS places_rtree_delete AFTER DELETE ON places
+BEGIN
+    DELETE FROM places_rtree WHERE id = OLD.spatial_id;
+END;
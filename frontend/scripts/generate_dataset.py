@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Script to fill an empty database with a large synthetic dataset, for benchmarks and load tests.
+
+It writes --users users, --amenities amenities, --places places with their
+amenities, and about --reviews reviews:
+- places are grouped around --clusters cities, spread normally over about
+  --spread-km around each centre; the first cities get the most places;
+- each place has 0 to --max-amenities amenities;
+- review counts follow a Zipf law over places: the place of popularity rank r
+  gets a share of the reviews proportional to 1/r^s (s = --zipf), and ranks
+  are shuffled over the places. A place cannot get more reviews than there
+  are users other than its owner; the excess goes to the next places, so the
+  total can only fall short when there are too few users;
+- ratings lean towards 4 and 5, and the review aggregates of each place
+  (review_count, rating_sum, avg_rating) are written with it.
+
+The same --seed always gives the same database, ids and timestamps included.
+Rows are written with executemany, --batch-size places (and their amenities
+and reviews) per transaction. The indexes of the tables are dropped for the
+load and rebuilt once at the end, spatial index included; if the process is
+killed, the next run of this script or of import_data.py rebuilds them first.
+Every user has the password --password, hashed once; user0@example.com is an
+administrator.
+
+Usage: python generate_dataset.py [--users 10000] [--places 100000] [--reviews 1000000]
+       [--amenities 40] [--seed 42] [--database PATH] [--config config.DevelopmentConfig]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import func, select
+from werkzeug.utils import import_string
+from app import create_app
+from app.extensions import db, passwords
+from app.passwords import hash_password
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from scripts.import_data import defer_indexes, rebuild_indexes, restore_deferred_indexes
+
+# Cluster centres: (name, latitude, longitude)
+CITIES = [
+    ('Paris', 48.8566, 2.3522), ('London', 51.5074, -0.1278), ('New York', 40.7128, -74.0060),
+    ('Barcelona', 41.3874, 2.1686), ('Rome', 41.9028, 12.4964), ('Tokyo', 35.6762, 139.6503),
+    ('Lisbon', 38.7223, -9.1393), ('Amsterdam', 52.3676, 4.9041), ('Berlin', 52.5200, 13.4050),
+    ('Los Angeles', 34.0522, -118.2437), ('Istanbul', 41.0082, 28.9784), ('Bangkok', 13.7563, 100.5018),
+    ('Prague', 50.0755, 14.4378), ('Sydney', -33.8688, 151.2093), ('Vienna', 48.2082, 16.3738),
+    ('Mexico City', 19.4326, -99.1332), ('Nice', 43.7102, 7.2620), ('Lyon', 45.7640, 4.8357),
+    ('Montreal', 45.5019, -73.5674), ('Rio de Janeiro', -22.9068, -43.1729), ('Dubai', 25.2048, 55.2708),
+    ('Marrakesh', 31.6295, -7.9811), ('Cape Town', -33.9249, 18.4241), ('Singapore', 1.3521, 103.8198),
+    ('Buenos Aires', -34.6037, -58.3816), ('Bordeaux', 44.8378, -0.5792), ('Annecy', 45.8992, 6.1294),
+    ('San Francisco', 37.7749, -122.4194), ('Reykjavik', 64.1466, -21.9426), ('Honolulu', 21.3069, -157.8583),
+]
+AMENITY_NAMES = [
+    'WiFi', 'Kitchen', 'Heating', 'Air conditioning', 'Washer', 'Dryer', 'Free parking', 'TV',
+    'Workspace', 'Coffee maker', 'Dishwasher', 'Iron', 'Hair dryer', 'Smoke alarm', 'First aid kit',
+    'Balcony', 'Garden', 'Patio', 'Barbecue', 'Pool', 'Hot tub', 'Sauna', 'Gym', 'Elevator',
+    'Fireplace', 'Bathtub', 'Crib', 'Pets allowed', 'EV charger', 'Bicycle', 'Breakfast',
+    'Sea view', 'Mountain view', 'Beach access', 'Lake access', 'Ski-in/ski-out', 'Piano',
+    'Game console', 'Wheelchair access', 'Self check-in',
+]
+FIRST_NAMES = ['Emma', 'Louis', 'Alice', 'Hugo', 'Chloé', 'Lucas', 'Léa', 'Gabriel', 'Manon', 'Jules',
+               'Sofia', 'Noah', 'Mia', 'Liam', 'Olivia', 'Adam']
+LAST_NAMES = ['Martin', 'Bernard', 'Dubois', 'Thomas', 'Robert', 'Petit', 'Durand', 'Leroy', 'Moreau',
+              'Simon', 'Laurent', 'Garcia', 'Smith', 'Rossi', 'Müller', 'Silva']
+ADJECTIVES = ['Cosy', 'Bright', 'Quiet', 'Modern', 'Charming', 'Spacious', 'Rustic', 'Elegant', 'Sunny',
+              'Stylish']
+KINDS = ['apartment', 'studio', 'loft', 'house', 'villa', 'cabin', 'room', 'cottage', 'chalet', 'guesthouse']
+DESCRIPTIONS = [
+    'Close to shops, restaurants and public transport.',
+    'A calm place to rest after a day of visits.',
+    'Fully equipped, with plenty of natural light.',
+    'Ideal for families and small groups.',
+    'Recently renovated, in a lively neighbourhood.',
+]
+REVIEW_TEXTS = {
+    1: ['Very disappointing stay.', 'Not as described, would not come back.'],
+    2: ['Below expectations.', 'Several things did not work.'],
+    3: ['Decent place for the price.', 'Fine for a short stay.'],
+    4: ['Nice place, good location.', 'Comfortable and clean, recommended.'],
+    5: ['Wonderful stay, perfect host!', 'Everything was perfect, thank you!'],
+}
+RATINGS = [1, 2, 3, 4, 5]
+RATING_CUM_WEIGHTS = [4, 10, 22, 55, 100]
+# Fixed reference date, so that timestamps only depend on the seed
+REFERENCE = datetime(2025, 1, 1)
+YEAR_SECONDS = 365 * 24 * 3600
+KM_PER_DEGREE = 111.32
+
+INSERT_USER = ("INSERT INTO users (id, first_name, last_name, email, password, role, is_admin, "
+               "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+INSERT_AMENITY = "INSERT INTO amenities (id, name, created_at, updated_at) VALUES (?, ?, ?, ?)"
+INSERT_PLACE = ("INSERT INTO places (id, title, description, price, latitude, longitude, owner_id, user_id, "
+                "review_count, rating_sum, avg_rating, spatial_id, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+INSERT_LINK = "INSERT INTO place_amenity (place_id, amenity_id) VALUES (?, ?)"
+INSERT_REVIEW = ("INSERT INTO reviews (id, text, rating, user_id, place_id, created_at, updated_at) "
+                 "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+
+def new_id(rng):
+    """Return a random UUID drawn from rng, so that ids are reproducible."""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def timestamp(rng, after=None):
+    """Return a random date of the year before REFERENCE, or between after and REFERENCE."""
+    start = after or REFERENCE - timedelta(seconds=YEAR_SECONDS)
+    span = int((REFERENCE - start).total_seconds())
+    return start + timedelta(seconds=rng.randrange(max(span, 1)))
+
+
+def sql_datetime(value):
+    """Format a date the way SQLAlchemy stores DateTime columns in SQLite."""
+    return value.isoformat(sep=' ', timespec='microseconds')
+
+
+def make_clusters(count, rng):
+    """
+    Return the cluster centres: the cities of CITIES, then random centres beyond them.
+    """
+    clusters = CITIES[:count]
+    for i in range(len(clusters), count):
+        clusters.append((f'Area {i + 1}', rng.uniform(-55.0, 65.0), rng.uniform(-180.0, 180.0)))
+    return clusters
+
+
+def zipf_counts(places, reviews, exponent, cap, rng):
+    """
+    Split reviews over places following a Zipf law, with at most cap reviews per place.
+
+    Shares are computed for the places of rank 1..places; the reviews a capped place
+    cannot take are split again over the others, in proportion to their shares.
+    Returns the count of each place, in a shuffled order.
+    """
+    weights = [1.0 / rank ** exponent for rank in range(1, places + 1)]
+    counts = [0] * places
+    remaining, ranks = reviews, list(range(places))
+    while remaining > 0 and ranks:
+        scale = remaining / math.fsum(weights[rank] for rank in ranks)
+        added, still_open = 0, []
+        for rank in ranks:
+            extra = min(cap - counts[rank], int(weights[rank] * scale))
+            counts[rank] += extra
+            added += extra
+            if counts[rank] < cap:
+                still_open.append(rank)
+        remaining -= added
+        ranks = still_open
+        if not added:
+            # Rounding leftovers: one more review for the most popular open places
+            for rank in ranks[:remaining]:
+                counts[rank] += 1
+            break
+    rng.shuffle(counts)
+    return counts
+
+
+def reviewers(count, owner, users, rng):
+    """
+    Return count distinct user indexes other than owner (count < users).
+
+    Users are walked from a random start with a step coprime with the number of
+    users, which visits each of them once without keeping a set of the chosen ones.
+    """
+    step = rng.randrange(1, users) if users > 1 else 1
+    while math.gcd(step, users) != 1:
+        step = rng.randrange(1, users)
+    start = rng.randrange(users)
+    chosen = [(start + k * step) % users for k in range(count + 1)]
+    return [user for user in chosen if user != owner][:count]
+
+
+def generate(users, places, reviews, amenities=40, clusters=20, spread_km=8.0, max_amenities=8,
+             zipf=1.0, seed=42, batch_size=50000, password='password123', out=None):
+    """
+    Write the dataset into the database of the current application.
+
+    Returns a dict with the number of rows written per table.
+    """
+    out = out or sys.stdout
+    rng = random.Random(seed)
+    written = {}
+
+    def report(table, rows, start):
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        print(f"{table}: {rows:,} rows in {elapsed:.1f} s ({rows / elapsed:,.0f} rows/s)", file=out)
+
+    # Users: a single hash, shared by every account, computed without starting the hashing pool
+    start = time.perf_counter()
+    hashed = hash_password(password, passwords.rounds)
+    user_ids = []
+    for first in range(0, users, batch_size):
+        rows = []
+        for i in range(first, min(first + batch_size, users)):
+            user_id = new_id(rng)
+            created = sql_datetime(timestamp(rng))
+            user_ids.append(user_id)
+            rows.append((user_id, FIRST_NAMES[i % len(FIRST_NAMES)], LAST_NAMES[(i // 7) % len(LAST_NAMES)],
+                         f'user{i}@example.com', hashed, 'admin' if i == 0 else 'user', i == 0,
+                         created, created))
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql(INSERT_USER, rows)
+    written['users'] = users
+    report('users', users, start)
+
+    start = time.perf_counter()
+    names = AMENITY_NAMES[:amenities] + [f'Amenity {i + 1}' for i in range(len(AMENITY_NAMES), amenities)]
+    amenity_ids = [new_id(rng) for _ in names]
+    created = sql_datetime(REFERENCE)
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(INSERT_AMENITY, [(amenity_id, name, created, created)
+                                                    for amenity_id, name in zip(amenity_ids, names)])
+    written['amenities'] = len(names)
+    report('amenities', len(names), start)
+
+    # Places, with their amenities and reviews
+    start = time.perf_counter()
+    centres = make_clusters(clusters, rng)
+    cluster_cum_weights = list(_cumulate(1.0 / (i + 1) for i in range(len(centres))))
+    counts = zipf_counts(places, reviews, zipf, max(users - 1, 0), rng)
+    hosts = max(1, users // 5)
+    spread = spread_km / KM_PER_DEGREE
+    max_amenities = min(max_amenities, len(amenity_ids))
+    links_written = reviews_written = 0
+    for first in range(0, places, batch_size):
+        place_rows, link_rows, review_rows = [], [], []
+        last = min(first + batch_size, places)
+        picked = rng.choices(centres, cum_weights=cluster_cum_weights, k=last - first)
+        for i, (city, lat, lng) in zip(range(first, last), picked):
+            place_id = new_id(rng)
+            owner = rng.randrange(hosts)
+            latitude = min(90.0, max(-90.0, rng.gauss(lat, spread)))
+            longitude = rng.gauss(lng, spread / max(math.cos(math.radians(lat)), 0.1))
+            longitude = (longitude + 180.0) % 360.0 - 180.0
+            created = timestamp(rng)
+
+            count = counts[i]
+            ratings = rng.choices(RATINGS, cum_weights=RATING_CUM_WEIGHTS, k=count)
+            for k, (rating, user) in enumerate(zip(ratings, reviewers(count, owner, users, rng))):
+                texts = REVIEW_TEXTS[rating]
+                reviewed = sql_datetime(timestamp(rng, created))
+                review_rows.append((new_id(rng), texts[k % len(texts)], rating, user_ids[user], place_id,
+                                    reviewed, reviewed))
+            total = sum(ratings)
+
+            place_rows.append((place_id, f'{rng.choice(ADJECTIVES)} {rng.choice(KINDS)} in {city}',
+                               DESCRIPTIONS[i % len(DESCRIPTIONS)],
+                               round(rng.lognormvariate(4.4, 0.5), 2) + 10.0, latitude, longitude,
+                               user_ids[owner], user_ids[owner], count, total,
+                               total / count if count else 0.0, i + 1, sql_datetime(created), sql_datetime(created)))
+            link_rows.extend((place_id, amenity_ids[a])
+                             for a in rng.sample(range(len(amenity_ids)), rng.randint(0, max_amenities)))
+
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql(INSERT_PLACE, place_rows)
+            if link_rows:
+                connection.exec_driver_sql(INSERT_LINK, link_rows)
+            if review_rows:
+                connection.exec_driver_sql(INSERT_REVIEW, review_rows)
+        links_written += len(link_rows)
+        reviews_written += len(review_rows)
+        print(f"places: {last:,}/{places:,}, reviews: {reviews_written:,}", file=out)
+    written.update(places=places, place_amenity=links_written, reviews=reviews_written)
+    report('places, amenities and reviews', places + links_written + reviews_written, start)
+    return written
+
+
+def _cumulate(values):
+    """Yield the running totals of values."""
+    total = 0.0
+    for value in values:
+        total += value
+        yield total
+
+
+def main(argv=None):
+    """
+    Generate the dataset described on the command line
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', type=int, default=10000, help='number of users (default: 10000)')
+    parser.add_argument('--places', type=int, default=100000, help='number of places (default: 100000)')
+    parser.add_argument('--reviews', type=int, default=1000000, help='number of reviews (default: 1000000)')
+    parser.add_argument('--amenities', type=int, default=40, help='number of amenities (default: 40)')
+    parser.add_argument('--max-amenities', type=int, default=8, help='most amenities per place (default: 8)')
+    parser.add_argument('--clusters', type=int, default=20, help='number of city clusters (default: 20)')
+    parser.add_argument('--spread-km', type=float, default=8.0,
+                        help='standard deviation of the distance to the cluster centre (default: 8)')
+    parser.add_argument('--zipf', type=float, default=1.0, help='Zipf exponent of review counts (default: 1.0)')
+    parser.add_argument('--seed', type=int, default=42, help='random seed (default: 42)')
+    parser.add_argument('--batch-size', type=int, default=50000, help='places per transaction (default: 50000)')
+    parser.add_argument('--password', default='password123', help='password of every user (default: password123)')
+    parser.add_argument('--database', help='SQLite file to fill instead of the database of --config')
+    parser.add_argument('--config', default='config.DevelopmentConfig',
+                        help='config class (default: config.DevelopmentConfig)')
+    args = parser.parse_args(argv)
+
+    config = import_string(args.config)
+    if args.database:
+        config = type('GeneratorConfig', (config,),
+                      {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.abspath(args.database)}'})
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        restore_deferred_indexes()
+        if any(db.session.scalar(select(func.count()).select_from(model)) for model in (User, Place, Review)):
+            db.session.remove()
+            parser.error('the database already contains users, places or reviews; use an empty one (--database)')
+        db.session.remove()
+
+        start = time.perf_counter()
+        for kind in ('users', 'places', 'reviews'):
+            defer_indexes(kind, unique=True)
+        try:
+            generate(args.users, args.places, args.reviews, args.amenities, args.clusters, args.spread_km,
+                     args.max_amenities, args.zipf, args.seed, args.batch_size, args.password)
+        finally:
+            print("Rebuilding indexes...")
+            index_start = time.perf_counter()
+            for kind in ('users', 'places', 'reviews'):
+                rebuild_indexes(kind)
+            print(f"Indexes rebuilt in {time.perf_counter() - index_start:.1f} s.")
+        print(f"Dataset generated in {time.perf_counter() - start:.1f} s.")
+
+
+if __name__ == "__main__":
+    main()
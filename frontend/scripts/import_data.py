@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Script to load users, places or reviews from a CSV or NDJSON file.
+
+The file is read as a stream, --chunk-size records at a time. Each chunk is
+validated with the rules of the models, written with executemany through the
+bulk methods of the facade and committed in its own transaction, together
+with the position reached in the file (import_checkpoints table). Running the
+same command again after an interruption resumes after the last committed
+chunk; --restart starts over. Passwords are hashed by a pool of
+--hash-workers processes (default: the number of CPUs).
+
+With --defer-indexes, the secondary indexes of the loaded table (and, for
+places, the insert triggers of the spatial index) are dropped for the load and
+rebuilt once at the end, which is much faster for large files. A marker is
+saved in import_checkpoints before they are dropped: if the process is killed,
+the next run of this script (with or without --defer-indexes), of
+generate_dataset.py or of upgrade_database.py rebuilds them first.
+
+Ids found in the file are kept, so that places can reference the imported
+users and reviews the imported places: load users, then places, then reviews.
+CSV files have one column per field; the amenities of a place are separated
+by ';'. Rejected records are reported on stderr with their record number.
+
+Usage: python import_data.py {users,places,reviews} FILE [--format csv|ndjson]
+       [--chunk-size 1000] [--hash-workers N] [--defer-indexes] [--restart]
+       [--config config.DevelopmentConfig]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.extensions import db, passwords
+from app.models.place import Place, place_amenity
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.import_checkpoints import (clear_checkpoint, clear_indexes_deferred, get_checkpoint,
+                                                get_deferred_kinds, mark_indexes_deferred, save_checkpoint)
+from app.persistence.spatial import install_spatial_index
+from app.services.facade import facade
+
+# Tables whose secondary indexes are rebuilt after a load with --defer-indexes
+TABLES = {
+    'users': [User.__table__],
+    'places': [Place.__table__, place_amenity],
+    'reviews': [Review.__table__],
+}
+
+
+def parse_bool(value):
+    """Convert a CSV boolean; unknown values are left for the validation to reject."""
+    return {'true': True, '1': True, 'yes': True,
+            'false': False, '0': False, 'no': False}.get(value.lower(), value)
+
+
+def parse_int(value):
+    """Convert a CSV integer; unknown values are left for the validation to reject."""
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+# CSV cells are strings: fields the validation expects with another type
+CSV_CONVERTERS = {
+    'users': {'is_admin': parse_bool},
+    'places': {'amenities': lambda value: [a for a in value.split(';') if a]},
+    'reviews': {'rating': parse_int},
+}
+
+
+def read_csv(path, kind):
+    """
+    Yield the rows of a CSV file as dicts; empty cells are left out.
+    """
+    converters = CSV_CONVERTERS[kind]
+    with open(path, newline='', encoding='utf-8') as source:
+        for row in csv.DictReader(source):
+            yield {field: converters[field](value) if field in converters else value
+                   for field, value in row.items() if field is not None and value not in (None, '')}
+
+
+def read_ndjson(path):
+    """
+    Yield the objects of an NDJSON file, or a ValueError for a line that is not valid JSON.
+    Blank lines are skipped.
+    """
+    with open(path, encoding='utf-8') as source:
+        for line in source:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield ValueError(f"JSON invalide: {e}")
+
+
+def read_records(path, kind, fmt=None):
+    """
+    Stream the records of a CSV or NDJSON file; the format defaults to the file extension.
+    """
+    fmt = fmt or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+    return read_csv(path, kind) if fmt == 'csv' else read_ndjson(path)
+
+
+def defer_indexes(kind, unique=False):
+    """
+    Drop the secondary indexes of the tables loaded by an import of this kind.
+    Unique indexes stay unless unique is set: the import relies on them to reject
+    duplicates, only data known to be valid can be loaded without them.
+    The marker is written first, so that it is saved before any index is dropped.
+    """
+    with db.engine.begin() as connection:
+        mark_indexes_deferred(connection, kind)
+        for table in TABLES[kind]:
+            for index in table.indexes:
+                if unique or not index.unique:
+                    index.drop(connection, checkfirst=True)
+        if kind == 'places' and connection.dialect.name == 'sqlite':
+            # install_spatial_index attribue les clés manquantes et remplit l'index en une passe
+            connection.exec_driver_sql("DROP TRIGGER IF EXISTS places_spatial_id")
+            connection.exec_driver_sql("DROP TRIGGER IF EXISTS places_rtree_insert")
+
+
+def rebuild_indexes(kind):
+    """
+    Recreate the indexes dropped by defer_indexes, each in a single pass over the table,
+    then remove the marker.
+    """
+    with db.engine.begin() as connection:
+        for table in TABLES[kind]:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+        if kind == 'places':
+            install_spatial_index(connection)
+        clear_indexes_deferred(connection, kind)
+
+
+def restore_deferred_indexes(out=None):
+    """
+    Rebuild the indexes left dropped by an interrupted run, whatever the current options.
+    """
+    for kind in get_deferred_kinds():
+        print(f"Rebuilding the {kind} indexes left dropped by an interrupted run...", file=out or sys.stdout)
+        rebuild_indexes(kind)
+
+
+def import_file(kind, path, fmt=None, chunk_size=1000, restart=False, out=None, err=None):
+    """
+    Import a file chunk by chunk, resuming after the last committed chunk.
+
+    Returns a tuple (records read, rows imported, records rejected) for the whole file,
+    including the chunks committed by previous runs. Progress goes to out and
+    rejected records to err (default: stdout and stderr).
+    """
+    out, err = out or sys.stdout, err or sys.stderr
+    bulk = {'users': facade.create_users_bulk,
+            'places': facade.create_places_bulk,
+            'reviews': facade.create_reviews_bulk}[kind]
+    source = f'{kind}:{os.path.abspath(path)}'
+    if restart:
+        clear_checkpoint(source)
+    records, imported, rejected = get_checkpoint(source)
+    if records:
+        print(f"Resuming the {kind} import after {records:,} records", file=out)
+
+    stream = islice(read_records(path, kind, fmt), records, None)
+    start, done = time.perf_counter(), 0
+    while True:
+        chunk = list(islice(stream, chunk_size))
+        if not chunk:
+            break
+        items, numbers, errors = [], [], []
+        for number, record in enumerate(chunk, start=records + 1):
+            if isinstance(record, ValueError):
+                errors.append((number, str(record)))
+            else:
+                items.append(record)
+                numbers.append(number)
+
+        with facade.transaction():
+            created, failed = bulk(items, keep_ids=True)
+            errors += [(numbers[error['index']], error['error']) for error in failed]
+            save_checkpoint(source, records + len(chunk), imported + len(created), rejected + len(errors))
+
+        for number, message in sorted(errors):
+            print(f"record {number}: {message}", file=err)
+        records += len(chunk)
+        imported += len(created)
+        rejected += len(errors)
+        done += len(chunk)
+        rate = done / max(time.perf_counter() - start, 1e-9)
+        print(f"{kind}: {records:,} records, {imported:,} imported, {rejected:,} rejected "
+              f"({rate:,.0f} rows/s)", file=out)
+    return records, imported, rejected
+
+
+def main(argv=None):
+    """
+    Import the file given on the command line
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('kind', choices=sorted(TABLES), help='what the file contains')
+    parser.add_argument('path', help='CSV or NDJSON file')
+    parser.add_argument('--format', choices=['csv', 'ndjson'],
+                        help='file format (default: from the extension, .csv or NDJSON)')
+    parser.add_argument('--chunk-size', type=int, default=1000,
+                        help='records per transaction (default: 1000)')
+    parser.add_argument('--hash-workers', type=int, default=os.cpu_count() or 1,
+                        help='password hashing processes (default: the number of CPUs)')
+    parser.add_argument('--defer-indexes', action='store_true',
+                        help='drop secondary indexes during the load and rebuild them at the end')
+    parser.add_argument('--restart', action='store_true',
+                        help='ignore the checkpoint of a previous run and start from the first record')
+    parser.add_argument('--config', default='config.DevelopmentConfig',
+                        help='config class (default: config.DevelopmentConfig)')
+    args = parser.parse_args(argv)
+
+    app = create_app(args.config)
+    app.config['PASSWORD_HASH_WORKERS'] = args.hash_workers
+    passwords.init_app(app)
+    with app.app_context():
+        # Also creates the import_checkpoints table on first use
+        db.create_all()
+        restore_deferred_indexes()
+        if args.defer_indexes:
+            defer_indexes(args.kind)
+        start = time.perf_counter()
+        try:
+            records, imported, rejected = import_file(args.kind, args.path, args.format,
+                                                      args.chunk_size, args.restart)
+        finally:
+            if args.defer_indexes:
+                print("Rebuilding indexes...")
+                rebuild_indexes(args.kind)
+        print(f"Imported {imported:,} of {records:,} records ({rejected:,} rejected) "
+              f"in {time.perf_counter() - start:.1f} s.")
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
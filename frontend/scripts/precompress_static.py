@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Script to write precompressed variants of the frontend text assets
+(static/ and templates/): a .gz next to each file, and a .br when the
+brotli module is installed. Variants are compressed at the highest level
+once, instead of on every request, and are only rewritten when the source
+file is newer. scripts/static_server.py runs it at startup.
+Usage: python precompress_static.py [directory ...] (default: static templates)
+"""
+import sys
+import os
+
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.compression import FILE_SUFFIXES, available_encodings, compress
+
+FRONTEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_DIRECTORIES = ('static', 'templates')
+# Text assets worth compressing; images are already compressed
+EXTENSIONS = ('.css', '.html', '.js', '.json', '.svg', '.txt')
+# Build-time levels: the cost is paid once per file
+LEVELS = {'br': 11, 'gzip': 9}
+
+def precompress(directories=DEFAULT_DIRECTORIES, verbose=False):
+    """
+    Write the missing or outdated compressed variants of the assets.
+
+    :param directories: The directories to walk, relative to frontend/
+    :param verbose: Print the size of each variant
+    :return: The number of variants written
+    """
+    written = 0
+    for directory in directories:
+        for root, _, files in os.walk(os.path.join(FRONTEND_DIR, directory)):
+            for name in sorted(files):
+                if not name.endswith(EXTENSIONS):
+                    continue
+                path = os.path.join(root, name)
+                with open(path, 'rb') as source:
+                    data = None
+                    for encoding in available_encodings():
+                        target = path + FILE_SUFFIXES[encoding]
+                        if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+                            continue
+                        if data is None:
+                            data = source.read()
+                        compressed = compress(data, encoding, LEVELS[encoding])
+                        with open(target, 'wb') as output:
+                            output.write(compressed)
+                        written += 1
+                        if verbose:
+                            print(f"{os.path.relpath(target, FRONTEND_DIR)}: "
+                                  f"{len(data)} -> {len(compressed)} bytes")
+    return written
+
+def main():
+    """
+    Precompress the directories given on the command line
+    """
+    directories = sys.argv[1:] or DEFAULT_DIRECTORIES
+    written = precompress(directories, verbose=True)
+    print(f"{written} precompressed variants written ({', '.join(available_encodings())}).")
+
+if __name__ == "__main__":
+    main()
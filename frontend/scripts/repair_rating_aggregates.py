@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Script to recompute the review aggregates stored on places
+(review_count, rating_sum, avg_rating) from the reviews table.
+The facade keeps them up to date; run this after importing reviews
+or editing the database directly.
+Usage: python repair_rating_aggregates.py [config class, default config.DevelopmentConfig]
+"""
+import sys
+import os
+
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.services.facade import facade
+
+def main():
+    """
+    Recompute the review aggregates of every place
+    """
+    config_class = sys.argv[1] if len(sys.argv) > 1 else 'config.DevelopmentConfig'
+    app = create_app(config_class)
+    with app.app_context():
+        updated = facade.recompute_rating_aggregates()
+        print(f"Review aggregates recomputed for {updated} places.")
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,8 @@ import hashlib
 # Add the parent directory to the path so we can import app
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from app.persistence.spatial import SPATIAL_INDEX_DDL
+
 def create_tables(conn):
     """
     Create the database tables using the SQL script.
@@ -48,6 +50,10 @@ def create_tables(conn):
             longitude FLOAT NOT NULL,
             owner_id CHAR(36) NOT NULL,
             user_id CHAR(36) NOT NULL,
+            review_count INT NOT NULL DEFAULT 0,
+            rating_sum INT NOT NULL DEFAULT 0,
+            avg_rating FLOAT NOT NULL DEFAULT 0,
+            spatial_id INTEGER,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE,
@@ -92,6 +98,17 @@ def create_tables(conn):
         )
     ''')
     
+    # Create the log of entity cache invalidations shared by the server workers
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS cache_invalidations (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind VARCHAR(20) NOT NULL,
+            entity_id VARCHAR(36) NOT NULL,
+            created_at TIMESTAMP NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_cache_invalidations_created_at ON cache_invalidations (created_at)')
+    
     # Create triggers for updating timestamps
     try:
         conn.execute('''
@@ -141,6 +158,35 @@ def create_tables(conn):
     except sqlite3.Error as e:
         print(f"Warning: Could not create reviews trigger: {e}")
     
+    # Create the indexes used by the filters and sorts of the places listing
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_places_price ON places (price, id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_places_created_at ON places (created_at, id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_places_owner_id ON places (owner_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_places_avg_rating ON places (avg_rating, id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_place_amenity_amenity_id_place_id ON place_amenity (amenity_id, place_id)')
+    
+    # Index the foreign keys and filter columns that SQLite does not index by itself
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS uq_reviews_place_id_user_id ON reviews (place_id, user_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_reviews_user_id ON reviews (user_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_places_user_id ON places (user_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_users_role ON users (role)')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_users_is_admin ON users (is_admin)')
+    
+    # Index the timestamps read by the collection versions of the conditional GETs
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_places_updated_at ON places (updated_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_reviews_updated_at ON reviews (updated_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_users_updated_at ON users (updated_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_amenities_updated_at ON amenities (updated_at)')
+    
+    # Create the spatial indexes used by the nearby search
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_places_latitude_longitude ON places (latitude, longitude)')
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS ix_places_spatial_id ON places (spatial_id)')
+    try:
+        for statement in SPATIAL_INDEX_DDL:
+            conn.execute(statement)
+    except sqlite3.Error as e:
+        print(f"Warning: Could not create R*Tree spatial index: {e}")
+    
     conn.commit()
     print("Tables created successfully.")
 
@@ -239,6 +285,14 @@ def insert_sample_data(conn):
         VALUES (?, ?, ?, ?, ?)
     ''', (review2_id, 'Nice house, but a bit far from the city center.', 4, user2_id, place2_id))
     
+    # Compute the review aggregates stored on places
+    conn.execute('''
+        UPDATE places SET
+            review_count = (SELECT COUNT(*) FROM reviews WHERE reviews.place_id = places.id),
+            rating_sum = (SELECT COALESCE(SUM(rating), 0) FROM reviews WHERE reviews.place_id = places.id),
+            avg_rating = COALESCE((SELECT AVG(rating) FROM reviews WHERE reviews.place_id = places.id), 0)
+    ''')
+    
     conn.commit()
     print("Sample data inserted successfully.")
 
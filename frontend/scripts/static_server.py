@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Static file server for the frontend (templates/ and static/), a drop-in
+replacement for `python -m http.server` run from frontend/. It writes the
+precompressed variants of the text assets at startup (precompress_static.py)
+and serves the .br or .gz variant when the client's Accept-Encoding allows it,
+so scripts.js and styles.css cross the wire compressed at no per-request cost.
+Usage: python scripts/static_server.py [port, default 8000] [--bind 127.0.0.1]
+"""
+import argparse
+import email.utils
+import os
+import sys
+from datetime import datetime, timezone
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.compression import FILE_SUFFIXES, negotiate
+from precompress_static import FRONTEND_DIR, precompress
+
+class PrecompressedRequestHandler(SimpleHTTPRequestHandler):
+    """
+    SimpleHTTPRequestHandler serving the precompressed variant of a file when there is one
+    """
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        encoding = negotiate(self.headers.get('Accept-Encoding'))
+        variant = path + FILE_SUFFIXES[encoding] if encoding else None
+        if (variant is None or not os.path.isfile(path) or not os.path.isfile(variant)
+                or os.path.getmtime(variant) < os.path.getmtime(path)):
+            return super().send_head()
+
+        # The validators describe the source file, whichever variant is sent
+        mtime = os.path.getmtime(path)
+        if self.not_modified(mtime):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return None
+
+        f = open(variant, 'rb')
+        stat = os.fstat(f.fileno())
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', self.guess_type(path))
+        self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(stat.st_size))
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Last-Modified', self.date_time_string(mtime))
+        self.end_headers()
+        return f
+
+    def not_modified(self, mtime):
+        """
+        Whether the request's If-Modified-Since covers mtime, with the same rules as
+        SimpleHTTPRequestHandler (ignored when If-None-Match is present or ill-formed)
+        """
+        if 'If-Modified-Since' not in self.headers or 'If-None-Match' in self.headers:
+            return False
+        try:
+            since = email.utils.parsedate_to_datetime(self.headers['If-Modified-Since'])
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return datetime.fromtimestamp(mtime, timezone.utc).replace(microsecond=0) <= since
+
+def main():
+    """
+    Precompress the assets, then serve frontend/
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('port', type=int, nargs='?', default=8000, help='port (default: 8000)')
+    parser.add_argument('--bind', default='', help='address to bind (default: all interfaces)')
+    args = parser.parse_args()
+
+    written = precompress()
+    print(f"{written} precompressed variants written.")
+    handler = partial(PrecompressedRequestHandler, directory=FRONTEND_DIR)
+    with ThreadingHTTPServer((args.bind, args.port), handler) as server:
+        print(f"Serving {FRONTEND_DIR} on port {args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
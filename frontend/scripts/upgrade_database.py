@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Script to bring an existing database up to date with the models.
+db.create_all() only creates missing tables; this script also adds the
+columns and indexes introduced since the database was created, removes
+duplicate reviews before the unique review index is built, installs the
+spatial index and recomputes the denormalized review aggregates.
+Usage: python upgrade_database.py [config class, default config.DevelopmentConfig]
+"""
+import sys
+import os
+
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateColumn
+from app import create_app
+from app.extensions import db
+from app.persistence.import_checkpoints import clear_indexes_deferred
+from app.persistence.spatial import install_spatial_index
+from app.services.facade import facade
+
+def add_missing_columns(connection):
+    """
+    Add the model columns missing from existing tables.
+    New columns must be nullable or have a server_default.
+    """
+    inspector = inspect(connection)
+    for table in db.metadata.sorted_tables:
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                ddl = CreateColumn(column).compile(dialect=connection.dialect)
+                connection.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {ddl}')
+                print(f"Added column {table.name}.{column.name}")
+
+def remove_duplicate_reviews(connection):
+    """
+    Keep only the oldest review of each user on each place, so that the
+    unique (place_id, user_id) index can be created.
+    """
+    removed = connection.exec_driver_sql(
+        "DELETE FROM reviews WHERE EXISTS ("
+        "SELECT 1 FROM reviews AS older WHERE older.place_id = reviews.place_id "
+        "AND older.user_id = reviews.user_id "
+        "AND (older.created_at < reviews.created_at "
+        "OR (older.created_at = reviews.created_at AND older.id < reviews.id)))"
+    ).rowcount
+    if removed:
+        print(f"Removed {removed} duplicate reviews")
+
+def create_missing_indexes(connection):
+    """
+    Create the model indexes missing from existing tables.
+    """
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+def main():
+    """
+    Upgrade the database
+    """
+    config_class = sys.argv[1] if len(sys.argv) > 1 else 'config.DevelopmentConfig'
+    app = create_app(config_class)
+    with app.app_context():
+        db.create_all()
+        with db.engine.begin() as connection:
+            add_missing_columns(connection)
+            remove_duplicate_reviews(connection)
+            create_missing_indexes(connection)
+            install_spatial_index(connection)
+            # Every index is back, including those of an interrupted --defer-indexes import
+            clear_indexes_deferred(connection)
+        updated = facade.recompute_rating_aggregates()
+        print(f"Review aggregates recomputed for {updated} places.")
+        print("Database upgraded successfully!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Ce fichier est le point d'entrée de production de l'API HBnB.
+Il sert l'application avec gunicorn (plusieurs processus, plusieurs threads chacun)
+ou, à défaut, avec waitress (un seul processus, plusieurs threads).
+
+Chaque option peut aussi être fournie par une variable d'environnement :
+WEB_BIND, WEB_WORKERS, WEB_THREADS, WEB_SERVER, WEB_PRELOAD et HBNB_CONFIG.
+
+Usage: python serve.py [--bind 0.0.0.0:5000] [--workers 4] [--threads 2] [--server gunicorn]
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+
+
+def default_server():
+    """
+    Choisit le serveur disponible : gunicorn si installé (POSIX), sinon waitress.
+
+    :return: 'gunicorn', 'waitress' ou None
+    """
+    for name in ('gunicorn', 'waitress'):
+        if importlib.util.find_spec(name) is not None:
+            return name
+    return None
+
+
+def parse_args(argv=None):
+    """
+    Lit les options de la ligne de commande, avec les variables d'environnement comme défauts.
+
+    :param argv: Les arguments (sys.argv[1:] par défaut)
+    :return: Les options
+    """
+    parser = argparse.ArgumentParser(description="Sert l'API HBnB en production.")
+    parser.add_argument('--bind', default=os.getenv('WEB_BIND', '0.0.0.0:5000'),
+                        help='adresse HOST:PORT d\'écoute (défaut : 0.0.0.0:5000)')
+    parser.add_argument('--workers', type=int,
+                        default=int(os.getenv('WEB_WORKERS', (os.cpu_count() or 1) * 2 + 1)),
+                        help='nombre de processus (défaut : 2 x CPU + 1)')
+    parser.add_argument('--threads', type=int, default=int(os.getenv('WEB_THREADS', 2)),
+                        help='threads par processus (défaut : 2)')
+    parser.add_argument('--server', choices=('gunicorn', 'waitress'),
+                        default=os.getenv('WEB_SERVER') or default_server(),
+                        help='serveur WSGI (défaut : gunicorn si disponible, sinon waitress)')
+    parser.add_argument('--preload', action='store_true', default=os.getenv('WEB_PRELOAD') == '1',
+                        help="crée l'application avant le fork des workers")
+    parser.add_argument('--config', default=os.getenv('HBNB_CONFIG', 'config.ProductionConfig'),
+                        help='classe de configuration (défaut : config.ProductionConfig)')
+    options = parser.parse_args(argv)
+    if options.workers < 1 or options.threads < 1:
+        parser.error('--workers et --threads doivent être strictement positifs')
+    if options.server is None:
+        parser.error('aucun serveur WSGI installé : pip install gunicorn (ou waitress)')
+    return options
+
+
+def serve_gunicorn(options):
+    """
+    Sert l'application avec gunicorn. Sans --preload, chaque worker crée sa propre
+    application après le fork ; avec --preload, create_app remplace dans chaque
+    worker le pool de connexions hérité du maître.
+    """
+    from gunicorn.app.base import BaseApplication
+    from app import create_app
+
+    class HBnBApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', [options.bind])
+            self.cfg.set('workers', options.workers)
+            self.cfg.set('threads', options.threads)
+            self.cfg.set('worker_class', 'gthread' if options.threads > 1 else 'sync')
+            self.cfg.set('preload_app', options.preload)
+
+        def load(self):
+            return create_app(options.config)
+
+    HBnBApplication().run()
+
+
+def serve_waitress(options):
+    """
+    Sert l'application avec waitress, qui n'utilise qu'un seul processus.
+    """
+    import waitress
+    from app import create_app
+
+    if options.workers > 1:
+        print("waitress n'utilise qu'un processus : --workers est ignoré", file=sys.stderr)
+    waitress.serve(create_app(options.config), listen=options.bind, threads=options.threads)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    print(f"HBnB API sur {options.bind} avec {options.server} "
+          f"({options.workers} processus x {options.threads} threads, {options.config})")
+    if options.server == 'gunicorn':
+        serve_gunicorn(options)
+    else:
+        serve_waitress(options)
+
+
+if __name__ == '__main__':
+    main()
@@ -106,8 +106,8 @@ document.addEventListener('DOMContentLoaded', () => {
     return Math.floor(normalizedHash * (2500 - 10 + 1)) + 10;
   }
   
-  // Fetch places from API
-  async function fetchPlaces() {
+  // Fetch places from API, optionally filtered server-side (e.g. { max_price: 100 })
+  async function fetchPlaces(filters = {}) {
     try {
       const headers = {
         'Content-Type': 'application/json'
@@ -119,21 +119,30 @@ document.addEventListener('DOMContentLoaded', () => {
         headers['Authorization'] = `Bearer ${token}`;
       }
       
-      // Add cache-busting parameter to prevent caching
-      const cacheBuster = Date.now();
-      const response = await fetch(`http://localhost:5000/api/v1/places/?_=${cacheBuster}`, {
-        method: 'GET',
-        headers: headers,
-        cache: 'no-store' // Tell browser not to cache this request
-      });
+      const places = [];
+      let cursor = null;
       
-      if (response.ok) {
-        const places = await response.json();
-        return places;
-      } else {
-        console.error('Failed to fetch places:', response.statusText);
-        return [];
-      }
+      // The API is paginated: follow X-Next-Cursor until the last page
+      do {
+        const params = new URLSearchParams(filters);
+        if (cursor) {
+          params.set('cursor', cursor);
+        }
+        const response = await fetch(`http://localhost:5000/api/v1/places/?${params}`, {
+          method: 'GET',
+          headers: headers,
+          cache: 'no-cache' // Revalidate with the ETag: the API answers 304 if unchanged
+        });
+        
+        if (!response.ok) {
+          console.error('Failed to fetch places:', response.statusText);
+          return places;
+        }
+        places.push(...await response.json());
+        cursor = response.headers.get('X-Next-Cursor');
+      } while (cursor);
+      
+      return places;
     } catch (error) {
       console.error('Error fetching places:', error);
       return [];
@@ -367,9 +376,9 @@ document.addEventListener('DOMContentLoaded', () => {
     
     const price = document.createElement('p');
     price.className = 'price';
-    // Generate a consistent random price based on place ID
-    const randomPrice = getConsistentRandomPrice(place.id);
-    price.textContent = `$${randomPrice} per night`;
+    // Use the real price, falling back to a consistent random price based on place ID
+    const displayPrice = place.price !== undefined ? place.price : getConsistentRandomPrice(place.id);
+    price.textContent = `$${displayPrice} per night`;
     
     const detailsButton = document.createElement('a');
     detailsButton.href = `place.html?id=${place.id}`;
@@ -397,7 +406,7 @@ document.addEventListener('DOMContentLoaded', () => {
   }
   
   // Populate places list with randomized order
-  async function populatePlacesList() {
+  async function populatePlacesList(filters = {}) {
     const placesList = document.getElementById('places-list');
     if (!placesList) return;
     
@@ -411,7 +420,7 @@ document.addEventListener('DOMContentLoaded', () => {
     
     try {
       // Fetch places from API
-      let places = await fetchPlaces();
+      let places = await fetchPlaces(filters);
       
       // Remove loading indicator
       placesList.removeChild(loadingDiv);
@@ -432,9 +441,6 @@ document.addEventListener('DOMContentLoaded', () => {
         placeCard.style.animationDelay = `${0.1 * (index % 5)}s`;
         placesList.appendChild(placeCard);
       });
-      
-      // Initialize price filter after places are loaded
-      initializePriceFilter();
     } catch (error) {
       // Remove loading indicator
       placesList.removeChild(loadingDiv);
@@ -456,27 +462,13 @@ document.addEventListener('DOMContentLoaded', () => {
     
     priceFilter.addEventListener('change', () => {
       const maxPrice = priceFilter.value;
-      const placeCards = document.querySelectorAll('.place-card');
       
-      // If "All Prices" is selected, show all places
+      // Filtering happens in the API: reload the list with the selected maximum price
       if (maxPrice === 'all') {
-        placeCards.forEach(card => {
-          card.style.display = 'block';
-        });
-        return;
+        populatePlacesList();
+      } else {
+        populatePlacesList({ max_price: maxPrice });
       }
-      
-      // Otherwise, filter places by price
-      placeCards.forEach(card => {
-        const priceText = card.querySelector('.price').textContent;
-        const price = parseInt(priceText.replace(/\D/g, ''));
-        
-        if (price <= parseInt(maxPrice)) {
-          card.style.display = 'block';
-        } else {
-          card.style.display = 'none';
-        }
-      });
     });
   }
   
@@ -1091,12 +1083,10 @@ document.addEventListener('DOMContentLoaded', () => {
         headers['Authorization'] = `Bearer ${token}`;
       }
       
-      // Add cache-busting parameter to prevent caching
-      const cacheBuster = Date.now();
-      const response = await fetch(`http://localhost:5000/api/v1/places/${placeId}/reviews/?_=${cacheBuster}`, {
+      const response = await fetch(`http://localhost:5000/api/v1/places/${placeId}/reviews/`, {
         method: 'GET',
         headers: headers,
-        cache: 'no-store' // Tell browser not to cache this request
+        cache: 'no-cache' // Revalidate with the ETag: the API answers 304 if unchanged
       });
       
       if (response.ok) {
@@ -1276,6 +1266,7 @@ document.addEventListener('DOMContentLoaded', () => {
     // Nothing special needed for register page initialization
   } else if (document.getElementById('places-list')) {
     populatePlacesList();
+    initializePriceFilter();
     // Initialize layout controls after places are loaded
     setTimeout(() => {
       initializeLayoutControls();
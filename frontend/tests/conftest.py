@@ -0,0 +1,43 @@
+import pytest
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+from app.services.facade import facade
+from config import TestingConfig
+
+@pytest.fixture
+def config():
+    """Classe de configuration de l'application ; un module de test peut la redéfinir."""
+    return TestingConfig
+
+@pytest.fixture
+def app(config):
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def world(app):
+    """Un propriétaire, un invité, l'équipement WiFi, le lieu « Loft » et un avis de l'invité."""
+    owner = facade.create_user({'first_name': 'Owner', 'last_name': 'User',
+                                'email': 'owner@example.com', 'password': 'password123'})
+    guest = facade.create_user({'first_name': 'Guest', 'last_name': 'User',
+                                'email': 'guest@example.com', 'password': 'password123'})
+    wifi = facade.create_amenity({'name': 'WiFi'})
+    place = facade.create_place({'title': 'Loft', 'description': 'Près du port', 'price': 80.0,
+                                 'latitude': 45.0, 'longitude': 5.0, 'owner_id': owner.id,
+                                 'amenities': [wifi.id]})
+    review = facade.create_review({'text': 'Great', 'rating': 5, 'user_id': guest.id, 'place_id': place.id})
+    return {'owner': owner.id, 'guest': guest.id, 'wifi': wifi.id, 'place': place.id, 'review': review.id}
@@ -0,0 +1,106 @@
+import sys
+import os
+from contextlib import contextmanager
+from flask import json
+from sqlalchemy import event
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extensions import db
+from app.models.user import User
+from app.services.facade import facade
+from app.services.loader import BatchLoader, request_loader
+
+@contextmanager
+def count_queries():
+    """Compte les requêtes SQL exécutées dans le bloc."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+def create_place_with_reviews(name, review_count):
+    owner = facade.create_user({'first_name': 'Owner', 'last_name': name,
+                                'email': f'owner.{name}@example.com', 'password': 'password123'})
+    place = facade.create_place({'title': f'Place {name}', 'price': 80.0, 'latitude': 48.85,
+                                 'longitude': 2.35, 'owner_id': owner.id})
+    for i in range(review_count):
+        reviewer = facade.create_user({'first_name': 'Reviewer', 'last_name': f'{name}{i}',
+                                       'email': f'reviewer.{name}.{i}@example.com',
+                                       'password': 'password123'})
+        facade.create_review({'text': f'Review {i}', 'rating': 4,
+                              'user_id': reviewer.id, 'place_id': place.id})
+    return place.id
+
+def fetch(client, url):
+    db.session.expire_all()
+    with count_queries() as statements:
+        response = client.get(url)
+    assert response.status_code == 200
+    return json.loads(response.data), len(statements)
+
+def test_loader_batches_and_caches_ids(app):
+    users = [facade.create_user({'first_name': 'User', 'last_name': f'{i}',
+                                 'email': f'user{i}@example.com', 'password': 'password123'})
+             for i in range(5)]
+    ids = [user.id for user in users]
+    db.session.expire_all()
+    loader = BatchLoader()
+
+    loader.prime(User, ids[:3])
+    with count_queries() as statements:
+        first = loader.load(User, ids[4])
+        cached = loader.load(User, ids[0])
+        found = loader.load_many(User, [ids[1], 'missing', ids[2]])
+        missing = loader.load(User, 'missing')
+        assert (first.last_name, cached.last_name) == ('4', '0')
+    assert list(found) == [ids[1], ids[2]]
+    assert missing is None
+    # Les quatre identifiants annoncés ou demandés partent dans la première requête ;
+    # l'identifiant inexistant demande une seule requête de plus, puis est mémorisé
+    assert len(statements) == loader.queries == 2
+
+def test_loader_is_request_scoped(app):
+    with app.test_request_context():
+        assert request_loader() is request_loader()
+        first = request_loader()
+    with app.test_request_context():
+        assert request_loader() is not first
+
+def test_place_reviews_query_count_is_constant(client):
+    small = create_place_with_reviews('small', 1)
+    large = create_place_with_reviews('large', 8)
+
+    small_data, small_count = fetch(client, f'/api/v1/places/{small}/reviews')
+    large_data, large_count = fetch(client, f'/api/v1/places/{large}/reviews')
+
+    assert small_count == large_count
+    # Requête de version du GET conditionnel comprise
+    assert large_count <= 4
+    assert sorted(review['user']['last_name'] for review in large_data) == [f'large{i}' for i in range(8)]
+
+def test_review_list_query_count_is_constant(client):
+    create_place_with_reviews('small', 1)
+    _, small_count = fetch(client, '/api/v1/reviews/')
+    create_place_with_reviews('large', 8)
+    data, large_count = fetch(client, '/api/v1/reviews/')
+
+    assert len(data) == 9
+    # La requête de version du GET conditionnel, puis la liste
+    assert small_count == large_count == 2
+
+def test_review_details_load_author_and_place(client):
+    place_id = create_place_with_reviews('details', 1)
+    review_id = facade.get_reviews_by_place(place_id)[0].id
+    data, count = fetch(client, f'/api/v1/reviews/{review_id}')
+    assert data['user']['last_name'] == 'details0'
+    assert data['place']['title'] == 'Place details'
+    # Requête de version du GET conditionnel comprise
+    assert count <= 4
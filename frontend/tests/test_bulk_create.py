@@ -0,0 +1,182 @@
+import sys
+import os
+from sqlalchemy import event, func, select
+from flask_jwt_extended import create_access_token
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extensions import db
+from app.models.place import Place, place_amenity
+from app.models.review import Review
+from app.models.amenity import Amenity
+from app.services.facade import facade
+
+def create_user(index):
+    return facade.create_user({'first_name': 'User', 'last_name': f'{index}',
+                               'email': f'user{index}@example.com', 'password': 'password123'})
+
+def auth(user, is_admin=False):
+    token = create_access_token(identity=user.id, additional_claims={'is_admin': is_admin})
+    return {'Authorization': f'Bearer {token}'}
+
+def count(model):
+    return db.session.scalar(select(func.count()).select_from(model))
+
+def place_data(index, **extra):
+    return dict({'title': f'Place {index}', 'price': 50.0 + index,
+                 'latitude': 45.0, 'longitude': 5.0, 'owner_id': 'ignored'}, **extra)
+
+def test_bulk_places_resolve_references_with_constant_queries(client):
+    owner = create_user('owner')
+    wifi = facade.create_amenity({'name': 'WiFi'})
+    pool = facade.create_amenity({'name': 'Pool'})
+    payload = [place_data(i, amenities=[wifi.id, pool.id]) for i in range(50)]
+
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.post('/api/v1/places/bulk', json=payload, headers=auth(owner))
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['errors'] == []
+    assert [item['index'] for item in body['created']] == list(range(50))
+    assert count(Place) == 50
+    assert count(place_amenity) == 100
+    place = db.session.get(Place, body['created'][0]['id'])
+    assert place.owner_id == owner.id and place.review_count == 0
+    assert len(statements) <= 6
+
+def test_bulk_places_report_errors_per_item(client):
+    owner = create_user('owner')
+    payload = [
+        place_data(0),
+        place_data(1, price=-5),
+        place_data(2, amenities=['missing']),
+        {'title': 'No price', 'latitude': 1.0, 'longitude': 1.0},
+        'not an object',
+        place_data(5, latitude=120),
+    ]
+    response = client.post('/api/v1/places/bulk', json=payload, headers=auth(owner))
+
+    assert response.status_code == 207
+    body = response.get_json()
+    assert [item['index'] for item in body['created']] == [0]
+    assert [error['index'] for error in body['errors']] == [1, 2, 3, 4, 5]
+    assert 'missing' in body['errors'][1]['error']
+    assert count(Place) == 1
+
+def test_bulk_places_owner_only_chosen_by_admin(client):
+    admin = create_user('admin')
+    owner = create_user('owner')
+    response = client.post('/api/v1/places/bulk',
+                           json=[place_data(0, owner_id=owner.id), place_data(1, owner_id='unknown')],
+                           headers=auth(admin, is_admin=True))
+    body = response.get_json()
+    assert response.status_code == 207
+    assert db.session.get(Place, body['created'][0]['id']).owner_id == owner.id
+    assert body['errors'][0]['index'] == 1
+
+    response = client.post('/api/v1/places/bulk', json=[place_data(2, owner_id=admin.id)],
+                           headers=auth(owner))
+    assert db.session.get(Place, response.get_json()['created'][0]['id']).owner_id == owner.id
+
+def test_bulk_payload_validation(app, client):
+    owner = create_user('owner')
+    assert client.post('/api/v1/places/bulk', json={'title': 'x'}, headers=auth(owner)).status_code == 400
+    assert client.post('/api/v1/amenities/bulk', json=[], headers=auth(owner)).status_code == 400
+    assert client.post('/api/v1/amenities/bulk', json=[{'name': 'x'}]).status_code == 401
+
+    app.config['BULK_MAX_ITEMS'] = 2
+    response = client.post('/api/v1/amenities/bulk', json=[{'name': 'a'}] * 3, headers=auth(owner))
+    assert response.status_code == 400
+
+def test_bulk_amenities(client):
+    user = create_user('user')
+    response = client.post('/api/v1/amenities/bulk',
+                           json=[{'name': 'WiFi'}, {'name': ''}, {'name': 'Pool'}],
+                           headers=auth(user))
+    body = response.get_json()
+    assert response.status_code == 207
+    assert [item['index'] for item in body['created']] == [0, 2]
+    assert sorted(a.name for a in Amenity.query.all()) == ['Pool', 'WiFi']
+
+def test_bulk_reviews_enforce_rules_and_update_aggregates(client):
+    owner = create_user('owner')
+    place = facade.create_place({'title': 'Loft', 'price': 80.0, 'latitude': 1.0,
+                                 'longitude': 1.0, 'owner_id': owner.id})
+    other = facade.create_place({'title': 'Flat', 'price': 60.0, 'latitude': 1.0,
+                                 'longitude': 1.0, 'owner_id': owner.id})
+    guests = [create_user(i) for i in range(3)]
+    facade.create_review({'text': 'Old', 'rating': 1, 'user_id': guests[2].id, 'place_id': place.id})
+
+    payload = [
+        {'text': 'Great', 'rating': 5, 'user_id': guests[0].id, 'place_id': place.id},
+        {'text': 'Good', 'rating': 4, 'user_id': guests[1].id, 'place_id': place.id},
+        {'text': 'Again', 'rating': 3, 'user_id': guests[2].id, 'place_id': place.id},
+        {'text': 'Twice', 'rating': 2, 'user_id': guests[0].id, 'place_id': place.id},
+        {'text': 'Mine', 'rating': 5, 'user_id': owner.id, 'place_id': other.id},
+        {'text': 'Bad rating', 'rating': 7, 'user_id': guests[0].id, 'place_id': other.id},
+        {'text': 'Nowhere', 'rating': 3, 'user_id': guests[0].id, 'place_id': 'missing'},
+        {'text': 'Fine', 'rating': 3, 'user_id': guests[0].id, 'place_id': other.id},
+    ]
+    response = client.post('/api/v1/reviews/bulk', json=payload, headers=auth(owner, is_admin=True))
+
+    body = response.get_json()
+    assert response.status_code == 207
+    assert [item['index'] for item in body['created']] == [0, 1, 7]
+    assert [error['index'] for error in body['errors']] == [2, 3, 4, 5, 6]
+    assert count(Review) == 4
+
+    db.session.expire_all()
+    place = db.session.get(Place, place.id)
+    assert (place.review_count, place.rating_sum, place.avg_rating) == (3, 10, 10 / 3)
+    other = db.session.get(Place, other.id)
+    assert (other.review_count, other.rating_sum, other.avg_rating) == (1, 3, 3.0)
+
+def test_bulk_reviews_author_is_current_user(client):
+    owner = create_user('owner')
+    guest = create_user('guest')
+    place = facade.create_place({'title': 'Loft', 'price': 80.0, 'latitude': 1.0,
+                                 'longitude': 1.0, 'owner_id': owner.id})
+    response = client.post('/api/v1/reviews/bulk',
+                           json=[{'text': 'Great', 'rating': 5, 'user_id': owner.id, 'place_id': place.id}],
+                           headers=auth(guest))
+    assert response.status_code == 201
+    assert db.session.get(Review, response.get_json()['created'][0]['id']).user_id == guest.id
+
+def test_bulk_and_single_creation_reject_with_the_same_message(app):
+    owner = create_user('owner')
+    place = facade.create_place({'title': 'Loft', 'price': 80.0, 'latitude': 1.0,
+                                 'longitude': 1.0, 'owner_id': owner.id})
+    guest = create_user('guest')
+    cases = [
+        (facade.create_user, facade.create_users_bulk,
+         [{'first_name': '', 'last_name': 'X', 'email': 'x@example.com', 'password': 'password123'},
+          {'first_name': 'X', 'last_name': 'X', 'email': 'invalid', 'password': 'password123'},
+          {'first_name': 'X', 'last_name': 'X', 'email': 'y@example.com', 'password': 'short'},
+          {'first_name': 'X', 'last_name': 'X', 'email': 'z@example.com', 'password': 'password123',
+           'role': 'root'}]),
+        (facade.create_place, facade.create_places_bulk,
+         [place_data(0, owner_id=owner.id, title='x' * 101), place_data(1, owner_id=owner.id, price=0),
+          place_data(2, owner_id=owner.id, latitude=91), place_data(3, owner_id=owner.id, longitude='east')]),
+        (facade.create_review, facade.create_reviews_bulk,
+         [{'text': '', 'rating': 5, 'user_id': guest.id, 'place_id': place.id},
+          {'text': 'Bad', 'rating': 6, 'user_id': guest.id, 'place_id': place.id},
+          {'text': 'Bad', 'user_id': guest.id, 'place_id': place.id}]),
+    ]
+    for create, create_bulk, items in cases:
+        single = []
+        for item in items:
+            try:
+                create(dict(item))
+            except ValueError as e:
+                single.append(str(e))
+        created, errors = create_bulk([dict(item) for item in items])
+        assert created == []
+        assert [error['error'] for error in errors] == single
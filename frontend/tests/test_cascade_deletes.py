@@ -0,0 +1,124 @@
+import pytest
+import sys
+import os
+from contextlib import contextmanager
+from sqlalchemy import event, func, select
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place, place_amenity
+from app.models.review import Review
+from app.models.amenity import Amenity
+from app.services.facade import facade
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def commit(conn):
+        statements.append('COMMIT')
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(db.engine, 'commit', commit)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        event.remove(db.engine, 'commit', commit)
+
+def create_user(index):
+    return facade.create_user({'first_name': 'User', 'last_name': f'{index}',
+                               'email': f'user{index}@example.com', 'password': 'password123'})
+
+def create_place(owner, index, amenities=()):
+    return facade.create_place({'title': f'Place {index}', 'price': 50.0, 'latitude': 1.0,
+                                'longitude': 1.0, 'owner_id': owner.id,
+                                'amenities': [amenity.id for amenity in amenities]})
+
+def review(user, place, rating=4):
+    return facade.create_review({'text': 'Nice', 'rating': rating,
+                                 'user_id': user.id, 'place_id': place.id})
+
+def count(model):
+    return db.session.scalar(select(func.count()).select_from(model))
+
+def build_world(guests, prefix=''):
+    """Un hôte avec deux lieux équipés, chacun évalué par `guests` invités."""
+    host = create_user(f'{prefix}host')
+    other_host = create_user(f'{prefix}other')
+    other_place = create_place(other_host, 'other')
+    wifi = facade.create_amenity({'name': f'{prefix}WiFi'})
+    places = [create_place(host, i, [wifi]) for i in range(2)]
+    for index in range(guests):
+        guest = create_user(f'{prefix}{index}')
+        for place in places:
+            review(guest, place)
+    review(host, other_place, rating=2)
+    return host, other_place, wifi
+
+def test_delete_user_cascades_to_places_reviews_and_links(app):
+    host, other_place, wifi = build_world(guests=3)
+
+    assert facade.delete_user(host.id) is True
+    db.session.expire_all()
+
+    assert db.session.get(User, host.id) is None
+    assert count(Place) == 1
+    assert count(Review) == 0
+    assert count(place_amenity) == 0
+    assert db.session.get(Amenity, wifi.id) is not None
+    place = db.session.get(Place, other_place.id)
+    assert (place.review_count, place.rating_sum, place.avg_rating) == (0, 0, 0.0)
+
+def test_delete_user_query_count_does_not_grow_with_reviews(app):
+    small_host, _, _ = build_world(guests=1, prefix='small')
+    with count_queries() as small:
+        facade.delete_user(small_host.id)
+
+    large_host, _, _ = build_world(guests=20, prefix='large')
+    with count_queries() as large:
+        facade.delete_user(large_host.id)
+
+    assert len(large) == len(small)
+    assert large.count('COMMIT') == 1
+
+def test_delete_place_removes_reviews_and_amenity_links(app):
+    host = create_user('host')
+    wifi = facade.create_amenity({'name': 'WiFi'})
+    place = create_place(host, 1, [wifi])
+    kept = create_place(host, 2, [wifi])
+    for index in range(5):
+        review(create_user(index), place)
+
+    with count_queries() as statements:
+        assert facade.delete_place(place.id) is True
+    db.session.expire_all()
+
+    assert len(statements) <= 6
+    assert statements.count('COMMIT') == 1
+    assert db.session.get(Place, place.id) is None
+    assert count(Review) == 0
+    assert count(place_amenity) == 1
+    assert [a.id for a in db.session.get(Place, kept.id).amenities] == [wifi.id]
+
+def test_delete_amenity_removes_links(app):
+    host = create_user('host')
+    wifi = facade.create_amenity({'name': 'WiFi'})
+    place = create_place(host, 1, [wifi])
+
+    assert facade.delete_amenity(wifi.id) is True
+    db.session.expire_all()
+
+    assert db.session.get(Amenity, wifi.id) is None
+    assert count(place_amenity) == 0
+    assert db.session.get(Place, place.id).amenities == []
+
+def test_delete_unknown_user_raises(app):
+    with pytest.raises(ValueError):
+        facade.delete_user('missing')
@@ -0,0 +1,103 @@
+import gzip
+import pytest
+import sys
+import os
+from flask import Response
+from flask_jwt_extended import create_access_token
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.compression import negotiate
+from app.services.facade import facade
+from config import TestingConfig
+from scripts.precompress_static import precompress
+
+class CompressedConfig(TestingConfig):
+    COMPRESSION_MIN_SIZE = 200
+    RESPONSE_CACHE_BACKEND = 'memory'
+
+@pytest.fixture
+def config():
+    return CompressedConfig
+
+@pytest.fixture
+def amenities(app):
+    facade.create_amenities_bulk([{'name': f'Amenity {i}'} for i in range(50)])
+
+GZIP = {'Accept-Encoding': 'gzip, deflate'}
+
+def auth():
+    token = create_access_token(identity='reader', additional_claims={'is_admin': False})
+    return {'Authorization': f'Bearer {token}'}
+
+@pytest.mark.parametrize('header, encodings, expected', [
+    ('gzip, deflate, br', ('br', 'gzip'), 'br'),
+    ('gzip, deflate, br', ('gzip',), 'gzip'),
+    ('br;q=0.5, gzip', ('br', 'gzip'), 'gzip'),
+    ('*', ('br', 'gzip'), 'br'),
+    ('gzip;q=0, identity', ('gzip',), None),
+    ('', ('gzip',), None),
+])
+def test_negotiate(header, encodings, expected):
+    assert negotiate(header, encodings) == expected
+
+def test_json_is_compressed_for_clients_that_accept_it(client, amenities):
+    plain = client.get('/api/v1/amenities/', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.headers['Vary'] == 'Accept-Encoding'
+
+    response = client.get('/api/v1/amenities/', headers=GZIP)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert int(response.headers['Content-Length']) == len(response.data) < len(plain.data) / 2
+    assert gzip.decompress(response.data) == plain.data
+    assert response.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+
+def test_compressed_variant_revalidates(client, amenities):
+    etag = client.get('/api/v1/amenities/', headers=GZIP).headers['ETag']
+    assert etag.endswith('-gzip"')
+    # Servie par le cache HTTP, puis par le GET conditionnel de l'application
+    for headers in ({}, auth()):
+        response = client.get('/api/v1/amenities/', headers={**GZIP, **headers, 'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+
+def test_response_cache_keeps_one_variant_per_encoding(client, amenities):
+    client.get('/api/v1/amenities/', headers=GZIP)
+    client.get('/api/v1/amenities/')
+    compressed = client.get('/api/v1/amenities/', headers=GZIP)
+    plain = client.get('/api/v1/amenities/')
+    assert compressed.headers['X-Cache'] == plain.headers['X-Cache'] == 'HIT'
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Encoding' not in plain.headers
+    assert gzip.decompress(compressed.data) == plain.data
+
+def test_small_responses_are_not_compressed(client):
+    response = client.get('/api/v1/amenities/', headers=GZIP)
+    assert response.status_code == 200 and len(response.data) < 200
+    assert 'Content-Encoding' not in response.headers
+
+def test_streamed_responses_are_not_buffered(app, client):
+    produced = []
+
+    def rows():
+        for i in range(1000):
+            produced.append(i)
+            yield b'{"row": %d}\n' % i
+
+    app.add_url_rule('/stream', 'stream', lambda: Response(rows(), mimetype='application/x-ndjson'))
+    response = client.get('/stream', headers=GZIP, buffered=False)
+    assert 'Content-Encoding' not in response.headers
+    # Seule la première ligne est produite pour obtenir les en-têtes
+    assert len(produced) <= 1
+    response.close()
+
+def test_precompress_static(tmp_path):
+    (tmp_path / 'app.js').write_text('console.log("hbnb");\n' * 200)
+    (tmp_path / 'logo.png').write_bytes(b'\x89PNG')
+    assert precompress([str(tmp_path)]) >= 1
+    assert gzip.decompress((tmp_path / 'app.js.gz').read_bytes()) == (tmp_path / 'app.js').read_bytes()
+    assert not (tmp_path / 'logo.png.gz').exists()
+    # Les variantes à jour ne sont pas réécrites
+    assert precompress([str(tmp_path)]) == 0
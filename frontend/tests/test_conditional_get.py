@@ -0,0 +1,123 @@
+import pytest
+import sys
+import os
+from contextlib import contextmanager
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extensions import db
+from app.services.facade import facade
+
+@contextmanager
+def count_queries():
+    """Compte les requêtes SQL exécutées dans le bloc."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+def auth(user_id, is_admin=False):
+    token = create_access_token(identity=user_id, additional_claims={'is_admin': is_admin})
+    return {'Authorization': f'Bearer {token}'}
+
+URLS = {
+    'places': lambda w: '/api/v1/places/',
+    'places.filtered': lambda w: '/api/v1/places/?min_price=50&sort=price',
+    'places.amenity': lambda w: f"/api/v1/places/?amenities={w['wifi']}",
+    'places.nearby': lambda w: '/api/v1/places/nearby?lat=45&lng=5&radius_km=10',
+    'place': lambda w: f"/api/v1/places/{w['place']}",
+    'place.reviews': lambda w: f"/api/v1/places/{w['place']}/reviews",
+    'reviews': lambda w: '/api/v1/reviews/',
+    'review': lambda w: f"/api/v1/reviews/{w['review']}",
+    'users': lambda w: '/api/v1/users/',
+    'user': lambda w: f"/api/v1/users/{w['owner']}",
+    'amenities': lambda w: '/api/v1/amenities/',
+    'amenity': lambda w: f"/api/v1/amenities/{w['wifi']}",
+}
+
+# Les listes n'ont pas de Last-Modified : une suppression ne change pas leur date
+LISTS = {'places', 'places.filtered', 'places.amenity', 'places.nearby', 'place.reviews',
+         'reviews', 'users', 'amenities'}
+
+@pytest.mark.parametrize('name', sorted(URLS))
+def test_get_returns_validators_and_304(client, world, name):
+    url = URLS[name](world)
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    assert etag.startswith('"') and not etag.startswith('W/')
+    assert ('Last-Modified' in response.headers) == (name not in LISTS)
+
+    # La réponse 304 ne coûte qu'une requête de version, sans chargement ni sérialisation
+    with count_queries() as statements:
+        response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+    assert len(statements) == 1, statements
+
+def test_if_modified_since(client, world):
+    url = f"/api/v1/places/{world['place']}"
+    last_modified = client.get(url).headers['Last-Modified']
+    assert client.get(url, headers={'If-Modified-Since': last_modified}).status_code == 304
+    assert client.get(url, headers={'If-Modified-Since': 'Thu, 01 Jan 2015 00:00:00 GMT'}).status_code == 200
+
+def test_list_ignores_if_modified_since(client, world):
+    since = 'Thu, 01 Jan 2099 00:00:00 GMT'
+    assert client.get('/api/v1/places/', headers={'If-Modified-Since': since}).status_code == 200
+
+def test_etag_depends_on_query_string(client, world):
+    assert client.get('/api/v1/places/').headers['ETag'] != \
+        client.get('/api/v1/places/?sort=price').headers['ETag']
+
+def test_unknown_entity_has_no_validators(client, world):
+    response = client.get('/api/v1/places/unknown')
+    assert response.status_code == 404
+    assert 'ETag' not in response.headers
+
+# (URL observée, modification qui doit changer sa représentation)
+CHANGES = {
+    'place.title': ('place', lambda c, w: c.put(f"/api/v1/places/{w['place']}", json={'title': 'Attic'},
+                                                 headers=auth(w['owner']))),
+    'place.owner': ('place', lambda c, w: c.put(f"/api/v1/users/{w['owner']}", json={'first_name': 'Olga'},
+                                                 headers=auth(w['owner']))),
+    'place.amenity': ('place', lambda c, w: c.put(f"/api/v1/amenities/{w['wifi']}", json={'name': 'Fiber'},
+                                                   headers=auth(w['owner'], is_admin=True))),
+    'place.amenity_links': ('place', lambda c, w: facade.update_place(w['place'], {'amenities': [
+        facade.create_amenity({'name': 'Pool'}).id]})),
+    'place.review': ('place', lambda c, w: c.delete(f"/api/v1/reviews/{w['review']}",
+                                                     headers=auth(w['guest']))),
+    'place.reviews': ('place.reviews', lambda c, w: c.put(f"/api/v1/users/{w['guest']}",
+                                                           json={'last_name': 'Guest'},
+                                                           headers=auth(w['guest']))),
+    'places.rating': ('places', lambda c, w: c.put(f"/api/v1/reviews/{w['review']}", json={'rating': 1},
+                                                    headers=auth(w['guest']))),
+    'amenities.delete': ('amenities', lambda c, w: c.delete(f"/api/v1/amenities/{w['wifi']}",
+                                                             headers=auth(w['owner'], is_admin=True))),
+    'places.amenity.delete': ('places.amenity', lambda c, w: c.delete(f"/api/v1/amenities/{w['wifi']}",
+                                                                      headers=auth(w['owner'], is_admin=True))),
+    'review.place': ('review', lambda c, w: c.put(f"/api/v1/places/{w['place']}", json={'title': 'Attic'},
+                                                   headers=auth(w['owner']))),
+}
+
+@pytest.mark.parametrize('name', sorted(CHANGES))
+def test_change_invalidates_etag(client, world, name):
+    target, change = CHANGES[name]
+    url = URLS[target](world)
+    etag = client.get(url).headers['ETag']
+    response = change(client, world)
+    assert getattr(response, 'status_code', 200) in (200, 204)
+    db.session.expire_all()
+
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
@@ -0,0 +1,165 @@
+import pytest
+import sys
+import os
+import time
+from contextlib import contextmanager
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.cache import EntityCache, MISSING
+from app.extensions import db, entity_cache
+from app.services.facade import facade
+from config import TestingConfig
+
+class CachedConfig(TestingConfig):
+    ENTITY_CACHE_SIZE = 100
+    ENTITY_CACHE_TTL = 60
+
+@pytest.fixture
+def config():
+    return CachedConfig
+
+@contextmanager
+def count_queries():
+    """Compte les requêtes SQL exécutées dans le bloc."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+def auth(user_id, is_admin=False):
+    token = create_access_token(identity=user_id, additional_claims={'is_admin': is_admin})
+    return {'Authorization': f'Bearer {token}'}
+
+def create_world():
+    owner = facade.create_user({'first_name': 'Owner', 'last_name': 'User',
+                                'email': 'owner@example.com', 'password': 'password123'})
+    guest = facade.create_user({'first_name': 'Guest', 'last_name': 'User',
+                                'email': 'guest@example.com', 'password': 'password123'})
+    wifi = facade.create_amenity({'name': 'WiFi'})
+    place = facade.create_place({'title': 'Loft', 'price': 80.0, 'latitude': 45.0, 'longitude': 5.0,
+                                 'owner_id': owner.id, 'amenities': [wifi.id]})
+    return owner.id, guest.id, wifi.id, place.id
+
+def get(client, url):
+    with count_queries() as statements:
+        response = client.get(url)
+    assert response.status_code == 200
+    return response.get_json(), len(statements)
+
+def test_repeated_reads_are_served_from_cache(client):
+    owner_id, _, wifi_id, place_id = create_world()
+    for url in (f'/api/v1/places/{place_id}', f'/api/v1/amenities/{wifi_id}', f'/api/v1/users/{owner_id}'):
+        first, first_queries = get(client, url)
+        second, second_queries = get(client, url)
+        assert first == second
+        # Seule la requête de version du GET conditionnel reste à la charge de la base
+        assert first_queries > 1 and second_queries == 1
+    stats = entity_cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (3, 3, 3)
+
+def test_missing_entity_is_not_cached(client):
+    assert client.get('/api/v1/places/unknown').status_code == 404
+    assert entity_cache.stats()['size'] == 0
+
+def test_new_review_invalidates_its_place(client):
+    _, guest_id, _, place_id = create_world()
+    get(client, f'/api/v1/places/{place_id}')
+    response = client.post('/api/v1/reviews/', headers=auth(guest_id),
+                           json={'text': 'Great', 'rating': 4, 'user_id': guest_id, 'place_id': place_id})
+    assert response.status_code == 201
+
+    data, _ = get(client, f'/api/v1/places/{place_id}')
+    assert data['review_count'] == 1
+    assert [review['rating'] for review in data['reviews']] == [4]
+
+def test_updates_invalidate_dependent_places(client):
+    owner_id, _, wifi_id, place_id = create_world()
+    get(client, f'/api/v1/places/{place_id}')
+    get(client, f'/api/v1/amenities/{wifi_id}')
+
+    facade.update_amenity(wifi_id, {'name': 'Fibre'})
+    facade.update_user(owner_id, {'first_name': 'Renamed'})
+
+    place, _ = get(client, f'/api/v1/places/{place_id}')
+    amenity, _ = get(client, f'/api/v1/amenities/{wifi_id}')
+    assert place['amenities'] == [{'id': wifi_id, 'name': 'Fibre'}]
+    assert place['owner']['first_name'] == 'Renamed'
+    assert amenity['name'] == 'Fibre'
+
+def test_deletes_invalidate_entities(client):
+    owner_id, _, wifi_id, place_id = create_world()
+    get(client, f'/api/v1/places/{place_id}')
+    get(client, f'/api/v1/amenities/{wifi_id}')
+
+    facade.delete_amenity(wifi_id)
+    assert client.get(f'/api/v1/amenities/{wifi_id}').status_code == 404
+    assert get(client, f'/api/v1/places/{place_id}')[0]['amenities'] == []
+
+    facade.delete_user(owner_id)
+    assert client.get(f'/api/v1/places/{place_id}').status_code == 404
+    assert client.get(f'/api/v1/users/{owner_id}').status_code == 404
+
+def test_rolled_back_write_keeps_database_state(client):
+    _, _, _, place_id = create_world()
+    get(client, f'/api/v1/places/{place_id}')
+    with pytest.raises(ValueError):
+        facade.update_place(place_id, {'title': 'Renamed', 'price': -5})
+    assert get(client, f'/api/v1/places/{place_id}')[0]['title'] == 'Loft'
+
+def test_lru_eviction_and_ttl():
+    cache = EntityCache()
+    cache.max_size, cache.ttl = 2, 0.05
+    cache.set(('place', 'a'), 1)
+    cache.set(('place', 'b'), 2)
+    assert cache.get(('place', 'a')) == 1
+    cache.set(('place', 'c'), 3)  # évince b, le moins récemment utilisé
+    assert cache.get(('place', 'b')) is MISSING
+    time.sleep(0.06)
+    assert cache.get(('place', 'a')) is MISSING
+    stats = cache.stats()
+    assert (stats['evictions'], stats['expirations'], stats['hits'], stats['misses']) == (1, 1, 1, 2)
+
+def test_value_loaded_during_invalidation_is_not_cached():
+    cache = EntityCache()
+    cache.max_size = 10
+
+    def load():
+        cache.invalidate(('place', 'a'))  # une écriture concurrente pendant le chargement
+        return 'old'
+
+    assert cache.get_or_load(('place', 'a'), load) == 'old'
+    assert cache.get(('place', 'a')) is MISSING
+
+def test_warm_up_at_startup(tmp_path):
+    class FileConfig(CachedConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "warm.db"}'
+
+    class WarmConfig(FileConfig):
+        ENTITY_CACHE_WARMUP = True
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        db.create_all()
+        _, _, wifi_id, place_id = create_world()
+        db.session.remove()
+
+    app = create_app(WarmConfig)
+    assert entity_cache.stats()['size'] == 2
+    with app.app_context():
+        with count_queries() as statements:
+            assert facade.get_place_snapshot(place_id)['amenities'] == [{'id': wifi_id, 'name': 'WiFi'}]
+            assert facade.get_amenity_snapshot(wifi_id)['name'] == 'WiFi'
+        assert statements == []
+        db.drop_all()
+        db.engine.dispose()
@@ -0,0 +1,132 @@
+import json
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.services.facade import facade
+from config import TestingConfig
+
+@pytest.fixture
+def world(app):
+    owner = facade.create_user({'first_name': 'Owner', 'last_name': 'User',
+                                'email': 'owner@example.com', 'password': 'password123'})
+    place_ids = [facade.create_place({'title': f'Place {i}', 'description': 'Calme', 'price': 50.0 + i,
+                                      'latitude': 45.0, 'longitude': 5.0, 'owner_id': owner.id}).id
+                 for i in range(3)]
+    facade.create_review({'text': 'Great', 'rating': 5, 'user_id': facade.create_user(
+        {'first_name': 'Guest', 'last_name': 'User', 'email': 'guest@example.com',
+         'password': 'password123'}).id, 'place_id': place_ids[0]})
+    return {'owner': owner.id, 'places': place_ids}
+
+def auth(app, is_admin=True):
+    with app.app_context():
+        token = create_access_token(identity='admin-id', additional_claims={'is_admin': is_admin})
+    return {'Authorization': f'Bearer {token}'}
+
+def read_ndjson(response):
+    return [json.loads(line) for line in response.data.decode().splitlines()]
+
+def test_export_requires_admin(app, client, world):
+    assert client.get('/api/v1/admin/export/places').status_code == 401
+    response = client.get('/api/v1/admin/export/places', headers=auth(app, is_admin=False))
+    assert response.status_code == 403
+
+@pytest.mark.parametrize('url, status', [
+    ('/api/v1/admin/export/amenities', 404),
+    ('/api/v1/admin/export/places?format=csv', 400),
+    ('/api/v1/admin/export/places?since=yesterday', 400),
+])
+def test_export_rejects_invalid_requests(app, client, world, url, status):
+    assert client.get(url, headers=auth(app)).status_code == status
+
+def test_export_places(app, client, world):
+    response = client.get('/api/v1/admin/export/places?format=ndjson', headers=auth(app))
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.headers['Content-Disposition'] == 'attachment; filename=places.ndjson'
+    places = read_ndjson(response)
+    assert sorted(place['id'] for place in places) == sorted(world['places'])
+    # Les lignes sont triées par date de modification croissante
+    assert places == sorted(places, key=lambda place: (place['updated_at'], place['id']))
+    first = next(place for place in places if place['id'] == world['places'][0])
+    assert first['title'] == 'Place 0' and first['owner_id'] == world['owner']
+    assert first['review_count'] == 1 and first['avg_rating'] == 5.0
+    assert datetime.fromisoformat(first['updated_at'])
+
+def test_export_reviews_and_users(app, client, world):
+    reviews = read_ndjson(client.get('/api/v1/admin/export/reviews', headers=auth(app)))
+    assert [(review['text'], review['place_id']) for review in reviews] == [('Great', world['places'][0])]
+    users = read_ndjson(client.get('/api/v1/admin/export/users', headers=auth(app)))
+    assert [user['email'] for user in users] == ['owner@example.com', 'guest@example.com']
+    # Le mot de passe n'est jamais exporté
+    assert all('password' not in user for user in users)
+
+def test_export_since_filters_on_updated_at(app, client, world):
+    since = datetime.utcnow() + timedelta(seconds=1)
+    with app.app_context():
+        db.session.execute(db.update(Place).where(Place.id == world['places'][1]).values(updated_at=since))
+        db.session.commit()
+    response = client.get(f'/api/v1/admin/export/places?since={since.isoformat()}', headers=auth(app))
+    assert [place['id'] for place in read_ndjson(response)] == [world['places'][1]]
+    # Une date avec fuseau est convertie en UTC
+    aware = (since + timedelta(hours=2)).isoformat() + '+02:00'
+    response = client.get('/api/v1/admin/export/places', query_string={'since': aware}, headers=auth(app))
+    assert [place['id'] for place in read_ndjson(response)] == [world['places'][1]]
+
+def test_export_is_streamed(app, client, world):
+    response = client.get('/api/v1/admin/export/places', headers=auth(app), buffered=False)
+    assert response.is_streamed
+    assert 'Content-Length' not in response.headers
+    chunks = list(response.response)
+    response.close()
+    assert b''.join(chunks).count(b'\n') == 3
+
+def rss_bytes():
+    """Renvoie la mémoire résidente du processus, en octets."""
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/statm'), reason='/proc non disponible')
+def test_export_memory_stays_flat_on_a_million_rows(tmp_path):
+    class ExportConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "export.db"}'
+        # Sans mmap ni grand cache de pages, la RSS ne mesure que le processus Python
+        SQLITE_PRAGMAS = dict(TestingConfig.SQLITE_PRAGMAS, mmap_size=0, cache_size=-2000)
+
+    rows = 1_000_000
+    app = create_app(ExportConfig)
+    with app.app_context():
+        db.create_all()
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql(
+                "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?) "
+                "INSERT INTO places (id, title, description, price, latitude, longitude, owner_id, user_id, "
+                "review_count, rating_sum, avg_rating, created_at, updated_at) "
+                "SELECT printf('place-%07d', i), 'Place ' || i, 'Calme', 50.0, 45.0, 5.0, 'owner', 'owner', "
+                "0, 0, 0.0, '2024-01-01 00:00:00', datetime('2024-01-01', '+' || i || ' seconds') FROM n",
+                (rows,))
+        headers = auth(app)
+        client = app.test_client()
+
+        response = client.get('/api/v1/admin/export/places', headers=headers, buffered=False)
+        lines, peak, baseline = 0, 0, None
+        for chunk in response.response:
+            lines += chunk.count(b'\n')
+            if baseline is None:
+                # Référence prise après le premier lot : connexion et requête sont en place
+                baseline = rss_bytes()
+            peak = max(peak, rss_bytes())
+        response.close()
+        db.session.remove()
+        db.engine.dispose()
+
+    assert lines == rows
+    assert peak - baseline < 20 * 1024 * 1024
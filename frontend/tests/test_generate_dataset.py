@@ -0,0 +1,96 @@
+import pytest
+import random
+import sys
+import os
+from sqlalchemy import text
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extensions import db
+from app.models.user import User
+from app.persistence.spatial import haversine_km
+from app.services.facade import facade
+from scripts import generate_dataset
+from scripts.generate_dataset import CITIES, generate, zipf_counts
+from scripts.import_data import defer_indexes
+
+def generate_small(seed=7, out=None):
+    return generate(users=60, places=300, reviews=3000, clusters=5, seed=seed, batch_size=100, out=out)
+
+def rows(sql):
+    return db.session.execute(text(sql)).all()
+
+def test_generate_writes_consistent_rows(app, capsys):
+    written = generate_small()
+    assert written['users'] == 60 and written['places'] == 300 and written['reviews'] == 3000
+    assert rows("SELECT COUNT(*) FROM reviews") == [(3000,)]
+    assert rows("SELECT COUNT(*) FROM place_amenity")[0][0] == written['place_amenity']
+    # Les agrégats écrits avec les lieux correspondent aux avis
+    assert rows("SELECT COUNT(*) FROM places p WHERE review_count != "
+                "(SELECT COUNT(*) FROM reviews r WHERE r.place_id = p.id) OR rating_sum != "
+                "(SELECT COALESCE(SUM(rating), 0) FROM reviews r WHERE r.place_id = p.id)") == [(0,)]
+    # Ni avis en double, ni avis du propriétaire sur son lieu
+    assert rows("SELECT COUNT(*) FROM (SELECT 1 FROM reviews GROUP BY place_id, user_id "
+                "HAVING COUNT(*) > 1)") == [(0,)]
+    assert rows("SELECT COUNT(*) FROM reviews r JOIN places p ON p.id = r.place_id "
+                "WHERE r.user_id = p.owner_id") == [(0,)]
+    assert 'rows/s' in capsys.readouterr().out
+
+def test_generated_users_can_log_in(app):
+    generate_small()
+    admin = User.query.filter_by(email='user0@example.com').one()
+    assert admin.is_admin and admin.verify_password('password123')
+    assert facade.get_place_details(rows("SELECT id FROM places LIMIT 1")[0][0]) is not None
+
+def test_same_seed_gives_the_same_dataset(app):
+    generate_small(seed=3)
+    first = rows("SELECT * FROM places ORDER BY id") + rows("SELECT * FROM reviews ORDER BY id")
+    db.drop_all()
+    db.create_all()
+    generate_small(seed=3)
+    assert rows("SELECT * FROM places ORDER BY id") + rows("SELECT * FROM reviews ORDER BY id") == first
+    db.drop_all()
+    db.create_all()
+    generate_small(seed=4)
+    assert rows("SELECT * FROM places ORDER BY id") != first[:300]
+
+def test_places_are_clustered_around_cities(app):
+    generate_small()
+    places = rows("SELECT latitude, longitude FROM places")
+    near = [min(haversine_km(lat, lng, city_lat, city_lng) for _, city_lat, city_lng in CITIES[:5])
+            for lat, lng in places]
+    assert sum(distance < 50 for distance in near) > 0.95 * len(places)
+    # Le premier cluster est le plus peuplé
+    counts = [sum(haversine_km(lat, lng, city_lat, city_lng) < 50 for lat, lng in places)
+              for _, city_lat, city_lng in CITIES[:5]]
+    assert counts[0] == max(counts)
+
+def test_next_run_rebuilds_indexes_of_an_interrupted_generation(app, monkeypatch):
+    indexes = "SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')"
+    before = set(db.session.scalars(text(indexes)))
+    # Une génération tuée pendant le chargement : les index ne sont pas reconstruits
+    for kind in ('users', 'places', 'reviews'):
+        defer_indexes(kind, unique=True)
+    generate_small()
+    assert set(db.session.scalars(text(indexes))) < before
+
+    monkeypatch.setattr(generate_dataset, 'create_app', lambda config: app)
+    # La base n'est plus vide : la génération est refusée, mais les index sont reconstruits
+    with pytest.raises(SystemExit):
+        generate_dataset.main([])
+    assert set(db.session.scalars(text(indexes))) == before
+    assert rows("SELECT COUNT(*) FROM places_rtree") == [(300,)]
+
+def test_review_counts_follow_zipf(app):
+    counts = sorted(zipf_counts(1000, 100000, 1.0, 10**6, random.Random(1)), reverse=True)
+    assert sum(counts) == 100000
+    # Part de la place de rang r proportionnelle à 1/r
+    assert counts[0] == pytest.approx(2 * counts[1], rel=0.01)
+    assert counts[0] == pytest.approx(10 * counts[9], rel=0.02)
+
+def test_zipf_counts_respect_the_cap(app):
+    counts = zipf_counts(100, 5000, 1.2, 80, random.Random(1))
+    assert max(counts) <= 80
+    assert sum(counts) == 5000
+    assert zipf_counts(10, 1000, 1.0, 50, random.Random(1)).count(50) == 10
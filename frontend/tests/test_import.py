@@ -0,0 +1,141 @@
+import json
+import pytest
+import sys
+import os
+from sqlalchemy import func, select, text
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extensions import db, passwords
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.import_checkpoints import get_checkpoint
+from app.services.facade import facade
+from scripts import import_data
+from scripts.import_data import defer_indexes, import_file, rebuild_indexes
+
+def write_ndjson(path, records):
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records))
+    return str(path)
+
+def user(i, **values):
+    return dict({'id': f'user-{i}', 'first_name': 'User', 'last_name': str(i),
+                 'email': f'user{i}@example.com', 'password': 'password123'}, **values)
+
+def place(i, owner='user-0', **values):
+    return dict({'id': f'place-{i}', 'title': f'Place {i}', 'price': 50 + i,
+                 'latitude': 45.0 + i / 100, 'longitude': 5.0, 'owner_id': owner}, **values)
+
+def count(model):
+    return db.session.scalar(select(func.count()).select_from(model))
+
+def test_import_users_from_csv(app, tmp_path, capsys):
+    path = tmp_path / 'users.csv'
+    path.write_text('id,first_name,last_name,email,password,is_admin\n'
+                    'user-0,Ada,Lovelace,ada@example.com,password123,true\n'
+                    'user-1,Bad,Email,not-an-email,password123,\n'
+                    'user-2,Short,Password,short@example.com,short,\n'
+                    'user-3,Ada,Again,ada@example.com,password123,false\n'
+                    ',Grace,Hopper,grace@example.com,password123,0\n')
+    assert import_file('users', str(path), chunk_size=2) == (5, 2, 3)
+
+    ada = User.query.get('user-0')
+    assert ada.is_admin is True and ada.verify_password('password123')
+    grace = User.query.filter_by(email='grace@example.com').one()
+    assert len(grace.id) == 36 and grace.is_admin is False
+    err = capsys.readouterr().err
+    assert 'record 2: Format d\'email invalide.' in err
+    assert 'record 3:' in err and 'record 4: Email already registered' in err
+
+def test_import_places_and_reviews_keep_ids(app, tmp_path):
+    import_file('users', write_ndjson(tmp_path / 'users.ndjson', [user(0), user(1)]))
+    wifi = facade.create_amenity({'name': 'WiFi'})
+    places = [place(0, amenities=[wifi.id]), place(1), place(2, owner='missing'), place(3, price=-1)]
+    assert import_file('places', write_ndjson(tmp_path / 'places.ndjson', places)) == (4, 2, 2)
+    assert [amenity.name for amenity in Place.query.get('place-0').amenities] == ['WiFi']
+
+    path = tmp_path / 'reviews.csv'
+    path.write_text('id,text,rating,user_id,place_id\n'
+                    'review-0,Great,5,user-1,place-0\n'
+                    'review-1,Own place,4,user-0,place-0\n'
+                    'review-2,Twice,3,user-1,place-0\n'
+                    'review-3,Nice,four,user-1,place-1\n')
+    assert import_file('reviews', str(path)) == (4, 1, 3)
+    assert Review.query.get('review-0').rating == 5
+    assert (Place.query.get('place-0').review_count, Place.query.get('place-0').avg_rating) == (1, 5.0)
+
+def test_invalid_json_lines_are_rejected(app, tmp_path, capsys):
+    path = tmp_path / 'users.ndjson'
+    path.write_text(json.dumps(user(0)) + '\n{not json\n\n' + json.dumps(user(1)) + '\n')
+    assert import_file('users', str(path)) == (3, 2, 1)
+    assert 'record 2: JSON invalide' in capsys.readouterr().err
+
+def test_import_resumes_after_last_committed_chunk(app, tmp_path, monkeypatch):
+    import_file('users', write_ndjson(tmp_path / 'users.ndjson', [user(0)]))
+    path = write_ndjson(tmp_path / 'places.ndjson', [place(i) for i in range(10)])
+    create_places_bulk = facade.create_places_bulk
+    calls = []
+
+    def crash_on_third_chunk(items, keep_ids=False):
+        calls.append(len(items))
+        created = create_places_bulk(items, keep_ids=keep_ids)
+        if len(calls) == 3:
+            raise RuntimeError('interrupted')
+        return created
+
+    monkeypatch.setattr(facade, 'create_places_bulk', crash_on_third_chunk)
+    with pytest.raises(RuntimeError):
+        import_file('places', path, chunk_size=3)
+    monkeypatch.undo()
+    # Le troisième lot a été annulé avec son point de reprise
+    assert count(Place) == 6
+    assert get_checkpoint(f'places:{path}') == (6, 6, 0)
+
+    assert import_file('places', path, chunk_size=3) == (10, 10, 0)
+    assert count(Place) == 10
+    # Une nouvelle exécution n'importe plus rien ; --restart relit tout le fichier
+    assert import_file('places', path) == (10, 10, 0)
+    assert import_file('places', path, restart=True) == (10, 0, 10)
+
+def test_deferred_indexes_are_rebuilt(app, tmp_path):
+    import_file('users', write_ndjson(tmp_path / 'users.ndjson', [user(0)]))
+    indexes = "SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger') AND tbl_name = 'places'"
+    before = set(db.session.scalars(text(indexes)))
+    defer_indexes('places')
+    db.session.commit()
+    assert set(db.session.scalars(text(indexes))) < before
+
+    import_file('places', write_ndjson(tmp_path / 'places.ndjson', [place(i) for i in range(5)]))
+    rebuild_indexes('places')
+    assert set(db.session.scalars(text(indexes))) == before
+    assert db.session.scalar(text("SELECT COUNT(*) FROM places_rtree")) == 5
+    assert len(facade.get_places_nearby(45.0, 5.0, 10, 10)) == 5
+
+def test_next_plain_run_rebuilds_indexes_of_an_interrupted_import(app, tmp_path, monkeypatch):
+    import_file('users', write_ndjson(tmp_path / 'users.ndjson', [user(0)]))
+    indexes = "SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger') AND tbl_name = 'places'"
+    before = set(db.session.scalars(text(indexes)))
+    # Un import --defer-indexes tué pendant le chargement : les index ne sont pas reconstruits
+    defer_indexes('places')
+    import_file('places', write_ndjson(tmp_path / 'first.ndjson', [place(i) for i in range(3)]))
+    assert set(db.session.scalars(text(indexes))) < before
+
+    monkeypatch.setattr(import_data, 'create_app', lambda config: app)
+    path = write_ndjson(tmp_path / 'second.ndjson', [place(i) for i in range(3, 5)])
+    assert import_data.main(['places', path, '--hash-workers', '0']) == 0
+    assert set(db.session.scalars(text(indexes))) == before
+    # Les lieux chargés avant et après la reconstruction sont dans l'index spatial
+    assert len(facade.get_places_nearby(45.0, 5.0, 10, 10)) == 5
+    assert import_data.get_deferred_kinds() == []
+
+def test_hash_many_uses_the_process_pool(app):
+    workers = passwords.workers
+    passwords.workers = 2
+    try:
+        hashes = passwords.hash_many([f'password{i}' for i in range(4)])
+    finally:
+        passwords.shutdown()
+        passwords.workers = workers
+    assert all(passwords.verify(hashed, f'password{i}') for i, hashed in enumerate(hashes))
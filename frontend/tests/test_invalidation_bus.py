@@ -0,0 +1,149 @@
+import pytest
+import sys
+import os
+import multiprocessing
+import time
+from datetime import datetime
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, insert, select
+from app import create_app
+from app.cache import MISSING, EntityCache
+from app.extensions import db, entity_cache
+from app.persistence.invalidation_bus import ALL, InvalidationBus, cache_invalidations
+from app.services.facade import facade
+from config import TestingConfig
+
+# Délai de propagation garanti entre processus, et marge pour l'horloge et l'ordonnanceur
+INTERVAL = 0.2
+MARGIN = 0.1
+
+def make_config(path, interval):
+    class BusConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        ENTITY_CACHE_SIZE = 100
+        ENTITY_CACHE_TTL = 3600
+        ENTITY_CACHE_BUS_INTERVAL = interval
+    return BusConfig
+
+def reader(path, interval, place_id, deadline, results):
+    """Worker : lit le lieu en boucle depuis son propre cache et note (début, titre)."""
+    app = create_app(make_config(path, interval))
+    reads = []
+    while time.time() < deadline:
+        with app.app_context():
+            start = time.time()
+            reads.append((start, facade.get_place_snapshot(place_id)['title']))
+        time.sleep(0.005)
+    results.put((reads, entity_cache.stats()['hits']))
+
+def run_workers(tmp_path, interval, readers=2, versions=5):
+    """Lance des workers lecteurs pendant que ce processus renomme le lieu plusieurs fois."""
+    path = tmp_path / 'bus.db'
+    app = create_app(make_config(path, interval))
+    with app.app_context():
+        db.create_all()
+        owner = facade.create_user({'first_name': 'Owner', 'last_name': 'User',
+                                    'email': 'owner@example.com', 'password': 'password123'})
+        place_id = facade.create_place({'title': 'v0', 'price': 80.0, 'latitude': 45.0,
+                                        'longitude': 5.0, 'owner_id': owner.id}).id
+        db.session.remove()
+
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    deadline = time.time() + 0.5 + versions * 0.3 + 0.8
+    processes = [context.Process(target=reader, args=(str(path), interval, place_id, deadline, results))
+                 for _ in range(readers)]
+    for process in processes:
+        process.start()
+
+    committed = {'v0': 0.0}
+    time.sleep(0.5)
+    with app.app_context():
+        for version in range(1, versions + 1):
+            facade.update_place(place_id, {'title': f'v{version}'})
+            committed[f'v{version}'] = time.time()
+            db.session.remove()
+            time.sleep(0.3)
+
+    outcomes = [results.get(timeout=30) for _ in processes]
+    for process in processes:
+        process.join()
+    with app.app_context():
+        db.drop_all()
+        db.engine.dispose()
+    return committed, outcomes
+
+def stale_reads(committed, reads, bound):
+    """Lectures qui ignorent une écriture validée plus de `bound` secondes avant leur début."""
+    order = sorted(committed, key=committed.get)
+    return [(start, title) for start, title in reads
+            if any(committed[version] < start - bound and order.index(version) > order.index(title)
+                   for version in order)]
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork')
+def test_workers_see_writes_of_other_workers_within_interval(tmp_path):
+    committed, outcomes = run_workers(tmp_path, INTERVAL)
+    for reads, hits in outcomes:
+        assert hits > 0  # les lectures passent bien par le cache du worker
+        assert reads[-1][1] == 'v5'
+        assert stale_reads(committed, reads, INTERVAL + MARGIN) == []
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork')
+def test_without_the_bus_workers_serve_stale_entities(tmp_path):
+    committed, outcomes = run_workers(tmp_path, -1, readers=1, versions=2)
+    reads, _ = outcomes[0]
+    assert stale_reads(committed, reads, INTERVAL + MARGIN)
+
+def test_poll_applies_published_invalidations(tmp_path):
+    app = create_app(make_config(tmp_path / 'poll.db', 0))
+    cache = EntityCache()
+    cache.max_size = 10
+    bus = InvalidationBus()
+    bus.interval = 0
+    with app.app_context():
+        db.create_all()
+        bus.poll(cache)  # premier passage : repart de la dernière séquence
+        cache.set(('place', 'a'), 'A')
+        cache.set(('place', 'b'), 'B')
+        cache.set(('amenity', 'c'), 'C')
+        bus.publish([('place', 'a')])
+        bus.publish([('amenity', ALL)])
+        db.session.commit()
+
+        bus.poll(cache)
+        assert cache.stats()['size'] == 1 and cache.get(('place', 'b')) == 'B'
+        assert db.session.scalar(select(func.count()).select_from(cache_invalidations)) == 2
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+def test_poll_applies_rows_committed_out_of_sequence_order(tmp_path):
+    app = create_app(make_config(tmp_path / 'gaps.db', 0))
+    cache = EntityCache()
+    cache.max_size = 10
+    bus = InvalidationBus()
+    bus.interval = 0
+    with app.app_context():
+        db.create_all()
+        bus.poll(cache)
+        cache.set(('place', 'a'), 'A')
+        cache.set(('place', 'b'), 'B')
+        now = datetime.utcnow()
+        # Une transaction a pris le numéro 1 mais valide après celle qui a pris le numéro 2
+        db.session.execute(insert(cache_invalidations).values(seq=2, kind='place', entity_id='b',
+                                                              created_at=now))
+        db.session.commit()
+        bus.poll(cache)
+        assert cache.get(('place', 'a')) == 'A' and cache.get(('place', 'b')) is MISSING
+
+        db.session.execute(insert(cache_invalidations).values(seq=1, kind='place', entity_id='a',
+                                                              created_at=now))
+        db.session.commit()
+        bus.poll(cache)
+        assert cache.get(('place', 'a')) is MISSING
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
@@ -0,0 +1,68 @@
+import pytest
+import sys
+import os
+from flask import json
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.facade import facade
+
+@pytest.fixture
+def place_ids(app):
+    owner = facade.create_user({
+        'first_name': 'Page',
+        'last_name': 'Owner',
+        'email': 'page.owner@example.com',
+        'password': 'password123'
+    })
+    ids = []
+    for i in range(7):
+        place = facade.create_place({
+            'title': f'Place {i}',
+            'price': 50.0 + i,
+            'latitude': 10.0,
+            'longitude': 20.0,
+            'owner_id': owner.id
+        })
+        ids.append(place.id)
+    return ids
+
+def test_get_page_walks_every_place_once(app, place_ids):
+    seen = []
+    cursor = None
+    while True:
+        items, cursor = facade.get_places_page(3, cursor)
+        assert len(items) <= 3
+        seen.extend(item.id for item in items)
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(place_ids)
+    assert len(seen) == len(set(seen))
+
+def test_list_places_returns_next_cursor(client, place_ids):
+    response = client.get('/api/v1/places/?limit=5')
+    assert response.status_code == 200
+    first_page = json.loads(response.data)
+    assert len(first_page) == 5
+    cursor = response.headers['X-Next-Cursor']
+    assert 'rel="next"' in response.headers['Link']
+
+    response = client.get(f'/api/v1/places/?limit=5&cursor={cursor}')
+    assert response.status_code == 200
+    second_page = json.loads(response.data)
+    assert len(second_page) == 2
+    assert 'X-Next-Cursor' not in response.headers
+    ids = [place['id'] for place in first_page + second_page]
+    assert sorted(ids) == sorted(place_ids)
+
+def test_list_places_limit_is_capped(app, client, place_ids):
+    app.config['PAGINATION_MAX_LIMIT'] = 2
+    response = client.get('/api/v1/places/?limit=500')
+    assert response.status_code == 200
+    assert len(json.loads(response.data)) == 2
+
+def test_list_places_invalid_parameters(client, place_ids):
+    assert client.get('/api/v1/places/?limit=0').status_code == 400
+    assert client.get('/api/v1/places/?limit=abc').status_code == 400
+    assert client.get('/api/v1/places/?cursor=not-a-cursor').status_code == 400
@@ -0,0 +1,73 @@
+import sys
+import os
+import threading
+import time
+import bcrypt
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extensions import db
+from app.passwords import PasswordHasher
+from app.services.facade import facade
+
+def test_rounds_come_from_config(app):
+    user = facade.create_user({'first_name': 'Ada', 'last_name': 'Lovelace',
+                               'email': 'ada@example.com', 'password': 'password123'})
+    assert user.password.startswith('$2b$04$')
+    assert user.verify_password('password123')
+    assert not user.verify_password('wrong-password')
+
+def test_login_accepts_hashes_of_another_cost(client):
+    user = facade.create_user({'first_name': 'Ada', 'last_name': 'Lovelace',
+                               'email': 'ada@example.com', 'password': 'password123'})
+    user.password = bcrypt.hashpw(b'password123', bcrypt.gensalt(5)).decode('utf-8')
+    db.session.commit()
+
+    response = client.post('/api/v1/auth/login', json={'email': 'ada@example.com',
+                                                       'password': 'password123'})
+    assert response.status_code == 200
+    response = client.post('/api/v1/auth/login', json={'email': 'ada@example.com',
+                                                       'password': 'not-the-password'})
+    assert response.status_code == 401
+
+def test_long_passwords_and_malformed_hashes():
+    hasher = PasswordHasher()
+    hasher.rounds = 4
+    hashed = hasher.hash('x' * 100)
+    assert hasher.verify(hashed, 'x' * 100)
+    assert not hasher.verify('not-a-bcrypt-hash', 'password123')
+
+def test_process_pool_hashes_and_verifies():
+    hasher = PasswordHasher()
+    hasher.rounds, hasher.workers = 4, 2
+    try:
+        hashed = hasher.hash('password123')
+        assert hashed.startswith('$2b$04$')
+        assert hasher.verify(hashed, 'password123')
+        assert not hasher.verify(hashed, 'password124')
+        assert hasher._pool is not None
+    finally:
+        hasher.shutdown()
+    assert hasher._pool is None
+
+def test_concurrency_limits_simultaneous_hashes(app):
+    app.config['PASSWORD_HASH_CONCURRENCY'] = 2
+    hasher = PasswordHasher(app)
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def slow_hash(password, rounds):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return password
+
+    threads = [threading.Thread(target=hasher._run, args=(slow_hash, 'password123', 4)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
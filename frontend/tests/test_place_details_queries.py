@@ -0,0 +1,81 @@
+import sys
+import os
+from contextlib import contextmanager
+from flask import json
+from sqlalchemy import event
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extensions import db
+from app.services.facade import facade
+
+@contextmanager
+def count_queries():
+    """Compte les requêtes SQL exécutées dans le bloc."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+def create_place_with_reviews(name, review_count):
+    owner = facade.create_user({
+        'first_name': 'Owner',
+        'last_name': name,
+        'email': f'owner.{name}@example.com',
+        'password': 'password123'
+    })
+    wifi = facade.create_amenity({'name': f'Wi-Fi {name}'})
+    pool = facade.create_amenity({'name': f'Pool {name}'})
+    place = facade.create_place({
+        'title': f'Place {name}',
+        'price': 80.0,
+        'latitude': 48.85,
+        'longitude': 2.35,
+        'owner_id': owner.id,
+        'amenities': [wifi.id, pool.id]
+    })
+    for i in range(review_count):
+        reviewer = facade.create_user({
+            'first_name': 'Reviewer',
+            'last_name': f'{name}{i}',
+            'email': f'reviewer.{name}.{i}@example.com',
+            'password': 'password123'
+        })
+        facade.create_review({
+            'text': f'Review {i}',
+            'rating': 4,
+            'user_id': reviewer.id,
+            'place_id': place.id
+        })
+    return place.id
+
+def fetch_details(client, place_id):
+    db.session.expire_all()
+    with count_queries() as statements:
+        response = client.get(f'/api/v1/places/{place_id}')
+    assert response.status_code == 200
+    return json.loads(response.data), len(statements)
+
+def test_place_details_are_complete(client):
+    place_id = create_place_with_reviews('complete', 3)
+    data, _ = fetch_details(client, place_id)
+    assert data['owner']['last_name'] == 'complete'
+    assert len(data['reviews']) == 3
+    assert len(data['amenities']) == 2
+
+def test_place_details_query_count_is_constant(client):
+    small = create_place_with_reviews('small', 1)
+    large = create_place_with_reviews('large', 8)
+
+    _, small_count = fetch_details(client, small)
+    _, large_count = fetch_details(client, large)
+
+    assert small_count == large_count
+    assert large_count <= 4
@@ -0,0 +1,78 @@
+import pytest
+import sys
+import os
+from flask import json
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.facade import facade
+
+@pytest.fixture
+def listing(app):
+    """Crée trois lieux de prix, propriétaires, équipements et notes différents."""
+    alice = facade.create_user({'first_name': 'Alice', 'last_name': 'Host',
+                                'email': 'alice@example.com', 'password': 'password123'})
+    bob = facade.create_user({'first_name': 'Bob', 'last_name': 'Host',
+                              'email': 'bob@example.com', 'password': 'password123'})
+    guest = facade.create_user({'first_name': 'Guest', 'last_name': 'User',
+                                'email': 'guest@example.com', 'password': 'password123'})
+    wifi = facade.create_amenity({'name': 'Wi-Fi'})
+    pool = facade.create_amenity({'name': 'Pool'})
+
+    def place(title, price, owner, amenities, rating=None):
+        created = facade.create_place({'title': title, 'price': price, 'latitude': 0.0,
+                                       'longitude': 0.0, 'owner_id': owner.id, 'amenities': amenities})
+        if rating:
+            facade.create_review({'text': 'Nice', 'rating': rating,
+                                  'user_id': guest.id, 'place_id': created.id})
+        return created
+
+    place('Cheap', 40.0, alice, [wifi.id], rating=2)
+    place('Mid', 120.0, alice, [wifi.id, pool.id], rating=5)
+    place('Luxury', 900.0, bob, [pool.id])
+    return {'alice': alice, 'bob': bob, 'wifi': wifi, 'pool': pool}
+
+def titles(response):
+    assert response.status_code == 200
+    return [place['title'] for place in json.loads(response.data)]
+
+def test_filter_by_price_range(client, listing):
+    assert titles(client.get('/api/v1/places/?max_price=100')) == ['Cheap']
+    assert titles(client.get('/api/v1/places/?min_price=100&max_price=1000')) == ['Mid', 'Luxury']
+
+def test_filter_by_all_amenities(client, listing):
+    wifi, pool = listing['wifi'].id, listing['pool'].id
+    assert titles(client.get(f'/api/v1/places/?amenities={wifi}')) == ['Cheap', 'Mid']
+    assert titles(client.get(f'/api/v1/places/?amenities={wifi},{pool}')) == ['Mid']
+
+def test_filter_by_owner(client, listing):
+    assert titles(client.get(f"/api/v1/places/?owner_id={listing['bob'].id}")) == ['Luxury']
+
+def test_sort_by_price_and_rating(client, listing):
+    assert titles(client.get('/api/v1/places/?sort=price')) == ['Cheap', 'Mid', 'Luxury']
+    assert titles(client.get('/api/v1/places/?sort=-price')) == ['Luxury', 'Mid', 'Cheap']
+    assert titles(client.get('/api/v1/places/?sort=rating')) == ['Mid', 'Cheap', 'Luxury']
+
+def test_sorted_pages_follow_cursor(client, listing):
+    response = client.get('/api/v1/places/?sort=-price&limit=2')
+    assert titles(response) == ['Luxury', 'Mid']
+    cursor = response.headers['X-Next-Cursor']
+    assert titles(client.get(f'/api/v1/places/?sort=-price&limit=2&cursor={cursor}')) == ['Cheap']
+
+def test_cursor_is_bound_to_its_sort(client, listing):
+    cursors = {sort: client.get(f'/api/v1/places/?sort={sort}&limit=1').headers['X-Next-Cursor']
+               for sort in ('created_at', 'price', '-price', 'rating')}
+    for sort, cursor in cursors.items():
+        for other in cursors:
+            response = client.get(f'/api/v1/places/?sort={other}&limit=1&cursor={cursor}')
+            if other == sort:
+                assert response.status_code == 200
+            else:
+                assert response.status_code == 400
+                assert 'Curseur de pagination invalide' in response.get_data(as_text=True)
+
+def test_invalid_filters(client, listing):
+    assert client.get('/api/v1/places/?sort=title').status_code == 400
+    assert client.get('/api/v1/places/?min_price=abc').status_code == 400
+    assert client.get('/api/v1/places/?min_price=500&max_price=100').status_code == 400
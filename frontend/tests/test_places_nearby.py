@@ -0,0 +1,149 @@
+import pytest
+import sys
+import os
+from flask import json
+from sqlalchemy import event
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extensions import db
+from app.persistence.spatial import bounding_boxes, has_spatial_index, haversine_km, install_spatial_index
+from app.services.facade import facade
+
+@pytest.fixture
+def owner(app):
+    return facade.create_user({
+        'first_name': 'Geo',
+        'last_name': 'Owner',
+        'email': 'geo.owner@example.com',
+        'password': 'password123'
+    })
+
+def create_place(owner, title, latitude, longitude):
+    return facade.create_place({
+        'title': title,
+        'price': 100.0,
+        'latitude': latitude,
+        'longitude': longitude,
+        'owner_id': owner.id
+    })
+
+def test_haversine_known_distance():
+    # Paris -> Londres, environ 344 km
+    assert abs(haversine_km(48.8566, 2.3522, 51.5074, -0.1278) - 343.5) < 2
+
+def test_bounding_box_widens_with_latitude():
+    (_, _, equator_min, equator_max), = bounding_boxes(0.0, 0.0, 100)
+    (_, _, north_min, north_max), = bounding_boxes(70.0, 0.0, 100)
+    assert north_max - north_min > 2 * (equator_max - equator_min)
+
+def test_bounding_box_splits_on_antimeridian():
+    boxes = bounding_boxes(0.0, 179.9, 50)
+    assert len(boxes) == 2
+
+def test_spatial_index_is_created(app):
+    assert has_spatial_index(db.session)
+
+def test_nearby_filters_and_orders_by_distance(client, owner):
+    create_place(owner, 'Louvre', 48.8606, 2.3376)
+    create_place(owner, 'Versailles', 48.8049, 2.1204)
+    create_place(owner, 'Lyon', 45.7640, 4.8357)
+
+    response = client.get('/api/v1/places/nearby?lat=48.8566&lng=2.3522&radius_km=30')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert [place['title'] for place in data] == ['Louvre', 'Versailles']
+    assert data[0]['distance_km'] < data[1]['distance_km'] <= 30
+
+    response = client.get('/api/v1/places/nearby?lat=48.8566&lng=2.3522&radius_km=30&limit=1')
+    assert [place['title'] for place in json.loads(response.data)] == ['Louvre']
+
+def test_nearby_at_high_latitude(client, owner):
+    # A 70° de latitude, 1° de longitude ne fait qu'environ 38 km
+    create_place(owner, 'Tromso East', 69.65, 19.95)
+    response = client.get('/api/v1/places/nearby?lat=69.65&lng=18.95&radius_km=50')
+    assert [place['title'] for place in json.loads(response.data)] == ['Tromso East']
+
+def test_nearby_across_antimeridian(client, owner):
+    create_place(owner, 'Fiji West', -17.0, 179.95)
+    create_place(owner, 'Fiji East', -17.0, -179.95)
+    response = client.get('/api/v1/places/nearby?lat=-17.0&lng=179.99&radius_km=20')
+    assert sorted(place['title'] for place in json.loads(response.data)) == ['Fiji East', 'Fiji West']
+
+def test_spatial_index_follows_updates_and_deletes(client, owner):
+    place = create_place(owner, 'Moving', 10.0, 10.0)
+    facade.update_place(place.id, {'latitude': 20.0, 'longitude': 20.0})
+    response = client.get('/api/v1/places/nearby?lat=10.0&lng=10.0&radius_km=10')
+    assert json.loads(response.data) == []
+    response = client.get('/api/v1/places/nearby?lat=20.0&lng=20.0&radius_km=10')
+    assert [p['title'] for p in json.loads(response.data)] == ['Moving']
+
+    facade.delete_place(place.id)
+    response = client.get('/api/v1/places/nearby?lat=20.0&lng=20.0&radius_km=10')
+    assert json.loads(response.data) == []
+
+def test_nearby_returns_the_nearest_within_limit(client, owner):
+    for step in (7, 2, 9, 4, 1, 8, 3, 6, 5):
+        create_place(owner, f'Place {step}', 45.0 + step / 1000, 5.0)
+    response = client.get('/api/v1/places/nearby?lat=45.0&lng=5.0&radius_km=0.75&limit=3')
+    assert [place['title'] for place in json.loads(response.data)] == ['Place 1', 'Place 2', 'Place 3']
+    # Place 7 est à 0,78 km : hors du rayon même si la limite n'est pas atteinte
+    response = client.get('/api/v1/places/nearby?lat=45.0&lng=5.0&radius_km=0.75&limit=20')
+    assert len(json.loads(response.data)) == 6
+
+def test_spatial_index_does_not_depend_on_rowid(client, owner):
+    create_place(owner, 'Louvre', 48.8606, 2.3376)
+    create_place(owner, 'Versailles', 48.8049, 2.1204)
+    # VACUUM peut renuméroter le rowid d'une table à clé primaire TEXT
+    db.session.execute(db.text('UPDATE places SET rowid = rowid + 1000'))
+    db.session.commit()
+    response = client.get('/api/v1/places/nearby?lat=48.8566&lng=2.3522&radius_km=30')
+    assert [place['title'] for place in json.loads(response.data)] == ['Louvre', 'Versailles']
+
+def test_install_spatial_index_upgrades_existing_database(client, owner):
+    create_place(owner, 'Louvre', 48.8606, 2.3376)
+    create_place(owner, 'Versailles', 48.8049, 2.1204)
+    # Base créée avant la colonne spatial_id : index R*Tree vide, clés absentes
+    for trigger in ('places_spatial_id', 'places_rtree_insert', 'places_rtree_update', 'places_rtree_delete'):
+        db.session.execute(db.text(f'DROP TRIGGER {trigger}'))
+    db.session.execute(db.text('UPDATE places SET spatial_id = NULL'))
+    db.session.execute(db.text('DELETE FROM places_rtree'))
+    db.session.commit()
+    with db.engine.begin() as connection:
+        install_spatial_index(connection)
+    keys = db.session.execute(db.text('SELECT spatial_id FROM places')).scalars().all()
+    assert None not in keys and len(set(keys)) == 2
+    create_place(owner, 'Orsay', 48.8600, 2.3266)
+    response = client.get('/api/v1/places/nearby?lat=48.8566&lng=2.3522&radius_km=30')
+    assert [place['title'] for place in json.loads(response.data)] == ['Louvre', 'Orsay', 'Versailles']
+
+def test_spatial_index_lookup_is_cached(app):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    assert has_spatial_index(db.session)
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        assert has_spatial_index(db.session)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    assert statements == []
+
+def test_nearby_without_spatial_index(client, owner):
+    for trigger in ('places_spatial_id', 'places_rtree_insert', 'places_rtree_update', 'places_rtree_delete'):
+        db.session.execute(db.text(f'DROP TRIGGER {trigger}'))
+    db.session.execute(db.text('DROP TABLE places_rtree'))
+    db.session.commit()
+    create_place(owner, 'Louvre', 48.8606, 2.3376)
+    response = client.get('/api/v1/places/nearby?lat=48.8566&lng=2.3522&radius_km=5')
+    assert [place['title'] for place in json.loads(response.data)] == ['Louvre']
+
+def test_nearby_invalid_parameters(client):
+    assert client.get('/api/v1/places/nearby?lat=10&lng=10').status_code == 400
+    assert client.get('/api/v1/places/nearby?lat=abc&lng=10&radius_km=5').status_code == 400
+    assert client.get('/api/v1/places/nearby?lat=95&lng=10&radius_km=5').status_code == 400
+    assert client.get('/api/v1/places/nearby?lat=10&lng=10&radius_km=0').status_code == 400
+    assert client.get('/api/v1/places/nearby?lat=10&lng=10&radius_km=100000').status_code == 400
@@ -0,0 +1,96 @@
+import json
+import pytest
+import sys
+import os
+from contextlib import contextmanager
+from sqlalchemy import event
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extensions import db
+from app.persistence.projections import PLACE_LIST, USER_LIST
+from app.services.facade import facade
+
+@pytest.fixture
+def world(app):
+    owner = facade.create_user({'first_name': 'Owner', 'last_name': 'User',
+                                'email': 'owner@example.com', 'password': 'password123'})
+    guest = facade.create_user({'first_name': 'Guest', 'last_name': 'User',
+                                'email': 'guest@example.com', 'password': 'password123'})
+    wifi = facade.create_amenity({'name': 'WiFi'})
+    place_ids = [facade.create_place({'title': f'Place {i}', 'description': 'Calme', 'price': 50.0 + i,
+                                      'latitude': 45.0 + i / 100, 'longitude': 5.0, 'owner_id': owner.id,
+                                      'amenities': [wifi.id]}).id for i in range(5)]
+    facade.create_review({'text': 'Great', 'rating': 5, 'user_id': guest.id, 'place_id': place_ids[0]})
+    ids = {'owner': owner.id, 'guest': guest.id, 'wifi': wifi.id, 'places': place_ids}
+    db.session.expunge_all()
+    return ids
+
+@contextmanager
+def capture_queries():
+    """Enregistre les requêtes SQL exécutées dans le bloc."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+def test_list_methods_return_detached_rows(world):
+    users = facade.list_users()
+    assert {user.email for user in users} == {'owner@example.com', 'guest@example.com'}
+    assert all(type(user) is USER_LIST.row for user in users)
+    assert users[0]._fields == ('id', 'first_name', 'last_name', 'email', 'role')
+    assert [amenity.name for amenity in facade.list_amenities()] == ['WiFi']
+    assert [(review.text, review.rating) for review in facade.list_reviews()] == [('Great', 5)]
+    # Aucun objet ORM n'est chargé dans la session
+    assert len(db.session.identity_map) == 0
+
+def test_places_page_projection_keeps_cursor_pagination(world):
+    seen, cursor = [], None
+    while True:
+        rows, cursor = facade.get_places_page(2, cursor, sort='-price')
+        assert all(type(row) is PLACE_LIST.row for row in rows)
+        seen.extend(row.price for row in rows)
+        if cursor is None:
+            break
+    assert seen == [54.0, 53.0, 52.0, 51.0, 50.0]
+    rows, _ = facade.get_places_page(10, filters={'amenity_ids': [world['wifi']], 'max_price': 51})
+    assert sorted(row.title for row in rows) == ['Place 0', 'Place 1']
+    assert len(db.session.identity_map) == 0
+
+def test_nearby_projection(world):
+    results = facade.get_places_nearby(45.0, 5.0, 3, 10)
+    assert [row.title for row, _ in results] == ['Place 0', 'Place 1', 'Place 2']
+    assert results[0][1] == pytest.approx(0.0)
+    assert len(db.session.identity_map) == 0
+
+@pytest.mark.parametrize('url, absent', [
+    ('/api/v1/places/', 'description'),
+    ('/api/v1/places/nearby?lat=45&lng=5&radius_km=10', 'description'),
+    ('/api/v1/users/', 'password'),
+    ('/api/v1/reviews/', 'created_at'),
+])
+def test_list_endpoints_select_only_their_columns(client, world, url, absent):
+    with capture_queries() as statements:
+        response = client.get(url)
+    assert response.status_code == 200
+    listing = [statement for statement in statements if 'updated_at)' not in statement]
+    assert listing and all(absent not in statement for statement in listing)
+
+def test_list_endpoints_keep_their_format(client, world):
+    places = json.loads(client.get('/api/v1/places/?sort=price').data)
+    assert places[0] == {'id': world['places'][0], 'title': 'Place 0', 'price': 50.0, 'latitude': 45.0,
+                         'longitude': 5.0, 'avg_rating': 5.0, 'review_count': 1}
+    users = json.loads(client.get('/api/v1/users/').data)
+    assert {'id': world['guest'], 'first_name': 'Guest', 'last_name': 'User',
+            'email': 'guest@example.com', 'role': 'user'} in users
+    reviews = json.loads(client.get('/api/v1/reviews/').data)
+    assert reviews == [{'id': reviews[0]['id'], 'text': 'Great', 'rating': 5,
+                        'user_id': world['guest'], 'place_id': world['places'][0]}]
+    assert json.loads(client.get('/api/v1/amenities/').data) == [{'id': world['wifi'], 'name': 'WiFi'}]
@@ -0,0 +1,139 @@
+import pytest
+import sys
+import os
+from sqlalchemy import event
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extensions import db
+from app.models.place import Place
+from app.models.review import Review
+from app.services.facade import facade
+
+@pytest.fixture
+def world(world):
+    # Les requêtes doivent être émises, pas servies par l'identity map
+    db.session.expire_all()
+    return world
+
+def query_plans(call):
+    """Exécute `call` et renvoie le plan EXPLAIN QUERY PLAN de chaque requête émise."""
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+            statements.append((statement, parameters))
+    with db.engine.connect() as connection:
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            call()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+            db.session.rollback()
+        plans = []
+        for statement, parameters in statements:
+            rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+            plans.append((statement, [row[-1] for row in rows]))
+    assert plans, 'aucune requête émise'
+    return plans
+
+def full_scans(plans):
+    # « SCAN places » parcourt la table ; « SCAN places USING INDEX » parcourt un index
+    # et « SCAN places_rtree VIRTUAL TABLE INDEX » interroge l'index R*Tree.
+    # Le catalogue sqlite_master (détection de l'index spatial) n'est pas une table applicative.
+    return [(statement, detail) for statement, details in plans for detail in details
+            if detail.startswith('SCAN') and not detail.startswith('SCAN sqlite_master')
+            and not any(marker in detail for marker in ('USING', 'VIRTUAL TABLE INDEX', 'CONSTANT ROW'))]
+
+REPOSITORY_QUERIES = {
+    'review.get_reviews_by_place': lambda w: facade.review_repo.get_reviews_by_place(w['place']),
+    'review.get_reviews_by_user': lambda w: facade.review_repo.get_reviews_by_user(w['guest']),
+    'review.has_reviewed': lambda w: facade.review_repo.has_reviewed(w['place'], w['guest']),
+    'review.get_reviewed_pairs': lambda w: facade.review_repo.get_reviewed_pairs([w['place']], [w['guest']]),
+    'review.get_average_rating_for_place': lambda w: facade.review_repo.get_average_rating_for_place(w['place']),
+    'review.delete_reviews_by_place': lambda w: facade.review_repo.delete_reviews_by_place(w['place']),
+    'review.delete_reviews_for_user': lambda w: facade.review_repo.delete_reviews_for_user(w['owner']),
+    'place.get_with_details': lambda w: facade.place_repo.get_with_details(w['place']),
+    'place.get_places_page.owner': lambda w: facade.place_repo.get_places_page(10, owner_id=w['owner']),
+    'place.get_places_page.amenities': lambda w: facade.place_repo.get_places_page(10, amenity_ids=[w['wifi']]),
+    'place.get_places_page.price': lambda w: facade.place_repo.get_places_page(10, min_price=50, sort='price'),
+    'place.get_places_nearby': lambda w: facade.place_repo.get_places_nearby(45.0, 5.0, 10, 10),
+    'place.get_places_by_owner': lambda w: facade.place_repo.get_places_by_owner(w['owner']),
+    'place.get_places_by_price_range': lambda w: facade.place_repo.get_places_by_price_range(50, 100),
+    'place.get_places_by_location': lambda w: facade.place_repo.get_places_by_location(45.0, 5.0, 1),
+    'place.get_owner_ids': lambda w: facade.place_repo.get_owner_ids([w['place']]),
+    'place.adjust_rating': lambda w: facade.place_repo.adjust_rating(w['place'], 1, 4),
+    'place.remove_ratings_of_user': lambda w: facade.place_repo.remove_ratings_of_user(w['guest']),
+    'place.delete_places_by_owner': lambda w: facade.place_repo.delete_places_by_owner(w['owner']),
+    'place.user_places': lambda w: facade.user_repo.get(w['owner']).places,
+    'amenity.delete_with_links': lambda w: facade.amenity_repo.delete_with_links(w['wifi']),
+    'user.get_user_by_email': lambda w: facade.user_repo.get_user_by_email('guest@example.com'),
+    'user.get_users_by_role': lambda w: facade.user_repo.get_users_by_role('admin'),
+    'user.get_admins': lambda w: facade.user_repo.get_admins(),
+    'user.get_existing_ids': lambda w: facade.user_repo.get_existing_ids([w['owner'], w['guest']]),
+    'place.get_detail_version': lambda w: facade.place_repo.get_detail_version(w['place']),
+    'place.get_reviews_version': lambda w: facade.place_repo.get_reviews_version(w['place']),
+    'review.get_detail_version': lambda w: facade.review_repo.get_detail_version(w['review']),
+    'user.get_version': lambda w: facade.user_repo.get_version(w['owner']),
+    'place.get_collection_version': lambda w: facade.place_repo.get_collection_version(),
+    'review.get_collection_version': lambda w: facade.review_repo.get_collection_version(),
+    'user.get_collection_version': lambda w: facade.user_repo.get_collection_version(),
+    'amenity.get_collection_version': lambda w: facade.amenity_repo.get_collection_version(),
+}
+
+@pytest.mark.parametrize('name', sorted(REPOSITORY_QUERIES))
+def test_repository_query_uses_an_index(world, name):
+    plans = query_plans(lambda: REPOSITORY_QUERIES[name](world))
+    assert full_scans(plans) == []
+
+def test_full_scan_is_detected(world):
+    # Garde-fou : le test ci-dessus doit échouer sur une colonne non indexée
+    plans = query_plans(lambda: facade.review_repo.model.query.filter_by(_text='Great').all())
+    assert full_scans(plans)
+
+def executed_statements(call):
+    """Exécute `call` et renvoie son résultat et les requêtes SQL émises."""
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        return call(), statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+# (appel, condition attendue dans la clause WHERE, titres / valeurs attendus)
+PUSHDOWN_QUERIES = {
+    'place.get_places_by_owner': (lambda w: [p.title for p in facade.place_repo.get_places_by_owner(w['owner'])],
+                                  'places.owner_id = ?', ['Loft']),
+    'place.get_places_by_price_range': (lambda w: [p.title for p in facade.place_repo.get_places_by_price_range(100, 200)],
+                                        'places.price >= ?', ['Castle']),
+    'place.get_places_by_location': (lambda w: [p.title for p in facade.place_repo.get_places_by_location(45.0, 5.0, 1)],
+                                     'places.latitude BETWEEN ? AND ?', ['Loft']),
+    'place.title': (lambda w: [p.title for p in Place.query.filter(Place.title.like('Ca%')).all()],
+                    'places.title LIKE ?', ['Castle']),
+    'place.order_by_price': (lambda w: [p.title for p in Place.query.order_by(Place.price.desc()).all()],
+                             'ORDER BY places.price DESC', ['Castle', 'Loft']),
+    'review.get_reviews_by_rating': (lambda w: [r.text for r in facade.review_repo.get_reviews_by_rating(5)],
+                                     'reviews.rating = ?', ['Great']),
+    'review.text': (lambda w: [r.rating for r in Review.query.filter(Review.text == 'Great').all()],
+                    'reviews.text = ?', [5]),
+    'amenity.get_amenity_by_name': (lambda w: [facade.amenity_repo.get_amenity_by_name('WiFi').name],
+                                    'amenities.name = ?', ['WiFi']),
+    'amenity.search_amenities_by_name': (lambda w: [a.name for a in facade.amenity_repo.search_amenities_by_name('fi')],
+                                         'lower(amenities.name) LIKE lower(?)', ['WiFi']),
+}
+
+@pytest.mark.parametrize('name', sorted(PUSHDOWN_QUERIES))
+def test_hybrid_property_filters_run_in_sql(world, name):
+    call, condition, expected = PUSHDOWN_QUERIES[name]
+    other = facade.create_user({'first_name': 'Other', 'last_name': 'User',
+                                'email': 'other@example.com', 'password': 'password123'})
+    facade.create_place({'title': 'Castle', 'price': 150.0, 'latitude': 48.0, 'longitude': 2.0,
+                         'owner_id': other.id})
+    facade.create_amenity({'name': 'Parking'})
+    db.session.expire_all()
+
+    result, statements = executed_statements(lambda: call(world))
+    assert result == expected
+    assert any(condition in statement for statement in statements), statements
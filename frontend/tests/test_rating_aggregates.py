@@ -0,0 +1,82 @@
+import pytest
+import sys
+import os
+from flask import json
+from sqlalchemy import event
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extensions import db
+from app.models.place import Place
+from app.services.facade import facade
+
+@pytest.fixture
+def place(app):
+    owner = facade.create_user({'first_name': 'Owner', 'last_name': 'Host',
+                                'email': 'owner@example.com', 'password': 'password123'})
+    return facade.create_place({'title': 'Rated', 'price': 75.0, 'latitude': 1.0,
+                                'longitude': 1.0, 'owner_id': owner.id})
+
+def create_guest(index):
+    return facade.create_user({'first_name': 'Guest', 'last_name': f'{index}',
+                               'email': f'guest{index}@example.com', 'password': 'password123'})
+
+def aggregates(place_id):
+    db.session.expire_all()
+    place = db.session.get(Place, place_id)
+    return place.review_count, place.rating_sum, place.avg_rating
+
+def test_aggregates_follow_review_lifecycle(place):
+    first = facade.create_review({'text': 'Good', 'rating': 4,
+                                  'user_id': create_guest(1).id, 'place_id': place.id})
+    second = facade.create_review({'text': 'Perfect', 'rating': 5,
+                                   'user_id': create_guest(2).id, 'place_id': place.id})
+    assert aggregates(place.id) == (2, 9, 4.5)
+
+    facade.update_review(first.id, {'rating': 2})
+    assert aggregates(place.id) == (2, 7, 3.5)
+
+    facade.delete_review(second.id)
+    assert aggregates(place.id) == (1, 2, 2.0)
+
+    facade.delete_review(first.id)
+    assert aggregates(place.id) == (0, 0, 0.0)
+
+def test_deleting_a_user_updates_reviewed_places(place):
+    guest = create_guest(1)
+    facade.create_review({'text': 'Good', 'rating': 3, 'user_id': guest.id, 'place_id': place.id})
+    facade.delete_user(guest.id)
+    assert aggregates(place.id) == (0, 0, 0.0)
+
+def test_aggregates_cannot_be_set_directly(place):
+    facade.update_place(place.id, {'review_count': 100, 'avg_rating': 5.0})
+    assert aggregates(place.id) == (0, 0, 0.0)
+
+def test_recompute_repairs_aggregates(place):
+    facade.create_review({'text': 'Good', 'rating': 4,
+                          'user_id': create_guest(1).id, 'place_id': place.id})
+    db.session.execute(db.update(Place).values(review_count=0, rating_sum=0, avg_rating=0.0))
+    db.session.commit()
+
+    assert facade.recompute_rating_aggregates() == 1
+    assert aggregates(place.id) == (1, 4, 4.0)
+
+def test_list_returns_avg_rating_without_reading_reviews(client, place):
+    facade.create_review({'text': 'Good', 'rating': 4,
+                          'user_id': create_guest(1).id, 'place_id': place.id})
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        response = client.get('/api/v1/places/?sort=rating')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    data = json.loads(response.data)
+    assert data[0]['avg_rating'] == 4.0
+    assert data[0]['review_count'] == 1
+    assert not any('reviews' in statement for statement in statements)
+
+    detail = json.loads(client.get(f'/api/v1/places/{place.id}').data)
+    assert detail['avg_rating'] == 4.0
@@ -0,0 +1,162 @@
+import pytest
+import sys
+import os
+from contextlib import contextmanager
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extensions import db
+from app.response_cache import MemoryStore, SQLiteStore
+from app.services.facade import facade
+from config import TestingConfig
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def config(request, tmp_path):
+    class CachedConfig(TestingConfig):
+        RESPONSE_CACHE_BACKEND = request.param
+        RESPONSE_CACHE_PATH = str(tmp_path / 'response_cache.db')
+
+    return CachedConfig
+
+@contextmanager
+def count_queries():
+    """Compte les requêtes SQL exécutées dans le bloc."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+def auth(user_id, is_admin=False):
+    token = create_access_token(identity=user_id, additional_claims={'is_admin': is_admin})
+    return {'Authorization': f'Bearer {token}'}
+
+URLS = {
+    'places': lambda w: '/api/v1/places/',
+    'place': lambda w: f"/api/v1/places/{w['place']}",
+    'place.reviews': lambda w: f"/api/v1/places/{w['place']}/reviews",
+    'amenities': lambda w: '/api/v1/amenities/',
+}
+
+@pytest.mark.parametrize('name', sorted(URLS))
+def test_hit_skips_flask_and_database(app, client, world, name):
+    url = URLS[name](world)
+    dispatched = []
+    app.before_request(lambda: dispatched.append(1))
+
+    first = client.get(url)
+    assert first.headers['X-Cache'] == 'MISS'
+    assert 'X-Cache-Tags' not in first.headers
+    with count_queries() as statements:
+        second = client.get(url)
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.data == first.data
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert dispatched == [1] and statements == []
+
+def test_hit_answers_if_none_match(client, world):
+    url = f"/api/v1/places/{world['place']}"
+    etag = client.get(url).headers['ETag']
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+def test_query_string_is_normalized(client, world):
+    client.get('/api/v1/places/?sort=price&min_price=10')
+    assert client.get('/api/v1/places/?min_price=10&sort=price').headers['X-Cache'] == 'HIT'
+    assert client.get('/api/v1/places/?min_price=20&sort=price').headers['X-Cache'] == 'MISS'
+
+def test_authenticated_and_untagged_requests_bypass_the_cache(client, world):
+    url = '/api/v1/places/'
+    client.get(url)
+    assert 'X-Cache' not in client.get(url, headers=auth(world['owner'])).headers
+    client.get('/api/v1/users/')
+    assert client.get('/api/v1/users/').headers['X-Cache'] == 'MISS'
+
+# (URL observée, écriture qui doit la purger, texte attendu ensuite dans la réponse)
+WRITES = {
+    'places.create': ('places', lambda c, w: c.post('/api/v1/places/', json={
+        'title': 'Castle', 'price': 150.0, 'latitude': 48.0, 'longitude': 2.0, 'owner_id': w['owner']},
+        headers=auth(w['owner'])), b'Castle'),
+    'places.review': ('places', lambda c, w: c.put(f"/api/v1/reviews/{w['review']}", json={'rating': 2},
+                                                    headers=auth(w['guest'])), b'2.0'),
+    'place.owner': ('place', lambda c, w: c.put(f"/api/v1/users/{w['owner']}", json={'first_name': 'Olga'},
+                                                 headers=auth(w['owner'])), b'Olga'),
+    'place.amenity': ('place', lambda c, w: c.put(f"/api/v1/amenities/{w['wifi']}", json={'name': 'Fiber'},
+                                                   headers=auth(w['owner'], is_admin=True)), b'Fiber'),
+    'place.reviews.author': ('place.reviews', lambda c, w: c.put(f"/api/v1/users/{w['guest']}",
+                                                                  json={'last_name': 'Visitor'},
+                                                                  headers=auth(w['guest'])), b'Visitor'),
+    'amenities.create': ('amenities', lambda c, w: c.post('/api/v1/amenities/', json={'name': 'Pool'},
+                                                           headers=auth(w['owner'], is_admin=True)), b'Pool'),
+    'amenities.bulk': ('amenities', lambda c, w: c.post('/api/v1/amenities/bulk', json=[{'name': 'Sauna'}],
+                                                         headers=auth(w['owner'], is_admin=True)), b'Sauna'),
+}
+
+@pytest.mark.parametrize('name', sorted(WRITES))
+def test_facade_writes_purge_tagged_responses(client, world, name):
+    target, write, expected = WRITES[name]
+    url = URLS[target](world)
+    client.get(url)
+    assert client.get(url).headers['X-Cache'] == 'HIT'
+
+    assert write(client, world).status_code in (200, 201)
+    response = client.get(url)
+    assert response.headers['X-Cache'] == 'MISS'
+    assert expected in response.data
+
+def test_unrelated_write_keeps_entries(client, world):
+    url = f"/api/v1/places/{world['place']}"
+    client.get(url)
+    client.post('/api/v1/amenities/', json={'name': 'Pool'}, headers=auth(world['owner'], is_admin=True))
+    assert client.get(url).headers['X-Cache'] == 'HIT'
+
+def test_rolled_back_write_purges_nothing_stale(client, world):
+    url = f"/api/v1/places/{world['place']}"
+    client.get(url)
+    with pytest.raises(RuntimeError):
+        with facade.transaction():
+            facade.update_place(world['place'], {'title': 'Attic'})
+            raise RuntimeError
+    response = client.get(url)
+    assert b'Loft' in response.data
+
+@pytest.mark.parametrize('make_store', [lambda tmp: MemoryStore(10),
+                                        lambda tmp: SQLiteStore(str(tmp / 'store.db'), 10)],
+                         ids=['memory', 'sqlite'])
+def test_store_ignores_response_computed_during_a_purge(tmp_path, make_store):
+    store = make_store(tmp_path)
+    generation = store.generation()
+    store.purge(['place:1'])
+    assert not store.set('key', ('200 OK', [], b'stale'), ['place:1'], 60, generation)
+    assert store.get('key') is None
+    assert store.set('key', ('200 OK', [], b'fresh'), ['place:1'], 60, store.generation())
+    assert store.get('key') == ('200 OK', [], b'fresh')
+
+def test_sqlite_store_purge_is_shared_between_processes(tmp_path):
+    # Deux instances sur le même fichier, comme deux workers du serveur
+    path = str(tmp_path / 'shared.db')
+    writer, reader = SQLiteStore(path, 10), SQLiteStore(path, 10)
+    writer.set('key', ('200 OK', [('ETag', '"a"')], b'body'), ['place:1', 'place:*'], 60, writer.generation())
+    assert reader.get('key') == ('200 OK', [('ETag', '"a"')], b'body')
+    reader.purge(['place:*'])
+    assert writer.get('key') is None
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemoryStore(2)
+    for key in ('a', 'b'):
+        store.set(key, ('200 OK', [], key.encode()), [f'tag:{key}'], 60, store.generation())
+    store.get('a')
+    store.set('c', ('200 OK', [], b'c'), ['tag:c'], 60, store.generation())
+    assert store.get('b') is None and store.get('a') is not None
+    store.purge(['tag:b'])
+    assert store.get('c') is not None
@@ -0,0 +1,88 @@
+import pytest
+import sys
+import os
+import uuid
+from datetime import datetime
+from sqlalchemy import event, insert
+from sqlalchemy.exc import IntegrityError
+from flask_jwt_extended import create_access_token
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extensions import db
+from app.models.review import Review
+from app.services.facade import facade
+
+def create_user(index):
+    return facade.create_user({'first_name': 'User', 'last_name': f'{index}',
+                               'email': f'user{index}@example.com', 'password': 'password123'})
+
+def auth(user):
+    token = create_access_token(identity=user.id, additional_claims={'is_admin': False})
+    return {'Authorization': f'Bearer {token}'}
+
+def create_place(owner, title):
+    return facade.create_place({'title': title, 'price': 80.0, 'latitude': 45.0,
+                                'longitude': 5.0, 'owner_id': owner.id})
+
+def add_reviews(place, count):
+    """Insère directement `count` avis de nouveaux utilisateurs sur un lieu."""
+    now = datetime.utcnow()
+    users = [create_user(f'{place.title}-{i}') for i in range(count)]
+    db.session.execute(insert(Review), [
+        {'id': str(uuid.uuid4()), '_text': 'Nice', '_rating': 4, 'user_id': user.id,
+         'place_id': place.id, 'created_at': now, 'updated_at': now} for user in users])
+    db.session.commit()
+
+def test_second_review_of_same_place_is_rejected(client):
+    owner, guest = create_user('owner'), create_user('guest')
+    place = create_place(owner, 'Loft')
+    payload = {'text': 'Great', 'rating': 5, 'user_id': guest.id, 'place_id': place.id}
+
+    assert client.post('/api/v1/reviews/', json=payload, headers=auth(guest)).status_code == 201
+    response = client.post('/api/v1/reviews/', json=payload, headers=auth(guest))
+    assert response.status_code == 400
+    assert 'already reviewed' in response.get_json()['message']
+    assert len(facade.get_reviews_by_place(place.id)) == 1
+    assert facade.get_place(place.id).review_count == 1
+
+def test_database_rejects_duplicate_review(app):
+    owner, guest = create_user('owner'), create_user('guest')
+    place = create_place(owner, 'Loft')
+    facade.create_review({'text': 'Great', 'rating': 5, 'user_id': guest.id, 'place_id': place.id})
+    now = datetime.utcnow()
+    with pytest.raises(IntegrityError):
+        db.session.execute(insert(Review).values(
+            id=str(uuid.uuid4()), _text='Again', _rating=1, user_id=guest.id,
+            place_id=place.id, created_at=now, updated_at=now))
+    db.session.rollback()
+
+def test_posting_a_review_does_not_depend_on_existing_reviews(client):
+    owner = create_user('owner')
+    quiet, busy = create_place(owner, 'Quiet'), create_place(owner, 'Busy')
+    add_reviews(quiet, 1)
+    add_reviews(busy, 50)
+    guest = create_user('guest')
+
+    def statements_for(place):
+        statements = []
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        headers = auth(guest)
+        db.session.expire_all()
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            response = client.post('/api/v1/reviews/', headers=headers,
+                                   json={'text': 'Fine', 'rating': 3, 'user_id': guest.id,
+                                         'place_id': place.id})
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        assert response.status_code == 201
+        return statements
+
+    quiet_statements = statements_for(quiet)
+    busy_statements = statements_for(busy)
+    assert len(quiet_statements) == len(busy_statements)
+    # Aucun chargement des avis du lieu : seule la requête EXISTS touche reviews.place_id
+    assert not any('reviews.place_id = ?' in s and 'EXISTS' not in s for s in busy_statements)
@@ -0,0 +1,66 @@
+import json
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import serializers
+from app.serializers import AMENITY, PLACE_DETAIL, PLACE_LIST, Nested, Serializer
+from app.services.facade import facade
+
+@pytest.fixture
+def place(world):
+    return facade.place_repo.get_with_details(world['place'])
+
+def test_serializer_compiles_fields_in_order():
+    owner = Serializer('Owner', 'id', ('name', '_name'))
+    serializer = Serializer('Thing', ('label', 'title'), 'id', owner=Nested(owner),
+                            parts=Nested(owner, source='children', many=True))
+    obj = SimpleNamespace(id='1', title='Thing', owner=SimpleNamespace(id='2', _name='Ann'),
+                          children=[SimpleNamespace(id='3', _name='Bob')])
+    expected = {'label': 'Thing', 'id': '1', 'owner': {'id': '2', 'name': 'Ann'},
+                'parts': [{'id': '3', 'name': 'Bob'}]}
+    assert serializer(obj) == expected
+    assert list(serializer(obj)) == list(serializer.keys) == ['label', 'id', 'owner', 'parts']
+    assert serializer.many([obj, obj]) == [expected, expected]
+    obj.owner = None
+    assert serializer(obj)['owner'] is None
+
+def test_serializer_rejects_invalid_attributes():
+    with pytest.raises(ValueError):
+        Serializer('Bad', ('id', 'id + 1'))
+
+def test_model_views_match_the_api_format(place):
+    detail = PLACE_DETAIL(place)
+    assert detail['title'] == 'Loft' and detail['price'] == 80.0
+    assert detail['owner'] == {'id': place.owner.id, 'first_name': 'Owner', 'last_name': 'User',
+                               'email': 'owner@example.com'}
+    assert detail['reviews'] == [{'id': place.reviews[0].id, 'text': 'Great', 'rating': 5,
+                                  'user_id': place.reviews[0].user_id}]
+    assert detail['amenities'] == AMENITY.many(place.amenities) == [{'id': place.amenities[0].id, 'name': 'WiFi'}]
+    assert PLACE_LIST(place) == {'id': place.id, 'title': 'Loft', 'price': 80.0, 'latitude': 45.0,
+                                 'longitude': 5.0, 'avg_rating': 5.0, 'review_count': 1}
+
+def test_responses_are_encoded_with_orjson(client, place):
+    response = client.get(f'/api/v1/places/{place.id}')
+    assert response.data.endswith(b'}\n')
+    assert json.loads(response.data) == PLACE_DETAIL(place)
+    if serializers.orjson is not None:
+        # Sortie compacte, UTF-8 sans échappement
+        assert b'"title":"Loft"' in response.data
+        assert 'Près du port'.encode() in response.data
+
+def test_restx_json_settings_keep_the_stdlib_encoder(app, client, place):
+    app.config['RESTX_JSON'] = {'sort_keys': True}
+    response = client.get(f'/api/v1/places/{place.id}/reviews')
+    assert response.data.startswith(b'[{"id": ')
+    assert json.loads(response.data)[0]['user']['first_name'] == 'Guest'
+
+def test_stdlib_fallback_without_orjson(client, place, monkeypatch):
+    monkeypatch.setattr(serializers, 'orjson', None)
+    response = client.get('/api/v1/places/')
+    assert json.loads(response.data) == [PLACE_LIST(place)]
+    assert serializers.dumps({'a': 1}) == b'{"a": 1}'
@@ -0,0 +1,54 @@
+import pytest
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+from config import Config
+
+def make_config(path, pragmas):
+    class PragmaConfig:
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        JWT_SECRET_KEY = 'test'
+        SQLITE_PRAGMAS = pragmas
+    return PragmaConfig
+
+def read_pragmas(app):
+    with app.app_context():
+        with db.engine.connect() as connection:
+            values = {name: connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+                      for name in ('journal_mode', 'synchronous', 'cache_size',
+                                   'mmap_size', 'temp_store', 'busy_timeout')}
+        db.engine.dispose()
+    return values
+
+def test_profile_applied_to_every_connection(tmp_path):
+    app = create_app(make_config(tmp_path / 'tuned.db', Config.SQLITE_PRAGMAS))
+    assert read_pragmas(app) == {
+        'journal_mode': 'wal',
+        'synchronous': 1,  # NORMAL
+        'cache_size': -64000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 2,  # MEMORY
+        'busy_timeout': 5000,
+    }
+
+def test_profile_is_configurable(tmp_path):
+    pragmas = {'journal_mode': 'DELETE', 'synchronous': 'FULL', 'busy_timeout': 100}
+    values = read_pragmas(create_app(make_config(tmp_path / 'custom.db', pragmas)))
+    assert (values['journal_mode'], values['synchronous'], values['busy_timeout']) == ('delete', 2, 100)
+
+def test_empty_profile_keeps_sqlite_defaults(tmp_path):
+    values = read_pragmas(create_app(make_config(tmp_path / 'plain.db', None)))
+    assert values['journal_mode'] == 'delete'
+    assert values['synchronous'] == 2
+
+@pytest.mark.parametrize('pragmas', [{'journal_mode': 'WAL; DROP TABLE users'},
+                                     {'user_version': 3}])
+def test_invalid_profile_is_rejected(tmp_path, pragmas):
+    with pytest.raises(ValueError):
+        create_app(make_config(tmp_path / 'invalid.db', pragmas))
@@ -0,0 +1,102 @@
+import pytest
+import sys
+import os
+from contextlib import contextmanager
+from sqlalchemy import event, func, select
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.persistence.unit_of_work import in_transaction, on_commit
+from app.services.facade import facade
+
+@contextmanager
+def count_commits():
+    commits = []
+
+    def commit(conn):
+        commits.append(conn)
+
+    event.listen(db.engine, 'commit', commit)
+    try:
+        yield commits
+    finally:
+        event.remove(db.engine, 'commit', commit)
+
+def user_data(index):
+    return {'first_name': 'User', 'last_name': f'{index}',
+            'email': f'user{index}@example.com', 'password': 'password123'}
+
+def count(model):
+    return db.session.scalar(select(func.count()).select_from(model))
+
+def test_facade_write_commits_once(app):
+    owner = facade.create_user(user_data(1))
+    guest = facade.create_user(user_data(2))
+    place = facade.create_place({'title': 'Loft', 'price': 80.0, 'latitude': 1.0,
+                                 'longitude': 1.0, 'owner_id': owner.id})
+
+    with count_commits() as commits:
+        facade.create_review({'text': 'Nice', 'rating': 5,
+                              'user_id': guest.id, 'place_id': place.id})
+    assert len(commits) == 1
+
+def test_transaction_commits_once_at_outer_boundary(app):
+    with count_commits() as commits:
+        with facade.transaction():
+            owner = facade.create_user(user_data(1))
+            assert in_transaction()
+            for index in range(3):
+                facade.create_place({'title': f'Place {index}', 'price': 10.0, 'latitude': 1.0,
+                                     'longitude': 1.0, 'owner_id': owner.id})
+            assert commits == []
+
+    assert len(commits) == 1
+    assert not in_transaction()
+    assert count(Place) == 3
+
+def test_transaction_rolls_back_everything_on_error(app):
+    with pytest.raises(ValueError):
+        with facade.transaction():
+            owner = facade.create_user(user_data(1))
+            facade.create_place({'title': 'Loft', 'price': 80.0, 'latitude': 1.0,
+                                 'longitude': 1.0, 'owner_id': owner.id})
+            facade.create_place({'title': 'Broken', 'price': -1, 'latitude': 1.0,
+                                 'longitude': 1.0, 'owner_id': owner.id})
+
+    assert not in_transaction()
+    assert count(User) == 0
+    assert count(Place) == 0
+
+def test_failed_facade_call_leaves_no_partial_write(app):
+    owner = facade.create_user(user_data(1))
+    place = facade.create_place({'title': 'Loft', 'price': 80.0, 'latitude': 1.0,
+                                 'longitude': 1.0, 'owner_id': owner.id})
+
+    with pytest.raises(ValueError):
+        facade.update_place(place.id, {'title': 'Renamed', 'price': -5})
+
+    db.session.expire_all()
+    assert db.session.get(Place, place.id).title == 'Loft'
+
+def test_on_commit_runs_after_outer_commit_only(app):
+    calls = []
+    with count_commits() as commits:
+        with facade.transaction():
+            with facade.transaction():
+                facade.create_user(user_data(1))
+                on_commit(lambda: calls.append(len(commits)))
+            assert calls == []
+    assert calls == [1]
+
+    with pytest.raises(ValueError):
+        with facade.transaction():
+            on_commit(lambda: calls.append('rolled back'))
+            raise ValueError('échec')
+    assert calls == [1]
+
+    on_commit(lambda: calls.append('immediate'))
+    assert calls == [1, 'immediate']
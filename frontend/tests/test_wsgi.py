@@ -0,0 +1,94 @@
+import pytest
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+import serve
+
+def make_config(path):
+    class ForkConfig:
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        JWT_SECRET_KEY = 'test'
+    return ForkConfig
+
+def test_production_config_reads_environment(monkeypatch, tmp_path):
+    url = f"sqlite:///{tmp_path / 'from-env.db'}"
+    monkeypatch.setenv('DATABASE_URL', url)
+    monkeypatch.setenv('SECRET_KEY', 'a-deployment-secret')
+    monkeypatch.setenv('JWT_SECRET_KEY', 'a-deployment-jwt-secret')
+    import importlib
+    import config
+    importlib.reload(config)
+    try:
+        app = create_app('config.ProductionConfig')
+        assert app.config['DEBUG'] is False
+        assert app.config['SQLALCHEMY_DATABASE_URI'] == url
+    finally:
+        monkeypatch.delenv('DATABASE_URL')
+        monkeypatch.delenv('SECRET_KEY')
+        monkeypatch.delenv('JWT_SECRET_KEY')
+        importlib.reload(config)
+
+@pytest.mark.parametrize('secrets', [{}, {'SECRET_KEY': 'a-deployment-secret'},
+                                     {'SECRET_KEY': 'a-deployment-secret',
+                                      'JWT_SECRET_KEY': 'default_jwt_secret_key'}])
+def test_production_config_requires_secrets(monkeypatch, tmp_path, secrets):
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'secrets.db'}")
+    monkeypatch.delenv('SECRET_KEY', raising=False)
+    monkeypatch.delenv('JWT_SECRET_KEY', raising=False)
+    for name, value in secrets.items():
+        monkeypatch.setenv(name, value)
+    import importlib
+    import config
+    importlib.reload(config)
+    try:
+        with pytest.raises(RuntimeError, match='_KEY'):
+            create_app('config.ProductionConfig')
+    finally:
+        monkeypatch.undo()
+        importlib.reload(config)
+
+def test_serve_options_from_environment_and_arguments(monkeypatch):
+    monkeypatch.setenv('WEB_WORKERS', '3')
+    monkeypatch.setenv('WEB_THREADS', '4')
+    options = serve.parse_args(['--bind', '127.0.0.1:9000', '--server', 'gunicorn'])
+    assert (options.workers, options.threads, options.bind) == (3, 4, '127.0.0.1:9000')
+    assert options.config == 'config.ProductionConfig'
+    assert serve.parse_args(['--workers', '1', '--server', 'gunicorn']).workers == 1
+    with pytest.raises(SystemExit):
+        serve.parse_args(['--workers', '0', '--server', 'gunicorn'])
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork')
+def test_forked_child_gets_a_fresh_connection_pool(tmp_path):
+    app = create_app(make_config(tmp_path / 'fork.db'))
+    with app.app_context():
+        db.create_all()
+        connection = db.engine.connect()
+        parent_pool = db.engine.pool
+        assert parent_pool.checkedout() == 1
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                fresh = db.engine.pool is not parent_pool and db.engine.pool.checkedout() == 0
+                with db.engine.connect() as child_connection:
+                    works = child_connection.exec_driver_sql('SELECT 1').scalar() == 1
+                os.write(write_fd, b'1' if fresh and works else b'0')
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        result = os.read(read_fd, 1)
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+
+        assert result == b'1'
+        assert db.engine.pool is parent_pool
+        assert connection.exec_driver_sql('SELECT 1').scalar() == 1
+        connection.close()
+        db.drop_all()
@@ -0,0 +1,12 @@
+"""
+Ce fichier expose l'application WSGI pour les serveurs de production.
+La configuration est choisie par la variable d'environnement HBNB_CONFIG
+(config.ProductionConfig par défaut).
+
+Exemple : gunicorn --workers 4 --threads 2 --bind 0.0.0.0:5000 wsgi:app
+"""
+
+import os
+from app import create_app
+
+app = create_app(os.getenv('HBNB_CONFIG', 'config.ProductionConfig'))
@@ -2,7 +2,7 @@
 
 # Script pour lancer les deux serveurs nécessaires pour l'application HBnB
 # 1. Le serveur API Flask sur le port 5000
-# 2. Le serveur HTTP Python pour le frontend sur le port 8000
+# 2. Le serveur de fichiers statiques du frontend sur le port 8000 (scripts/static_server.py)
 
 # Définir les couleurs pour une meilleure lisibilité
 GREEN='\033[0;32m'
@@ -65,6 +65,7 @@ kill_port() {
         if [ $port -eq 8000 ]; then
             echo -e "${YELLOW}Recherche de processus Python pouvant utiliser le port $port...${NC}"
             pkill -f "python -m http.server" 2>/dev/null || true
+            pkill -f "scripts/static_server.py" 2>/dev/null || true
             pkill -f "SimpleHTTPServer" 2>/dev/null || true
         fi
         
@@ -99,6 +100,7 @@ stop_servers() {
     echo -e "${YELLOW}Arrêt des processus spécifiques...${NC}"
     pkill -f "python run.py" 2>/dev/null || true
     pkill -f "python -m http.server" 2>/dev/null || true
+    pkill -f "scripts/static_server.py" 2>/dev/null || true
     
     # Attendre que les processus se terminent
     sleep 2
@@ -149,9 +151,9 @@ start_http_server() {
     local port=$1
     echo -e "${BLUE}Démarrage du serveur HTTP Python pour le frontend sur le port $port...${NC}"
     
-    # Utiliser une approche différente pour démarrer le serveur HTTP
-    # Changer de répertoire et démarrer le serveur
-    cd frontend && python -m http.server $port &
+    # Changer de répertoire et démarrer le serveur de fichiers statiques, qui
+    # précompresse scripts.js et styles.css (gzip, brotli) au démarrage
+    cd frontend && python scripts/static_server.py $port &
     HTTP_PID=$!
     
     # Attendre que le serveur HTTP démarre